@@ -0,0 +1,48 @@
+import asyncio
+
+from functools import partial
+
+from .cloud_management import CloudManager
+
+
+class AsyncCloudManager():
+    """
+    provides the API of the CloudManager as coroutines. The blocking calls to the cloud provider are run in an executor
+    of the event loop, so many cloud operations can be awaited concurrently.
+    """
+    def __init__(self, settings, executor=None):
+        """
+        :param settings: the cloud settings from the migration plan
+        :type settings: dict
+        :param executor: the executor the blocking calls are run in. By default the event loops default executor is used
+        :type executor: concurrent.futures.Executor
+        """
+        self._cloud_manager = CloudManager(settings)
+        self._executor = executor
+
+    async def start_target(self, server_id):
+        return await self._run_in_executor(self._cloud_manager.start_target, server_id)
+
+    async def stop_target(self, server_id):
+        return await self._run_in_executor(self._cloud_manager.stop_target, server_id)
+
+    async def delete_target(self, server_id):
+        return await self._run_in_executor(self._cloud_manager.delete_target, server_id)
+
+    async def create_target(self, name, bootstrapping_network_interface, network_interfaces, volumes, ram, cores):
+        return await self._run_in_executor(
+            self._cloud_manager.create_target,
+            name, bootstrapping_network_interface, network_interfaces, volumes, ram, cores
+        )
+
+    async def delete_volume(self, volume_id):
+        return await self._run_in_executor(self._cloud_manager.delete_volume, volume_id)
+
+    async def make_volume_boot(self, server_id, volume_id):
+        return await self._run_in_executor(self._cloud_manager.make_volume_boot, server_id, volume_id)
+
+    async def delete_nic(self, server_id, nic_id):
+        return await self._run_in_executor(self._cloud_manager.delete_nic, server_id, nic_id)
+
+    def _run_in_executor(self, function, *args):
+        return asyncio.get_event_loop().run_in_executor(self._executor, partial(function, *args))
@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+from settings.secret_loading import get_secret
+
 
 class CloudAdapter(metaclass=ABCMeta):
     """
@@ -19,6 +21,22 @@ class CloudAdapter(metaclass=ABCMeta):
     def __init__(self, settings):
         self._settings = settings
 
+    def _get_login(self):
+        """
+        returns the login of the cloud settings. If the cloud settings don't contain a login, the login is read from the
+        cloud_logins section of the secrets, which maps the cloud providers onto their logins.
+
+        :return: the login
+        :rtype: dict
+        :raises CloudAdapter.InvalidCloudSettingsException: if there is no login for the cloud provider
+        """
+        login = self._settings.get('login') or get_secret('cloud_logins', {}).get(self._settings.get('provider'))
+
+        if not login:
+            raise CloudAdapter.InvalidCloudSettingsException('The cloud settings are not specifying a login')
+
+        return login
+
     @abstractmethod
     def create_target(self, name, bootstrapping_network_interface, network_interfaces, volumes, ram, cores):
         """
@@ -1,7 +1,8 @@
+from importlib import import_module
+
 from enums.public import StringEnum
 
 from .cloud_adapter import CloudAdapter
-from .profitbricks import ProfitbricksAdapter
 
 
 class CloudProvider(StringEnum):
@@ -25,10 +26,11 @@ class CloudManager(CloudAdapter):
     provides an API to the operations executed in a cloud, but abstracts the actually used provider away
     """
     _PROVIDER_TO_ADAPTER_MAPPING = {
-        CloudProvider.PROFITBRICKS: ProfitbricksAdapter
+        CloudProvider.PROFITBRICKS: '.profitbricks.ProfitbricksAdapter'
     }
     """
-    maps a cloud provider onto the CloudAdapter which supports it
+    maps a cloud provider onto the path of the CloudAdapter which supports it. The adapters are only imported once they
+    are used, so the SDKs of the cloud providers are not loaded, when no cloud operation is executed.
     """
 
     def __init__(self, settings):
@@ -52,7 +54,20 @@ class CloudManager(CloudAdapter):
         if settings['provider'] not in self._PROVIDER_TO_ADAPTER_MAPPING:
             raise CloudProvider.UnsupportedProviderException(settings['provider'])
 
-        return self._PROVIDER_TO_ADAPTER_MAPPING[settings['provider']](settings)
+        return self._import_adapter_class(self._PROVIDER_TO_ADAPTER_MAPPING[settings['provider']])(settings)
+
+    @staticmethod
+    def _import_adapter_class(adapter_path):
+        """
+        imports the CloudAdapter with the given path
+
+        :param adapter_path: the path of the adapter class, relative to this package
+        :type adapter_path: str
+        :return: the adapter class
+        :rtype: CloudAdapter.__class__
+        """
+        module_path, class_name = adapter_path.rsplit('.', 1)
+        return getattr(import_module(module_path, __package__), class_name)
 
     def start_target(self, server_id):
         return self._adapter.start_target(server_id)
@@ -33,9 +33,10 @@ class ProfitbricksAdapter(CloudAdapter):
 
     def __init__(self, settings):
         super().__init__(settings)
+        login = self._get_login()
         self._client = ProfitBricksService(
-            username=settings['login']['username'],
-            password=settings['login']['password'],
+            username=login['username'],
+            password=login['password'],
         )
 
     @property
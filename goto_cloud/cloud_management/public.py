@@ -1 +1,2 @@
 from .cloud_management import CloudManager
+from .async_cloud_management import AsyncCloudManager
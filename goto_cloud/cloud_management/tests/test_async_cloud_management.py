@@ -0,0 +1,45 @@
+import asyncio
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from test_assets.public import TestAsset
+
+from cloud_management.public import AsyncCloudManager
+
+
+class TestAsyncCloudManager(TestCase):
+    def setUp(self):
+        self.cloud_manager = AsyncCloudManager(TestAsset.MIGRATION_PLAN_MOCK['target_cloud'])
+
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    @patch('cloud_management.cloud_management.CloudManager.start_target', return_value='STARTED')
+    def test_start_target(self, mocked_start_target):
+        self.assertEqual(self._run(self.cloud_manager.start_target('ID')), 'STARTED')
+        mocked_start_target.assert_called_with('ID')
+
+    @patch('cloud_management.cloud_management.CloudManager.create_target', return_value={'id': 'ID'})
+    def test_create_target(self, mocked_create_target):
+        self.assertEqual(
+            self._run(self.cloud_manager.create_target('name', {}, [], [10], 1024, 1)),
+            {'id': 'ID'}
+        )
+        mocked_create_target.assert_called_with('name', {}, [], [10], 1024, 1)
+
+    @patch('cloud_management.cloud_management.CloudManager.delete_nic')
+    @patch('cloud_management.cloud_management.CloudManager.delete_volume')
+    def test_concurrent_calls(self, mocked_delete_volume, mocked_delete_nic):
+        self._run(asyncio.gather(
+            self.cloud_manager.delete_volume('VOLUME_ID'),
+            self.cloud_manager.delete_nic('ID', 'NIC_ID'),
+        ))
+
+        mocked_delete_volume.assert_called_with('VOLUME_ID')
+        mocked_delete_nic.assert_called_with('ID', 'NIC_ID')
+
+    @patch('cloud_management.cloud_management.CloudManager.stop_target', side_effect=Exception('FAILED'))
+    def test_exception_raised(self, mocked_stop_target):
+        with self.assertRaises(Exception):
+            self._run(self.cloud_manager.stop_target('ID'))
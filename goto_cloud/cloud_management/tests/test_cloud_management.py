@@ -1,5 +1,10 @@
+import unittest
+
+from unittest.mock import patch
+
 from test_assets.public import TestAsset
 
+from ..cloud_adapter import CloudAdapter
 from ..cloud_management import CloudManager, CloudProvider
 
 from .test_profitbricks import TestProfitbricksAdapter
@@ -16,3 +21,48 @@ class TestCloudManager(TestProfitbricksAdapter):
     def test_unsupported_cloud_provider(self):
         with self.assertRaises(CloudProvider.UnsupportedProviderException):
             CloudManager({'provider': 'NOT_SUPPORTED'})
+
+
+class TestCloudAdapterLogin(unittest.TestCase):
+    LOGIN = {'username': 'user', 'password': 'password'}
+
+    class CloudAdapterMock(CloudAdapter):
+        create_target = delete_target = start_target = stop_target = delete_volume = None
+        delete_nic = make_volume_boot = None
+
+    @patch(CloudAdapter.__module__ + '.get_secret')
+    def test_get_login(self, get_secret):
+        self.assertEqual(
+            self.CloudAdapterMock({'provider': CloudProvider.PROFITBRICKS, 'login': self.LOGIN})._get_login(),
+            self.LOGIN
+        )
+        self.assertFalse(get_secret.called)
+
+    @patch(CloudAdapter.__module__ + '.get_secret')
+    def test_get_login__from_secrets(self, get_secret):
+        get_secret.return_value = {CloudProvider.PROFITBRICKS: self.LOGIN}
+
+        self.assertEqual(self.CloudAdapterMock({'provider': CloudProvider.PROFITBRICKS})._get_login(), self.LOGIN)
+        get_secret.assert_called_once_with('cloud_logins', {})
+
+    @patch(CloudAdapter.__module__ + '.get_secret', lambda name, default=None: default)
+    def test_get_login__missing(self):
+        with self.assertRaises(CloudAdapter.InvalidCloudSettingsException):
+            self.CloudAdapterMock({'provider': CloudProvider.PROFITBRICKS})._get_login()
+
+
+class TestCloudManagementImport(unittest.TestCase):
+    MODULE_BUDGET = 200
+
+    def setUp(self):
+        self.measurement = TestAsset.ImportMeasurement('cloud_management.public')
+
+    def test_import__cloud_sdks_not_loaded(self):
+        self.assertFalse(self.measurement.loaded('profitbricks'))
+
+    def test_import__settings_not_loaded(self):
+        self.assertFalse(self.measurement.loaded('settings.base'))
+        self.assertFalse(self.measurement.loaded('django'))
+
+    def test_import__within_budget(self):
+        self.assertLessEqual(len(self.measurement.imported_modules), self.MODULE_BUDGET)
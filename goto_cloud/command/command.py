@@ -1,3 +1,5 @@
+import asyncio
+
 import logging
 
 import traceback
@@ -95,12 +97,22 @@ class Command(metaclass=ABCMeta):
     def _collect_errors(method):
         """
         decorator function, which catches errors raised during the execution of the decorated method and collects them,
-        instead of stopping execution
+        instead of stopping execution. Coroutine functions can be decorated as well.
         
         :param method: (self: Command, *args, **kwargs) -> Any
         :return: the decorated method
         :rtype: (self: Command, *args, **kwargs) -> Any
         """
+        if asyncio.iscoroutinefunction(method):
+            async def wrapped_coroutine_method(self, *args, **kwargs):
+                try:
+                    return await method(self, *args, **kwargs)
+                except Exception as e:
+                    self.logger.error(traceback.format_exc())
+                    self._add_error(str(e))
+
+            return wrapped_coroutine_method
+
         def wrapped_method(self, *args, **kwargs):
             try:
                 return method(self, *args, **kwargs)
@@ -111,6 +123,40 @@ class Command(metaclass=ABCMeta):
         return wrapped_method
 
 
+class AsyncCommand(Command, metaclass=ABCMeta):
+    """
+    A Command, which is executed asynchronously. execute and _execute are coroutines, but errors are collected and
+    reported the same way, as they are for a synchronous Command.
+    """
+    async def execute(self):
+        """
+        executes the command
+
+        :return: does not return anything, except for a Commander.Signal, in case a Signal is given to the executing
+        unit
+        :rtype: None | str
+        """
+        self.errors = []
+
+        signal = await self._execute()
+
+        error_report = self.get_error_report()
+        if error_report: self._handle_error_report(error_report)
+
+        return signal
+
+    @abstractmethod
+    async def _execute(self):
+        """
+        private implementation of the command execution
+
+        :return: does not return anything, except for a Commander.Signal, in case a Signal is given to the executing
+        unit
+        :rtype: None | str
+        """
+        pass
+
+
 class SourceCommand(Command, metaclass=ABCMeta):
     """
     A Command which specifically executes in the context of a given Source
@@ -126,3 +172,10 @@ class SourceCommand(Command, metaclass=ABCMeta):
         self._source = source
         self._target = source.target
         self.logger = self.EVENT_LOGGER(source.remote_host)
+
+
+class AsyncSourceCommand(AsyncCommand, SourceCommand, metaclass=ABCMeta):
+    """
+    An AsyncCommand which specifically executes in the context of a given Source
+    """
+    pass
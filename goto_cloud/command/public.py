@@ -1 +1 @@
-from .command import SourceCommand
+from .command import SourceCommand, AsyncSourceCommand
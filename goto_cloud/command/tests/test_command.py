@@ -1,8 +1,10 @@
+import asyncio
+
 from unittest import TestCase
 
 from remote_host_event_logging.public import RemoteHostEventLogger
 
-from ..command import Command
+from ..command import Command, AsyncCommand
 
 
 class ErrorCommand(Command):
@@ -23,6 +25,25 @@ class NoErrorCommand(Command):
         return 'NOT_FAILED'
 
 
+class AsyncErrorCommand(AsyncCommand):
+    async def _execute(self):
+        await self._failing_method()
+        return 'SIGNAL'
+
+    @Command._collect_errors
+    async def _failing_method(self):
+        raise Exception('FAILED')
+
+
+class AsyncNoErrorCommand(AsyncCommand):
+    async def _execute(self):
+        return await self.not_failing_method()
+
+    @Command._collect_errors
+    async def not_failing_method(self):
+        return 'NOT_FAILED'
+
+
 class TestCommand(TestCase):
     def test_collect_errors(self):
         command = ErrorCommand()
@@ -46,3 +67,29 @@ class TestCommand(TestCase):
         command.execute()
         self.assertEqual(command.not_failing_method(), 'NOT_FAILED')
         self.assertEqual(command.get_error_report(), '')
+
+
+class TestAsyncCommand(TestCase):
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def test_collect_errors(self):
+        command = AsyncErrorCommand()
+        try:
+            with RemoteHostEventLogger.DisableLoggingContextManager():
+                self._run(command.execute())
+        except:
+            pass
+
+        self.assertEqual(command.get_error_report(), 'FAILED')
+
+    def test_collect_errors__throws_command_execution_exception(self):
+        with RemoteHostEventLogger.DisableLoggingContextManager():
+            with self.assertRaises(Command.CommandExecutionException):
+                self._run(AsyncErrorCommand().execute())
+
+    def test_collect_errors__not_failed(self):
+        command = AsyncNoErrorCommand()
+
+        self.assertEqual(self._run(command.execute()), 'NOT_FAILED')
+        self.assertEqual(command.get_error_report(), '')
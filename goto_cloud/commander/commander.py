@@ -1,11 +1,46 @@
+import asyncio
+import threading
+
 from abc import ABCMeta, abstractmethod
 
-from command.public import SourceCommand
+from concurrent.futures import ThreadPoolExecutor
+
+from contextlib import contextmanager
+
+from functools import partial
+
+from django.db import connection
+
+from command.public import SourceCommand, AsyncSourceCommand
+
+from event_store.public import SourceEvent, SourceEventRecorder
 
 from hook_handling.public import HookEventHandler
 
+from status_model.public import StatusModel
+
+
+class ConnectionClosingThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    a thread pool, which closes the database connection of its thread after every call. This way the threads don't
+    keep their connections open, once the pool has been shut down without waiting for them.
+    """
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(self._call_and_close_connection, fn, *args, **kwargs)
+
+    @staticmethod
+    def _call_and_close_connection(fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connection.close()
 
-class Commander(SourceCommand, metaclass=ABCMeta):
+
+class CommanderMixin(metaclass=ABCMeta):
+    """
+    The behaviour, which is shared by the Commander and the AsyncCommander: loading the context of the source, recording
+    the events of the executed commands, and holding the lease of the source.
+    """
     class Signal():
         """
         a signal can be returned by a Commands execute or rollback method, to trigger a certain behaviour of the
@@ -13,17 +48,137 @@ class Commander(SourceCommand, metaclass=ABCMeta):
         """
         SLEEP = 'SLEEP'
 
-    def __init__(self, source):
-        """
-        The Commander is initialized with a Source instance and the commander driver.
+    HEARTBEAT_FRACTION = 1 / 3
+    """
+    the fraction of the lease duration, after which the lease is renewed, while a command is executed
+    """
 
+    def __init__(self, source, lease_owner=None, lease_duration=StatusModel.DEFAULT_LEASE_DURATION):
+        """
         :param source: the Source in whose context the Command will be executed
         :type source: source.public.Source
+        :param lease_owner: identifies this worker. If given, the source is only executed while its lease is held.
+        :type lease_owner: str
+        :param lease_duration: the number of seconds the lease is held, after it has been claimed or renewed
+        :type lease_duration: float
         """
+        source.load_lifecycle_context()
         super().__init__(source)
         self.hook_event_handler = HookEventHandler(source)
+        self.event_recorder = SourceEventRecorder.get_default()
+        self.lease_owner = lease_owner
+        self.lease_duration = lease_duration
+        self._source_hostname = self._get_source_hostname(source)
+
+    @staticmethod
+    def _get_source_hostname(source):
+        return (source.remote_host.hostname if source.remote_host else None) or 'unknown host'
+
+    def _renew_lease(self):
+        """
+        claims the lease of the source in its current status, or renews it, if a lease owner is given
+
+        :raises: StatusModel.LeaseLostException in case the source is leased by another owner, or its status changed
+        """
+        if self.lease_owner and not self._source.claim(self.lease_owner, self.lease_duration):
+            raise StatusModel.LeaseLostException('{owner} could not claim the lease of {source_hostname}'.format(
+                owner=self.lease_owner,
+                source_hostname=self._source_hostname,
+            ))
+
+    def _heartbeat(self):
+        """
+        renews the lease of the source, while a command is executed
+
+        :raises: StatusModel.LeaseLostException in case the lease is not held anymore
+        """
+        self._source.heartbeat(self.lease_owner, self.lease_duration)
+
+    def _get_heartbeat_interval(self):
+        """
+        :return: the number of seconds between two heartbeats
+        :rtype: float
+        """
+        return self.lease_duration * self.HEARTBEAT_FRACTION
+
+    def _increment_status(self):
+        """
+        increments the status of the source, as the owner of its lease
+        """
+        self._source.increment_status(owner=self.lease_owner or '')
+
+    def _stop(self):
+        """
+        flushes the recorded events and releases the lease of the source, once the Commander stops
+        """
+        self.event_recorder.flush(wait=False)
+        if self.lease_owner:
+            self._source.release(self.lease_owner)
+
+    def _record_event(self, event_type, phase, command_class, flush_when_full=True, **data):
+        """
+        records an event of the executed command
+
+        :param event_type: the type of the event
+        :type event_type: str
+        :param phase: the status, the command has been executed in
+        :type phase: str
+        :param command_class: the class of the executed command
+        :type command_class: SourceCommand.__class__ | AsyncSourceCommand.__class__
+        :param flush_when_full: whether the buffered events are written right away, once the buffer is full
+        :type flush_when_full: bool
+        :param data: additional data of the event. Values which are None are not recorded
+        :type data: **dict
+        """
+        self.event_recorder.record(
+            self._source,
+            event_type,
+            phase=phase,
+            command=command_class.__name__,
+            data={key: value for key, value in data.items() if value is not None},
+            flush_when_full=flush_when_full,
+        )
 
+    def _initialize_command(self, command_class):
+        """
+        This method is used, to initialize a given Command. This can easily be overwritten, to change the way the
+        Commands are initialized
+
+        :param command_class: the class for the Command
+        :type command_class: SourceCommand.__class__ | AsyncSourceCommand.__class__
+        :return: the Command instance
+        :rtype: SourceCommand | AsyncSourceCommand
+        """
+        return command_class(self._source)
+
+    @property
+    @abstractmethod
+    def _commander_driver(self):
+        """
+        returns the mapping of status to command, which is used in this Commander
+        
+        :return: the command mapping
+        :rtype: dict
+        """
+        pass
+
+
+class Commander(CommanderMixin, SourceCommand, metaclass=ABCMeta):
+    """
+    Drives the lifecycle of a Source, by executing the command of every status. The related objects of the source are
+    loaded once, when the Commander is initialized, and shared by all commands.
+
+    The start, the end and the failure of every command are recorded as SourceEvents. The events are buffered by the
+    process wide SourceEventRecorder and are flushed, once the Commander stops or a command fails.
+
+    If a lease owner is given, the lease of the source is claimed, or renewed, before every status is executed, and
+    released once the Commander stops or a command fails. This way several workers can drive the lifecycles of the same
+    sources, without executing a status twice. While a command is executed, a background thread renews the lease by a
+    heartbeat. A running command can not be interrupted, so if a heartbeat fails, the command is aborted once it
+    returned, and the status is not changed.
+    """
     def _execute(self):
+        self._renew_lease()
         current_command_class = self._commander_driver.get(self._source.status)
         signal = None
         if current_command_class:
@@ -32,8 +187,10 @@ class Commander(SourceCommand, metaclass=ABCMeta):
             self._source.status != self._source.lifecycle[-1]
             and (signal is None or signal != Commander.Signal.SLEEP)
         ):
-            self._source.increment_status()
+            self._increment_status()
             self.execute()
+        else:
+            self._stop()
 
     def _execute_command(self, command_class):
         """
@@ -43,50 +200,329 @@ class Commander(SourceCommand, metaclass=ABCMeta):
         :type command_class: SourceCommand.__class__
         :return: the signal the executed command returned, in case it did return a signal
         """
-        # TODO error handling and persistent status logging
+        # TODO error handling
         current_command = self._initialize_command(command_class)
         self.logger.info('start executing {command_name} on {source_hostname}'.format(
             command_name=str(command_class),
-            source_hostname=self._source.remote_host.system_info.get('network', {}).get('hostname', 'unknown host')
-            if self._source.remote_host else 'unknown host'
+            source_hostname=self._source_hostname,
         ))
-        self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
-        signal = current_command.execute()
-        self.hook_event_handler.emit(HookEventHandler.EventType.AFTER)
+        phase = self._source.status
+        self._record_event(SourceEvent.EventType.COMMAND_STARTED, phase, command_class)
+        try:
+            with self._keep_lease():
+                self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
+                signal = current_command.execute()
+                self.hook_event_handler.emit(HookEventHandler.EventType.AFTER)
+        except Exception as e:
+            self._record_event(SourceEvent.EventType.COMMAND_FAILED, phase, command_class, error=str(e))
+            self._stop()
+            raise
+        self._record_event(SourceEvent.EventType.COMMAND_FINISHED, phase, command_class, signal=signal)
         self.logger.info('finished executing {command_name} on {source_hostname}'.format(
             command_name=str(command_class),
-            source_hostname=self._source.remote_host.system_info.get('network', {}).get('hostname', 'unknown host')
-            if self._source.remote_host else 'unknown host'
+            source_hostname=self._source_hostname,
         ))
         return signal
 
+    @contextmanager
+    def _keep_lease(self):
+        """
+        renews the lease of the source in a background thread, while the context is entered
+
+        :raises: StatusModel.LeaseLostException when the context is left, in case a heartbeat failed
+        """
+        if not self.lease_owner:
+            yield
+            return
+
+        stopped = threading.Event()
+        heartbeat_errors = []
+
+        def keep_lease():
+            try:
+                while not stopped.wait(self._get_heartbeat_interval()):
+                    self._heartbeat()
+            except Exception as e:
+                heartbeat_errors.append(e)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=keep_lease, name='LeaseHeartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+        if heartbeat_errors:
+            raise StatusModel.LeaseLostException('{owner} lost the lease of {source_hostname}'.format(
+                owner=self.lease_owner,
+                source_hostname=self._source_hostname,
+            )) from heartbeat_errors[0]
+
     def increment_status_and_execute(self):
         """
-        starts execution beginning with the next status
+        starts execution beginning with the next status. If a lease owner is given, the lease is claimed first, since
+        only the owner of the lease can change the status.
         
         """
-        self._source.increment_status()
+        self._renew_lease()
+        self._increment_status()
         self.execute()
 
-    def _initialize_command(self, command_class):
+
+class AsyncCommander(CommanderMixin, AsyncSourceCommand, metaclass=ABCMeta):
+    """
+    The asynchronous counterpart of the Commander. Commands of the driver, which are AsyncSourceCommands, are awaited
+    directly. Synchronous SourceCommands, hooks and status changes are run in an executor, so they don't block the event
+    loop. This allows a single process, to drive the lifecycles of many sources concurrently.
+
+    Only the awaited AsyncSourceCommands are executed without occupying a thread. Every blocking call occupies a thread
+    of the executor, so the number of commanders which make progress on blocking calls at the same time, is limited by
+    the number of threads of the executor.
+
+    If a lease owner is given, the lease is renewed by a heartbeat task, while a command is executed. The heartbeats are
+    run in their own small thread pool, so they are not delayed by the blocking calls they keep the lease for. If a
+    heartbeat fails, awaiting the command is cancelled, and the status is not changed. An AsyncSourceCommand is
+    cancelled with it, but a SourceCommand, which is running in the executor, can not be interrupted and keeps running
+    in its thread, until it returns. Its failure event is marked as abandoned.
+    """
+    HEARTBEAT_THREADS = 2
+    """
+    the number of threads of the thread pool, which is shared by the heartbeats of all AsyncCommanders by default
+    """
+
+    _default_heartbeat_executor = None
+
+    def __init__(
+        self,
+        source,
+        executor=None,
+        lease_owner=None,
+        lease_duration=StatusModel.DEFAULT_LEASE_DURATION,
+        heartbeat_executor=None,
+    ):
         """
-        This method is used, to initialize a given Command. This can easily be overwritten, to change the way the
-        Commands are initialized
+        :param source: the Source in whose context the Command will be executed
+        :type source: source.public.Source
+        :param executor: the executor blocking calls are run in. By default the event loops default executor is used
+        :type executor: concurrent.futures.Executor
+        :param lease_owner: identifies this worker. If given, the source is only executed while its lease is held.
+        :type lease_owner: str
+        :param lease_duration: the number of seconds the lease is held, after it has been claimed or renewed
+        :type lease_duration: float
+        :param heartbeat_executor: the executor the heartbeats are run in. By default a thread pool is used, which is
+        shared by all AsyncCommanders of this process
+        :type heartbeat_executor: concurrent.futures.Executor
+        """
+        self._executor = executor
+        self._heartbeat_executor = heartbeat_executor
+        super().__init__(source, lease_owner=lease_owner, lease_duration=lease_duration)
 
-        :param command_class: the class for the Command
-        :type command_class: SourceCommand.__class__()
-        :return: the Command instance
-        :rtype: SourceCommand
+    @classmethod
+    def get_default_heartbeat_executor(cls):
         """
-        return command_class(self._source)
+        :return: the thread pool, which runs the heartbeats of all AsyncCommanders of this process by default
+        :rtype: ConnectionClosingThreadPoolExecutor
+        """
+        if AsyncCommander._default_heartbeat_executor is None:
+            AsyncCommander._default_heartbeat_executor = ConnectionClosingThreadPoolExecutor(
+                cls.HEARTBEAT_THREADS,
+                thread_name_prefix='LeaseHeartbeat',
+            )
+        return AsyncCommander._default_heartbeat_executor
 
-    @property
-    @abstractmethod
-    def _commander_driver(self):
+    @classmethod
+    async def execute_many(cls, sources, max_concurrency=None, executor=None, lease_owner=None, increment_status=False):
         """
-        returns the mapping of status to command, which is used in this Commander
+        executes a commander for every given source concurrently
+
+        :param sources: the sources to execute the commanders for
+        :type sources: list[source.public.Source]
+        :param max_concurrency: the maximum number of commanders, which are executed at the same time. By default there
+        is no limit.
+        :type max_concurrency: int
+        :param executor: the executor blocking calls, including the initialization of the commanders, are run in. By
+        default a thread pool is used, which has a thread for every commander that is executed at the same time, so the
+        blocking calls of the commanders don't wait for each other. Its threads close their database connections after
+        every call.
+        :type executor: concurrent.futures.Executor
+        :param lease_owner: identifies this worker. If given, sources leased by other workers fail with a
+        StatusModel.LeaseLostException.
+        :type lease_owner: str
+        :param increment_status: whether the commanders start with the next status of their sources, instead of the
+        current one, like increment_status_and_execute does
+        :type increment_status: bool
+        :return: the result of every commander, in the order of the sources. If a commander failed, its exception is
+        returned instead of raised, so one failing source does not affect the others
+        :rtype: list
+        """
+        if not sources:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        owned_executor = None
+        if executor is None:
+            executor = owned_executor = ConnectionClosingThreadPoolExecutor(max_concurrency or len(sources))
+
+        async def execute(source):
+            # the commander loads the context of the source from the database, when it is initialized
+            commander = await asyncio.get_event_loop().run_in_executor(
+                executor,
+                partial(cls, source, executor=executor, lease_owner=lease_owner),
+            )
+            return await (commander.increment_status_and_execute() if increment_status else commander.execute())
+
+        async def execute_limited(source):
+            async with semaphore:
+                return await execute(source)
+
+        try:
+            # the tasks are created in the order of the sources, since gather does not keep the order, in which it
+            # starts the coroutines it is given
+            return await asyncio.gather(
+                *[
+                    asyncio.ensure_future(execute(source) if semaphore is None else execute_limited(source))
+                    for source in sources
+                ],
+                return_exceptions=True
+            )
+        finally:
+            if owned_executor is not None:
+                owned_executor.shutdown(wait=False)
+
+    async def _execute(self):
+        while True:
+            await self._run_in_executor(self._renew_lease)
+            current_command_class = self._commander_driver.get(self._source.status)
+            signal = None
+            if current_command_class:
+                signal = await self._execute_command(current_command_class)
+            if self._source.status == self._source.lifecycle[-1] or signal == Commander.Signal.SLEEP:
+                await self._run_in_executor(self._stop)
+                return
+            await self._run_in_executor(self._increment_status)
+
+    async def _execute_command(self, command_class):
+        """
+        initialized and executes the given command class
+
+        :param command_class: the class of the command you want to execute
+        :type command_class: SourceCommand.__class__ | AsyncSourceCommand.__class__
+        :return: the signal the executed command returned, in case it did return a signal
+        """
+        current_command = self._initialize_command(command_class)
+        self.logger.info('start executing {command_name} on {source_hostname}'.format(
+            command_name=str(command_class),
+            source_hostname=self._source_hostname,
+        ))
+        phase = self._source.status
+        self._record_event(SourceEvent.EventType.COMMAND_STARTED, phase, command_class)
+        try:
+            signal = await self._keep_lease(self._execute_with_hooks(current_command))
+        except Exception as e:
+            # a SourceCommand can't be cancelled, once it is running in the executor. It is only not awaited anymore.
+            abandoned = (
+                isinstance(e, StatusModel.LeaseLostException) and not isinstance(current_command, AsyncSourceCommand)
+            )
+            self._record_event(
+                SourceEvent.EventType.COMMAND_FAILED,
+                phase,
+                command_class,
+                error=str(e),
+                abandoned=abandoned or None,
+            )
+            await self._run_in_executor(self._stop)
+            raise
+        self._record_event(SourceEvent.EventType.COMMAND_FINISHED, phase, command_class, signal=signal)
+        self.logger.info('finished executing {command_name} on {source_hostname}'.format(
+            command_name=str(command_class),
+            source_hostname=self._source_hostname,
+        ))
+        return signal
+
+    async def _execute_with_hooks(self, command):
+        """
+        executes the given command, and emits the hooks before and after it
+
+        :param command: the command to execute
+        :type command: SourceCommand | AsyncSourceCommand
+        :return: the signal the executed command returned, in case it did return a signal
+        """
+        await self._run_in_executor(self.hook_event_handler.emit, HookEventHandler.EventType.BEFORE)
+        if isinstance(command, AsyncSourceCommand):
+            signal = await command.execute()
+        else:
+            signal = await self._run_in_executor(command.execute)
+        await self._run_in_executor(self.hook_event_handler.emit, HookEventHandler.EventType.AFTER)
+        return signal
+
+    async def _keep_lease(self, coroutine):
+        """
+        awaits the given coroutine, while a heartbeat task renews the lease of the source
+
+        :param coroutine: the coroutine to await
+        :type coroutine: collections.Awaitable
+        :return: the result of the coroutine
+        :raises: StatusModel.LeaseLostException in case a heartbeat failed, and awaiting the coroutine has been
+        cancelled. Blocking calls the coroutine awaited in the executor are not interrupted by this.
+        """
+        task = asyncio.ensure_future(coroutine)
+
+        if not self.lease_owner:
+            return await task
+
+        heartbeat = asyncio.ensure_future(self._heartbeat_until_done(task))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.exception():
+                raise StatusModel.LeaseLostException('{owner} lost the lease of {source_hostname}'.format(
+                    owner=self.lease_owner,
+                    source_hostname=self._source_hostname,
+                )) from heartbeat.exception()
+            raise
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat_until_done(self, task):
+        """
+        renews the lease of the source periodically in the heartbeat executor, until it is cancelled. If a heartbeat
+        fails, the given task is cancelled.
+
+        :param task: the task, which requires the lease
+        :type task: asyncio.Task
+        """
+        heartbeat_executor = self._heartbeat_executor or self.get_default_heartbeat_executor()
+
+        while True:
+            await asyncio.sleep(self._get_heartbeat_interval())
+            try:
+                await asyncio.get_event_loop().run_in_executor(heartbeat_executor, self._heartbeat)
+            except Exception:
+                task.cancel()
+                raise
+
+    async def increment_status_and_execute(self):
+        """
+        starts execution beginning with the next status. If a lease owner is given, the lease is claimed first, since
+        only the owner of the lease can change the status.
         
-        :return: the command mapping
-        :rtype: dict
         """
-        pass
+        await self._run_in_executor(self._renew_lease)
+        await self._run_in_executor(self._increment_status)
+        await self.execute()
+
+    def _record_event(self, event_type, phase, command_class, flush_when_full=True, **data):
+        """
+        records an event of the executed command. Events are recorded on the event loop, so a full buffer is flushed in
+        the executor, instead of blocking the event loop.
+        """
+        super()._record_event(event_type, phase, command_class, flush_when_full=False, **data)
+
+        if flush_when_full and self.event_recorder.is_full:
+            self._run_in_executor(self.event_recorder.flush, False)
+
+    def _run_in_executor(self, function, *args):
+        return asyncio.get_event_loop().run_in_executor(self._executor, partial(function, *args))
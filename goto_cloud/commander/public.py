@@ -1 +1 @@
-from .commander import Commander
+from .commander import Commander, AsyncCommander
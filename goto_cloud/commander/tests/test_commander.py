@@ -1,12 +1,25 @@
+import asyncio
+import threading
+import time
+
 from unittest import TestCase
+from unittest.mock import patch
+
+from django import test
 
-from command.public import SourceCommand
+from command.public import SourceCommand, AsyncSourceCommand
 
 from enums.public import StringEnum
 
+from event_store.public import SourceEvent, SourceEventRecorder
+
+from remote_host.public import RemoteHost
+
 from source.public import Source
 
-from ..commander import Commander
+from test_assets.public import TestAsset
+
+from ..commander import Commander, AsyncCommander, ConnectionClosingThreadPoolExecutor
 
 
 class TestSource(Source):
@@ -34,7 +47,7 @@ class TestSource(Source):
             TestSource.Status.FIFTH,
         )
 
-    def increment_status(self):
+    def increment_status(self, owner=''):
         self.status = self._lifecycle_manager.get_next_status()
 
 
@@ -81,6 +94,152 @@ class SleepCommander(Commander):
         }
 
 
+class AsyncDefaultCommand(AsyncSourceCommand):
+    executed_statuses = []
+
+    async def _execute(self):
+        AsyncDefaultCommand.executed_statuses.append(self._source.status)
+
+
+class AsyncSleepCommand(AsyncSourceCommand):
+    async def _execute(self):
+        await asyncio.sleep(0)
+        return Commander.Signal.SLEEP
+
+
+class AsyncDefaultCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            TestSource.Status.FIRST: AsyncDefaultCommand,
+            TestSource.Status.SECOND: DefaultCommand,
+            TestSource.Status.THIRD: AsyncDefaultCommand,
+            TestSource.Status.FORTH: AsyncDefaultCommand,
+            TestSource.Status.FIFTH: DefaultCommand,
+        }
+
+
+class AsyncSleepCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            TestSource.Status.FIRST: DefaultCommand,
+            TestSource.Status.SECOND: AsyncDefaultCommand,
+            TestSource.Status.FORTH: AsyncSleepCommand,
+            TestSource.Status.FIFTH: DefaultCommand,
+        }
+
+
+class FailingCommand(SourceCommand):
+    def _execute(self):
+        raise Exception('command failed')
+
+
+class SourceSleepCommander(Commander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: DefaultCommand,
+            Source.Status.CREATE_TARGET: SleepCommand,
+        }
+
+
+class SourceFailingCommander(Commander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: FailingCommand,
+        }
+
+
+class AsyncSourceSleepCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: AsyncDefaultCommand,
+            Source.Status.CREATE_TARGET: AsyncSleepCommand,
+        }
+
+
+class SlowCommand(SourceCommand):
+    def _execute(self):
+        time.sleep(0.1)
+
+
+class SlowSourceCommander(Commander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: SlowCommand,
+            Source.Status.CREATE_TARGET: SleepCommand,
+        }
+
+
+class AsyncSlowCommand(AsyncSourceCommand):
+    async def _execute(self):
+        await asyncio.sleep(0.35)
+
+
+class AsyncLeaseStealingCommand(AsyncSourceCommand):
+    finished = False
+
+    async def _execute(self):
+        Source.objects.filter(pk=self._source.pk).update(lease_owner='other worker')
+        await asyncio.sleep(0.35)
+        AsyncLeaseStealingCommand.finished = True
+
+
+class HeartbeatAwaitingCommand(SourceCommand):
+    heartbeat_sent = threading.Event()
+    heartbeat_sent_while_executing = False
+
+    def _execute(self):
+        HeartbeatAwaitingCommand.heartbeat_sent_while_executing = HeartbeatAwaitingCommand.heartbeat_sent.wait(5)
+
+
+class LeaseStealingCommand(SourceCommand):
+    finished = threading.Event()
+
+    def _execute(self):
+        Source.objects.filter(pk=self._source.pk).update(lease_owner='other worker')
+        time.sleep(0.35)
+        LeaseStealingCommand.finished.set()
+
+
+class AsyncSlowSourceCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: AsyncSlowCommand,
+            Source.Status.CREATE_TARGET: AsyncSleepCommand,
+        }
+
+
+class AsyncLeaseStealingSourceCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: AsyncLeaseStealingCommand,
+        }
+
+
+class HeartbeatAwaitingSourceCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: HeartbeatAwaitingCommand,
+            Source.Status.CREATE_TARGET: SleepCommand,
+        }
+
+
+class LeaseStealingSourceCommander(AsyncCommander):
+    @property
+    def _commander_driver(self):
+        return {
+            Source.Status.DRAFT: LeaseStealingCommand,
+        }
+
+
 class TestCommander(TestCase):
     def setUp(self):
         self.test_source = TestSource()
@@ -107,3 +266,385 @@ class TestCommander(TestCase):
         SleepCommander(self.test_source).execute()
         self.assertEquals(self.test_source.status, TestSource.Status.FORTH)
         SleepCommander(self.test_source).increment_status_and_execute()
+
+
+class TestAsyncCommander(TestCase):
+    def setUp(self):
+        self.test_source = TestSource()
+        AsyncDefaultCommand.executed_statuses = []
+
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def test_execute(self):
+        self._run(AsyncDefaultCommander(self.test_source).execute())
+
+        self.assertEquals(self.test_source.status, TestSource.Status.FIFTH)
+        self.assertEquals(AsyncDefaultCommand.executed_statuses, [TestSource.Status.FIRST, TestSource.Status.FORTH])
+
+    def test_execute__sleep(self):
+        self._run(AsyncSleepCommander(self.test_source).execute())
+        self.assertEquals(self.test_source.status, TestSource.Status.FORTH)
+        self._run(AsyncSleepCommander(self.test_source).execute())
+        self.assertEquals(self.test_source.status, TestSource.Status.FORTH)
+
+    def test_increment_status_and_execute(self):
+        self._run(AsyncSleepCommander(self.test_source).execute())
+        self._run(AsyncSleepCommander(self.test_source).increment_status_and_execute())
+        self.assertEquals(self.test_source.status, TestSource.Status.FIFTH)
+
+    def test_execute_many(self):
+        test_sources = [TestSource() for _ in range(10)]
+
+        results = self._run(AsyncSleepCommander.execute_many(test_sources, max_concurrency=3))
+
+        self.assertEqual(results, [None] * 10)
+        self.assertEqual({test_source.status for test_source in test_sources}, {TestSource.Status.FORTH})
+
+    def test_execute_many__executor_sized_for_concurrency(self):
+        executors = []
+
+        class RecordingCommander(AsyncSleepCommander):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                executors.append(self._executor)
+
+        self._run(RecordingCommander.execute_many([TestSource() for _ in range(4)], max_concurrency=3))
+
+        self.assertEqual(len({id(executor) for executor in executors}), 1)
+        self.assertEqual(executors[0]._max_workers, 3)
+
+    def test_execute_many__commanders_initialized_in_executor(self):
+        initializing_threads = []
+
+        class RecordingCommander(AsyncSleepCommander):
+            def __init__(self, *args, **kwargs):
+                initializing_threads.append(threading.current_thread())
+                super().__init__(*args, **kwargs)
+
+        self._run(RecordingCommander.execute_many([TestSource() for _ in range(3)]))
+
+        self.assertEqual(len(initializing_threads), 3)
+        self.assertNotIn(threading.current_thread(), initializing_threads)
+
+    @patch(ConnectionClosingThreadPoolExecutor.__module__ + '.connection')
+    def test_execute_many__connections_closed(self, connection):
+        self._run(AsyncSleepCommander.execute_many([TestSource() for _ in range(3)], max_concurrency=2))
+
+        self.assertTrue(connection.close.called)
+
+    @patch(ConnectionClosingThreadPoolExecutor.__module__ + '.connection')
+    def test_connection_closing_thread_pool_executor(self, connection):
+        executor = ConnectionClosingThreadPoolExecutor(1)
+
+        self.assertEqual(executor.submit(lambda: connection.close.call_count).result(), 0)
+        self.assertEqual(connection.close.call_count, 1)
+
+        with self.assertRaises(ValueError):
+            executor.submit(int, 'no number').result()
+        self.assertEqual(connection.close.call_count, 2)
+        executor.shutdown()
+
+    def test_execute_many__no_sources(self):
+        self.assertEqual(self._run(AsyncSleepCommander.execute_many([])), [])
+
+    def test_commander_driver_required(self):
+        class IncompleteCommander(AsyncCommander):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteCommander(self.test_source)
+
+    def test_execute_many__failure_does_not_affect_other_sources(self):
+        test_sources = [TestSource() for _ in range(3)]
+        test_sources[1].status = 'UNKNOWN'
+
+        results = self._run(AsyncDefaultCommander.execute_many(test_sources))
+
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(test_sources[0].status, TestSource.Status.FIFTH)
+        self.assertEqual(test_sources[2].status, TestSource.Status.FIFTH)
+
+
+class TestCommanderEvents(test.TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(remote_host=RemoteHost.objects.create())
+
+    def get_events(self):
+        return list(
+            SourceEvent.objects.for_source(self.source).timeline().values_list('phase', 'command', 'event_type')
+        )
+
+    def test_execute(self):
+        SourceSleepCommander(self.source).execute()
+
+        self.assertEqual(self.get_events(), [
+            (Source.Status.DRAFT, 'DefaultCommand', SourceEvent.EventType.COMMAND_STARTED),
+            (Source.Status.DRAFT, 'DefaultCommand', SourceEvent.EventType.COMMAND_FINISHED),
+            (Source.Status.CREATE_TARGET, 'SleepCommand', SourceEvent.EventType.COMMAND_STARTED),
+            (Source.Status.CREATE_TARGET, 'SleepCommand', SourceEvent.EventType.COMMAND_FINISHED),
+        ])
+        self.assertEqual(
+            SourceEvent.objects.for_source(self.source).timeline().last().data,
+            {'signal': Commander.Signal.SLEEP}
+        )
+
+    def test_execute__failed(self):
+        with self.assertRaises(Exception):
+            SourceFailingCommander(self.source).execute()
+
+        self.assertEqual(self.get_events(), [
+            (Source.Status.DRAFT, 'FailingCommand', SourceEvent.EventType.COMMAND_STARTED),
+            (Source.Status.DRAFT, 'FailingCommand', SourceEvent.EventType.COMMAND_FAILED),
+        ])
+        self.assertIn(
+            'command failed',
+            SourceEvent.objects.of_types(SourceEvent.EventType.COMMAND_FAILED).get().data['error']
+        )
+
+    def test_execute__async(self):
+        asyncio.get_event_loop().run_until_complete(
+            AsyncSourceSleepCommander(self.source, executor=TestAsset.CurrentThreadExecutor()).execute()
+        )
+
+        self.assertEqual(self.get_events(), [
+            (Source.Status.DRAFT, 'AsyncDefaultCommand', SourceEvent.EventType.COMMAND_STARTED),
+            (Source.Status.DRAFT, 'AsyncDefaultCommand', SourceEvent.EventType.COMMAND_FINISHED),
+            (Source.Status.CREATE_TARGET, 'AsyncSleepCommand', SourceEvent.EventType.COMMAND_STARTED),
+            (Source.Status.CREATE_TARGET, 'AsyncSleepCommand', SourceEvent.EventType.COMMAND_FINISHED),
+        ])
+
+
+    def test_execute__async_full_buffer_flushed_in_executor(self):
+        class RecordingExecutor(TestAsset.CurrentThreadExecutor):
+            is_executing = False
+
+            def submit(self, fn, *args, **kwargs):
+                self.is_executing = True
+                try:
+                    return super().submit(fn, *args, **kwargs)
+                finally:
+                    self.is_executing = False
+
+        executor = RecordingExecutor()
+        commander = AsyncSourceSleepCommander(self.source, executor=executor)
+        commander.event_recorder = SourceEventRecorder(batch_size=1)
+        flushed_in_executor = []
+        flush = commander.event_recorder.flush
+
+        def recording_flush(*args, **kwargs):
+            flushed_in_executor.append(executor.is_executing)
+            return flush(*args, **kwargs)
+
+        with patch.object(commander.event_recorder, 'flush', recording_flush):
+            asyncio.get_event_loop().run_until_complete(commander.execute())
+
+        self.assertTrue(flushed_in_executor)
+        self.assertTrue(all(flushed_in_executor))
+        self.assertEqual(len(self.get_events()), 4)
+
+    @test.override_settings(SOURCE_EVENT_RECORDER_STARTED=True)
+    def test_execute__flushed_in_background(self):
+        flushing_threads = []
+
+        def bulk_create(events, batch_size=None):
+            flushing_threads.append(threading.current_thread().name)
+
+        with patch.object(SourceEventRecorder, '_default_recorder', None), \
+                patch.object(SourceEvent.objects, 'bulk_create', bulk_create):
+            commander = SourceSleepCommander(self.source)
+            self.assertTrue(commander.event_recorder.is_running)
+
+            commander.execute()
+            commander.event_recorder.stop()
+
+        self.assertTrue(flushing_threads)
+        self.assertEqual(set(flushing_threads), {'SourceEventRecorder'})
+
+
+class TestCommanderLease(test.TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(remote_host=RemoteHost.objects.create())
+
+    def test_execute(self):
+        SourceSleepCommander(self.source, lease_owner='worker').execute()
+
+        source = Source.objects.get(pk=self.source.pk)
+        self.assertEqual(source.status, Source.Status.CREATE_TARGET)
+        self.assertEqual(source.lease_owner, '')
+        self.assertIsNone(source.lease_expires)
+
+    def test_execute__leased_by_other_owner(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        with self.assertRaises(Source.LeaseLostException):
+            SourceSleepCommander(self.source, lease_owner='worker').execute()
+
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.DRAFT)
+        self.assertFalse(SourceEvent.objects.for_source(self.source).exists())
+
+    def test_execute__failed__lease_released(self):
+        with self.assertRaises(Exception):
+            SourceFailingCommander(self.source, lease_owner='worker').execute()
+
+        self.assertEqual(Source.objects.get(pk=self.source.pk).lease_owner, '')
+
+    def test_execute__async(self):
+        asyncio.get_event_loop().run_until_complete(AsyncSourceSleepCommander(
+            self.source,
+            executor=TestAsset.CurrentThreadExecutor(),
+            lease_owner='worker',
+        ).execute())
+
+        source = Source.objects.get(pk=self.source.pk)
+        self.assertEqual(source.status, Source.Status.CREATE_TARGET)
+        self.assertEqual(source.lease_owner, '')
+
+    def test_execute__async__leased_by_other_owner(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        with self.assertRaises(Source.LeaseLostException):
+            asyncio.get_event_loop().run_until_complete(AsyncSourceSleepCommander(
+                self.source,
+                executor=TestAsset.CurrentThreadExecutor(),
+                lease_owner='worker',
+            ).execute())
+
+    def test_increment_status_and_execute(self):
+        SourceSleepCommander(Source.objects.get(pk=self.source.pk), lease_owner='worker').increment_status_and_execute()
+
+        source = Source.objects.get(pk=self.source.pk)
+        self.assertEqual(source.status, Source.Status.CREATE_TARGET)
+        self.assertEqual(source.lease_owner, '')
+
+    def test_increment_status_and_execute__async(self):
+        asyncio.get_event_loop().run_until_complete(AsyncSourceSleepCommander(
+            Source.objects.get(pk=self.source.pk),
+            executor=TestAsset.CurrentThreadExecutor(),
+            lease_owner='worker',
+        ).increment_status_and_execute())
+
+        source = Source.objects.get(pk=self.source.pk)
+        self.assertEqual(source.status, Source.Status.CREATE_TARGET)
+        self.assertEqual(source.lease_owner, '')
+
+    def test_increment_status_and_execute__leased_by_other_owner(self):
+        self.source.claim('other worker')
+
+        with self.assertRaises(Source.LeaseLostException):
+            SourceSleepCommander(
+                Source.objects.get(pk=self.source.pk), lease_owner='worker'
+            ).increment_status_and_execute()
+
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.DRAFT)
+
+    def test_execute__heartbeat(self):
+        commander = SlowSourceCommander(self.source, lease_owner='worker', lease_duration=0.03)
+
+        with patch.object(commander, '_heartbeat') as heartbeat:
+            commander.execute()
+
+        self.assertGreater(heartbeat.call_count, 0)
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.CREATE_TARGET)
+
+    def test_execute__heartbeat_failed(self):
+        commander = SlowSourceCommander(self.source, lease_owner='worker', lease_duration=0.03)
+
+        with patch.object(commander, '_heartbeat', side_effect=Source.LeaseLostException()):
+            with self.assertRaises(Source.LeaseLostException):
+                commander.execute()
+
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.DRAFT)
+        self.assertTrue(SourceEvent.objects.of_types(SourceEvent.EventType.COMMAND_FAILED).exists())
+
+    def test_execute__heartbeat_without_lease_owner(self):
+        commander = SlowSourceCommander(self.source, lease_duration=0.03)
+
+        with patch.object(commander, '_heartbeat') as heartbeat:
+            commander.execute()
+
+        heartbeat.assert_not_called()
+
+    def test_execute__async__heartbeat(self):
+        commander = AsyncSlowSourceCommander(
+            self.source,
+            executor=TestAsset.CurrentThreadExecutor(),
+            lease_owner='worker',
+            lease_duration=0.3,
+            heartbeat_executor=TestAsset.CurrentThreadExecutor(),
+        )
+
+        with patch.object(commander, '_heartbeat', wraps=commander._heartbeat) as heartbeat:
+            asyncio.get_event_loop().run_until_complete(commander.execute())
+
+        self.assertGreater(heartbeat.call_count, 0)
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.CREATE_TARGET)
+
+    def test_execute__async__heartbeat_failed(self):
+        AsyncLeaseStealingCommand.finished = False
+
+        with self.assertRaises(Source.LeaseLostException):
+            asyncio.get_event_loop().run_until_complete(AsyncLeaseStealingSourceCommander(
+                self.source,
+                executor=TestAsset.CurrentThreadExecutor(),
+                lease_owner='worker',
+                lease_duration=0.3,
+                heartbeat_executor=TestAsset.CurrentThreadExecutor(),
+            ).execute())
+
+        self.assertFalse(AsyncLeaseStealingCommand.finished)
+        self.assertEqual(
+            Source.objects.filter(pk=self.source.pk).values_list('status', 'lease_owner').get(),
+            (Source.Status.DRAFT, 'other worker')
+        )
+        self.assertNotIn('abandoned', SourceEvent.objects.of_types(SourceEvent.EventType.COMMAND_FAILED).get().data)
+
+
+class TestAsyncCommanderHeartbeatExecutor(test.TransactionTestCase):
+    """
+    the commands are run in thread pools, whose threads use their own database connections, so the data of the tests is
+    committed
+    """
+    def setUp(self):
+        self.source = Source.objects.create(remote_host=RemoteHost.objects.create())
+
+    def _create_executor(self, threads):
+        executor = ConnectionClosingThreadPoolExecutor(threads)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_execute__heartbeat_while_executor_busy(self):
+        HeartbeatAwaitingCommand.heartbeat_sent.clear()
+        commander = HeartbeatAwaitingSourceCommander(
+            self.source,
+            executor=self._create_executor(1),
+            lease_owner='worker',
+            lease_duration=0.3,
+        )
+        heartbeat = commander._heartbeat
+
+        def recording_heartbeat():
+            heartbeat()
+            HeartbeatAwaitingCommand.heartbeat_sent.set()
+
+        with patch.object(commander, '_heartbeat', recording_heartbeat):
+            asyncio.get_event_loop().run_until_complete(commander.execute())
+
+        self.assertTrue(HeartbeatAwaitingCommand.heartbeat_sent_while_executing)
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.CREATE_TARGET)
+
+    def test_execute__heartbeat_failed__command_abandoned(self):
+        LeaseStealingCommand.finished.clear()
+
+        with self.assertRaises(Source.LeaseLostException):
+            asyncio.get_event_loop().run_until_complete(LeaseStealingSourceCommander(
+                self.source,
+                executor=self._create_executor(2),
+                lease_owner='worker',
+                lease_duration=0.3,
+            ).execute())
+
+        self.assertFalse(LeaseStealingCommand.finished.is_set())
+        self.assertTrue(LeaseStealingCommand.finished.wait(5))
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, Source.Status.DRAFT)
+        self.assertTrue(SourceEvent.objects.of_types(SourceEvent.EventType.COMMAND_FAILED).get().data['abandoned'])
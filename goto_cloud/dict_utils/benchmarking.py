@@ -0,0 +1,98 @@
+"""
+micro benchmarks of DictUtils, using blueprint like trees, which are either deep or wide
+
+run them with: python -m dict_utils.benchmarking (from within the goto_cloud directory)
+"""
+import timeit
+
+from .dict_utils import DictUtils
+
+
+def create_deep_tree(depth, value='value'):
+    """
+    creates a tree, which nests one dict per level and has a value on every level
+
+    :param depth: the number of levels
+    :type depth: int
+    :param value: the value which is stored on every level
+    :type value: str
+    :return: the tree
+    :rtype: dict
+    """
+    tree = {}
+    current_dict = tree
+
+    for level in range(depth):
+        current_dict['value'] = '{value}_{level}'.format(value=value, level=level)
+        current_dict['child'] = {}
+        current_dict = current_dict['child']
+
+    return tree
+
+
+def create_wide_tree(width, value='value'):
+    """
+    creates a tree, which has the given number of children, each of them containing a small blueprint section
+
+    :param width: the number of children
+    :type width: int
+    :param value: the value which is stored in every child
+    :type value: str
+    :return: the tree
+    :rtype: dict
+    """
+    return {
+        'child_{index}'.format(index=index): {
+            'command': '{value}_{index}'.format(value=value, index=index),
+            'optionals': {'uuid': '-U {UUID}', 'label': '-L {LABEL}'},
+        } for index in range(width)
+    }
+
+
+BENCHMARKS = {
+    'merge_dicts__deep': lambda size: (
+        lambda dominant, other: lambda: DictUtils.merge_dicts(dominant, other)
+    )(create_deep_tree(size, 'dominant'), create_deep_tree(size, 'other')),
+    'merge_dicts__wide': lambda size: (
+        lambda dominant, other: lambda: DictUtils.merge_dicts(dominant, other)
+    )(create_wide_tree(size, 'dominant'), create_wide_tree(size, 'other')),
+    'flatten_child_elements__deep': lambda size: (
+        lambda tree: lambda: DictUtils.flatten_child_elements(tree)
+    )(create_deep_tree(size)),
+    'flatten_child_elements__wide': lambda size: (
+        lambda tree: lambda: DictUtils.flatten_child_elements(tree)
+    )(create_wide_tree(size)),
+}
+"""
+maps the name of every benchmark onto a function, which creates the benchmarked function for a given tree size
+"""
+
+
+def run_benchmarks(sizes=(10, 100, 1000), number=20):
+    """
+    runs every benchmark for every given size
+
+    :param sizes: the tree sizes to run the benchmarks with
+    :type sizes: tuple
+    :param number: how often the benchmarked function is executed per measurement
+    :type number: int
+    :return: one result per benchmark and size, containing the average time of a single execution in seconds
+    :rtype: list[dict]
+    """
+    return [
+        {
+            'benchmark': name,
+            'size': size,
+            'seconds': timeit.timeit(create_benchmark(size), number=number) / number,
+        }
+        for name, create_benchmark in sorted(BENCHMARKS.items())
+        for size in sizes
+    ]
+
+
+if __name__ == '__main__':
+    for result in run_benchmarks():
+        print('{benchmark:<32} {size:>6} {microseconds:>12.1f}us'.format(
+            microseconds=result['seconds'] * 1000000,
+            **result
+        ))
@@ -1,5 +1,21 @@
-import operator
-from functools import reduce
+class ReadOnlyDict(dict):
+    """
+    a dict, which can't be modified after it has been created. Since it is a dict, it can be used everywhere a dict is
+    read, including json serialization, but all methods modifying it raise a TypeError. Copies of it are read only too.
+    """
+    def _raise_read_only(self, *args, **kwargs):
+        raise TypeError('{class_name} can not be modified'.format(class_name=self.__class__.__name__))
+
+    __setitem__ = _raise_read_only
+    __delitem__ = _raise_read_only
+    clear = _raise_read_only
+    pop = _raise_read_only
+    popitem = _raise_read_only
+    setdefault = _raise_read_only
+    update = _raise_read_only
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
 
 
 class DictUtils():
@@ -16,16 +32,37 @@ class DictUtils():
         :return: flat child values
         :rtype: list
         """
-        if isinstance(dic, dict):
-            return (
-                reduce(
-                    operator.add,
-                    [(DictUtils.flatten_child_elements(child)) for child in dic.values()] + [list(dic.keys())]
-                )
-                if dic else []
-            )
-        else:
-            return [dic]
+        return list(DictUtils.iterate_child_elements(dic))
+
+    @staticmethod
+    def iterate_child_elements(dic):
+        """
+        iterates over all child keys, and values of a tree-like dict, in the order of flatten_child_elements. The tree
+        is traversed using a stack, instead of recursion, so its depth is not limited by the recursion limit. The values
+        are not copied, so values which are not dicts, like lists, are the objects of the given dict.
+
+        :param dic: the dict to get the children for
+        :type dic: dict
+        :return: generator of the child values
+        :rtype: collections.Iterable
+        """
+        if not isinstance(dic, dict):
+            yield dic
+            return
+
+        stack = [(dic, iter(dic.values()))]
+
+        while stack:
+            current_dict, values = stack[-1]
+
+            for value in values:
+                if isinstance(value, dict):
+                    stack.append((value, iter(value.values())))
+                    break
+                yield value
+            else:
+                stack.pop()
+                yield from current_dict.keys()
 
     @staticmethod
     def find_sub_dict_by_key(dic, key):
@@ -53,34 +90,51 @@ class DictUtils():
             return None
 
     @staticmethod
-    def merge_dicts(dominant_dict, other_dict):
+    def merge_dicts(dominant_dict, other_dict, in_place=False):
         """
         returns a new dict which contains a merge of the given dicts. If there are key collisions, the first given dict
         overwrites the values, of the second dict. In case of both values belonging to the collision keys, are dicts
         too, these are merged as well.
-        same.
-        
+
+        The dicts are merged using a stack, instead of recursion. All dicts nested in the merged dict are new dicts,
+        even if they are taken over from one of the given dicts unchanged, so the merged dict can be modified without
+        modifying the given dicts. Values which are not dicts, like lists, are shared with the given dicts.
+
         :param dominant_dict: the dominant dict
         :type dominant_dict: dict
         :param other_dict: the other dict
         :type other_dict: dict
+        :param in_place: if True, the other dict is merged into the dominant dict, which is modified and returned,
+        instead of creating a new dict. This must only be used, if the dominant dict and all dicts nested in it, are
+        owned by the caller.
+        :type in_place: bool
         :return: merged dict
         :rtype: dict
         """
-        dominant_dict_keys = dominant_dict.keys()
-        other_dict_keys = other_dict.keys()
-        common_keys = dominant_dict_keys & other_dict_keys
-
-        merged_dict = {
-            **DictUtils.filter_dict(other_dict, other_dict_keys - common_keys),
-            **DictUtils.filter_dict(dominant_dict, dominant_dict_keys - common_keys),
-        }
-
-        for common_key in common_keys:
-            if isinstance(dominant_dict[common_key], dict) and isinstance(other_dict[common_key], dict):
-                merged_dict[common_key] = DictUtils.merge_dicts(dominant_dict[common_key], other_dict[common_key])
+        merged_dict = dominant_dict if in_place else {}
+        stack = [(merged_dict, dominant_dict, other_dict)]
+
+        while stack:
+            target_dict, dominant_dict, other_dict = stack.pop()
+
+            if target_dict is dominant_dict:
+                for key, other_value in other_dict.items():
+                    if key not in target_dict and isinstance(other_value, dict):
+                        target_dict[key] = {}
+                        stack.append((target_dict[key], other_value, {}))
+                    elif key not in target_dict:
+                        target_dict[key] = other_value
+                    elif isinstance(target_dict[key], dict) and isinstance(other_value, dict):
+                        stack.append((target_dict[key], target_dict[key], other_value))
             else:
-                merged_dict[common_key] = dominant_dict[common_key]
+                target_dict.update(other_dict)
+                target_dict.update(dominant_dict)
+
+                for key, value in target_dict.items():
+                    if isinstance(value, dict):
+                        other_value = other_dict.get(key) if key in dominant_dict else None
+                        target_dict[key] = {}
+                        stack.append((target_dict[key], value, other_value if isinstance(other_value, dict) else {}))
 
         return merged_dict
 
@@ -1 +1 @@
-from .dict_utils import DictUtils
+from .dict_utils import DictUtils, ReadOnlyDict
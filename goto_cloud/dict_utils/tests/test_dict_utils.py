@@ -1,6 +1,11 @@
+import copy
+import json
+import sys
+
 from unittest import TestCase
 
-from ..dict_utils import DictUtils
+from ..benchmarking import BENCHMARKS, create_deep_tree, run_benchmarks
+from ..dict_utils import DictUtils, ReadOnlyDict
 
 
 TEST_TREE_DICT = {
@@ -44,6 +49,25 @@ class TestDictUtils(TestCase):
             set([str(i) for i in range(28)])
         )
 
+    def test_flatten_child_elements__order(self):
+        self.assertEqual(
+            DictUtils.flatten_child_elements({'1': {'2': '3'}, '4': '5', '6': {}}),
+            ['3', '2', '5', '1', '4', '6']
+        )
+
+    def test_flatten_child_elements__values_not_copied(self):
+        values = ['1']
+
+        self.assertIs(DictUtils.flatten_child_elements({'2': {'3': values}})[0], values)
+
+    def test_flatten_child_elements__no_dict(self):
+        self.assertEqual(DictUtils.flatten_child_elements('1'), ['1'])
+
+    def test_flatten_child_elements__deeper_than_recursion_limit(self):
+        tree = create_deep_tree(sys.getrecursionlimit() + 100)
+
+        self.assertEqual(len(DictUtils.flatten_child_elements(tree)), 3 * (sys.getrecursionlimit() + 100))
+
     def test_find_sub_dict_by_key(self):
         self.assertDictEqual(
             DictUtils.find_sub_dict_by_key(TEST_TREE_DICT, '11'),
@@ -118,6 +142,65 @@ class TestDictUtils(TestCase):
             }
         )
 
+    def test_merge_dicts__given_dicts_not_modified(self):
+        dominant_dict = {'1': {'2': '3'}}
+        other_dict = {'1': {'4': '5'}, '6': '7'}
+
+        self.assertEqual(DictUtils.merge_dicts(dominant_dict, other_dict), {'1': {'2': '3', '4': '5'}, '6': '7'})
+        self.assertEqual(dominant_dict, {'1': {'2': '3'}})
+        self.assertEqual(other_dict, {'1': {'4': '5'}, '6': '7'})
+
+    def test_merge_dicts__nested_dicts_copied(self):
+        dominant_dict = {'1': {'2': {'3': '4'}}, '5': {'6': '7'}}
+        other_dict = {'1': {'8': {'9': '10'}}, '11': {'12': {'13': '14'}}}
+
+        merged_dict = DictUtils.merge_dicts(dominant_dict, other_dict)
+        merged_dict['1']['2']['3'] = 'changed'
+        merged_dict['1']['8']['9'] = 'changed'
+        merged_dict['5']['6'] = 'changed'
+        merged_dict['11']['12']['13'] = 'changed'
+
+        self.assertEqual(dominant_dict, {'1': {'2': {'3': '4'}}, '5': {'6': '7'}})
+        self.assertEqual(other_dict, {'1': {'8': {'9': '10'}}, '11': {'12': {'13': '14'}}})
+
+    def test_merge_dicts__in_place__nested_other_dicts_copied(self):
+        other_dict = {'1': {'2': {'3': '4'}}}
+
+        merged_dict = DictUtils.merge_dicts({}, other_dict, in_place=True)
+        merged_dict['1']['2']['3'] = 'changed'
+
+        self.assertEqual(other_dict, {'1': {'2': {'3': '4'}}})
+
+    def test_merge_dicts__key_order(self):
+        self.assertEqual(
+            list(DictUtils.merge_dicts({'1': '2', '3': {}}, {'4': '5', '1': '6', '7': {}})),
+            ['4', '1', '7', '3']
+        )
+
+    def test_merge_dicts__in_place(self):
+        dominant_dict = {'1': {'2': '3'}, '4': '5'}
+        nested_dict = dominant_dict['1']
+
+        merged_dict = DictUtils.merge_dicts(dominant_dict, {'1': {'2': '6', '7': '8'}, '4': {}}, in_place=True)
+
+        self.assertIs(merged_dict, dominant_dict)
+        self.assertIs(merged_dict['1'], nested_dict)
+        self.assertEqual(merged_dict, {'1': {'2': '3', '7': '8'}, '4': '5'})
+
+    def test_merge_dicts__deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 100
+
+        merged_dict = DictUtils.merge_dicts(create_deep_tree(depth, 'dominant'), create_deep_tree(depth + 1, 'other'))
+
+        self.assertEqual(DictUtils.flatten_child_elements(merged_dict).count('other_{depth}'.format(depth=depth)), 1)
+        self.assertNotIn('other_0', DictUtils.flatten_child_elements(merged_dict))
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(sizes=(1, 10), number=1)
+
+        self.assertEqual(len(results), 2 * len(BENCHMARKS))
+        self.assertTrue(all(result['seconds'] >= 0 for result in results))
+
     def test_get_values(self):
         self.assertEquals(
             DictUtils.filter_dict(
@@ -135,3 +218,33 @@ class TestDictUtils(TestCase):
             ),
             {'2': 2, '3': {'1': 1,'2': 2,}, '5': 5}
         )
+
+
+class TestReadOnlyDict(TestCase):
+    def test_modify(self):
+        read_only_dict = ReadOnlyDict({'1': '2'})
+
+        with self.assertRaises(TypeError):
+            read_only_dict['1'] = '3'
+        with self.assertRaises(TypeError):
+            del read_only_dict['1']
+        with self.assertRaises(TypeError):
+            read_only_dict.update({'3': '4'})
+        with self.assertRaises(TypeError):
+            read_only_dict.setdefault('3', '4')
+        with self.assertRaises(TypeError):
+            read_only_dict.pop('1')
+
+        self.assertEqual(read_only_dict, {'1': '2'})
+
+    def test_copy(self):
+        read_only_dict = ReadOnlyDict({'1': ReadOnlyDict({'2': '3'})})
+
+        copied_dict = copy.deepcopy(read_only_dict)
+
+        self.assertEqual(copied_dict, read_only_dict)
+        self.assertIsInstance(copied_dict['1'], ReadOnlyDict)
+        self.assertIsNot(copied_dict['1'], read_only_dict['1'])
+
+    def test_json(self):
+        self.assertEqual(json.loads(json.dumps(ReadOnlyDict({'1': ReadOnlyDict({'2': ('3',)})}))), {'1': {'2': ['3']}})
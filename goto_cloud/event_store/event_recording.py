@@ -0,0 +1,171 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SourceEvent
+
+
+class SourceEventRecorder():
+    """
+    Buffers SourceEvents in memory and writes them with batched inserts, so recording an event does not cost a database
+    roundtrip. By default the buffer is written, whenever it holds batch_size events, or when it is flushed explicitly.
+    Once the recorder is started, a background thread flushes the buffer every flush_interval seconds instead, and
+    whenever it is full.
+
+    Events are diagnostic data, so an error while writing them is logged and never interrupts the recording unit. The
+    events are written in their own savepoint, so a failed insert does not break the transaction of the caller.
+    """
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_FLUSH_INTERVAL = 1.0
+
+    _default_recorder = None
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        :param batch_size: the number of events, which are written with a single insert
+        :type batch_size: int
+        :param flush_interval: the number of seconds, the background thread waits between two flushes
+        :type flush_interval: float
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def get_default(cls):
+        """
+        returns the recorder, which is shared by all units of this process. It is started, when it is created, unless the
+        SOURCE_EVENT_RECORDER_STARTED setting is False.
+
+        :return: the recorder, which is shared by all units of this process
+        :rtype: SourceEventRecorder
+        """
+        if SourceEventRecorder._default_recorder is None:
+            SourceEventRecorder._default_recorder = cls()
+            atexit.register(SourceEventRecorder._default_recorder.stop)
+
+            if settings.SOURCE_EVENT_RECORDER_STARTED:
+                SourceEventRecorder._default_recorder.start()
+        return SourceEventRecorder._default_recorder
+
+    @property
+    def is_running(self):
+        """
+        :return: whether the background thread is flushing the buffer
+        :rtype: bool
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_full(self):
+        """
+        :return: whether the buffer holds batch_size events or more, and should be flushed
+        :rtype: bool
+        """
+        return len(self._buffer) >= self.batch_size
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def record(self, source, event_type, phase=None, command='', data=None, flush_when_full=True):
+        """
+        records an event of the given source. Events of sources which have not been saved yet, are not recorded.
+
+        :param source: the source the event occurred for
+        :type source: source.public.Source
+        :param event_type: the type of the event
+        :type event_type: str
+        :param phase: the phase the event occurred in, by default the current status of the source
+        :type phase: str
+        :param command: the name of the command, the event is related to
+        :type command: str
+        :param data: additional data of the event
+        :type data: dict
+        :param flush_when_full: if False, a full buffer is not flushed by this call, so the caller can flush it, without
+        blocking the thread it records the event in
+        :type flush_when_full: bool
+        :return: the recorded event, or None if the source has not been saved yet
+        :rtype: event_store.public.SourceEvent
+        """
+        if source.pk is None:
+            return None
+
+        event = SourceEvent(
+            source_id=source.pk,
+            migration_run_id=source.migration_run_id,
+            phase=phase if phase is not None else source.status,
+            command=command,
+            event_type=event_type,
+            timestamp=timezone.now(),
+            data=data or {},
+        )
+
+        with self._lock:
+            self._buffer.append(event)
+
+        if flush_when_full and self.is_full:
+            self.flush(wait=False)
+
+        return event
+
+    def flush(self, wait=True):
+        """
+        writes all buffered events
+
+        :param wait: if False and the background thread is running, the thread is only asked to flush the buffer.
+        Otherwise the events are written in the calling thread.
+        :type wait: bool
+        """
+        if not wait and self.is_running:
+            self._flush_requested.set()
+            return
+
+        with self._lock:
+            events, self._buffer = self._buffer, []
+
+        if events:
+            try:
+                with transaction.atomic():
+                    SourceEvent.objects.bulk_create(events, batch_size=self.batch_size)
+            except Exception:
+                self._logger.exception('could not write {count} source events'.format(count=len(events)))
+
+    def start(self):
+        """
+        starts the background thread, which flushes the buffer
+        """
+        if self.is_running:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='SourceEventRecorder', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        stops the background thread, if it is running, and writes the remaining events
+        """
+        if self.is_running:
+            self._stopped.set()
+            self._flush_requested.set()
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                self._flush_requested.wait(self.flush_interval)
+                self._flush_requested.clear()
+                self.flush()
+        finally:
+            connection.close()
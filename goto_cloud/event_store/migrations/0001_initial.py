@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:14
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('migration_run', '0001_initial'),
+        ('source', '0004_source_run_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(max_length=255)),
+                ('command', models.CharField(blank=True, default='', max_length=255)),
+                ('event_type', models.CharField(choices=[('COMMAND_FAILED', 'COMMAND_FAILED'), ('COMMAND_FINISHED', 'COMMAND_FINISHED'), ('COMMAND_STARTED', 'COMMAND_STARTED')], max_length=255)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('data', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('migration_run', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='source_events', to='migration_run.MigrationRun')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='source.Source')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='sourceevent',
+            index=models.Index(fields=['source', 'timestamp'], name='source_event_timeline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourceevent',
+            index=models.Index(fields=['migration_run', 'phase', 'timestamp'], name='source_event_run_phase_idx'),
+        ),
+    ]
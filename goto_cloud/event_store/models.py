@@ -0,0 +1,108 @@
+from django.db import models
+from django.contrib.postgres.fields import JSONField
+from django.utils import timezone
+
+from enums.public import StringEnum
+
+from migration_run.public import MigrationRun
+
+from source.public import Source
+
+
+class SourceEventQuerySet(models.QuerySet):
+    """
+    queries on the timeline of source events, which are covered by the indexes of SourceEvent
+    """
+    def for_source(self, source):
+        """
+        :param source: the source to get the events of
+        :type source: source.public.Source
+        :return: the events of the given source
+        :rtype: SourceEventQuerySet
+        """
+        return self.filter(source=source)
+
+    def in_migration_run(self, migration_run):
+        """
+        :param migration_run: the migration run to get the events of
+        :type migration_run: migration_run.public.MigrationRun
+        :return: the events of all sources of the given migration run
+        :rtype: SourceEventQuerySet
+        """
+        return self.filter(migration_run=migration_run)
+
+    def in_phases(self, *phases):
+        """
+        :param phases: the statuses of the sources, the events have been recorded in
+        :type phases: str
+        :return: the events which have been recorded in one of the given phases
+        :rtype: SourceEventQuerySet
+        """
+        return self.filter(phase__in=phases)
+
+    def of_types(self, *event_types):
+        """
+        :param event_types: the types of the events
+        :type event_types: str
+        :return: the events of the given types
+        :rtype: SourceEventQuerySet
+        """
+        return self.filter(event_type__in=event_types)
+
+    def between(self, start=None, end=None):
+        """
+        :param start: the time the events have been recorded at or after
+        :type start: datetime.datetime
+        :param end: the time the events have been recorded before
+        :type end: datetime.datetime
+        :return: the events which have been recorded in the given time range
+        :rtype: SourceEventQuerySet
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(timestamp__gte=start)
+        if end is not None:
+            queryset = queryset.filter(timestamp__lt=end)
+        return queryset
+
+    def timeline(self):
+        """
+        :return: the events in the order they have been recorded in
+        :rtype: SourceEventQuerySet
+        """
+        return self.order_by('timestamp', 'id')
+
+
+class SourceEvent(models.Model):
+    """
+    An event which occurred while driving the lifecycle of a Source. Events are only appended and never updated. They
+    are keyed by the source, the phase (the status of the source, when the event has been recorded) and the command,
+    which has been executed in the phase.
+    """
+    class EventType(StringEnum):
+        """
+        Enum to describe the type of a SourceEvent
+        """
+        COMMAND_STARTED = 'COMMAND_STARTED'
+        COMMAND_FINISHED = 'COMMAND_FINISHED'
+        COMMAND_FAILED = 'COMMAND_FAILED'
+
+    source = models.ForeignKey(Source, related_name='events')
+    migration_run = models.ForeignKey(MigrationRun, related_name='source_events', null=True)
+    """
+    the migration run of the source, when the event has been recorded. It is stored with the event, so the events of a
+    whole run can be queried, without joining the sources.
+    """
+    phase = models.CharField(max_length=255)
+    command = models.CharField(max_length=255, blank=True, default='')
+    event_type = models.CharField(max_length=255, choices=EventType.get_django_choices())
+    timestamp = models.DateTimeField(default=timezone.now)
+    data = JSONField(default=dict)
+
+    objects = SourceEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'timestamp'], name='source_event_timeline_idx'),
+            models.Index(fields=['migration_run', 'phase', 'timestamp'], name='source_event_run_phase_idx'),
+        ]
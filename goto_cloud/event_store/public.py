@@ -0,0 +1,2 @@
+from .event_recording import SourceEventRecorder
+from .models import SourceEvent
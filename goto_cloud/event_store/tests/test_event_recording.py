@@ -0,0 +1,138 @@
+import threading
+
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from event_store.public import SourceEvent, SourceEventRecorder
+
+from migration_plan.public import MigrationPlan
+
+from migration_run.public import MigrationRun
+
+from remote_host.public import RemoteHost
+
+from source.public import Source
+
+
+class TestSourceEventRecorder(TestCase):
+    def setUp(self):
+        self.migration_run = MigrationRun.objects.create(plan=MigrationPlan.objects.create())
+        self.source = Source.objects.create(migration_run=self.migration_run, remote_host=RemoteHost.objects.create())
+        self.recorder = SourceEventRecorder(batch_size=3)
+
+    def tearDown(self):
+        self.recorder.stop()
+
+    def test_record(self):
+        event = self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED, command='Command')
+
+        self.assertEqual(len(self.recorder), 1)
+        self.assertIsNone(event.pk)
+        self.assertEqual(event.source_id, self.source.pk)
+        self.assertEqual(event.migration_run_id, self.migration_run.pk)
+        self.assertEqual(event.phase, Source.Status.DRAFT)
+        self.assertEqual(event.command, 'Command')
+        self.assertFalse(SourceEvent.objects.exists())
+
+    def test_record__unsaved_source(self):
+        self.assertIsNone(self.recorder.record(Source(), SourceEvent.EventType.COMMAND_STARTED))
+        self.assertEqual(len(self.recorder), 0)
+
+    def test_record__batch_written_once_full(self):
+        with CaptureQueriesContext(connection) as queries:
+            for phase in (Source.Status.DRAFT, Source.Status.CREATE_TARGET, Source.Status.SYNC):
+                self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED, phase=phase)
+
+        self.assertEqual(len([query for query in queries.captured_queries if query['sql'].startswith('INSERT')]), 1)
+
+        self.assertEqual(len(self.recorder), 0)
+        self.assertEqual(
+            list(SourceEvent.objects.timeline().values_list('phase', flat=True)),
+            [Source.Status.DRAFT, Source.Status.CREATE_TARGET, Source.Status.SYNC]
+        )
+
+    def test_flush(self):
+        self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED, data={'key': 'value'})
+        self.recorder.flush()
+
+        self.assertEqual(SourceEvent.objects.get().data, {'key': 'value'})
+        self.assertEqual(len(self.recorder), 0)
+
+    def test_flush__empty_buffer(self):
+        with self.assertNumQueries(0):
+            self.recorder.flush()
+
+    def test_flush__error_not_raised(self):
+        self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED)
+
+        with patch.object(SourceEvent.objects, 'bulk_create', side_effect=Exception('error')), \
+                self.assertLogs(SourceEventRecorder.__module__, 'ERROR'):
+            self.recorder.flush()
+
+        self.assertEqual(len(self.recorder), 0)
+
+    def test_flush__failed_insert_does_not_break_transaction(self):
+        self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED, command='C' * 256)
+
+        with self.assertLogs(SourceEventRecorder.__module__, 'ERROR'):
+            self.recorder.flush()
+
+        self.assertEqual(Source.objects.count(), 1)
+        self.assertFalse(SourceEvent.objects.exists())
+
+    def test_record__full_buffer_not_flushed(self):
+        with self.assertNumQueries(0):
+            for phase in (Source.Status.DRAFT, Source.Status.CREATE_TARGET, Source.Status.SYNC):
+                self.recorder.record(
+                    self.source, SourceEvent.EventType.COMMAND_STARTED, phase=phase, flush_when_full=False
+                )
+
+        self.assertTrue(self.recorder.is_full)
+
+    def test_start(self):
+        flushed = threading.Event()
+        written_events = []
+
+        def bulk_create(events, batch_size=None):
+            written_events.extend(events)
+            flushed.set()
+
+        with patch.object(SourceEvent.objects, 'bulk_create', bulk_create):
+            self.recorder.start()
+            self.assertTrue(self.recorder.is_running)
+
+            for _ in range(3):
+                self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED)
+
+            self.assertTrue(flushed.wait(5))
+            self.recorder.stop()
+
+        self.assertFalse(self.recorder.is_running)
+        self.assertEqual(len(written_events), 3)
+
+    def test_stop__remaining_events_written(self):
+        with patch.object(SourceEvent.objects, 'bulk_create') as bulk_create:
+            self.recorder.start()
+            self.recorder.record(self.source, SourceEvent.EventType.COMMAND_STARTED)
+            self.recorder.stop()
+
+        bulk_create.assert_called_once()
+
+    def test_get_default(self):
+        self.assertIs(SourceEventRecorder.get_default(), SourceEventRecorder.get_default())
+
+    @override_settings(SOURCE_EVENT_RECORDER_STARTED=True)
+    def test_get_default__started(self):
+        with patch.object(SourceEventRecorder, '_default_recorder', None):
+            recorder = SourceEventRecorder.get_default()
+            self.addCleanup(recorder.stop)
+
+            self.assertTrue(recorder.is_running)
+
+    @override_settings(SOURCE_EVENT_RECORDER_STARTED=False)
+    def test_get_default__not_started(self):
+        with patch.object(SourceEventRecorder, '_default_recorder', None):
+            self.assertFalse(SourceEventRecorder.get_default().is_running)
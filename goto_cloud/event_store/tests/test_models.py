@@ -0,0 +1,75 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from event_store.public import SourceEvent
+
+from migration_plan.public import MigrationPlan
+
+from migration_run.public import MigrationRun
+
+from remote_host.public import RemoteHost
+
+from source.public import Source
+
+
+class TestSourceEventQuerySet(TestCase):
+    def setUp(self):
+        self.migration_run = MigrationRun.objects.create(plan=MigrationPlan.objects.create())
+        self.source = Source.objects.create(migration_run=self.migration_run, remote_host=RemoteHost.objects.create())
+        self.other_source = Source.objects.create(remote_host=RemoteHost.objects.create())
+        self.start = timezone.now()
+
+        self.events = [
+            self._create_event(self.source, Source.Status.SYNC, SourceEvent.EventType.COMMAND_FINISHED, 2),
+            self._create_event(self.source, Source.Status.DRAFT, SourceEvent.EventType.COMMAND_STARTED, 0),
+            self._create_event(self.source, Source.Status.SYNC, SourceEvent.EventType.COMMAND_STARTED, 1),
+            self._create_event(self.other_source, Source.Status.SYNC, SourceEvent.EventType.COMMAND_STARTED, 1),
+        ]
+
+    def _create_event(self, source, phase, event_type, seconds):
+        return SourceEvent.objects.create(
+            source=source,
+            migration_run=source.migration_run,
+            phase=phase,
+            event_type=event_type,
+            timestamp=self.start + datetime.timedelta(seconds=seconds),
+        )
+
+    def test_for_source__timeline(self):
+        self.assertEqual(
+            list(SourceEvent.objects.for_source(self.source).timeline()),
+            [self.events[1], self.events[2], self.events[0]]
+        )
+
+    def test_in_migration_run(self):
+        self.assertEqual(
+            set(SourceEvent.objects.in_migration_run(self.migration_run)),
+            set(self.events[:3])
+        )
+
+    def test_in_phases(self):
+        self.assertEqual(
+            list(SourceEvent.objects.in_migration_run(self.migration_run).in_phases(Source.Status.SYNC).timeline()),
+            [self.events[2], self.events[0]]
+        )
+
+    def test_of_types(self):
+        self.assertEqual(
+            set(SourceEvent.objects.of_types(SourceEvent.EventType.COMMAND_FINISHED)),
+            {self.events[0]}
+        )
+
+    def test_between(self):
+        self.assertEqual(
+            list(SourceEvent.objects.between(
+                self.start + datetime.timedelta(seconds=1),
+                self.start + datetime.timedelta(seconds=2),
+            ).timeline()),
+            [self.events[2], self.events[3]]
+        )
+        self.assertEqual(SourceEvent.objects.between().count(), 4)
+
+    def test_source_events(self):
+        self.assertEqual(set(self.source.events.all()), set(self.events[:3]))
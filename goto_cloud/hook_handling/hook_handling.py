@@ -1,14 +1,16 @@
 from enums.public import StringEnum
 
-from remote_script_execution.public import RemoteScriptExecutor
+from .remote_hook_caching import RemoteHookCache
 
 
 class HookEventHandler():
     """
     Takes care of letting another instance trigger a hook by emitting a specific event. Which event is emitted 
     eventually, is determined by the event type plus the status the given source is currently in. If a hook is specified
-    in the provided hooks, the hook script will be executed on the location, described in the hook, by a 
-    RemoteScriptExecutor.
+    in the provided hooks, the hook script will be executed on the location, described in the hook.
+
+    Hook scripts are staged once per host in a RemoteHookCache and invoked by their hash afterwards. A hook gets all
+    context fields, unless it lists the fields it uses under its 'context' key. Then only these fields are loaded.
     """
     class EventType(StringEnum):
         """
@@ -24,6 +26,14 @@ class HookEventHandler():
         SOURCE = 'SOURCE'
         TARGET = 'TARGET'
 
+    CONTEXT_FIELDS = (
+        'blueprint',
+        'device_mapping',
+        'source_system_info',
+        'target_system_info',
+        'cloud_metadata',
+    )
+
     def __init__(self, source):
         """
         is initialized with a dict of hooks
@@ -33,6 +43,8 @@ class HookEventHandler():
         """
         self._source = source
         self._cached_hooks = {}
+        self._context_fields = {}
+        self._remote_hook_caches = {}
 
     @property
     def _hooks(self):
@@ -58,43 +70,82 @@ class HookEventHandler():
         hook_name = '_'.join((self._source.status, event_type))
 
         if hook_name in self._hooks:
-            self._get_remote_script_executor(
-                self._hooks[hook_name],
-            ).execute(
-                self._hooks[hook_name]['execute'],
-                self._load_script_env(),
-                **{'sudo': self._hooks[hook_name]['sudo']} if 'sudo' in self._hooks[hook_name] else {}
+            hook = self._hooks[hook_name]
+
+            self._get_remote_hook_cache(hook).execute(
+                hook['execute'],
+                self._load_script_env(self._get_context_fields(hook_name, hook)),
+                sudo=hook.get('sudo', False),
             )
 
-    def _get_remote_script_executor(self, hook):
+    def _get_remote_hook_cache(self, hook):
         """
-        returns the remote script executor which will be used to execute a hook
-        
+        returns the remote hook cache of the host, the given hook will be executed on
+
         :param hook: the hook to execute
         :type hook: dict
-        :return: 
+        :return: the remote hook cache of the execution location
+        :rtype: hook_handling.remote_hook_caching.RemoteHookCache
         """
         if hook['location'] == self.ExecutionLocations.TARGET:
-            return RemoteScriptExecutor(self._source.target.remote_host)
+            remote_host = self._source.target.remote_host
+        else:
+            remote_host = self._source.remote_host
+
+        if remote_host.pk not in self._remote_hook_caches:
+            self._remote_hook_caches[remote_host.pk] = RemoteHookCache(remote_host)
 
-        return RemoteScriptExecutor(self._source.remote_host)
+        return self._remote_hook_caches[remote_host.pk]
 
-    def _load_script_env(self):
+    def _get_context_fields(self, hook_name, hook):
         """
-        loads the environment variables which will be injected into the script execution
-        
+        returns the context fields the given hook requires. These are all context fields, unless the fields are listed
+        under the 'context' key of the hook.
+
+        :param hook_name: the name of the hook
+        :type hook_name: str
+        :param hook: the hook to execute
+        :type hook: dict
+        :return: the required context fields
+        :rtype: tuple
+        """
+        if hook_name not in self._context_fields:
+            self._context_fields[hook_name] = tuple(
+                field for field in self.CONTEXT_FIELDS if 'context' not in hook or field in hook['context']
+            )
+
+        return self._context_fields[hook_name]
+
+    def _load_script_env(self, fields=None):
+        """
+        loads the environment variables which will be injected into the script execution. Only the given fields are
+        loaded, so the system info of the target is only refreshed, if the hook actually uses it.
+
+        :param fields: the context fields to load, by default all fields are loaded
+        :type fields: tuple
         :return: the loaded env
         :rtype: dict
         """
-        if self._source.target.remote_host:
-            self._source.target.remote_host.update_system_info()
-
         return {
-            'blueprint': self._source.target.blueprint,
-            'device_mapping': self._source.target.device_mapping,
-            'source_system_info': self._source.remote_host.system_info,
-            'target_system_info': self._source.target.remote_host.system_info
-                                    if self._source.target.remote_host else {},
-            'cloud_metadata': self._source.target.remote_host.cloud_metadata
-                                    if self._source.target.remote_host else {},
+            field: getattr(self, '_load_{field}'.format(field=field))()
+            for field in (fields if fields is not None else self.CONTEXT_FIELDS)
         }
+
+    def _load_blueprint(self):
+        return self._source.target.blueprint
+
+    def _load_device_mapping(self):
+        return self._source.target.device_mapping
+
+    def _load_source_system_info(self):
+        return self._source.remote_host.system_info
+
+    def _load_target_system_info(self):
+        if not self._source.target.remote_host:
+            return {}
+
+        self._source.target.remote_host.update_system_info()
+        return self._source.target.remote_host.system_info
+
+    def _load_cloud_metadata(self):
+        return self._source.target.remote_host.cloud_metadata if self._source.target.remote_host else {}
@@ -1 +1,2 @@
 from .hook_handling import HookEventHandler
+from .remote_hook_caching import RemoteHookCache
@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from remote_execution.public import RemoteHostExecutor
+
+from remote_host_command.public import RemoteHostCommand
+
+
+class RemoteHookCache():
+    """
+    Stages hook scripts in a content addressed cache directory on a remote host, so a hook is only transferred once per
+    host and is invoked by its hash afterwards. The context of a hook is sent as compact JSON over the stdin of the
+    invocation and is available as the CONTEXT dict within the script.
+
+    Hooks executed as sudo are staged in a directory, which is owned by root, and hooks executed as the connecting user
+    are staged in a directory owned by this user. Both directories are only accessible by their owner, which is checked
+    before a hook is staged, and the hash of a staged hook is verified every time, before it is executed.
+    """
+    CACHE_DIRECTORY = '/var/lib/goto_cloud/hooks'
+    USER_CACHE_DIRECTORY = '$HOME/.goto_cloud/hooks'
+    HOOK_TEMPLATE = (
+        'import json, sys\n'
+        'CONTEXT = json.loads(sys.stdin.read() or "{{}}")\n'
+        '{script}'
+    )
+
+    VERIFY_COMMAND = 'echo "{DIGEST}  {PATH}" | {SUDO_PREFIX}sha256sum -c --status'
+    STAGE_COMMAND = RemoteHostCommand(
+        '{SUDO_PREFIX}install -d -m 0700 {DIRECTORY} '
+        '&& [ "$({SUDO_PREFIX}stat -c %u:%a {DIRECTORY})" = "$({SUDO_PREFIX}id -u):700" ] '
+        '&& {{ ' + VERIFY_COMMAND + ' 2>/dev/null '
+        '|| {{ {SUDO_PREFIX}tee {PATH}.$$ >/dev/null && {SUDO_PREFIX}mv -f {PATH}.$$ {PATH}; }}; }}'
+    )
+    EXECUTE_COMMAND = RemoteHostCommand(VERIFY_COMMAND + ' && {SUDO_PREFIX}python {PATH}')
+
+    def __init__(self, remote_host):
+        """
+        :param remote_host: the remote host the hooks are staged on and executed on
+        :type remote_host: remote_host.public.RemoteHost
+        """
+        self.remote_host = remote_host
+        self.remote_executor = RemoteHostExecutor(remote_host)
+        self._staged_paths = {}
+
+    def execute(self, script, context=None, sudo=False):
+        """
+        executes the given hook script on the remote host, staging it first, if it has not been staged yet. The script
+        is only executed, if the staged file still matches its hash.
+
+        :param script: the hook script to execute
+        :type script: str
+        :param context: the context which is provided to the script as CONTEXT
+        :type context: dict
+        :param sudo: whether the script should be executed as sudo or not
+        :type sudo: bool
+        :return: the stdout of the script execution
+        :rtype: str
+        :raises RemoteExecutor.ExecutionException: if the staged script does not match its hash
+        """
+        path = self.stage(script, sudo)
+
+        return self.remote_executor.execute(
+            self.EXECUTE_COMMAND.render(
+                sudo_prefix=self._get_sudo_prefix(sudo),
+                digest=self.get_digest(self.HOOK_TEMPLATE.format(script=script)),
+                path=path,
+            ),
+            stdin=self._encode_context(context),
+        )
+
+    def stage(self, script, sudo=False):
+        """
+        makes sure the given hook script is available in the cache directory of the remote host. Staging a script which
+        is cached already, neither transfers it again, nor triggers a remote call.
+
+        :param script: the hook script to stage
+        :type script: str
+        :param sudo: whether the script is staged to be executed as sudo or not
+        :type sudo: bool
+        :return: the remote path of the staged script
+        :rtype: str
+        :raises RemoteExecutor.ExecutionException: if the cache directory is not owned by the executing user, or is
+        accessible by others
+        """
+        content = self.HOOK_TEMPLATE.format(script=script)
+        digest = self.get_digest(content)
+
+        if (digest, sudo) not in self._staged_paths:
+            directory = self.get_cache_directory(sudo)
+            path = '{directory}/{digest}.py'.format(directory=directory, digest=digest)
+            self.remote_executor.execute(
+                self.STAGE_COMMAND.render(
+                    sudo_prefix=self._get_sudo_prefix(sudo),
+                    directory=directory,
+                    digest=digest,
+                    path=path,
+                ),
+                stdin=content.encode(),
+            )
+            self._staged_paths[(digest, sudo)] = path
+
+        return self._staged_paths[(digest, sudo)]
+
+    @classmethod
+    def get_cache_directory(cls, sudo=False):
+        """
+        :param sudo: whether the hooks of the directory are executed as sudo or not
+        :type sudo: bool
+        :return: the directory the hooks are staged in
+        :rtype: str
+        """
+        return cls.CACHE_DIRECTORY if sudo else cls.USER_CACHE_DIRECTORY
+
+    @staticmethod
+    def get_digest(content):
+        """
+        :param content: the content of a staged hook file
+        :type content: str
+        :return: the hash the content is addressed by
+        :rtype: str
+        """
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @staticmethod
+    def _get_sudo_prefix(sudo):
+        return 'sudo ' if sudo else ''
+
+    @staticmethod
+    def _encode_context(context):
+        return json.dumps(context or {}, separators=(',', ':'), sort_keys=True).encode()
@@ -1,3 +1,5 @@
+import json
+
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -10,9 +12,10 @@ from target.public import Target
 from test_assets.public import TestAsset
 
 from ..hook_handling import HookEventHandler
+from ..remote_hook_caching import RemoteHookCache
 
 
-class TestHookHandling(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
+class TestHookHandling(TestCase):
     TEST_HOOKS = {
         'GET_TARGET_SYSTEM_INFORMATION_AFTER': {
             'location': 'TARGET',
@@ -32,6 +35,15 @@ class TestHookHandling(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
             'execute': 'SYNC_AFTER',
             'sudo': False,
         },
+        'CREATE_PARTITIONS_BEFORE': {
+            'location': 'TARGET',
+            'execute': 'print(CONTEXT["device_mapping"], CONTEXT["target_system_info"])',
+        },
+        'CREATE_PARTITIONS_AFTER': {
+            'location': 'TARGET',
+            'execute': 'print(CONTEXT)',
+            'context': ['blueprint'],
+        },
     }
 
     def setUp(self):
@@ -51,102 +63,146 @@ class TestHookHandling(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
         self.executed_as_sudo = None
 
         self.hook_event_handler = HookEventHandler(self.source)
+        self.executions = []
 
-    def get_mocked_script_execution_decorator(self):
-        def mocked_script_execution(remote_script_executor, script, env=None, sudo=False):
-            self.triggered_script = script
-            self.execution_location = remote_script_executor.remote_executor.remote_host.address
-            self.execution_env = env
-            self.executed_as_sudo = sudo
-        return mocked_script_execution
-
-    def test_emit__no_hook_triggered(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
+        for method, mock in (
+            ('connect', lambda remote_executor: None),
+            ('close', lambda remote_executor: None),
+            ('is_connected', lambda remote_executor: True),
+            ('_execute', self.get_mocked_execute()),
         ):
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
-
-            self.assertIsNone(self.triggered_script)
+            method_patch = patch('remote_execution.remote_execution.SshRemoteExecutor.' + method, mock)
+            method_patch.start()
+            self.addCleanup(method_patch.stop)
+
+    def get_mocked_execute(self):
+        def mocked_execute(remote_executor, command, block_for_response=True, stdin=None):
+            if not any(
+                RemoteHookCache.get_cache_directory(sudo) in command for sudo in (True, False)
+            ):
+                return TestAsset.PatchRemoteHostMeta.MOCKED_EXECUTE(remote_executor, command)
+
+            self.executions.append((remote_executor.hostname, command, stdin))
+            return {'exit_code': 0, 'stdout': '', 'stderr': ''}
+        return mocked_execute
+
+    def get_invocations(self):
+        return [
+            (hostname, command, json.loads(stdin.decode())) for hostname, command, stdin in self.executions
+            if 'install -d' not in command
+        ]
+
+    def get_stagings(self):
+        return [
+            (hostname, stdin.decode()) for hostname, command, stdin in self.executions if 'install -d' in command
+        ]
+
+    def get_invocation(self, script, sudo=False):
+        digest = RemoteHookCache.get_digest(RemoteHookCache.HOOK_TEMPLATE.format(script=script))
+
+        return RemoteHookCache.EXECUTE_COMMAND.render(
+            sudo_prefix='sudo ' if sudo else '',
+            digest=digest,
+            path='{directory}/{digest}.py'.format(directory=RemoteHookCache.get_cache_directory(sudo), digest=digest),
+        )
 
-    def test_emit(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
-        ):
-            self.source.status = Source.Status.GET_TARGET_SYSTEM_INFORMATION
-            self.source.save()
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
+    def emit(self, status, event_type):
+        self.source.status = status
+        self.source.save()
+        self.hook_event_handler.emit(event_type)
 
-            self.assertEqual(self.triggered_script, 'GET_TARGET_SYSTEM_INFORMATION_BEFORE')
-            self.assertEqual(self.executed_as_sudo, False)
+    def test_emit__no_hook_triggered(self):
+        self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
 
-            self.hook_event_handler.emit(HookEventHandler.EventType.AFTER)
+        self.assertEqual(self.executions, [])
 
-            self.assertEqual(self.triggered_script, 'GET_TARGET_SYSTEM_INFORMATION_AFTER')
-            self.assertEqual(self.executed_as_sudo, False)
+    def test_emit(self):
+        self.emit(Source.Status.GET_TARGET_SYSTEM_INFORMATION, HookEventHandler.EventType.BEFORE)
+        self.emit(Source.Status.GET_TARGET_SYSTEM_INFORMATION, HookEventHandler.EventType.AFTER)
+
+        self.assertEqual(
+            [command for hostname, command, context in self.get_invocations()],
+            [
+                self.get_invocation('GET_TARGET_SYSTEM_INFORMATION_BEFORE'),
+                self.get_invocation('GET_TARGET_SYSTEM_INFORMATION_AFTER'),
+            ]
+        )
 
     def test_emit__executed_in_correct_location(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
-        ):
-            self.source.status = Source.Status.GET_TARGET_SYSTEM_INFORMATION
-            self.source.save()
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
+        self.emit(Source.Status.GET_TARGET_SYSTEM_INFORMATION, HookEventHandler.EventType.BEFORE)
+        self.emit(Source.Status.GET_TARGET_SYSTEM_INFORMATION, HookEventHandler.EventType.AFTER)
 
-            self.assertEqual(self.execution_location, 'ubuntu16')
+        self.assertEqual(
+            [hostname for hostname, command, context in self.get_invocations()],
+            ['ubuntu16', 'target__device_identification']
+        )
 
-            self.hook_event_handler.emit(HookEventHandler.EventType.AFTER)
+    def test_emit__execute_as_sudo(self):
+        self.emit(Source.Status.SYNC, HookEventHandler.EventType.BEFORE)
+        self.emit(Source.Status.SYNC, HookEventHandler.EventType.AFTER)
+
+        self.assertEqual(
+            [command for hostname, command, context in self.get_invocations()],
+            [
+                self.get_invocation('SYNC_BEFORE', sudo=True),
+                self.get_invocation('SYNC_AFTER'),
+            ]
+        )
 
-            self.assertEqual(self.execution_location, 'target__device_identification')
+    def test_emit__hook_staged_once_per_host(self):
+        for _ in range(3):
+            self.emit(Source.Status.SYNC, HookEventHandler.EventType.BEFORE)
+        self.emit(Source.Status.SYNC, HookEventHandler.EventType.AFTER)
+
+        self.assertEqual(
+            self.get_stagings(),
+            [
+                ('ubuntu16', RemoteHookCache.HOOK_TEMPLATE.format(script='SYNC_BEFORE')),
+                ('ubuntu16', RemoteHookCache.HOOK_TEMPLATE.format(script='SYNC_AFTER')),
+            ]
+        )
+        self.assertEqual(len(self.get_invocations()), 4)
 
     def test_emit__env_loaded(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
-        ):
-            self.source.status = Source.Status.GET_TARGET_SYSTEM_INFORMATION
-            self.source.save()
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
-
-            self.assertDictEqual(self.execution_env, {
-                'blueprint': self.source.target.blueprint,
-                'device_mapping': self.source.target.device_mapping,
-                'source_system_info': self.source.remote_host.system_info,
-                'target_system_info': self.source.target.remote_host.system_info,
-                'cloud_metadata': self.source.target.remote_host.cloud_metadata,
-            })
-
-
-    def test_emit__env_loaded_without_target_remote_host(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
-        ):
-            self.source.target.remote_host = None
-            self.source.status = Source.Status.GET_TARGET_SYSTEM_INFORMATION
-            self.source.save()
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
-
-            self.assertDictEqual(self.execution_env, {
-                'blueprint': self.source.target.blueprint,
-                'device_mapping': self.source.target.device_mapping,
-                'source_system_info': self.source.remote_host.system_info,
-                'target_system_info': {},
-                'cloud_metadata': {},
-            })
-
-    def test_emit__execute_as_sudo(self):
-        with patch(
-            'remote_script_execution.remote_script_execution.RemoteScriptExecutor.execute',
-            self.get_mocked_script_execution_decorator()
-        ):
-            self.source.status = Source.Status.SYNC
-            self.source.save()
-
-            self.hook_event_handler.emit(HookEventHandler.EventType.BEFORE)
-            self.assertEqual(self.executed_as_sudo, True)
-            
-            self.hook_event_handler.emit(HookEventHandler.EventType.AFTER)
-            self.assertEqual(self.executed_as_sudo, False)
+        self.emit(Source.Status.CREATE_PARTITIONS, HookEventHandler.EventType.BEFORE)
+
+        self.assertEqual(self.get_invocations()[0][2], {
+            'blueprint': self.source.target.blueprint,
+            'device_mapping': self.source.target.device_mapping,
+            'source_system_info': self.source.remote_host.system_info,
+            'target_system_info': self.source.target.remote_host.system_info,
+            'cloud_metadata': self.source.target.remote_host.cloud_metadata,
+        })
+
+    def test_emit__env_loaded_from_declared_context(self):
+        self.emit(Source.Status.CREATE_PARTITIONS, HookEventHandler.EventType.AFTER)
+
+        self.assertEqual(self.get_invocations()[0][2], {'blueprint': self.source.target.blueprint})
+
+    def test_emit__unused_target_system_info_not_fetched(self):
+        with patch.object(RemoteHost, 'update_system_info') as update_system_info:
+            self.emit(Source.Status.CREATE_PARTITIONS, HookEventHandler.EventType.AFTER)
+            update_system_info.assert_not_called()
+
+            self.emit(Source.Status.CREATE_PARTITIONS, HookEventHandler.EventType.BEFORE)
+            update_system_info.assert_called_once_with()
+
+    def test_load_script_env(self):
+        self.assertDictEqual(self.hook_event_handler._load_script_env(), {
+            'blueprint': self.source.target.blueprint,
+            'device_mapping': self.source.target.device_mapping,
+            'source_system_info': self.source.remote_host.system_info,
+            'target_system_info': self.source.target.remote_host.system_info,
+            'cloud_metadata': self.source.target.remote_host.cloud_metadata,
+        })
+
+    def test_load_script_env__without_target_remote_host(self):
+        self.source.target.remote_host = None
+
+        self.assertDictEqual(self.hook_event_handler._load_script_env(), {
+            'blueprint': self.source.target.blueprint,
+            'device_mapping': self.source.target.device_mapping,
+            'source_system_info': self.source.remote_host.system_info,
+            'target_system_info': {},
+            'cloud_metadata': {},
+        })
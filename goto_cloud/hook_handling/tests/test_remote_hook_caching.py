@@ -0,0 +1,182 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.test import TestCase
+
+from remote_host.public import RemoteHost
+
+from test_assets.public import TestAsset
+
+from ..remote_hook_caching import RemoteHookCache
+
+
+class TestRemoteHookCache(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
+    def setUp(self):
+        self.remote_hook_cache = RemoteHookCache(RemoteHost.objects.create(address='ubuntu16'))
+        self.executions = []
+        self.remote_hook_cache.remote_executor = SimpleNamespace(
+            execute=lambda command, stdin=None: self.executions.append((command, stdin))
+        )
+
+    def get_path(self, script, sudo=False):
+        return '{directory}/{digest}.py'.format(
+            directory=RemoteHookCache.get_cache_directory(sudo),
+            digest=RemoteHookCache.get_digest(RemoteHookCache.HOOK_TEMPLATE.format(script=script)),
+        )
+
+    def test_stage(self):
+        path = self.remote_hook_cache.stage('script')
+        content = RemoteHookCache.HOOK_TEMPLATE.format(script='script')
+
+        self.assertEqual(path, '$HOME/.goto_cloud/hooks/{digest}.py'.format(
+            digest=RemoteHookCache.get_digest(content)
+        ))
+        self.assertEqual(self.executions, [(
+            RemoteHookCache.STAGE_COMMAND.render(
+                sudo_prefix='',
+                directory=RemoteHookCache.USER_CACHE_DIRECTORY,
+                digest=RemoteHookCache.get_digest(content),
+                path=path,
+            ),
+            content.encode(),
+        )])
+
+    def test_stage__sudo(self):
+        path = self.remote_hook_cache.stage('script', sudo=True)
+
+        self.assertEqual(path, self.get_path('script', sudo=True))
+        self.assertTrue(path.startswith('/var/lib/goto_cloud/hooks/'))
+        self.assertIn('sudo install -d -m 0700 /var/lib/goto_cloud/hooks ', self.executions[0][0])
+
+    def test_stage__staged_once(self):
+        self.assertEqual(self.remote_hook_cache.stage('script'), self.remote_hook_cache.stage('script'))
+        self.assertEqual(len(self.executions), 1)
+
+    def test_stage__staged_once_per_privilege(self):
+        self.assertNotEqual(self.remote_hook_cache.stage('script'), self.remote_hook_cache.stage('script', sudo=True))
+        self.assertEqual(len(self.executions), 2)
+
+    def test_stage__content_addressed(self):
+        self.assertNotEqual(self.remote_hook_cache.stage('script'), self.remote_hook_cache.stage('other script'))
+        self.assertEqual(len(self.executions), 2)
+
+    def test_execute(self):
+        self.remote_hook_cache.execute('script', {'b': [1, 2], 'a': 'value'})
+
+        self.assertEqual(self.executions[1], (
+            'echo "{digest}  {path}" | sha256sum -c --status && python {path}'.format(
+                digest=RemoteHookCache.get_digest(RemoteHookCache.HOOK_TEMPLATE.format(script='script')),
+                path=self.get_path('script'),
+            ),
+            b'{"a":"value","b":[1,2]}',
+        ))
+
+    def test_execute__sudo_without_context(self):
+        self.remote_hook_cache.execute('script', sudo=True)
+
+        self.assertEqual(self.executions[1], (
+            'echo "{digest}  {path}" | sudo sha256sum -c --status && sudo python {path}'.format(
+                digest=RemoteHookCache.get_digest(RemoteHookCache.HOOK_TEMPLATE.format(script='script')),
+                path=self.get_path('script', sudo=True),
+            ),
+            b'{}',
+        ))
+
+    def test_hook_template(self):
+        result = subprocess.run(
+            [sys.executable, '-c', RemoteHookCache.HOOK_TEMPLATE.format(script='print(CONTEXT["key"])')],
+            input=RemoteHookCache._encode_context({'key': 'value'}),
+            stdout=subprocess.PIPE,
+        )
+
+        self.assertEqual(result.stdout, b'value\n')
+
+
+class TestRemoteHookCacheCommands(TestCase):
+    """
+    runs the commands of the hook cache in a local shell, using the cache directory of the current user
+    """
+    def setUp(self):
+        home = tempfile.TemporaryDirectory()
+        self.addCleanup(home.cleanup)
+        self.home = home.name
+        self.directory = os.path.join(self.home, '.goto_cloud', 'hooks')
+
+    def run_command(self, command, stdin=b''):
+        return subprocess.run(
+            command,
+            shell=True,
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={'HOME': self.home, 'PATH': os.pathsep.join((os.path.dirname(sys.executable), os.environ['PATH']))},
+        )
+
+    def stage(self, script):
+        content = RemoteHookCache.HOOK_TEMPLATE.format(script=script)
+        digest = RemoteHookCache.get_digest(content)
+        path = '{directory}/{digest}.py'.format(directory=RemoteHookCache.USER_CACHE_DIRECTORY, digest=digest)
+
+        result = self.run_command(
+            RemoteHookCache.STAGE_COMMAND.render(
+                sudo_prefix='', directory=RemoteHookCache.USER_CACHE_DIRECTORY, digest=digest, path=path
+            ),
+            content.encode(),
+        )
+        return result, digest, path
+
+    def execute(self, digest, path):
+        return self.run_command(
+            RemoteHookCache.EXECUTE_COMMAND.render(sudo_prefix='', digest=digest, path=path),
+            RemoteHookCache._encode_context({'key': 'value'}),
+        )
+
+    def test_stage_and_execute(self):
+        result, digest, path = self.stage('print(CONTEXT["key"])')
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(os.stat(self.directory).st_mode & 0o777, 0o700)
+        self.assertEqual(self.execute(digest, path).stdout, b'value\n')
+
+    def test_stage__directory_mode_restricted(self):
+        os.makedirs(self.directory)
+        os.chmod(self.directory, 0o777)
+
+        result, digest, path = self.stage('print(CONTEXT["key"])')
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(os.stat(self.directory).st_mode & 0o777, 0o700)
+
+    @skipUnless(hasattr(os, 'geteuid') and os.geteuid() == 0, 'changing the owner of a directory requires root')
+    def test_stage__directory_of_other_user(self):
+        os.makedirs(self.directory)
+        os.chown(self.directory, 65534, 65534)
+
+        result, digest, path = self.stage('print(CONTEXT["key"])')
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_execute__modified_hook_not_executed(self):
+        result, digest, path = self.stage('print(CONTEXT["key"])')
+        with open(os.path.join(self.directory, '{digest}.py'.format(digest=digest)), 'a') as hook_file:
+            hook_file.write('\nprint("modified")')
+
+        result = self.execute(digest, path)
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b'')
+
+    def test_stage__modified_hook_staged_again(self):
+        result, digest, path = self.stage('print(CONTEXT["key"])')
+        with open(os.path.join(self.directory, '{digest}.py'.format(digest=digest)), 'a') as hook_file:
+            hook_file.write('\nprint("modified")')
+
+        self.stage('print(CONTEXT["key"])')
+
+        self.assertEqual(self.execute(digest, path).stdout, b'value\n')
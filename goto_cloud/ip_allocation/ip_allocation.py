@@ -0,0 +1,191 @@
+import heapq
+
+
+class IpAllocator():
+    """
+    Takes care of allocating the ips of a range. The allocated ips are tracked in a sparse bitmap, which only stores the
+    words containing allocated ips, so ranges spanning a whole IPv6 /64 net can be handled as well.
+
+    New ips are handed out at a cursor, which only moves forward. Released ips are kept in a heap and are handed out
+    again first, lowest ip first. The next free ip is therefore found in constant time, amortized over the reserved ips,
+    the cursor has to skip.
+    """
+    class RangeExhaustedException(Exception):
+        """
+        is raised when the range is exhausted
+        """
+        def __init__(self, from_ip, to_ip):
+            """
+            :param from_ip: the ranges from address
+            :type from_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            :param to_ip: the ranges to address
+            :type to_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            """
+            super().__init__('the ip range ({from_ip} - {to_ip}) is exhausted!'.format(
+                from_ip=from_ip,
+                to_ip=to_ip,
+            ))
+
+    class IpNotAssignableException(Exception):
+        """
+        is raised if an ip is not part of the range, or is the network or broadcast address of its net
+        """
+        def __init__(self, ip, from_ip, to_ip):
+            """
+            :param ip: the ip which is not assignable
+            :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            :param from_ip: the ranges from address
+            :type from_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            :param to_ip: the ranges to address
+            :type to_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            """
+            super().__init__('the ip {ip} can not be assigned from the range ({from_ip} - {to_ip})'.format(
+                ip=ip,
+                from_ip=from_ip,
+                to_ip=to_ip,
+            ))
+
+    class IpAlreadyAllocatedException(Exception):
+        """
+        is raised if an ip is reserved, which has already been allocated
+        """
+        def __init__(self, ip):
+            """
+            :param ip: the ip which has already been allocated
+            :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+            """
+            super().__init__('the ip {ip} has already been allocated'.format(ip=ip))
+
+    WORD_SIZE = 64
+
+    def __init__(self, from_ip, to_ip, net_address, state=None):
+        """
+        initialized with a given range, in a given network
+
+        :param from_ip: the ip the range starts at
+        :type from_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :param to_ip: the ip the range stops at (included)
+        :type to_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :param net_address: the network address, in which the ips are allocated
+        :type net_address: ipaddress.IPv4Network or ipaddress.IPv6Network
+        :param state: a state returned by get_state, to continue allocating from
+        :type state: dict
+        """
+        self.from_ip = from_ip
+        self.to_ip = to_ip
+        self.net_address = net_address
+        self._size = int(to_ip) - int(from_ip) + 1
+        self._unassignable_offsets = {
+            int(address) - int(from_ip) for address in (net_address.network_address, net_address.broadcast_address)
+            if from_ip <= address <= to_ip
+        }
+        self._words = {}
+        self._cursor = 0
+        self._released = []
+
+        if state:
+            self._words = {int(word_index): word for word_index, word in state['words'].items()}
+            self._cursor = state['cursor']
+            self._released = list(state['released'])
+            heapq.heapify(self._released)
+
+    def get_state(self):
+        """
+        returns the state of the allocator in a JSON serializable format, so it can be persisted
+
+        :return: the state
+        :rtype: dict
+        """
+        return {
+            'words': {str(word_index): word for word_index, word in self._words.items()},
+            'cursor': self._cursor,
+            'released': list(self._released),
+        }
+
+    def allocate(self):
+        """
+        allocates the next free ip
+
+        :return: the allocated ip
+        :rtype: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.RangeExhaustedException: if there is no free ip left
+        """
+        while self._released:
+            offset = heapq.heappop(self._released)
+            if not self._is_offset_allocated(offset):
+                return self._allocate_offset(offset)
+
+        while self._cursor < self._size:
+            offset = self._cursor
+            self._cursor += 1
+            if not self._is_offset_allocated(offset) and offset not in self._unassignable_offsets:
+                return self._allocate_offset(offset)
+
+        raise IpAllocator.RangeExhaustedException(self.from_ip, self.to_ip)
+
+    def reserve(self, ip):
+        """
+        allocates the given ip, for example because it is already used by a system, which is not managed by this
+        allocator
+
+        :param ip: the ip to reserve
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :return: the reserved ip
+        :rtype: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be assigned from this range
+        :raises IpAllocator.IpAlreadyAllocatedException: if the ip has already been allocated
+        """
+        offset = self._get_offset(ip)
+
+        if self._is_offset_allocated(offset):
+            raise IpAllocator.IpAlreadyAllocatedException(ip)
+
+        return self._allocate_offset(offset)
+
+    def release(self, ip):
+        """
+        releases the given ip, so it can be allocated again. Releasing an ip, which is not allocated, has no effect.
+
+        :param ip: the ip to release
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be assigned from this range
+        """
+        offset = self._get_offset(ip)
+
+        if not self._is_offset_allocated(offset):
+            return
+
+        word_index, bit = divmod(offset, self.WORD_SIZE)
+        self._words[word_index] &= ~(1 << bit)
+        if not self._words[word_index]:
+            del self._words[word_index]
+
+        if offset < self._cursor:
+            heapq.heappush(self._released, offset)
+
+    def is_allocated(self, ip):
+        """
+        :param ip: the ip to check
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :return: whether the given ip is allocated
+        :rtype: bool
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be assigned from this range
+        """
+        return self._is_offset_allocated(self._get_offset(ip))
+
+    def _get_offset(self, ip):
+        offset = int(ip) - int(self.from_ip)
+
+        if ip.version != self.from_ip.version or not 0 <= offset < self._size or offset in self._unassignable_offsets:
+            raise IpAllocator.IpNotAssignableException(ip, self.from_ip, self.to_ip)
+
+        return offset
+
+    def _is_offset_allocated(self, offset):
+        word_index, bit = divmod(offset, self.WORD_SIZE)
+        return bool(self._words.get(word_index, 0) & (1 << bit))
+
+    def _allocate_offset(self, offset):
+        word_index, bit = divmod(offset, self.WORD_SIZE)
+        self._words[word_index] = self._words.get(word_index, 0) | (1 << bit)
+        return self.from_ip + offset
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:03
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IpRangeAllocation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('net_address', models.CharField(max_length=255)),
+                ('from_ip', models.CharField(max_length=255)),
+                ('to_ip', models.CharField(max_length=255)),
+                ('state', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='iprangeallocation',
+            unique_together=set([('net_address', 'from_ip', 'to_ip')]),
+        ),
+    ]
@@ -0,0 +1,122 @@
+import ipaddress
+
+from contextlib import contextmanager
+
+from django.db import models, transaction
+from django.contrib.postgres.fields import JSONField
+
+from tracked_model.public import TrackedModel
+
+from .ip_allocation import IpAllocator
+
+
+class IpRangeAllocation(TrackedModel):
+    """
+    persists the state of the IpAllocator of a range, so all processes share the ips allocated from it. Every operation
+    locks the row of the range, so concurrent allocations never hand out the same ip.
+    """
+    net_address = models.CharField(max_length=255)
+    from_ip = models.CharField(max_length=255)
+    to_ip = models.CharField(max_length=255)
+    state = JSONField(default=dict)
+    """
+    the state of the IpAllocator, as returned by IpAllocator.get_state
+    """
+
+    class Meta:
+        unique_together = (('net_address', 'from_ip', 'to_ip'),)
+
+    @classmethod
+    def get_for_range(cls, from_ip, to_ip, net_address):
+        """
+        returns the allocation of the given range, which is created if it does not exist yet
+
+        :param from_ip: the ip the range starts at
+        :type from_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :param to_ip: the ip the range stops at (included)
+        :type to_ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :param net_address: the network address, in which the ips are allocated
+        :type net_address: ipaddress.IPv4Network or ipaddress.IPv6Network
+        :return: the allocation of the range
+        :rtype: IpRangeAllocation
+        """
+        return cls.objects.get_or_create(net_address=str(net_address), from_ip=str(from_ip), to_ip=str(to_ip))[0]
+
+    def allocate(self):
+        """
+        allocates the next free ip of the range
+
+        :return: the allocated ip
+        :rtype: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.RangeExhaustedException: if there is no free ip left
+        """
+        with self._lock_allocator() as allocator:
+            return allocator.allocate()
+
+    def reserve(self, ip):
+        """
+        allocates the given ip
+
+        :param ip: the ip to reserve
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :return: the reserved ip
+        :rtype: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be assigned from this range
+        :raises IpAllocator.IpAlreadyAllocatedException: if the ip has already been allocated
+        """
+        with self._lock_allocator() as allocator:
+            return allocator.reserve(ip)
+
+    def release(self, ip):
+        """
+        releases the given ip, so it can be allocated again
+
+        :param ip: the ip to release
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be assigned from this range
+        """
+        with self._lock_allocator() as allocator:
+            allocator.release(ip)
+
+    def release_many(self, ips):
+        """
+        releases the given ips at once, so they can be allocated again
+
+        :param ips: the ips to release
+        :type ips: list[ipaddress.IPv4Address or ipaddress.IPv6Address]
+        :raises IpAllocator.IpNotAssignableException: if an ip can not be assigned from this range
+        """
+        with self._lock_allocator() as allocator:
+            for ip in ips:
+                allocator.release(ip)
+
+    def is_allocated(self, ip):
+        """
+        :param ip: the ip to check
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :return: whether the given ip is allocated
+        :rtype: bool
+        """
+        self.refresh_from_db(fields=['state'])
+        return self._get_allocator().is_allocated(ip)
+
+    @contextmanager
+    def _lock_allocator(self):
+        """
+        locks the row of the range and yields an IpAllocator with the current state. The changed state is saved, when
+        the context is left without an exception.
+        """
+        with transaction.atomic():
+            self.state = type(self).objects.select_for_update().values_list('state', flat=True).get(pk=self.pk)
+            allocator = self._get_allocator()
+            yield allocator
+            self.state = allocator.get_state()
+            self.save(update_fields=['state', 'updated'])
+
+    def _get_allocator(self):
+        return IpAllocator(
+            ipaddress.ip_address(self.from_ip),
+            ipaddress.ip_address(self.to_ip),
+            ipaddress.ip_network(self.net_address),
+            self.state,
+        )
@@ -0,0 +1,2 @@
+from .ip_allocation import IpAllocator
+from .models import IpRangeAllocation
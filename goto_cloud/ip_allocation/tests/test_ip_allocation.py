@@ -0,0 +1,85 @@
+import ipaddress
+
+from unittest import TestCase
+
+from ..ip_allocation import IpAllocator
+
+
+class TestIpAllocator(TestCase):
+    def setUp(self):
+        self.allocator = IpAllocator(
+            ipaddress.ip_address('10.17.32.0'),
+            ipaddress.ip_address('10.17.32.4'),
+            ipaddress.ip_network('10.17.32.0/24'),
+        )
+
+    def test_allocate(self):
+        self.assertEqual(
+            [str(self.allocator.allocate()) for _ in range(4)],
+            ['10.17.32.1', '10.17.32.2', '10.17.32.3', '10.17.32.4']
+        )
+
+    def test_allocate__range_exhausted(self):
+        [self.allocator.allocate() for _ in range(4)]
+
+        with self.assertRaises(IpAllocator.RangeExhaustedException):
+            self.allocator.allocate()
+
+    def test_allocate__released_ip_allocated_first(self):
+        [self.allocator.allocate() for _ in range(3)]
+        self.allocator.release(ipaddress.ip_address('10.17.32.2'))
+
+        self.assertEqual(str(self.allocator.allocate()), '10.17.32.2')
+        self.assertEqual(str(self.allocator.allocate()), '10.17.32.4')
+
+    def test_allocate__reserved_ip_skipped(self):
+        self.allocator.reserve(ipaddress.ip_address('10.17.32.2'))
+
+        self.assertEqual(
+            [str(self.allocator.allocate()) for _ in range(3)],
+            ['10.17.32.1', '10.17.32.3', '10.17.32.4']
+        )
+
+    def test_allocate__ipv6_64_net(self):
+        allocator = IpAllocator(
+            ipaddress.ip_address('2001:db8::'),
+            ipaddress.ip_address('2001:db8::ffff:ffff:ffff:ffff'),
+            ipaddress.ip_network('2001:db8::/64'),
+        )
+        allocator.reserve(ipaddress.ip_address('2001:db8::ffff:ffff:ffff:fffe'))
+
+        self.assertEqual(str(allocator.allocate()), '2001:db8::1')
+        self.assertTrue(allocator.is_allocated(ipaddress.ip_address('2001:db8::ffff:ffff:ffff:fffe')))
+        self.assertEqual(len(allocator.get_state()['words']), 2)
+
+    def test_reserve__already_allocated(self):
+        self.allocator.allocate()
+
+        with self.assertRaises(IpAllocator.IpAlreadyAllocatedException):
+            self.allocator.reserve(ipaddress.ip_address('10.17.32.1'))
+
+    def test_reserve__not_assignable(self):
+        for ip in ('10.17.32.0', '10.17.32.5', '2001:db8::1'):
+            with self.assertRaises(IpAllocator.IpNotAssignableException):
+                self.allocator.reserve(ipaddress.ip_address(ip))
+
+    def test_release__not_allocated(self):
+        self.allocator.release(ipaddress.ip_address('10.17.32.3'))
+
+        self.assertEqual(str(self.allocator.allocate()), '10.17.32.1')
+        self.assertFalse(self.allocator.get_state()['released'])
+
+    def test_get_state(self):
+        self.allocator.allocate()
+        self.allocator.allocate()
+        self.allocator.release(ipaddress.ip_address('10.17.32.1'))
+
+        allocator = IpAllocator(
+            self.allocator.from_ip,
+            self.allocator.to_ip,
+            self.allocator.net_address,
+            self.allocator.get_state(),
+        )
+
+        self.assertEqual(str(allocator.allocate()), '10.17.32.1')
+        self.assertEqual(str(allocator.allocate()), '10.17.32.3')
@@ -0,0 +1,58 @@
+import ipaddress
+
+from django.test import TestCase
+
+from ip_allocation.public import IpAllocator, IpRangeAllocation
+
+
+class TestIpRangeAllocation(TestCase):
+    FROM_IP = ipaddress.ip_address('10.17.32.10')
+    TO_IP = ipaddress.ip_address('10.17.32.11')
+    NET_ADDRESS = ipaddress.ip_network('10.17.32.0/24')
+
+    def setUp(self):
+        self.ip_range_allocation = IpRangeAllocation.get_for_range(self.FROM_IP, self.TO_IP, self.NET_ADDRESS)
+
+    def test_get_for_range(self):
+        self.assertEqual(
+            IpRangeAllocation.get_for_range(self.FROM_IP, self.TO_IP, self.NET_ADDRESS),
+            self.ip_range_allocation
+        )
+        self.assertEqual(IpRangeAllocation.objects.count(), 1)
+
+    def test_allocate__shared_between_instances(self):
+        other_ip_range_allocation = IpRangeAllocation.get_for_range(self.FROM_IP, self.TO_IP, self.NET_ADDRESS)
+
+        self.assertEqual(str(self.ip_range_allocation.allocate()), '10.17.32.10')
+        self.assertEqual(str(other_ip_range_allocation.allocate()), '10.17.32.11')
+
+        with self.assertRaises(IpAllocator.RangeExhaustedException):
+            self.ip_range_allocation.allocate()
+
+    def test_reserve_and_release(self):
+        self.ip_range_allocation.reserve(ipaddress.ip_address('10.17.32.10'))
+
+        self.assertTrue(
+            IpRangeAllocation.objects.get().is_allocated(ipaddress.ip_address('10.17.32.10'))
+        )
+
+        self.ip_range_allocation.release(ipaddress.ip_address('10.17.32.10'))
+
+        self.assertFalse(self.ip_range_allocation.is_allocated(ipaddress.ip_address('10.17.32.10')))
+
+    def test_reserve__failure_not_persisted(self):
+        self.ip_range_allocation.allocate()
+
+        with self.assertRaises(IpAllocator.IpAlreadyAllocatedException):
+            self.ip_range_allocation.reserve(ipaddress.ip_address('10.17.32.10'))
+
+        self.assertEqual(str(self.ip_range_allocation.allocate()), '10.17.32.11')
+
+    def test_release_many(self):
+        self.ip_range_allocation.allocate()
+        self.ip_range_allocation.allocate()
+
+        self.ip_range_allocation.release_many([self.FROM_IP, self.TO_IP])
+
+        self.assertFalse(self.ip_range_allocation.is_allocated(ipaddress.ip_address('10.17.32.10')))
+        self.assertFalse(self.ip_range_allocation.is_allocated(ipaddress.ip_address('10.17.32.11')))
@@ -0,0 +1,37 @@
+from cloud_management.public import AsyncCloudManager
+
+from command.public import AsyncSourceCommand
+
+from remote_execution.public import AsyncRemoteHostExecutor
+
+from .cloud_commanding import BootstrapVolumeDeletionMixin
+
+
+class AsyncCloudCommand(AsyncSourceCommand):
+    """
+    base class for AsyncSourceCommands which need to use a CloudManager
+    """
+    def __init__(self, source):
+        super().__init__(source)
+        self._cloud_manager = AsyncCloudManager(self._source.migration_run.plan.plan.get('target_cloud', {}))
+
+
+class AsyncStopTargetCommand(AsyncCloudCommand):
+    async def _execute(self):
+        await AsyncRemoteHostExecutor(self._target.remote_host).execute(
+            'sudo shutdown -P now &',
+            block_for_response=False
+        )
+        await self._cloud_manager.stop_target(self._target.remote_host.cloud_metadata['id'])
+
+
+class AsyncDeleteBootstrapVolumeCommand(BootstrapVolumeDeletionMixin, AsyncCloudCommand):
+    async def _execute(self):
+        volume_deletion = self._delete_bootstrap_volume()
+        if volume_deletion is not None:
+            await volume_deletion
+
+
+class AsyncStartTargetCommand(AsyncCloudCommand):
+    async def _execute(self):
+        await self._cloud_manager.start_target(self._target.remote_host.cloud_metadata['id'])
@@ -0,0 +1,325 @@
+from remote_host_command.public import RemoteHostCommand
+
+from remote_script_execution.public import RemoteScriptExecutor
+
+
+class BlockStream():
+    """
+    Renders the commands, which stream a block device from the source to the target, as an alternative to the file level
+    sync. The device is read in chunks, which are compressed before they are sent over ssh. Chunks which only contain
+    zeros are not transferred, but only announced to the receiver.
+
+    Both sides keep a binary manifest of the device, which consists of a small header followed by the concatenated sha1
+    digests of all chunks. Before a stream is started, the fingerprint of the manifest on the target is retrieved and
+    handed to the sender. The sender only trusts its own manifest, if it has the same fingerprint, and then only
+    transfers the chunks whose digest changed. Additionally the source manifest remembers the boot id and the number of
+    sectors written to the device, so a device which was not written to since the last sync is not read at all.
+
+    The manifests decide which chunks are skipped, so they are kept in a directory, which is only accessible by root.
+    Manifests in a directory which is not owned by root or accessible by other users, are ignored and not written, and
+    manifest files are neither followed if they are symlinks, nor trusted if they are writable by other users.
+
+    The source connects to the target using the ssh command given on initialization. Like the ssh options of the sync
+    command, it is configured in the commands section of the blueprint.
+
+    The scripts are executed using the python interpreter of the remote hosts, so they have to stay python 2 and
+    python 3 compatible.
+    """
+    MANIFEST_SCRIPT = (
+        'import hashlib, os, struct, sys, zlib\n'
+        'from stat import S_ISDIR, S_ISREG\n'
+        'HEADER = struct.Struct("!QBI")\n'
+        'DATA, ZERO, END, START = 0, 1, 2, 3\n'
+        'MANIFEST_HEADER = struct.Struct("!4sBQQ36sQ")\n'
+        'MANIFEST_MAGIC = b"GCBM"\n'
+        'MANIFEST_VERSION = 1\n'
+        'DIGEST_SIZE = 20\n'
+        'def count_chunks(chunk_size, device_size):\n'
+        '    return (device_size + chunk_size - 1) // chunk_size\n'
+        'def is_private(status, is_expected_type):\n'
+        '    return is_expected_type(status.st_mode) and status.st_uid == os.getuid() and not status.st_mode & 0o077\n'
+        'def is_private_directory(path):\n'
+        '    try:\n'
+        '        return is_private(os.lstat(path), S_ISDIR)\n'
+        '    except OSError:\n'
+        '        return False\n'
+        'def get_manifest_directories(path):\n'
+        '    directory = os.path.dirname(path)\n'
+        '    return [os.path.dirname(directory), directory]\n'
+        'def load_manifest(path):\n'
+        '    if not all(is_private_directory(directory) for directory in get_manifest_directories(path)):\n'
+        '        return None\n'
+        '    try:\n'
+        '        manifest_fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)\n'
+        '    except OSError:\n'
+        '        return None\n'
+        '    with os.fdopen(manifest_fd, "rb") as manifest_file:\n'
+        '        if not is_private(os.fstat(manifest_fd), S_ISREG):\n'
+        '            return None\n'
+        '        data = manifest_file.read()\n'
+        '    if len(data) < MANIFEST_HEADER.size:\n'
+        '        return None\n'
+        '    magic, version, chunk_size, device_size, boot_id, sectors_written = MANIFEST_HEADER.unpack(\n'
+        '        data[:MANIFEST_HEADER.size]\n'
+        '    )\n'
+        '    digests = data[MANIFEST_HEADER.size:]\n'
+        '    if (\n'
+        '        magic != MANIFEST_MAGIC or version != MANIFEST_VERSION\n'
+        '        or len(digests) != count_chunks(chunk_size, device_size) * DIGEST_SIZE\n'
+        '    ):\n'
+        '        return None\n'
+        '    return {\n'
+        '        "chunk_size": chunk_size,\n'
+        '        "device_size": device_size,\n'
+        '        "boot_id": boot_id.rstrip(b"\\0"),\n'
+        '        "sectors_written": sectors_written,\n'
+        '        "digests": digests,\n'
+        '    }\n'
+        'def write_manifest(path, chunk_size, device_size, digests, boot_id=b"", sectors_written=0):\n'
+        '    for directory in get_manifest_directories(path):\n'
+        '        if not os.path.lexists(directory):\n'
+        '            os.mkdir(directory, 0o700)\n'
+        '        if not is_private_directory(directory):\n'
+        '            sys.exit("the manifest directory %s is accessible by other users" % directory)\n'
+        '    try:\n'
+        '        os.unlink(path + ".new")\n'
+        '    except OSError:\n'
+        '        pass\n'
+        '    manifest_fd = os.open(path + ".new", os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)\n'
+        '    with os.fdopen(manifest_fd, "wb") as manifest_file:\n'
+        '        manifest_file.write(MANIFEST_HEADER.pack(\n'
+        '            MANIFEST_MAGIC, MANIFEST_VERSION, chunk_size, device_size, boot_id, sectors_written\n'
+        '        ))\n'
+        '        manifest_file.write(bytes(digests))\n'
+        '        manifest_file.flush()\n'
+        '        os.fsync(manifest_file.fileno())\n'
+        'def fingerprint(manifest):\n'
+        '    if manifest is None:\n'
+        '        return ""\n'
+        '    return hashlib.sha1(\n'
+        '        struct.pack("!QQ", manifest["chunk_size"], manifest["device_size"]) + bytes(manifest["digests"])\n'
+        '    ).hexdigest()\n'
+    )
+    FINGERPRINT_SCRIPT = MANIFEST_SCRIPT + (
+        'sys.stdout.write(fingerprint(load_manifest(CONTEXT["manifest"])))\n'
+    )
+    SENDER_SCRIPT = MANIFEST_SCRIPT + (
+        'def read_first_line(path):\n'
+        '    try:\n'
+        '        with open(path, "rb") as hint_file:\n'
+        '            return hint_file.readline().strip()\n'
+        '    except (IOError, OSError):\n'
+        '        return None\n'
+        'boot_id = read_first_line(CONTEXT["boot_id"]) or b""\n'
+        'stat = read_first_line(CONTEXT["stat"])\n'
+        'sectors_written = int(stat.split()[6]) if stat and len(stat.split()) > 6 else None\n'
+        'chunk_size = CONTEXT["chunk_size"]\n'
+        'zero_chunk = b"\\0" * chunk_size\n'
+        'output = getattr(sys.stdout, "buffer", sys.stdout)\n'
+        'device = open(CONTEXT["device"], "rb")\n'
+        'device.seek(0, os.SEEK_END)\n'
+        'device_size = device.tell()\n'
+        'device.seek(0)\n'
+        'previous = load_manifest(CONTEXT["manifest"])\n'
+        'if previous is not None and (\n'
+        '    previous["chunk_size"] != chunk_size or previous["device_size"] != device_size\n'
+        '    or fingerprint(previous) != CONTEXT["target_fingerprint"]\n'
+        '):\n'
+        '    previous = None\n'
+        'output.write(HEADER.pack(device_size, START, chunk_size))\n'
+        'if (\n'
+        '    previous is not None and sectors_written is not None and boot_id\n'
+        '    and previous["boot_id"] == boot_id and previous["sectors_written"] == sectors_written\n'
+        '):\n'
+        '    digests = previous["digests"]\n'
+        'else:\n'
+        '    digests = bytearray()\n'
+        '    offset = 0\n'
+        '    while True:\n'
+        '        chunk = device.read(chunk_size)\n'
+        '        if not chunk:\n'
+        '            break\n'
+        '        digest = hashlib.sha1(chunk).digest()\n'
+        '        if previous is None or previous["digests"][len(digests):len(digests) + DIGEST_SIZE] != digest:\n'
+        '            if chunk == zero_chunk[:len(chunk)]:\n'
+        '                output.write(HEADER.pack(offset, ZERO, len(chunk)))\n'
+        '            else:\n'
+        '                payload = zlib.compress(chunk, CONTEXT["compression_level"])\n'
+        '                output.write(HEADER.pack(offset, DATA, len(payload)))\n'
+        '                output.write(payload)\n'
+        '        digests += digest\n'
+        '        offset += len(chunk)\n'
+        'device.close()\n'
+        'output.write(HEADER.pack(device_size, END, 0))\n'
+        'output.flush()\n'
+        'write_manifest(CONTEXT["manifest"], chunk_size, device_size, digests, boot_id, sectors_written or 0)\n'
+    )
+    RECEIVER_SCRIPT = MANIFEST_SCRIPT + (
+        'stream = getattr(sys.stdin, "buffer", sys.stdin)\n'
+        'def read(length):\n'
+        '    data = b""\n'
+        '    while len(data) < length:\n'
+        '        part = stream.read(length - len(data))\n'
+        '        if not part:\n'
+        '            sys.exit("the stream ended unexpectedly")\n'
+        '        data += part\n'
+        '    return data\n'
+        'device_size, kind, chunk_size = HEADER.unpack(read(HEADER.size))\n'
+        'if kind != START:\n'
+        '    sys.exit("the stream is invalid")\n'
+        'device = open(CONTEXT["device"], "r+b")\n'
+        'device.seek(0, os.SEEK_END)\n'
+        'if device.tell() < device_size:\n'
+        '    sys.exit("the target device is too small")\n'
+        'previous = load_manifest(CONTEXT["manifest"])\n'
+        'if previous is not None and previous["chunk_size"] == chunk_size and previous["device_size"] == device_size:\n'
+        '    digests = bytearray(previous["digests"])\n'
+        'else:\n'
+        '    digests = bytearray(count_chunks(chunk_size, device_size) * DIGEST_SIZE)\n'
+        'while True:\n'
+        '    offset, kind, length = HEADER.unpack(read(HEADER.size))\n'
+        '    if kind == END:\n'
+        '        break\n'
+        '    chunk = zlib.decompress(read(length)) if kind == DATA else b"\\0" * length\n'
+        '    device.seek(offset)\n'
+        '    device.write(chunk)\n'
+        '    index = offset // chunk_size * DIGEST_SIZE\n'
+        '    digests[index:index + DIGEST_SIZE] = hashlib.sha1(chunk).digest()\n'
+        'device.flush()\n'
+        'os.fsync(device.fileno())\n'
+        'device.close()\n'
+        'write_manifest(CONTEXT["manifest"], chunk_size, device_size, digests)\n'
+        'os.rename(CONTEXT["manifest"] + ".new", CONTEXT["manifest"])\n'
+    )
+    STREAM_COMMAND = RemoteHostCommand('{SENDER} | {SSH} {TARGET} "{RECEIVER}"')
+    COMMIT_MANIFEST_COMMAND = RemoteHostCommand('sudo mv -f {MANIFEST}.new {MANIFEST}')
+    DEFAULT_SSH_COMMAND = 'ssh'
+    MANIFEST_DIRECTORY = '/var/lib/goto_cloud/block_sync'
+    BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+    DEVICE_STAT_PATH = '/sys/class/block/{device_id}/stat'
+    DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+    DEFAULT_COMPRESSION_LEVEL = 1
+
+    def __init__(
+        self,
+        target_remote_host,
+        ssh_command=DEFAULT_SSH_COMMAND,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        compression_level=DEFAULT_COMPRESSION_LEVEL
+    ):
+        """
+        :param target_remote_host: the remote host the devices are streamed to
+        :type target_remote_host: remote_host.public.RemoteHost
+        :param ssh_command: the ssh command, including its options like the key and the host key checking, which is
+        used to connect from the source to the target
+        :type ssh_command: str
+        :param chunk_size: the number of bytes which are compared, compressed and transferred at once
+        :type chunk_size: int
+        :param compression_level: the zlib compression level
+        :type compression_level: int
+        """
+        self.target_remote_host = target_remote_host
+        self.ssh_command = ssh_command
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+
+    def render_fingerprint_command(self, target_device_id):
+        """
+        renders the command, which has to be executed on the target, to retrieve the fingerprint of the manifest of the
+        target device. If there is no valid manifest, the command outputs nothing.
+
+        :param target_device_id: the id of the device on the target
+        :type target_device_id: str
+        :return: the rendered command
+        :rtype: str
+        """
+        return RemoteScriptExecutor.render_command(
+            self.FINGERPRINT_SCRIPT,
+            env={'manifest': self.get_target_manifest_path(target_device_id)},
+            sudo=True,
+        )
+
+    def render_stream_command(self, source_device_id, target_device_id, target_fingerprint=''):
+        """
+        renders the command, which has to be executed on the source, to stream the source device onto the target device
+
+        :param source_device_id: the id of the device on the source
+        :type source_device_id: str
+        :param target_device_id: the id of the device on the target
+        :type target_device_id: str
+        :param target_fingerprint: the fingerprint of the manifest of the target device
+        :type target_fingerprint: str
+        :return: the rendered command
+        :rtype: str
+        """
+        return self.STREAM_COMMAND.render(
+            sender=RemoteScriptExecutor.render_command(
+                self.SENDER_SCRIPT,
+                env={
+                    'device': '/dev/{device_id}'.format(device_id=source_device_id),
+                    'manifest': self.get_manifest_path(source_device_id),
+                    'target_fingerprint': target_fingerprint,
+                    'boot_id': self.BOOT_ID_PATH,
+                    'stat': self.DEVICE_STAT_PATH.format(device_id=source_device_id),
+                    'chunk_size': self.chunk_size,
+                    'compression_level': self.compression_level,
+                },
+                sudo=True,
+            ),
+            ssh=self.ssh_command,
+            target='{user}{remote_host_address}'.format(
+                user=('{username}@'.format(username=self.target_remote_host.username))
+                    if self.target_remote_host.username else '',
+                remote_host_address=self.target_remote_host.address,
+            ),
+            receiver=RemoteScriptExecutor.render_command(
+                self.RECEIVER_SCRIPT,
+                env={
+                    'device': '/dev/{device_id}'.format(device_id=target_device_id),
+                    'manifest': self.get_target_manifest_path(target_device_id),
+                },
+                sudo=True,
+            ).replace('"', '\\"'),
+        )
+
+    def render_commit_manifest_command(self, source_device_id):
+        """
+        renders the command, which replaces the manifest of the last sync by the manifest of the current one. This must
+        only be done, after the stream succeeded, otherwise chunks which didn't reach the target would be skipped.
+
+        :param source_device_id: the id of the device on the source
+        :type source_device_id: str
+        :return: the rendered command
+        :rtype: str
+        """
+        return self.COMMIT_MANIFEST_COMMAND.render(manifest=self.get_manifest_path(source_device_id))
+
+    def get_manifest_path(self, source_device_id):
+        """
+        returns the path of the manifest on the source. The manifest is bound to the target, so that the manifests of
+        migrations to different targets don't overwrite each other.
+
+        :param source_device_id: the id of the device on the source
+        :type source_device_id: str
+        :return: the path of the manifest
+        :rtype: str
+        """
+        return '{directory}/{device_id}.{target_id}.manifest'.format(
+            directory=self.MANIFEST_DIRECTORY,
+            device_id=source_device_id,
+            target_id=self.target_remote_host.pk,
+        )
+
+    def get_target_manifest_path(self, target_device_id):
+        """
+        returns the path of the manifest on the target
+
+        :param target_device_id: the id of the device on the target
+        :type target_device_id: str
+        :return: the path of the manifest
+        :rtype: str
+        """
+        return '{directory}/{device_id}.manifest'.format(
+            directory=self.MANIFEST_DIRECTORY,
+            device_id=target_device_id,
+        )
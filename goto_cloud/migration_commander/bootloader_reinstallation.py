@@ -1,5 +1,7 @@
 from command.public import SourceCommand
 
+from remote_command_batching.public import RemoteCommandBatch
+
 from remote_execution.public import RemoteHostExecutor
 
 from remote_host_command.public import RemoteHostCommand
@@ -13,7 +15,7 @@ class BootloaderReinstallationCommand(SourceCommand):
     Takes care of reinstalling in the target environment before go live. To do this, the copied source root directory
     will be chrooted and then the bootloader reinstall command from the migration plan will be executed. To avoid errors
     in the chrooted environment, important temp filesystems like proc, sys and dev will be mounted into the directory,
-    which will be chrooted, before the chroot actually happens.
+    which will be chrooted, before the chroot actually happens. All of this is executed as a single batch of commands.
     """
     class InstallationException(SourceCommand.CommandExecutionException):
         """
@@ -32,54 +34,53 @@ class BootloaderReinstallationCommand(SourceCommand):
     @SourceCommand._collect_errors
     def _execute(self):
         root_source_mountpoint = self._find_root_source_mountpoint()
-        remote_executor = RemoteHostExecutor(self._target.remote_host)
-        self._create_source_environment_mountpoints(remote_executor, root_source_mountpoint)
-        self._mount_source_environment(remote_executor, root_source_mountpoint)
-        self._mount_source_mountpoints(remote_executor, root_source_mountpoint)
-        self._reinstall_bootloader(remote_executor, root_source_mountpoint)
-
-    def _mount_source_environment(self, remote_executor, root_source_mountpoint):
+        batch = RemoteCommandBatch(RemoteHostExecutor(self._target.remote_host))
+        self._create_source_environment_mountpoints(batch, root_source_mountpoint)
+        self._mount_source_environment(batch, root_source_mountpoint)
+        self._mount_source_mountpoints(batch, root_source_mountpoint)
+        self._reinstall_bootloader(batch, root_source_mountpoint)
+        batch.execute()
+
+    def _mount_source_environment(self, batch, root_source_mountpoint):
         """
         mounts temp filesystems in the chroot environment 
         
-        :param remote_executor: the remote executor to execute the create commands with
-        :type remote_executor: RemoteHostExecutor
+        :param batch: the batch to add the mount commands to
+        :type batch: RemoteCommandBatch
         :param root_source_mountpoint: the directory which maps the sources root directory
         :type root_source_mountpoint: str
         """
-        remote_executor.execute(
-            self.MOUNT_CUSTOM_TYPE_COMMAND.render(
-                type='proc',
-                name='proc',
-                mountpoint=root_source_mountpoint + '/proc/'
-            )
+        batch.add(
+            self.MOUNT_CUSTOM_TYPE_COMMAND,
+            type='proc',
+            name='proc',
+            mountpoint=root_source_mountpoint + '/proc/'
         )
-        remote_executor.execute(
-            self.MOUNT_CUSTOM_TYPE_COMMAND.render(
-                type='sysfs',
-                name='sys',
-                mountpoint=root_source_mountpoint + '/sys/'
-            )
+        batch.add(
+            self.MOUNT_CUSTOM_TYPE_COMMAND,
+            type='sysfs',
+            name='sys',
+            mountpoint=root_source_mountpoint + '/sys/'
         )
-        remote_executor.execute(
-            DefaultRemoteHostCommand.BIND_MOUNT.render(
-                directory='/dev',
-                mountpoint=root_source_mountpoint + '/dev/'
-            )
+        batch.add(
+            DefaultRemoteHostCommand.BIND_MOUNT,
+            directory='/dev',
+            mountpoint=root_source_mountpoint + '/dev/'
         )
 
-    def _reinstall_bootloader(self, remote_executor, root_source_mountpoint):
+    def _reinstall_bootloader(self, batch, root_source_mountpoint):
         """
         executes the reinstall bootloader command in the chrooted environment
         
-        :param remote_executor: 
-        :param root_source_mountpoint: 
-        :return: 
+        :param batch: the batch to add the reinstall command to
+        :type batch: RemoteCommandBatch
+        :param root_source_mountpoint: the directory which maps the sources root directory
+        :type root_source_mountpoint: str
         """
-        remote_executor.execute(
+        batch.add(
             self.CHROOT_COMMAND.render(
                 directory=root_source_mountpoint,
-                command=RemoteHostCommand(self._target.blueprint['commands']['reinstall_bootloader']).render(
+                command=RemoteHostCommand.compile(self._target.blueprint['commands']['reinstall_bootloader']).render(
                     device='/dev/{device_id}'.format(
                         device_id=self._find_target_device_id_by_mountpoint(root_source_mountpoint)
                     )
@@ -96,20 +97,19 @@ class BootloaderReinstallationCommand(SourceCommand):
         """
         return self.source_file_location_resolver.resolve_path('/')
 
-    def _create_source_environment_mountpoints(self, remote_executor, root_source_mountpoint):
+    def _create_source_environment_mountpoints(self, batch, root_source_mountpoint):
         """
         creates the directory where the temp filesystems will be mounted
         
-        :param remote_executor: the remote executor to execute the commands with
-        :type remote_executor: RemoteHostExecutor
+        :param batch: the batch to add the commands to
+        :type batch: RemoteCommandBatch
         :param root_source_mountpoint: the directory which maps the sources root directory
         :type root_source_mountpoint: str 
         """
         for source_environment_dir in ('/sys', '/proc', '/dev',):
-            remote_executor.execute(
-                DefaultRemoteHostCommand.MAKE_DIRECTORY.render(
-                    directory=root_source_mountpoint + source_environment_dir
-                )
+            batch.add(
+                DefaultRemoteHostCommand.MAKE_DIRECTORY,
+                directory=root_source_mountpoint + source_environment_dir
             )
 
     def _find_target_device_id_by_mountpoint(self, mountpoint):
@@ -129,13 +129,13 @@ class BootloaderReinstallationCommand(SourceCommand):
                 if partition['mountpoint'] == mountpoint:
                     return device['id']
 
-    def _mount_source_mountpoints(self, remote_executor, root_source_mountpoint):
+    def _mount_source_mountpoints(self, batch, root_source_mountpoint):
         self._target.device_mapping.values()
         for device_id, device in self._target.device_mapping.items():
             device_mountpoint = self._source.remote_host.system_info['block_devices'][device_id]['mountpoint']
 
             if device_mountpoint and device_mountpoint != '/':
-                self._mount_source_mountpoint(remote_executor, root_source_mountpoint, device_mountpoint)
+                self._mount_source_mountpoint(batch, root_source_mountpoint, device_mountpoint)
 
             for partition_id in device['children'].keys():
                 partition_mountpoint = self\
@@ -144,23 +144,21 @@ class BootloaderReinstallationCommand(SourceCommand):
                     .system_info['block_devices'][device_id]['children'][partition_id]['mountpoint']
 
                 if partition_mountpoint and partition_mountpoint != '/':
-                    self._mount_source_mountpoint(remote_executor, root_source_mountpoint, partition_mountpoint)
+                    self._mount_source_mountpoint(batch, root_source_mountpoint, partition_mountpoint)
 
-    def _mount_source_mountpoint(self, remote_executor, root_source_mountpoint, mountpoint):
+    def _mount_source_mountpoint(self, batch, root_source_mountpoint, mountpoint):
         chrooted_env_location = root_source_mountpoint + mountpoint
 
         try:
             resolved_base_path = self.source_file_location_resolver.resolve_path(mountpoint)
-            remote_executor.execute(
-                DefaultRemoteHostCommand.MAKE_DIRECTORY.render(
-                    directory=chrooted_env_location
-                )
+            batch.add(
+                DefaultRemoteHostCommand.MAKE_DIRECTORY,
+                directory=chrooted_env_location
             )
-            remote_executor.execute(
-                DefaultRemoteHostCommand.BIND_MOUNT.render(
-                    directory=resolved_base_path,
-                    mountpoint=chrooted_env_location
-                )
+            batch.add(
+                DefaultRemoteHostCommand.BIND_MOUNT,
+                directory=resolved_base_path,
+                mountpoint=chrooted_env_location
             )
         except SourceFileLocationResolver.InvalidPathException:
             pass
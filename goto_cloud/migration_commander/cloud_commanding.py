@@ -70,7 +70,11 @@ class StopTargetCommand(CloudCommand):
         self._cloud_manager.stop_target(self._target.remote_host.cloud_metadata['id'])
 
 
-class DeleteBootstrapVolumeCommand(CloudCommand):
+class BootstrapVolumeDeletionMixin():
+    """
+    deletes the bootstrap volume of the target. The lookup of the volume is shared by the DeleteBootstrapVolumeCommand
+    and the AsyncDeleteBootstrapVolumeCommand, which only differ in their cloud manager.
+    """
     class NoBootstrapVolumeFoundException(CloudCommand.CommandExecutionException):
         """
         raised if the bootstrap volume could not be deleted, since it wasn't found
@@ -79,7 +83,14 @@ class DeleteBootstrapVolumeCommand(CloudCommand):
 
     ERROR_REPORT_EXCEPTION_CLASS = NoBootstrapVolumeFoundException
 
-    def _execute(self):
+    def _delete_bootstrap_volume(self):
+        """
+        deletes the bootstrap volume of the target, using the cloud manager of the command. If there is no bootstrap
+        volume, an error is added.
+
+        :return: the result of the cloud manager, which has to be awaited for an asynchronous cloud manager, or None if
+        there is no bootstrap volume
+        """
         bootstrap_volume = next(
             (
                 volume
@@ -89,9 +100,14 @@ class DeleteBootstrapVolumeCommand(CloudCommand):
             None
         )
         if bootstrap_volume:
-            self._cloud_manager.delete_volume(bootstrap_volume['id'])
-        else:
-            self._add_error('bootstrapping volume could not be found')
+            return self._cloud_manager.delete_volume(bootstrap_volume['id'])
+
+        self._add_error('bootstrapping volume could not be found')
+
+
+class DeleteBootstrapVolumeCommand(BootstrapVolumeDeletionMixin, CloudCommand):
+    def _execute(self):
+        self._delete_bootstrap_volume()
 
 
 class DeleteBootstrapNetworkInterfaceCommand(CloudCommand):
@@ -6,6 +6,7 @@ class DefaultRemoteHostCommand():
     a set of default remote host commands
     """
     RELOAD_MOUNTS = RemoteHostCommand('sudo mount -a')
+    UNMOUNT = RemoteHostCommand('sudo umount {DIRECTORY}')
     BIND_MOUNT = RemoteHostCommand('sudo mount -o bind {DIRECTORY} {MOUNTPOINT}')
     MAKE_DIRECTORY = RemoteHostCommand('sudo mkdir -p {DIRECTORY}')
     CHECK_MOUNTPOINT = RemoteHostCommand('sudo mountpoint {DIRECTORY}')
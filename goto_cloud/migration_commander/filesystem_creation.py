@@ -1,3 +1,7 @@
+from remote_command_batching.public import RemoteCommandBatch
+
+from remote_host.public import RemoteHost
+
 from remote_host_command.public import RemoteHostCommand
 
 from .device_modification import DeviceModifyingCommand
@@ -6,6 +10,10 @@ from .device_modification import DeviceModifyingCommand
 class CreateFilesystemsCommand(DeviceModifyingCommand):
     """
     takes care, of creating the filesystems
+
+    The filesystems are created using a single batch of commands. By default they are created one after another. If
+    simultaneous_filesystem_creations is set in the migration section of the migration plan, up to that many
+    filesystems are created concurrently. The duration of every filesystem creation is logged.
     """
     class UnsupportedFilesystemException(DeviceModifyingCommand.CommandExecutionException):
         """
@@ -14,9 +22,29 @@ class CreateFilesystemsCommand(DeviceModifyingCommand):
         COMMAND_DOES = 'create the partitions'
 
     ERROR_REPORT_EXCEPTION_CLASS = UnsupportedFilesystemException
+    DEFAULT_SIMULTANEOUS_FILESYSTEM_CREATIONS = 1
 
     def _execute(self):
-        self._execute_on_every_device(self._create_filesystem_on_disk, self._create_filesystem_on_partition)
+        self._create_filesystem_commands = []
+        remote_executor = self._execute_on_every_device(
+            self._create_filesystem_on_disk,
+            self._create_filesystem_on_partition
+        )
+        if self._create_filesystem_commands:
+            self._execute_create_filesystem_commands(remote_executor)
+        self._target.remote_host.invalidate_system_info(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
+
+    def _get_simultaneous_filesystem_creations(self):
+        """
+        :return: the number of filesystems, which may be created at the same time
+        :rtype: int
+        """
+        if self._source.migration_run:
+            return self._source.migration_run.plan.plan.get('migration', {}).get(
+                'simultaneous_filesystem_creations',
+                self.DEFAULT_SIMULTANEOUS_FILESYSTEM_CREATIONS
+            )
+        return self.DEFAULT_SIMULTANEOUS_FILESYSTEM_CREATIONS
 
     def _create_filesystem_on_partition(
         self, remote_executor, source_device, target_device, partition_device, target_partition_device
@@ -63,7 +91,7 @@ class CreateFilesystemsCommand(DeviceModifyingCommand):
         """
         if source_device[1]['fs']:
             if source_device[1]['fs'] in self._target.blueprint['commands']['create_filesystem']:
-                self._execute_create_filesystem_command(remote_executor, source_device, target_device_id)
+                self._add_create_filesystem_command(source_device, target_device_id)
             else:
                 self._add_error(
                     'The device {source_device_id} can not be replicated, since the filesystem {filesystem} is not '
@@ -74,23 +102,53 @@ class CreateFilesystemsCommand(DeviceModifyingCommand):
                 )
 
     @DeviceModifyingCommand._collect_errors
-    def _execute_create_filesystem_command(self, remote_executor, source_device, target_device_id):
+    def _add_create_filesystem_command(self, source_device, target_device_id):
         """
-        executes the command to create a filesystem on the remote host
+        renders the command to create a filesystem and adds it to the commands, which are executed on the remote host
         
-        :param remote_executor: remote executor to use for execution
-        :type remote_executor: RemoteHostExecutor 
         :param source_device: the source device
         :type source_device: (str, dict)
         :param target_device: the target device id
         :type target_device: str 
         """
-        remote_executor.execute(
-            RemoteHostCommand(
+        self._create_filesystem_commands.append((
+            target_device_id,
+            RemoteHostCommand.compile(
                 self._target.blueprint['commands']['create_filesystem'][source_device[1]['fs']]
             ).render(
                 device='/dev/{device_id}'.format(device_id=target_device_id),
                 **{'uuid': source_device[1]['uuid']} if source_device[1]['uuid'] else {},
                 **{'label': source_device[1]['label']} if source_device[1]['label'] else {},
             )
+        ))
+
+    @DeviceModifyingCommand._collect_errors
+    def _execute_create_filesystem_commands(self, remote_executor):
+        """
+        executes the commands to create the filesystems on the remote host. A failing command does not stop the
+        creation of the other filesystems, but is reported as an error.
+
+        :param remote_executor: remote executor to use for execution
+        :type remote_executor: RemoteHostExecutor
+        """
+        simultaneous_filesystem_creations = self._get_simultaneous_filesystem_creations()
+        batch = RemoteCommandBatch(
+            remote_executor,
+            parallel=simultaneous_filesystem_creations > 1,
+            max_concurrency=simultaneous_filesystem_creations,
         )
+
+        for target_device_id, create_filesystem_command in self._create_filesystem_commands:
+            batch.add(create_filesystem_command, stop_on_failure=False)
+
+        for (target_device_id, create_filesystem_command), result in zip(
+            self._create_filesystem_commands,
+            batch.execute(raise_exception_on_failure=False)
+        ):
+            self.logger.info('creating the filesystem on {target_device_id} took {duration} seconds'.format(
+                target_device_id=target_device_id,
+                duration=result.duration,
+            ))
+
+            if result.failed:
+                self._add_error(result.get_error_message())
@@ -1,3 +1,7 @@
+from remote_command_batching.public import RemoteCommandBatch
+
+from remote_host.public import RemoteHost
+
 from migration_commander.remote_file_edit import RemoteFileEditor
 from .default_remote_host_commands import DefaultRemoteHostCommand
 from .device_modification import DeviceModifyingCommand
@@ -5,7 +9,9 @@ from .device_modification import DeviceModifyingCommand
 
 class FilesystemMountCommand(DeviceModifyingCommand):
     """
-    takes care of mounting the filesystems correctly
+    takes care of mounting the filesystems correctly. The mount directories and fstab entries of all devices are
+    created and mounted using a single batch of commands. The directory and the fstab entry of a mountpoint are created
+    in one step, so the fstab entry is only added, if its directory could be created.
     """
     class MountingException(DeviceModifyingCommand.CommandExecutionException):
         """
@@ -17,6 +23,7 @@ class FilesystemMountCommand(DeviceModifyingCommand):
 
     def _execute(self):
         self._mount_filesystems()
+        self._target.remote_host.invalidate_system_info(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
 
     def _mount_filesystem_on_disk(self, remote_executor, source_device, target_device):
         """
@@ -83,19 +90,22 @@ class FilesystemMountCommand(DeviceModifyingCommand):
         :type label: str
         """
         if mountpoint:
-            remote_executor.execute(DefaultRemoteHostCommand.MAKE_DIRECTORY.render(directory=mountpoint))
-            RemoteFileEditor(remote_executor).append(
-                '/etc/fstab', '{identifier}\t{mountpoint}\t{filesystem}\tdefaults\t0\t2'.format(
-                    identifier='UUID={uuid}'.format(uuid=uuid) if uuid else 'LABEL={label}'.format(label=label),
-                    mountpoint=mountpoint,
-                    filesystem=filesystem,
-                )
-            )
+            self._mount_commands.append(' && '.join((
+                DefaultRemoteHostCommand.MAKE_DIRECTORY.render(directory=mountpoint),
+                RemoteFileEditor(remote_executor).render_append(
+                    '/etc/fstab', '{identifier}\t{mountpoint}\t{filesystem}\tdefaults\t0\t2'.format(
+                        identifier='UUID={uuid}'.format(uuid=uuid) if uuid else 'LABEL={label}'.format(label=label),
+                        mountpoint=mountpoint,
+                        filesystem=filesystem,
+                    )
+                ),
+            )))
 
     def _mount_filesystems(self):
         """
         adds the mounts to /etc/fstab and mounts them
         """
+        self._mount_commands = []
         self._reload_mounts(
             self._execute_on_every_device(self._mount_filesystem_on_disk, self._mount_filesystem_on_partition)
         )
@@ -103,9 +113,18 @@ class FilesystemMountCommand(DeviceModifyingCommand):
     @DeviceModifyingCommand._collect_errors
     def _reload_mounts(self, remote_executor):
         """
-        reloads the mounts on the remote host
+        executes the collected mount commands and reloads the mounts on the remote host. A mountpoint which fails does
+        not stop the following ones, but is reported as an error.
         
         :param remote_executor: remote executor to use for execution
         :type remote_executor: RemoteHostExecutor 
         """
-        remote_executor.execute(DefaultRemoteHostCommand.RELOAD_MOUNTS.render())
+        batch = RemoteCommandBatch(remote_executor)
+
+        for mount_command in self._mount_commands:
+            batch.add(mount_command, stop_on_failure=False)
+        batch.add(DefaultRemoteHostCommand.RELOAD_MOUNTS)
+
+        for result in batch.execute(raise_exception_on_failure=False):
+            if result.failed:
+                self._add_error(result.get_error_message())
@@ -1,7 +1,10 @@
-from commander.public import Commander
+import asyncio
+
+from commander.public import Commander, AsyncCommander
 
 from source.public import Source
 
+from .async_cloud_commanding import AsyncStopTargetCommand, AsyncDeleteBootstrapVolumeCommand, AsyncStartTargetCommand
 from .cloud_commanding import \
     CreateTargetCommand, \
     StopTargetCommand, \
@@ -14,6 +17,8 @@ from .device_identification import DeviceIdentificationCommand
 from .partition_creation import CreatePartitionsCommand
 from .filesystem_creation import CreateFilesystemsCommand
 from .filesystem_mounting import FilesystemMountCommand
+from .sync_estimation import SyncEstimationCommand
+from .sync_scheduling import SyncScheduler
 from .syncing import SyncCommand, FinalSyncCommand
 from .config_adjustment import NetworkConfigAdjustmentCommand, SshConfigAdjustmentCommand, FstabAdjustmentCommand
 from .bootloader_reinstallation import BootloaderReinstallationCommand
@@ -27,6 +32,7 @@ class MigrationCommander(Commander):
         Source.Status.CREATE_PARTITIONS: CreatePartitionsCommand,
         Source.Status.CREATE_FILESYSTEMS: CreateFilesystemsCommand,
         Source.Status.MOUNT_FILESYSTEMS: FilesystemMountCommand,
+        Source.Status.ESTIMATE_SYNC: SyncEstimationCommand,
         Source.Status.SYNC: SyncCommand,
         Source.Status.FINAL_SYNC: FinalSyncCommand,
         Source.Status.ADJUST_NETWORK_CONFIG: NetworkConfigAdjustmentCommand,
@@ -43,3 +49,71 @@ class MigrationCommander(Commander):
     @property
     def _commander_driver(self):
         return self._COMMAND_DRIVER
+
+    @classmethod
+    def start_syncs(cls, migration_run, lease_owner=None):
+        """
+        starts the syncs of the sources of the given migration run, once all of them have been estimated. The syncs
+        are executed one after another, starting with the most expensive one.
+
+        :param migration_run: the migration run to start the syncs for
+        :type migration_run: migration_run.public.MigrationRun
+        :param lease_owner: identifies this worker
+        :type lease_owner: str
+        :return: the sources whose syncs have been executed
+        :rtype: list[source.public.Source]
+        """
+        sources = SyncScheduler.for_migration_run(migration_run).get_sources_to_sync(migration_run)
+
+        for source in sources:
+            cls(source, lease_owner=lease_owner).increment_status_and_execute()
+
+        return sources
+
+
+class AsyncMigrationCommander(AsyncCommander):
+    """
+    drives the same lifecycle as the MigrationCommander, but asynchronously. The cloud commands, which mostly wait for
+    the cloud provider, are awaited natively, all other commands are run in an executor.
+    """
+    _COMMAND_DRIVER = dict(MigrationCommander._COMMAND_DRIVER, **{
+        Source.Status.STOP_TARGET: AsyncStopTargetCommand,
+        Source.Status.DELETE_BOOTSTRAP_VOLUME: AsyncDeleteBootstrapVolumeCommand,
+        Source.Status.START_TARGET: AsyncStartTargetCommand,
+    })
+
+    @property
+    def _commander_driver(self):
+        return self._COMMAND_DRIVER
+
+    @classmethod
+    async def start_syncs(cls, migration_run, executor=None, lease_owner=None):
+        """
+        starts the syncs of the sources of the given migration run, once all of them have been estimated. The syncs
+        are started in the order of the SyncScheduler, and as many of them are executed at the same time, as
+        simultaneous migrations are allowed by the migration plan. Starting the most expensive sync first, whenever a
+        slot is free, keeps the time until the last sync finishes low.
+
+        :param migration_run: the migration run to start the syncs for
+        :type migration_run: migration_run.public.MigrationRun
+        :param executor: the executor blocking calls are run in
+        :type executor: concurrent.futures.Executor
+        :param lease_owner: identifies this worker
+        :type lease_owner: str
+        :return: the result of every commander, in the order the syncs have been started
+        :rtype: list
+        """
+        scheduler = SyncScheduler.for_migration_run(migration_run)
+        sources = await asyncio.get_event_loop().run_in_executor(
+            executor,
+            scheduler.get_sources_to_sync,
+            migration_run,
+        )
+
+        return await cls.execute_many(
+            sources,
+            max_concurrency=scheduler.slots,
+            executor=executor,
+            lease_owner=lease_owner,
+            increment_status=True,
+        )
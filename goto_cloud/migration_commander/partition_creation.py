@@ -1,5 +1,9 @@
+from remote_command_batching.public import RemoteCommandBatch
+
 from remote_execution.public import RemoteHostExecutor
 
+from remote_host.public import RemoteHost
+
 from remote_host_command.public import RemoteHostCommand
 
 from .device_modification import DeviceModifyingCommand
@@ -8,6 +12,11 @@ from .device_modification import DeviceModifyingCommand
 class CreatePartitionsCommand(DeviceModifyingCommand):
     """
     takes care of creating the partitions on the target system
+
+    By default the partition tables are replicated one device after another. If the partitioning_mode of the blueprint
+    is set to "parallel", all source partition tables are read using a single batch, all target partition tables are
+    written concurrently using a single parallel batch and the kernel is told to reread the partition tables once
+    afterwards, so the number of remote calls does not depend on the number of devices.
     """
     class CanNotCreatePartitionException(DeviceModifyingCommand.CommandExecutionException):
         """
@@ -15,16 +24,28 @@ class CreatePartitionsCommand(DeviceModifyingCommand):
         """
         COMMAND_DOES = 'create the partitions'
 
+    class PartitioningMode():
+        """
+        the modes the partition tables can be replicated with
+        """
+        SEQUENTIAL = 'sequential'
+        PARALLEL = 'parallel'
+
     ERROR_REPORT_EXCEPTION_CLASS = CanNotCreatePartitionException
 
     READ_PARTITION_TABLE_COMMAND = RemoteHostCommand('sudo sfdisk -d {DEVICE}')
     WRITE_PARTITION_TABLE_COMMAND = RemoteHostCommand('echo "{PARTITION_TABLE}" | sudo sfdisk {DEVICE}')
+    RELOAD_PARTITION_TABLES_COMMAND = RemoteHostCommand('sudo partprobe {DEVICES} && sudo udevadm settle')
 
     def _execute(self):
         self.source_remote_executor = RemoteHostExecutor(self._source.remote_host)
-        self._execute_on_every_device(self._replicate_partition_table, None, include_swap=True)
+        if self._target.blueprint.get('partitioning_mode') == CreatePartitionsCommand.PartitioningMode.PARALLEL:
+            self._replicate_partition_tables()
+        else:
+            self._execute_on_every_device(self._replicate_partition_table, None, include_swap=True)
         self.source_remote_executor.close()
         self.source_remote_executor = None
+        self._target.remote_host.invalidate_system_info(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
 
     @DeviceModifyingCommand._collect_errors
     def _replicate_partition_table(self, remote_executor, source_device, target_device):
@@ -49,6 +70,52 @@ class CreatePartitionsCommand(DeviceModifyingCommand):
         else:
             self.logger.debug('no valid partition table found for {source_device}'.format(source_device=source_device))
 
+    @DeviceModifyingCommand._collect_errors
+    def _replicate_partition_tables(self):
+        """
+        replicates the partition tables of all source devices and applies them to the target devices, using one remote
+        call to read them, one to write them concurrently and one to reload them
+        """
+        device_ids = [
+            (source_device_id, target_device['id'])
+            for source_device_id, target_device in self._target.device_mapping.items()
+        ]
+
+        read_batch = RemoteCommandBatch(self.source_remote_executor)
+        for source_device_id, target_device_id in device_ids:
+            read_batch.add(
+                self.READ_PARTITION_TABLE_COMMAND,
+                stop_on_failure=False,
+                device='/dev/{device_id}'.format(device_id=source_device_id)
+            )
+
+        remote_executor = RemoteHostExecutor(self._target.remote_host)
+        write_batch = RemoteCommandBatch(remote_executor, parallel=True)
+        written_devices = []
+
+        for (source_device_id, target_device_id), read_result in zip(device_ids, read_batch.execute()):
+            if read_result.failed or not read_result.stdout:
+                self.logger.debug('no valid partition table found for {source_device_id}'.format(
+                    source_device_id=source_device_id
+                ))
+            else:
+                written_devices.append('/dev/{device_id}'.format(device_id=target_device_id))
+                write_batch.add(
+                    self.WRITE_PARTITION_TABLE_COMMAND,
+                    partition_table=self._make_string_echo_safe(read_result.stdout),
+                    device=written_devices[-1]
+                )
+
+        try:
+            if written_devices:
+                for write_result in write_batch.execute(raise_exception_on_failure=False):
+                    if write_result.failed:
+                        self._add_error(write_result.get_error_message())
+
+                remote_executor.execute(self.RELOAD_PARTITION_TABLES_COMMAND.render(devices=' '.join(written_devices)))
+        finally:
+            remote_executor.close()
+
     def _write_partition_table(self, remote_executor, target_device_id, partition_table):
         remote_executor.execute(
             self.WRITE_PARTITION_TABLE_COMMAND.render(
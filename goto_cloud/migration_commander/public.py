@@ -0,0 +1,2 @@
+from .migration_commander import MigrationCommander, AsyncMigrationCommander
+from .sync_scheduling import SyncScheduler
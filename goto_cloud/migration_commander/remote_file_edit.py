@@ -46,9 +46,21 @@ class RemoteFileEditor():
         :param text_to_append: the text to append
         :type text_to_append: str
         """
-        self.remote_executor.execute(
-            self._APPEND_FILE.render(file=file, file_content=self._make_string_echo_safe(text_to_append))
-        )
+        self.remote_executor.execute(self.render_append(file, text_to_append))
+
+    def render_append(self, file, text_to_append):
+        """
+        renders the command, which appends something to the given file, without executing it. This can be used to add
+        the command to a RemoteCommandBatch.
+
+        :param file: the file which will be edited
+        :type file: str
+        :param text_to_append: the text to append
+        :type text_to_append: str
+        :return: the rendered command
+        :rtype: str
+        """
+        return self._APPEND_FILE.render(file=file, file_content=self._make_string_echo_safe(text_to_append))
 
     def write(self, file, text_to_write):
         """
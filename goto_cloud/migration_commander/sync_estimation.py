@@ -0,0 +1,120 @@
+import shlex
+
+from command.public import SourceCommand
+
+from commander.public import Commander
+
+from remote_execution.public import RemoteHostExecutor
+
+from remote_host_command.public import RemoteHostCommand
+
+
+class SyncEstimationCommand(SourceCommand):
+    """
+    Estimates how much data will have to be transferred during the sync, by retrieving the used bytes and inodes of
+    every mountpoint which will be synced. All mountpoints are probed using a single remote command. The estimation is
+    only used to schedule the syncs, therefore a failing probe does not stop the migration.
+
+    Once estimated, the source sleeps, so no source of a migration run starts its sync, before all of them have been
+    estimated. The syncs are then started in the order of the SyncScheduler, by MigrationCommander.start_syncs.
+    """
+    ESTIMATE_USAGE_COMMAND = RemoteHostCommand('sudo df -P -B1 {MOUNTPOINTS}; sudo df -P -i {MOUNTPOINTS}')
+    DF_HEADER_PREFIX = 'Filesystem'
+
+    def _execute(self):
+        mountpoints = self._get_mountpoints()
+
+        if mountpoints:
+            self._source.sync_estimation = self._estimate_usage(mountpoints)
+            self._source.save()
+
+        return Commander.Signal.SLEEP
+
+    def _get_mountpoints(self):
+        """
+        :return: the mountpoints of the source devices, which will be synced, without swap devices
+        :rtype: list[str]
+        """
+        block_devices = self._source.remote_host.system_info['block_devices']
+        mountpoints = []
+
+        for source_device_id, target_device in self._target.device_mapping.items():
+            source_device = block_devices[source_device_id]
+            source_partitions = [
+                source_device['children'][source_partition_id] for source_partition_id in target_device['children']
+            ]
+
+            for device in [source_device] + source_partitions:
+                if device['fs'] != 'swap' and device['mountpoint'] and device['mountpoint'] not in mountpoints:
+                    mountpoints.append(device['mountpoint'])
+
+        return mountpoints
+
+    def _estimate_usage(self, mountpoints):
+        """
+        retrieves the used bytes and inodes of the given mountpoints on the source
+
+        :param mountpoints: the mountpoints to estimate the usage for
+        :type mountpoints: list[str]
+        :return: maps the mountpoints onto their usage, looking like this: {str: {'bytes': int, 'inodes': int}}
+        :rtype: dict
+        """
+        try:
+            output = RemoteHostExecutor(self._source.remote_host).execute(
+                self.ESTIMATE_USAGE_COMMAND.render(
+                    mountpoints=' '.join(shlex.quote(mountpoint) for mountpoint in mountpoints)
+                )
+            )
+        except RemoteHostExecutor.ExecutionException as e:
+            self.logger.warning('could not estimate the sync size:\n{error}'.format(error=str(e)))
+            return {}
+
+        sections = self._split_df_output(output)
+        used_bytes = self._parse_df_section(sections[0]) if len(sections) > 0 else {}
+        used_inodes = self._parse_df_section(sections[1]) if len(sections) > 1 else {}
+
+        return {
+            mountpoint: {
+                'bytes': used_bytes[mountpoint],
+                'inodes': used_inodes.get(mountpoint, 0),
+            }
+            for mountpoint in mountpoints
+            if mountpoint in used_bytes
+        }
+
+    def _split_df_output(self, output):
+        """
+        splits the output of the probe into the output of the single df calls
+
+        :param output: the probe output
+        :type output: str
+        :return: list of df outputs, each being a list of lines without the header
+        :rtype: list[list[str]]
+        """
+        sections = []
+
+        for line in output.split('\n'):
+            if line.startswith(self.DF_HEADER_PREFIX):
+                sections.append([])
+            elif line.strip() and sections:
+                sections[-1].append(line)
+
+        return sections
+
+    def _parse_df_section(self, lines):
+        """
+        parses the lines of a POSIX formatted df output
+
+        :param lines: the lines of the df output, without the header
+        :type lines: list[str]
+        :return: mountpoint to used units mapping
+        :rtype: dict
+        """
+        usage = {}
+
+        for line in lines:
+            columns = line.split()
+            if len(columns) >= 6:
+                usage[' '.join(columns[5:])] = int(columns[2]) if columns[2].isdigit() else 0
+
+        return usage
@@ -0,0 +1,123 @@
+import heapq
+
+from source.public import Source
+
+
+class SyncScheduler():
+    """
+    Distributes the syncs of a set of sources across a limited number of concurrency slots. The sources are ordered by
+    their estimated sync cost (longest job first) and each one is assigned to the slot which currently has the least
+    amount of work, which keeps the time until the last sync finishes low.
+
+    The sources sleep in ESTIMATE_SYNC, once their sync has been estimated. As soon as every source of a migration run
+    has been estimated, MigrationCommander.start_syncs starts their syncs in the order of the scheduler.
+    """
+    class InvalidSlotCountException(Exception):
+        """
+        raised if the number of slots is not a positive number
+        """
+        pass
+
+    DEFAULT_SLOTS = 1
+    INODE_COST = 64 * 1024
+    """
+    the number of bytes, which transferring a single file costs in terms of time, on top of its actual size
+    """
+
+    def __init__(self, slots=DEFAULT_SLOTS):
+        """
+        :param slots: the number of syncs which can run at the same time
+        :type slots: int
+        :raises SyncScheduler.InvalidSlotCountException: if slots is smaller than 1
+        """
+        if slots < 1:
+            raise SyncScheduler.InvalidSlotCountException('at least one slot is required to schedule syncs')
+
+        self.slots = slots
+
+    @staticmethod
+    def for_migration_run(migration_run):
+        """
+        creates a SyncScheduler, which uses as many slots, as simultaneous migrations are allowed by the migration plan
+        of the given migration run
+
+        :param migration_run: the migration run to schedule
+        :type migration_run: migration_run.public.MigrationRun
+        :return: the scheduler
+        :rtype: SyncScheduler
+        """
+        return SyncScheduler(
+            migration_run.plan.plan.get('migration', {}).get('simultaneous_migrations', SyncScheduler.DEFAULT_SLOTS)
+        )
+
+    def estimate_cost(self, source):
+        """
+        estimates the cost of syncing the given source. If the source's sync size has not been estimated yet, the size
+        of its devices is used as an upper bound.
+
+        :param source: the source to estimate the cost for
+        :type source: source.public.Source
+        :return: the estimated cost
+        :rtype: int
+        """
+        if source.sync_estimation:
+            return sum(
+                usage['bytes'] + usage['inodes'] * self.INODE_COST
+                for usage in source.sync_estimation.values()
+            )
+
+        return sum(
+            device['size']
+            for device in source.remote_host.system_info.get('block_devices', {}).values()
+            if device['type'] == 'disk'
+        )
+
+    def order(self, sources):
+        """
+        orders the given sources by their estimated sync cost, starting with the most expensive one
+
+        :param sources: the sources to order
+        :type sources: list[source.public.Source]
+        :return: the ordered sources
+        :rtype: list[source.public.Source]
+        """
+        return sorted(sources, key=self.estimate_cost, reverse=True)
+
+    def get_sources_to_sync(self, migration_run):
+        """
+        returns the sources of the given migration run, which have been estimated and wait for their sync, ordered by
+        their estimated sync cost. As long as a source of the run has not been estimated yet, no source is returned, so
+        the syncs of all sources are ordered together.
+
+        :param migration_run: the migration run to get the sources for
+        :type migration_run: migration_run.public.MigrationRun
+        :return: the sources whose syncs can be started, starting with the most expensive one
+        :rtype: list[source.public.Source]
+        """
+        sources = list(Source.objects.in_migration_run(migration_run).select_related('remote_host'))
+        if any(
+            source.lifecycle.index(source.status) < source.lifecycle.index(Source.Status.ESTIMATE_SYNC)
+            for source in sources
+        ):
+            return []
+
+        return self.order([source for source in sources if source.status == Source.Status.ESTIMATE_SYNC])
+
+    def schedule(self, sources):
+        """
+        assigns the given sources to the available slots, so that the load of all slots is as balanced as possible
+
+        :param sources: the sources to schedule
+        :type sources: list[source.public.Source]
+        :return: one list of sources per slot, in the order they should be synced
+        :rtype: list[list[source.public.Source]]
+        """
+        slots = [[] for _ in range(self.slots)]
+        slot_loads = [(0, slot_index) for slot_index in range(self.slots)]
+
+        for source in self.order(sources):
+            load, slot_index = heapq.heappop(slot_loads)
+            slots[slot_index].append(source)
+            heapq.heappush(slot_loads, (load + self.estimate_cost(source), slot_index))
+
+        return slots
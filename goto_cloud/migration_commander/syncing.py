@@ -1,9 +1,12 @@
 from commander.public import Commander
 
+from remote_command_batching.public import RemoteCommandBatch
+
 from remote_execution.public import RemoteHostExecutor
 
 from remote_host_command.public import RemoteHostCommand
 
+from .block_streaming import BlockStream
 from .device_modification import DeviceModifyingCommand
 from .default_remote_host_commands import DefaultRemoteHostCommand
 from .mountpoint_mapping import MountpointMapper
@@ -13,6 +16,12 @@ class SyncCommand(DeviceModifyingCommand):
     """
     does the actual sync and makes sure, that temp mounts are created and used, to avoid problems introduced by 
     overlapping mountpoints.
+
+    By default the filesystems are synced on file level, using the sync command of the blueprint. Devices can be synced
+    on block level instead, by setting their mode in the sync_modes section of the blueprint, which maps source device
+    ids onto either "file" or "block". If a disk is synced on block level, its partitions are synced with it. The
+    source connects to the target using the ssh command, which is configured as block_sync_ssh in the commands section
+    of the blueprint.
     """
     class SyncingException(DeviceModifyingCommand.CommandExecutionException):
         """
@@ -20,11 +29,22 @@ class SyncCommand(DeviceModifyingCommand):
         """
         COMMAND_DOES = 'do the sync'
 
+    class SyncMode():
+        """
+        the modes a device can be synced with
+        """
+        FILE = 'file'
+        BLOCK = 'block'
+
     ERROR_REPORT_EXCEPTION_CLASS = SyncingException
     ACCEPTED_EXIT_CODES = (24,)
 
     def _execute(self):
         self.source_remote_executor = RemoteHostExecutor(self._source.remote_host)
+        self.block_stream = BlockStream(
+            self._target.remote_host,
+            self._target.blueprint.get('commands', {}).get('block_sync_ssh', BlockStream.DEFAULT_SSH_COMMAND),
+        )
         self._execute_on_every_device(self._sync_disk, self._sync_partition)
         self.source_remote_executor.close()
         self.source_remote_executor = None
@@ -32,49 +52,142 @@ class SyncCommand(DeviceModifyingCommand):
         return Commander.Signal.SLEEP
 
     def _sync_disk(self, remote_executor, source_device, target_device):
-        self._sync_device(self.source_remote_executor, source_device[1]['mountpoint'], target_device[1]['mountpoint'])
+        if self._get_sync_mode(source_device[0]) == SyncCommand.SyncMode.BLOCK:
+            self._stream_device(
+                remote_executor,
+                source_device[0],
+                target_device[0],
+                [target_device[1]['mountpoint']] + [
+                    target_partition['mountpoint'] for target_partition in target_device[1]['children'].values()
+                ],
+            )
+        else:
+            self._sync_device(
+                self.source_remote_executor,
+                source_device[1]['mountpoint'],
+                target_device[1]['mountpoint']
+            )
 
     def _sync_partition(
         self, remote_executor, source_device, target_device, source_partition_device, target_partition_device
     ):
-        self._sync_device(
-            self.source_remote_executor,
-            source_partition_device[1]['mountpoint'],
-            target_partition_device[1]['mountpoint'],
-        )
+        if self._get_sync_mode(source_device[0]) == SyncCommand.SyncMode.BLOCK:
+            return
+
+        if self._get_sync_mode(source_partition_device[0]) == SyncCommand.SyncMode.BLOCK:
+            self._stream_device(
+                remote_executor,
+                source_partition_device[0],
+                target_partition_device[0],
+                [target_partition_device[1]['mountpoint']],
+            )
+        else:
+            self._sync_device(
+                self.source_remote_executor,
+                source_partition_device[1]['mountpoint'],
+                target_partition_device[1]['mountpoint'],
+            )
+
+    def _get_sync_mode(self, source_device_id):
+        """
+        returns the sync mode, which is configured for the given device in the blueprint
+
+        :param source_device_id: the id of the source device
+        :type source_device_id: str
+        :return: the sync mode
+        :rtype: str
+        """
+        return self._target.blueprint.get('sync_modes', {}).get(source_device_id, SyncCommand.SyncMode.FILE)
+
+    @DeviceModifyingCommand._collect_errors
+    def _stream_device(self, remote_executor, source_device_id, target_device_id, target_mountpoints):
+        """
+        streams the source device onto the target device on block level. The target device is unmounted while it is
+        written to and remounted afterwards. The fingerprint of the target's manifest is handed to the source, so only
+        the chunks which changed since the last sync are transferred.
+
+        :param remote_executor: remote executor of the target
+        :type remote_executor: RemoteHostExecutor
+        :param source_device_id: the id of the source device
+        :type source_device_id: str
+        :param target_device_id: the id of the target device
+        :type target_device_id: str
+        :param target_mountpoints: the mountpoints of the target device and its children
+        :type target_mountpoints: list[str]
+        """
+        target_mountpoints = [target_mountpoint for target_mountpoint in target_mountpoints if target_mountpoint]
+
+        for target_mountpoint in target_mountpoints:
+            remote_executor.execute(
+                DefaultRemoteHostCommand.UNMOUNT.render(directory=target_mountpoint),
+                raise_exception_on_failure=False
+            )
+
+        try:
+            self.source_remote_executor.execute(
+                self.block_stream.render_stream_command(
+                    source_device_id,
+                    target_device_id,
+                    remote_executor.execute(self.block_stream.render_fingerprint_command(target_device_id)).strip(),
+                )
+            )
+            self.source_remote_executor.execute(self.block_stream.render_commit_manifest_command(source_device_id))
+        finally:
+            if target_mountpoints:
+                remote_executor.execute(DefaultRemoteHostCommand.RELOAD_MOUNTS.render())
 
     @DeviceModifyingCommand._collect_errors
     def _sync_device(self, remote_executor, source_directory, target_directory):
+        """
+        syncs a source directory to the target. The temp bind mount and the sync are executed in a single batch, so a
+        device only costs one remote call.
+
+        :param remote_executor: remote executor of the source
+        :type remote_executor: RemoteHostExecutor
+        :param source_directory: the directory to sync
+        :type source_directory: str
+        :param target_directory: the directory on the target to sync to
+        :type target_directory: str
+        """
         if source_directory:
-            remote_executor.execute(
-                RemoteHostCommand(self._target.blueprint['commands']['sync']).render(
-                    source_dir=self._create_temp_bind_mount(remote_executor, source_directory),
-                    target_dir='{user}{remote_host_address}:{target_directory}'.format(
-                        user=('{username}@'.format(username=self._target.remote_host.username))
-                                if self._target.remote_host.username else '',
-                        remote_host_address=self._target.remote_host.address,
-                        target_directory=target_directory,
-                    )
-                ),
-                accepted_exit_codes=self.ACCEPTED_EXIT_CODES
+            batch = RemoteCommandBatch(remote_executor)
+            batch.add(
+                RemoteHostCommand.compile(self._target.blueprint['commands']['sync']),
+                accepted_exit_codes=self.ACCEPTED_EXIT_CODES,
+                source_dir=self._add_temp_bind_mount(batch, source_directory),
+                target_dir='{user}{remote_host_address}:{target_directory}'.format(
+                    user=('{username}@'.format(username=self._target.remote_host.username))
+                            if self._target.remote_host.username else '',
+                    remote_host_address=self._target.remote_host.address,
+                    target_directory=target_directory,
+                )
             )
+            batch.execute()
 
-    def _create_temp_bind_mount(self, remote_executor, source_directory):
+    def _add_temp_bind_mount(self, batch, source_directory):
+        """
+        adds the commands to the batch, which bind mount the source directory to a temp mountpoint, if it is not
+        mounted already
+
+        :param batch: the batch to add the commands to
+        :type batch: RemoteCommandBatch
+        :param source_directory: the directory to bind mount
+        :type source_directory: str
+        :return: the temp mountpoint
+        :rtype: str
+        """
         temp_mountpoint = MountpointMapper.map_mountpoint('/tmp', source_directory)
 
-        remote_executor.execute(
-            DefaultRemoteHostCommand.MAKE_DIRECTORY.render(directory=temp_mountpoint)
-        )
-
-        try:
-            remote_executor.execute(DefaultRemoteHostCommand.CHECK_MOUNTPOINT.render(directory=temp_mountpoint))
-        except RemoteHostExecutor.ExecutionException:
-            remote_executor.execute(
-                DefaultRemoteHostCommand.BIND_MOUNT.render(
+        batch.add(DefaultRemoteHostCommand.MAKE_DIRECTORY, directory=temp_mountpoint)
+        batch.add(
+            '{check_mountpoint} || {bind_mount}'.format(
+                check_mountpoint=DefaultRemoteHostCommand.CHECK_MOUNTPOINT.render(directory=temp_mountpoint),
+                bind_mount=DefaultRemoteHostCommand.BIND_MOUNT.render(
                     directory=source_directory,
                     mountpoint=temp_mountpoint
-                )
+                ),
             )
+        )
 
         return temp_mountpoint
 
@@ -0,0 +1,295 @@
+import base64
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+
+from unittest import TestCase
+
+from remote_host.public import RemoteHost
+
+from remote_script_execution.public import RemoteScriptExecutor
+
+from ..block_streaming import BlockStream
+
+
+class TestBlockStream(TestCase):
+    CHUNK_SIZE = 1024
+    HEADER = struct.Struct('!QBI')
+    MANIFEST_HEADER_SIZE = struct.calcsize('!4sBQQ36sQ')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source_device = self._path('source')
+        self.target_device = self._path('target')
+        self.source_manifest = self._path('source_manifests', 'source.manifest')
+        self.target_manifest = self._path('target_manifests', 'target.manifest')
+        self.boot_id = self._path('boot_id')
+        self.stat = self._path('stat')
+
+        self._write_file(self.source_device, b'a' * self.CHUNK_SIZE + b'\0' * self.CHUNK_SIZE + b'b' * 100)
+        self._write_file(self.target_device, b'x' * (2 * self.CHUNK_SIZE + 100))
+        self._write_file(self.boot_id, b'0b5c6b3e-8d2f-4bd4-9b39-4f5e0e2a1c7d\n')
+        self._set_sectors_written(100)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, *parts):
+        return os.path.join(self.directory.name, *parts)
+
+    def _write_file(self, path, content):
+        with open(path, 'wb') as device:
+            device.write(content)
+
+    def _read_file(self, path):
+        with open(path, 'rb') as device:
+            return device.read()
+
+    def _set_sectors_written(self, sectors_written):
+        self._write_file(self.stat, '  1 0 8 0 2 0 {sectors_written} 0 0 0 0\n'.format(
+            sectors_written=sectors_written
+        ).encode())
+
+    def _run_script(self, script, env, stdin=b''):
+        return subprocess.run(
+            [sys.executable, '-c', RemoteScriptExecutor.REMOTE_SCRIPT_BASE_TEMPLATE.format(
+                env_string=str(env),
+                script_string=script,
+            )],
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def _fingerprint(self, manifest):
+        return self._run_script(BlockStream.FINGERPRINT_SCRIPT, {'manifest': manifest}).stdout.decode()
+
+    def _send(self):
+        result = self._send_unchecked()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def _send_unchecked(self):
+        return self._run_script(BlockStream.SENDER_SCRIPT, {
+            'device': self.source_device,
+            'manifest': self.source_manifest,
+            'target_fingerprint': self._fingerprint(self.target_manifest),
+            'boot_id': self.boot_id,
+            'stat': self.stat,
+            'chunk_size': self.CHUNK_SIZE,
+            'compression_level': BlockStream.DEFAULT_COMPRESSION_LEVEL,
+        })
+
+    def _receive(self, stream):
+        return self._run_script(
+            BlockStream.RECEIVER_SCRIPT,
+            {'device': self.target_device, 'manifest': self.target_manifest},
+            stream
+        )
+
+    def _sync(self):
+        stream = self._send()
+        self.assertEqual(self._receive(stream).returncode, 0)
+        os.replace(self.source_manifest + '.new', self.source_manifest)
+        return stream
+
+    def _parse_records(self, stream):
+        records = []
+        position = 0
+        while position < len(stream):
+            offset, kind, length = self.HEADER.unpack(stream[position:position + self.HEADER.size])
+            position += self.HEADER.size
+            records.append((offset, kind))
+            if kind == 0:
+                position += length
+        return records
+
+    def _write_source_chunk(self, offset, data):
+        with open(self.source_device, 'r+b') as device:
+            device.seek(offset)
+            device.write(data)
+
+    def test_stream(self):
+        self._sync()
+
+        self.assertEqual(self._read_file(self.target_device), self._read_file(self.source_device))
+
+    def test_stream__zero_chunks_not_transferred(self):
+        stream = self._send()
+
+        self.assertEqual(
+            self._parse_records(stream),
+            [
+                (2 * self.CHUNK_SIZE + 100, 3),
+                (0, 0),
+                (self.CHUNK_SIZE, 1),
+                (2 * self.CHUNK_SIZE, 0),
+                (2 * self.CHUNK_SIZE + 100, 2),
+            ]
+        )
+        self.assertLess(len(stream), self.CHUNK_SIZE)
+
+    def test_stream__binary_manifests_written_on_both_sides(self):
+        self._sync()
+
+        self.assertEqual(len(self._read_file(self.source_manifest)), self.MANIFEST_HEADER_SIZE + 3 * 20)
+        self.assertEqual(len(self._read_file(self.target_manifest)), self.MANIFEST_HEADER_SIZE + 3 * 20)
+        self.assertTrue(self._fingerprint(self.source_manifest))
+        self.assertEqual(self._fingerprint(self.source_manifest), self._fingerprint(self.target_manifest))
+
+    def test_stream__only_changed_chunks_transferred(self):
+        self._sync()
+        self._write_source_chunk(self.CHUNK_SIZE, b'c')
+        self._set_sectors_written(108)
+
+        stream = self._sync()
+
+        self.assertEqual(
+            self._parse_records(stream),
+            [(2 * self.CHUNK_SIZE + 100, 3), (self.CHUNK_SIZE, 0), (2 * self.CHUNK_SIZE + 100, 2)]
+        )
+        self.assertEqual(self._read_file(self.target_device), self._read_file(self.source_device))
+        self.assertEqual(self._fingerprint(self.source_manifest), self._fingerprint(self.target_manifest))
+
+    def test_stream__unwritten_device_not_read(self):
+        self._sync()
+        self._write_source_chunk(0, b'c')
+
+        self.assertEqual(
+            self._parse_records(self._send()),
+            [(2 * self.CHUNK_SIZE + 100, 3), (2 * self.CHUNK_SIZE + 100, 2)]
+        )
+
+    def test_stream__device_read_after_reboot(self):
+        self._sync()
+        self._write_source_chunk(0, b'c')
+        self._write_file(self.boot_id, b'5f0c8f52-0c4e-4d6f-a1b8-7d3c1b0e9a21\n')
+
+        self.assertEqual(
+            self._parse_records(self._send()),
+            [(2 * self.CHUNK_SIZE + 100, 3), (0, 0), (2 * self.CHUNK_SIZE + 100, 2)]
+        )
+
+    def test_stream__missing_target_manifest(self):
+        self._sync()
+        os.remove(self.target_manifest)
+
+        self.assertEqual(len(self._parse_records(self._send())), 5)
+
+    def test_stream__manifest_of_different_chunk_size_ignored(self):
+        self._sync()
+        self.CHUNK_SIZE = 512
+        self._set_sectors_written(100)
+
+        self.assertEqual(len(self._parse_records(self._send())), 7)
+
+    def test_receive__incomplete_stream(self):
+        stream = self._send()
+
+        self.assertNotEqual(self._receive(stream[:-self.HEADER.size]).returncode, 0)
+        self.assertFalse(os.path.exists(self.target_manifest))
+
+    def test_stream__planted_manifest_ignored(self):
+        self._sync()
+        os.chmod(os.path.dirname(self.source_manifest), 0o777)
+        self._write_source_chunk(0, b'c')
+        self._set_sectors_written(108)
+
+        self.assertEqual(self._fingerprint(self.source_manifest), '')
+        self.assertEqual(len(self._parse_records(self._send_unchecked().stdout)), 5)
+
+    def test_stream__world_writable_manifest_ignored(self):
+        self._sync()
+        os.chmod(self.target_manifest, 0o666)
+
+        self.assertEqual(self._fingerprint(self.target_manifest), '')
+
+    def test_stream__symlinked_manifest_ignored(self):
+        self._sync()
+        os.rename(self.target_manifest, self._path('target_manifests', 'elsewhere'))
+        os.symlink(self._path('target_manifests', 'elsewhere'), self.target_manifest)
+
+        self.assertEqual(self._fingerprint(self.target_manifest), '')
+
+    def test_stream__insecure_manifest_directory_not_written(self):
+        os.mkdir(os.path.dirname(self.source_manifest), 0o777)
+        os.chmod(os.path.dirname(self.source_manifest), 0o777)
+
+        result = self._send_unchecked()
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertFalse(os.path.exists(self.source_manifest + '.new'))
+
+    def test_stream__manifest_not_written_through_symlink(self):
+        os.mkdir(os.path.dirname(self.source_manifest), 0o700)
+        os.symlink(self.boot_id, self.source_manifest + '.new')
+        boot_id = self._read_file(self.boot_id)
+
+        self._send()
+
+        self.assertEqual(self._read_file(self.boot_id), boot_id)
+        self.assertFalse(os.path.islink(self.source_manifest + '.new'))
+
+    def test_receive__target_device_too_small(self):
+        self._write_file(self.target_device, b'x' * self.CHUNK_SIZE)
+
+        self.assertNotEqual(self._receive(self._send()).returncode, 0)
+
+
+class TestBlockStreamCommands(TestCase):
+    def setUp(self):
+        self.target_remote_host = RemoteHost(pk=7, address='10.17.32.100', username='migration')
+        self.block_stream = BlockStream(self.target_remote_host, 'ssh -i /root/.ssh/migration')
+
+    def test_render_fingerprint_command(self):
+        self.assertEqual(
+            self.block_stream.render_fingerprint_command('vdc'),
+            RemoteScriptExecutor.render_command(
+                BlockStream.FINGERPRINT_SCRIPT,
+                env={'manifest': '/var/lib/goto_cloud/block_sync/vdc.manifest'},
+                sudo=True,
+            )
+        )
+
+    def test_render_stream_command(self):
+        command = self.block_stream.render_stream_command('vdb', 'vdc')
+        sender, receiver = command.split(' | ')
+
+        self.assertTrue(sender.startswith('sudo python -c "import base64;exec(base64.b64decode('))
+        self.assertIn('ssh -i /root/.ssh/migration migration@10.17.32.100 ', receiver)
+        self.assertIn(
+            '"sudo python -c \\"import base64;exec(base64.b64decode({encoded_script}))\\""'.format(
+                encoded_script=base64.b64encode(
+                    RemoteScriptExecutor.REMOTE_SCRIPT_BASE_TEMPLATE.format(
+                        env_string=str({
+                            'device': '/dev/vdc',
+                            'manifest': '/var/lib/goto_cloud/block_sync/vdc.manifest',
+                        }),
+                        script_string=BlockStream.RECEIVER_SCRIPT,
+                    ).encode()
+                )
+            ),
+            receiver
+        )
+
+    def test_render_stream_command__without_user(self):
+        self.target_remote_host.username = None
+
+        self.assertIn(
+            'ssh -i /root/.ssh/migration 10.17.32.100 ',
+            self.block_stream.render_stream_command('vdb', 'vdc')
+        )
+
+    def test_render_commit_manifest_command(self):
+        self.assertEqual(
+            self.block_stream.render_commit_manifest_command('vdb'),
+            'sudo mv -f /var/lib/goto_cloud/block_sync/vdb.7.manifest.new /var/lib/goto_cloud/block_sync/vdb.7.manifest'
+        )
+
+    def test_render_stream_command__default_ssh_command(self):
+        self.assertIn(
+            ' | ssh migration@10.17.32.100 ',
+            BlockStream(self.target_remote_host).render_stream_command('vdb', 'vdc')
+        )
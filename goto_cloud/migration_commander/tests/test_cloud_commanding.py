@@ -1,3 +1,5 @@
+import asyncio
+
 from unittest.mock import patch
 
 from django.test import TestCase
@@ -17,6 +19,7 @@ from ..cloud_commanding import \
     ConfigureBootDeviceCommand, \
     StopTargetCommand, \
     StartTargetCommand
+from ..async_cloud_commanding import AsyncStopTargetCommand, AsyncDeleteBootstrapVolumeCommand, AsyncStartTargetCommand
 from ..device_identification import DeviceIdentificationCommand
 from ..target_system_info_inspection import GetTargetSystemInfoCommand
 
@@ -302,3 +305,48 @@ class TestStartTargetCommand(AfterCreationCoudCommandTestCase):
         StartTargetCommand(self.source).execute()
 
         mocked_start_target.assert_called_with(self.CLOUD_DATA['id'])
+
+
+class AsyncCloudCommandTestCase(AfterCreationCoudCommandTestCase):
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+class TestAsyncStopTargetCommand(AsyncCloudCommandTestCase):
+    @patch('cloud_management.public.CloudManager.stop_target')
+    def test_execute__stop_server_called(self, mocked_stop_target):
+        self._init_test_data()
+
+        self.source.target.remote_host.address = 'ubuntu16'
+        self.source.target.remote_host.save()
+
+        self._run(AsyncStopTargetCommand(self.source).execute())
+
+        mocked_stop_target.assert_called_with(self.CLOUD_DATA['id'])
+
+
+class TestAsyncDeleteBootstrapVolumeCommand(AsyncCloudCommandTestCase):
+    @patch('cloud_management.public.CloudManager.delete_volume')
+    def test_execute(self, mocked_delete_volume):
+        self._init_test_data()
+        self._run(AsyncDeleteBootstrapVolumeCommand(self.source).execute())
+
+        mocked_delete_volume.assert_called_with(self.BOOTSTRAP_VOLUME_ID)
+
+    def test_execute__no_bootstrapping_volume_found(self):
+        self._init_test_data()
+        self.source.target.remote_host.refresh_from_db()
+        self.source.target.remote_host.cloud_metadata['volumes'].pop(0)
+        self.source.target.remote_host.save()
+
+        with self.assertRaises(DeleteBootstrapVolumeCommand.NoBootstrapVolumeFoundException):
+            self._run(AsyncDeleteBootstrapVolumeCommand(self.source).execute())
+
+
+class TestAsyncStartTargetCommand(AsyncCloudCommandTestCase):
+    @patch('cloud_management.public.CloudManager.start_target')
+    def test_execute(self, mocked_start_target):
+        self._init_test_data()
+        self._run(AsyncStartTargetCommand(self.source).execute())
+
+        mocked_start_target.assert_called_with(self.CLOUD_DATA['id'])
@@ -1,3 +1,11 @@
+from unittest.mock import patch
+
+from remote_command_batching.public import RemoteCommandBatch
+
+from remote_host_event_logging.public import RemoteHostEventLogger
+
+from test_assets.public import TestAsset
+
 from ..filesystem_creation import CreateFilesystemsCommand
 
 from .utils import MigrationCommanderTestCase
@@ -24,3 +32,47 @@ class TestCreateFilesystemsCommand(MigrationCommanderTestCase):
         self._init_test_data('ubuntu12', 'target__device_identification')
 
         CreateFilesystemsCommand(self.source).execute()
+
+    def _set_simultaneous_filesystem_creations(self, simultaneous_filesystem_creations):
+        plan = self.source.migration_run.plan
+        plan.plan['migration']['simultaneous_filesystem_creations'] = simultaneous_filesystem_creations
+        plan.save()
+
+    def test_execute__single_batch(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        with patch.object(RemoteCommandBatch, 'execute', autospec=True, side_effect=RemoteCommandBatch.execute) as execute:
+            CreateFilesystemsCommand(self.source).execute()
+
+        self.assertEqual(execute.call_count, 1)
+        self.assertFalse(execute.call_args[0][0].parallel)
+        self.assertEqual(len(execute.call_args[0][0]), 4)
+
+    def test_execute__concurrently(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._set_simultaneous_filesystem_creations(2)
+
+        with patch.object(RemoteCommandBatch, 'execute', autospec=True, side_effect=RemoteCommandBatch.execute) as execute:
+            CreateFilesystemsCommand(self.source).execute()
+
+        self.assertTrue(execute.call_args[0][0].parallel)
+        self.assertEqual(execute.call_args[0][0].max_concurrency, 2)
+        self.assertIn('sudo mkfs.ext4 -U 549c8755-2757-446e-8c78-f76b50491f21 -F /dev/vdb1', self.executed_commands)
+        self.assertIn('sudo mkfs.ext3 -U d04ba532-cd2d-4406-a5ef-114acf019cc8 -F /dev/vdc', self.executed_commands)
+        self.assertIn('sudo mkfs.ext4 -U 53ad2170-488d-481a-a6ab-5ce0e538f247 -F /dev/vdd1', self.executed_commands)
+        self.assertIn('sudo mkfs.ext4 -U bcab224c-8407-4783-8cea-f9ea4be3fabf -F /dev/vdd2', self.executed_commands)
+
+    def test_execute__concurrently_failed(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._set_simultaneous_filesystem_creations(2)
+        mkfs_output = TestAsset.REMOTE_HOST_MOCKS['target__device_identification'].commands.pop('sudo mkfs')
+
+        try:
+            with RemoteHostEventLogger.DisableLoggingContextManager():
+                with self.assertRaises(CreateFilesystemsCommand.UnsupportedFilesystemException) as context:
+                    CreateFilesystemsCommand(self.source).execute()
+        finally:
+            TestAsset.REMOTE_HOST_MOCKS['target__device_identification'].add_command('sudo mkfs', mkfs_output)
+
+        self.assertIn('sudo mkfs.ext3 -U d04ba532-cd2d-4406-a5ef-114acf019cc8 -F /dev/vdc', str(context.exception))
+        self.assertIn('sudo mkfs.ext4 -U bcab224c-8407-4783-8cea-f9ea4be3fabf -F /dev/vdd2', str(context.exception))
@@ -2,6 +2,8 @@ from unittest.mock import patch, Mock
 
 from remote_host_event_logging.public import RemoteHostEventLogger
 
+from test_assets.public import TestAsset
+
 from ..filesystem_mounting import FilesystemMountCommand
 from ..device_identification import DeviceIdentificationCommand
 
@@ -71,7 +73,7 @@ class TestFilesystemMountCommand(MigrationCommanderTestCase):
         )
 
     @patch(
-        'migration_commander.remote_file_edit.RemoteFileEditor.append',
+        'migration_commander.remote_file_edit.RemoteFileEditor.render_append',
         Mock(side_effect=Exception())
     )
     def test_execute__failed(self):
@@ -81,6 +83,31 @@ class TestFilesystemMountCommand(MigrationCommanderTestCase):
             with self.assertRaises(FilesystemMountCommand.MountingException):
                 FilesystemMountCommand(self.source).execute()
 
+    def test_execute__failed_directory_skips_fstab_entry(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        failing_directory = DeviceIdentificationCommand._map_mountpoint('/mnt/vdc1')
+        remote_host_mock = TestAsset.REMOTE_HOST_MOCKS['target__device_identification']
+        execute = remote_host_mock.execute
+
+        def execute_with_failing_directory(command):
+            if command == 'sudo mkdir -p ' + failing_directory:
+                return {'exit_code': 1, 'stdout': '', 'stderr': 'mkdir failed'}
+            return execute(command)
+
+        with patch.object(remote_host_mock, 'execute', execute_with_failing_directory):
+            with RemoteHostEventLogger.DisableLoggingContextManager():
+                with self.assertRaises(FilesystemMountCommand.MountingException):
+                    FilesystemMountCommand(self.source).execute()
+
+        fstab_entries = [command for command in self.executed_commands if '/etc/fstab' in command]
+        self.assertEqual(len(fstab_entries), 2)
+        self.assertFalse(any(failing_directory in fstab_entry for fstab_entry in fstab_entries))
+        self.assertIn(
+            'sudo mkdir -p ' + DeviceIdentificationCommand._map_mountpoint('/mnt/vdc2'),
+            self.executed_commands
+        )
+        self.assertIn('sudo mount -a', self.executed_commands)
+
     def test_execute__with_swap(self):
         self._init_test_data('ubuntu12', 'target__device_identification')
 
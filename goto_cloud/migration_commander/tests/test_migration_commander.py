@@ -1,3 +1,5 @@
+import asyncio
+
 from unittest.mock import patch
 
 from remote_host.public import RemoteHost
@@ -10,7 +12,7 @@ from test_assets.public import TestAsset
 
 from command.public import SourceCommand
 
-from migration_commander.migration_commander import MigrationCommander
+from migration_commander.migration_commander import MigrationCommander, AsyncMigrationCommander
 
 from .utils import MigrationCommanderTestCase
 
@@ -26,6 +28,14 @@ class NoopCommand(SourceCommand):
         pass
 
 
+class SyncCommandMock(SourceCommand):
+    synced_hosts = []
+
+    def _execute(self):
+        self.synced_hosts.append(self._source.remote_host.address)
+        return MigrationCommander.Signal.SLEEP
+
+
 class TestMigrationCommander(MigrationCommanderTestCase):
     def _init_test_data(self, source_host, target_host):
         MigrationPlanParser().parse(TestAsset.MIGRATION_PLAN_MOCK)
@@ -57,6 +67,105 @@ class TestMigrationCommander(MigrationCommanderTestCase):
         self._init_test_data('ubuntu16', 'target__device_identification')
 
         MigrationCommander(self.source).execute()
+        self.assertEqual(self.source.status, Source.Status.ESTIMATE_SYNC)
+        self._estimate_other_sources()
+        MigrationCommander.start_syncs(self.source.migration_run)
+        self.source.refresh_from_db()
         self.assertEqual(self.source.status, Source.Status.SYNC)
         MigrationCommander(self.source).increment_status_and_execute()
         self.assertEqual(self.source.status, Source.Status.LIVE)
+
+    def _estimate_other_sources(self, status=Source.Status.LIVE):
+        Source.objects.exclude(pk=self.source.pk).update(status=status)
+
+    def _init_estimated_sources(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        SyncCommandMock.synced_hosts.clear()
+        for source in Source.objects.in_migration_run(self.source.migration_run).select_related('target'):
+            if source.target.remote_host is None:
+                source.target.remote_host = RemoteHost.objects.create(address='target__device_identification')
+                source.target.save()
+        for address, used_bytes in (('ubuntu12', 100), ('ubuntu14', 700), ('ubuntu16', 300), ('ubuntu16__lvm', 400)):
+            Source.objects.filter(remote_host__address=address).update(
+                status=Source.Status.ESTIMATE_SYNC,
+                sync_estimation={'/': {'bytes': used_bytes, 'inodes': 0}},
+            )
+
+    @patch.dict(MigrationCommander._COMMAND_DRIVER, {Source.Status.SYNC: SyncCommandMock})
+    def test_start_syncs(self):
+        self._init_estimated_sources()
+
+        MigrationCommander.start_syncs(self.source.migration_run)
+
+        self.assertEqual(SyncCommandMock.synced_hosts, ['ubuntu14', 'ubuntu16__lvm', 'ubuntu16', 'ubuntu12'])
+        self.assertEqual(
+            Source.objects.in_migration_run(self.source.migration_run, Source.Status.SYNC).count(),
+            4
+        )
+
+    @patch.dict(MigrationCommander._COMMAND_DRIVER, {Source.Status.SYNC: SyncCommandMock})
+    def test_start_syncs__not_every_source_estimated(self):
+        self._init_estimated_sources()
+        Source.objects.filter(remote_host__address='ubuntu12').update(status=Source.Status.MOUNT_FILESYSTEMS)
+
+        self.assertEqual(MigrationCommander.start_syncs(self.source.migration_run), [])
+        self.assertEqual(SyncCommandMock.synced_hosts, [])
+
+
+class TestAsyncMigrationCommander(TestMigrationCommander):
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    @patch.dict(AsyncMigrationCommander._COMMAND_DRIVER, {
+        Source.Status.CREATE_TARGET: CreateTargetCommandMock,
+        Source.Status.STOP_TARGET: NoopCommand,
+        Source.Status.DELETE_BOOTSTRAP_VOLUME: NoopCommand,
+        Source.Status.DELETE_BOOTSTRAP_NETWORK_INTERFACE: NoopCommand,
+        Source.Status.CONFIGURE_BOOT_DEVICE: NoopCommand,
+        Source.Status.START_TARGET: NoopCommand,
+    })
+    def test_execute(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        executor = TestAsset.CurrentThreadExecutor()
+
+        self._run(AsyncMigrationCommander(self.source, executor=executor).execute())
+        self.assertEqual(self.source.status, Source.Status.ESTIMATE_SYNC)
+        self._estimate_other_sources()
+        self._run(AsyncMigrationCommander.start_syncs(self.source.migration_run, executor=executor))
+        self.source.refresh_from_db()
+        self.assertEqual(self.source.status, Source.Status.SYNC)
+        self._run(AsyncMigrationCommander(self.source, executor=executor).increment_status_and_execute())
+        self.assertEqual(self.source.status, Source.Status.LIVE)
+
+    @patch.dict(AsyncMigrationCommander._COMMAND_DRIVER, {Source.Status.SYNC: SyncCommandMock})
+    def test_start_syncs(self):
+        self._init_estimated_sources()
+        migration_plan = self.source.migration_run.plan
+        migration_plan.plan['migration']['simultaneous_migrations'] = 1
+        migration_plan.save()
+
+        self._run(AsyncMigrationCommander.start_syncs(
+            self.source.migration_run,
+            executor=TestAsset.CurrentThreadExecutor(),
+        ))
+
+        self.assertEqual(SyncCommandMock.synced_hosts, ['ubuntu14', 'ubuntu16__lvm', 'ubuntu16', 'ubuntu12'])
+
+    @patch.dict(AsyncMigrationCommander._COMMAND_DRIVER, {Source.Status.SYNC: SyncCommandMock})
+    def test_start_syncs__not_every_source_estimated(self):
+        self._init_estimated_sources()
+        Source.objects.filter(remote_host__address='ubuntu12').update(status=Source.Status.MOUNT_FILESYSTEMS)
+
+        self.assertEqual(
+            self._run(AsyncMigrationCommander.start_syncs(
+                self.source.migration_run,
+                executor=TestAsset.CurrentThreadExecutor(),
+            )),
+            []
+        )
+
+    def test_async_cloud_commands_used(self):
+        self.assertTrue(all(
+            asyncio.iscoroutinefunction(AsyncMigrationCommander._COMMAND_DRIVER[status]._execute)
+            for status in (Source.Status.STOP_TARGET, Source.Status.DELETE_BOOTSTRAP_VOLUME, Source.Status.START_TARGET)
+        ))
@@ -1,3 +1,11 @@
+from unittest.mock import patch
+
+from remote_command_batching.public import RemoteCommandBatch
+
+from remote_host.public import RemoteHost
+
+from remote_host_event_logging.public import RemoteHostEventLogger
+
 from test_assets.public import TestAsset
 
 from ..partition_creation import CreatePartitionsCommand
@@ -47,3 +55,75 @@ class TestCreatePartitionsCommand(MigrationCommanderTestCase):
             'echo "" | sudo sfdisk /dev/vdb',
             self.executed_commands
         )
+
+    def test_execute__block_device_info_invalidated(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        CreatePartitionsCommand(self.source).execute()
+
+        self.assertTrue(
+            self.source.target.remote_host.is_system_info_stale(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
+        )
+        self.assertFalse(self.source.target.remote_host.is_system_info_stale(RemoteHost.SystemInfoSection.OS))
+
+    def _enable_parallel_partitioning(self):
+        self.source.target.blueprint['partitioning_mode'] = CreatePartitionsCommand.PartitioningMode.PARALLEL
+        self.source.target.save()
+
+    def test_execute__parallel__source_part_table_read(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_parallel_partitioning()
+
+        CreatePartitionsCommand(self.source).execute()
+
+        self.assertIn('sudo sfdisk -d /dev/vda', self.executed_commands)
+        self.assertIn('sudo sfdisk -d /dev/vdb', self.executed_commands)
+        self.assertIn('sudo sfdisk -d /dev/vdc', self.executed_commands)
+
+    def test_execute__parallel__target_part_table_write(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_parallel_partitioning()
+
+        CreatePartitionsCommand(self.source).execute()
+
+        self.assertIn('echo "PART \\"TABLE\\"" | sudo sfdisk /dev/vdc', self.executed_commands)
+        self.assertIn('echo "PART \\"TABLE\\"" | sudo sfdisk /dev/vdd', self.executed_commands)
+        self.assertNotIn('echo "" | sudo sfdisk /dev/vdb', self.executed_commands)
+
+    def test_execute__parallel__partition_tables_reloaded_once(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_parallel_partitioning()
+
+        CreatePartitionsCommand(self.source).execute()
+
+        self.assertEqual(
+            [command for command in self.executed_commands if 'partprobe' in command],
+            [
+                'sudo partprobe {devices} && sudo udevadm settle'.format(
+                    devices=' '.join(
+                        '/dev/{device_id}'.format(device_id=self.source.target.device_mapping[source_device_id]['id'])
+                        for source_device_id in self.source.target.device_mapping
+                        if source_device_id in ('vdb', 'vdc')
+                    )
+                )
+            ]
+        )
+
+    def test_execute__parallel__remote_calls_independent_of_device_count(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_parallel_partitioning()
+
+        with patch.object(RemoteCommandBatch, 'execute', autospec=True, side_effect=RemoteCommandBatch.execute) as execute:
+            CreatePartitionsCommand(self.source).execute()
+
+        self.assertEqual(execute.call_count, 2)
+        self.assertTrue(execute.call_args_list[1][0][0].parallel)
+
+    def test_execute__parallel__failed_write(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_parallel_partitioning()
+        TestAsset.REMOTE_HOST_MOCKS['target__device_identification'].commands.pop('sfdisk')
+
+        with RemoteHostEventLogger.DisableLoggingContextManager():
+            with self.assertRaises(CreatePartitionsCommand.CanNotCreatePartitionException):
+                CreatePartitionsCommand(self.source).execute()
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+from commander.public import Commander
+
+from remote_host_event_logging.public import RemoteHostEventLogger
+
+from test_assets.public import TestAsset
+
+from ..sync_estimation import SyncEstimationCommand
+
+from .utils import MigrationCommanderTestCase
+
+
+DF_OUTPUT = (
+    'Filesystem        1-blocks        Used   Available Capacity Mounted on\n'
+    '/dev/vda1      10436935680  2171371520  7711858688      22% /\n'
+    '/dev/vdc1       5150212096    10563584  4877438976       1% /mnt/vdc1\n'
+    '/dev/vdc2       5150212096   524288000  4363714560      11% /mnt/vdc2\n'
+    'Filesystem      Inodes  IUsed   IFree IUse% Mounted on\n'
+    '/dev/vda1       640848 110591  530257   18% /\n'
+    '/dev/vdc1       327680     11  327669    1% /mnt/vdc1\n'
+    '/dev/vdc2       327680   4096  323584    2% /mnt/vdc2\n'
+)
+
+
+class TestSyncEstimationCommand(MigrationCommanderTestCase):
+    def setUp(self):
+        super().setUp()
+        remote_host_mock_patch = patch.dict(TestAsset.REMOTE_HOST_MOCKS['ubuntu16'].commands, {'sudo df': DF_OUTPUT})
+        remote_host_mock_patch.start()
+        self.addCleanup(remote_host_mock_patch.stop)
+
+    def test_execute(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        SyncEstimationCommand(self.source).execute()
+
+        self.assertDictEqual(
+            self.source.sync_estimation,
+            {
+                '/': {'bytes': 2171371520, 'inodes': 110591},
+                '/mnt/vdc1': {'bytes': 10563584, 'inodes': 11},
+                '/mnt/vdc2': {'bytes': 524288000, 'inodes': 4096},
+            }
+        )
+
+    def test_execute__sleeps(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        self.assertEqual(SyncEstimationCommand(self.source).execute(), Commander.Signal.SLEEP)
+
+    def test_execute__single_probe(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        SyncEstimationCommand(self.source).execute()
+
+        self.assertIn(
+            'sudo df -P -B1 / /mnt/vdc1 /mnt/vdc2; sudo df -P -i / /mnt/vdc1 /mnt/vdc2',
+            self.executed_commands
+        )
+        self.assertEqual(len([command for command in self.executed_commands if 'df' in command]), 1)
+
+    def test_estimate_usage__mountpoints_quoted(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        command = SyncEstimationCommand(self.source)
+        command.errors = []
+
+        command._estimate_usage(['/mnt/my data', '/mnt/$(reboot)'])
+
+        self.assertIn(
+            "sudo df -P -B1 '/mnt/my data' '/mnt/$(reboot)'; sudo df -P -i '/mnt/my data' '/mnt/$(reboot)'",
+            self.executed_commands
+        )
+
+    def test_execute__persisted(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+
+        SyncEstimationCommand(self.source).execute()
+        self.source.refresh_from_db()
+
+        self.assertEqual(self.source.sync_estimation['/']['bytes'], 2171371520)
+
+    def test_execute__failing_probe(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        TestAsset.REMOTE_HOST_MOCKS['ubuntu16'].commands.pop('sudo df')
+
+        with RemoteHostEventLogger.DisableLoggingContextManager():
+            SyncEstimationCommand(self.source).execute()
+
+        self.assertDictEqual(self.source.sync_estimation, {})
@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+from django.test import TestCase as DjangoTestCase
+
+from migration_plan_parsing.public import MigrationPlanParser
+
+from source.public import Source
+
+from test_assets.public import TestAsset
+
+from ..sync_scheduling import SyncScheduler
+
+
+class RemoteHostMock():
+    def __init__(self, disk_sizes):
+        self.system_info = {
+            'block_devices': {
+                'vd{index}'.format(index=index): {'type': 'disk', 'size': size}
+                for index, size in enumerate(disk_sizes)
+            }
+        }
+
+
+class SourceMock():
+    def __init__(self, name, sync_estimation=None, disk_sizes=()):
+        self.name = name
+        self.sync_estimation = sync_estimation or {}
+        self.remote_host = RemoteHostMock(disk_sizes)
+
+
+class TestSyncScheduler(TestCase):
+    def setUp(self):
+        self.sources = [
+            SourceMock('small', {'/': {'bytes': 100, 'inodes': 0}}),
+            SourceMock('large', {'/': {'bytes': 700, 'inodes': 0}}),
+            SourceMock('medium', {'/': {'bytes': 300, 'inodes': 0}, '/var': {'bytes': 100, 'inodes': 0}}),
+            SourceMock('medium_2', {'/': {'bytes': 400, 'inodes': 0}}),
+        ]
+
+    def test_init__invalid_slots(self):
+        with self.assertRaises(SyncScheduler.InvalidSlotCountException):
+            SyncScheduler(0)
+
+    def test_estimate_cost(self):
+        self.assertEqual(
+            SyncScheduler().estimate_cost(SourceMock('source', {'/': {'bytes': 100, 'inodes': 2}})),
+            100 + 2 * SyncScheduler.INODE_COST
+        )
+
+    def test_estimate_cost__fall_back_to_device_size(self):
+        self.assertEqual(SyncScheduler().estimate_cost(SourceMock('source', disk_sizes=(1000, 500))), 1500)
+
+    def test_order(self):
+        self.assertEqual(
+            [source.name for source in SyncScheduler().order(self.sources)],
+            ['large', 'medium', 'medium_2', 'small']
+        )
+
+    def test_schedule(self):
+        self.assertEqual(
+            [[source.name for source in slot] for slot in SyncScheduler(2).schedule(self.sources)],
+            [['large', 'small'], ['medium', 'medium_2']]
+        )
+
+    def test_schedule__more_slots_than_sources(self):
+        slots = SyncScheduler(5).schedule(self.sources)
+
+        self.assertEqual(len(slots), 5)
+        self.assertEqual(sum(len(slot) for slot in slots), len(self.sources))
+
+
+class TestSyncSchedulerSourcesToSync(DjangoTestCase, metaclass=TestAsset.PatchRemoteHostMeta):
+    def _init_test_data(self):
+        self.migration_run = MigrationPlanParser().parse(TestAsset.MIGRATION_PLAN_MOCK)
+        self.sources = {source.remote_host.address: source for source in self.migration_run.sources.all()}
+
+        for address, used_bytes in (('ubuntu12', 100), ('ubuntu14', 700), ('ubuntu16', 300), ('ubuntu16__lvm', 400)):
+            Source.objects.filter(pk=self.sources[address].pk).update(
+                status=Source.Status.ESTIMATE_SYNC,
+                sync_estimation={'/': {'bytes': used_bytes, 'inodes': 0}},
+            )
+
+    def _get_addresses(self, sources):
+        return [source.remote_host.address for source in sources]
+
+    def test_get_sources_to_sync(self):
+        self._init_test_data()
+
+        self.assertEqual(
+            self._get_addresses(SyncScheduler().get_sources_to_sync(self.migration_run)),
+            ['ubuntu14', 'ubuntu16__lvm', 'ubuntu16', 'ubuntu12']
+        )
+
+    def test_get_sources_to_sync__not_every_source_estimated(self):
+        self._init_test_data()
+        Source.objects.filter(pk=self.sources['ubuntu12'].pk).update(status=Source.Status.MOUNT_FILESYSTEMS)
+
+        self.assertEqual(SyncScheduler().get_sources_to_sync(self.migration_run), [])
+
+    def test_get_sources_to_sync__already_syncing_sources_skipped(self):
+        self._init_test_data()
+        Source.objects.filter(pk=self.sources['ubuntu14'].pk).update(status=Source.Status.SYNC)
+
+        self.assertEqual(
+            self._get_addresses(SyncScheduler().get_sources_to_sync(self.migration_run)),
+            ['ubuntu16__lvm', 'ubuntu16', 'ubuntu12']
+        )
@@ -6,6 +6,7 @@ from remote_host_command.public import RemoteHostCommand
 
 from remote_host_event_logging.public import RemoteHostEventLogger
 
+from ..block_streaming import BlockStream
 from ..default_remote_host_commands import DefaultRemoteHostCommand
 from ..syncing import SyncCommand, FinalSyncCommand
 from ..mountpoint_mapping import MountpointMapper
@@ -180,6 +181,84 @@ class TestSyncCommand(MigrationCommanderTestCase):
             with self.assertRaises(SyncCommand.SyncingException):
                 SyncCommand(self.source).execute()
 
+    def _enable_block_sync(self, *source_device_ids):
+        self.source.target.blueprint['sync_modes'] = {
+            source_device_id: SyncCommand.SyncMode.BLOCK for source_device_id in source_device_ids
+        }
+        self.source.target.save()
+
+    def _get_block_stream(self):
+        return BlockStream(self.source.target.remote_host, self.source.target.blueprint['commands']['block_sync_ssh'])
+
+    def test_execute__block_sync_ssh_command(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_block_sync('vdb')
+
+        SyncCommand(self.source).execute()
+
+        self.assertTrue([
+            command for command in self.executed_commands
+            if ' | ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no ' in command
+        ])
+
+    def test_execute__block_sync_disk(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_block_sync('vdb')
+
+        SyncCommand(self.source).execute()
+
+        block_stream = self._get_block_stream()
+        self.assertIn(
+            block_stream.render_stream_command('vdb', self.source.target.device_mapping['vdb']['id']),
+            self.executed_commands
+        )
+        self.assertIn(block_stream.render_commit_manifest_command('vdb'), self.executed_commands)
+
+    def test_execute__block_sync_partition(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_block_sync('vdc1')
+
+        SyncCommand(self.source).execute()
+
+        target_partition = self.source.target.device_mapping['vdc']['children']['vdc1']
+        self.assertIn(
+            self._get_block_stream().render_stream_command('vdc1', target_partition['id']),
+            self.executed_commands
+        )
+        self.assertIn(
+            'sudo umount {mountpoint}'.format(mountpoint=target_partition['mountpoint']),
+            self.executed_commands
+        )
+        self.assertIn('sudo mount -a', self.executed_commands)
+        self.assertFalse([
+            command for command in self.executed_commands
+            if 'rsync' in command and MountpointMapper.map_mountpoint('/tmp', '/mnt/vdc1') in command
+        ])
+        self.assertTrue([
+            command for command in self.executed_commands
+            if 'rsync' in command and MountpointMapper.map_mountpoint('/tmp', '/mnt/vdc2') in command
+        ])
+
+    def test_execute__block_sync_disk_includes_partitions(self):
+        self._init_test_data('ubuntu16', 'target__device_identification')
+        self._enable_block_sync('vdc')
+
+        SyncCommand(self.source).execute()
+
+        block_stream = self._get_block_stream()
+        target_device = self.source.target.device_mapping['vdc']
+        self.assertIn(block_stream.render_stream_command('vdc', target_device['id']), self.executed_commands)
+        self.assertFalse([command for command in self.executed_commands if 'vdc1' in command and 'rsync' in command])
+        self.assertNotIn(
+            block_stream.render_stream_command('vdc1', target_device['children']['vdc1']['id']),
+            self.executed_commands
+        )
+        for target_partition in target_device['children'].values():
+            self.assertIn(
+                'sudo umount {mountpoint}'.format(mountpoint=target_partition['mountpoint']),
+                self.executed_commands
+            )
+
 
 class TestFinalSyncCommand(MigrationCommanderTestCase):
     def test_execute__no_sleep(self):
@@ -1,11 +1,16 @@
-from functools import reduce
-
-from dict_utils.public import DictUtils
+from dict_utils.public import ReadOnlyDict
 
 
 class BlueprintResolver():
     """
     takes care of resolving the dependencies of blueprints into one independent document
+
+    The fully merged form of every base blueprint is computed only once, when it is used for the first time, and is
+    shared by all blueprints resolved from it. Resolving a blueprint therefore only overlays its own values on its
+    resolved parent, copying just the dicts, which both of them define. To keep the shared parts intact, resolved
+    blueprints are read only: their dicts are ReadOnlyDicts and their lists are tuples. Callers, which need to change a
+    resolved blueprint, have to copy the parts they change. Neither the given blueprints nor the base blueprints are
+    modified.
     """
     class ResolvingException(Exception):
         """
@@ -13,6 +18,8 @@ class BlueprintResolver():
         """
         pass
 
+    PARENT_KEY = 'parent'
+
     def __init__(self, base_blueprints):
         """
         is initialized with a set of base blueprints, which are used to resolve the given blueprints
@@ -21,6 +28,7 @@ class BlueprintResolver():
         :type base_blueprints: dict
         """
         self.base_blueprints = base_blueprints
+        self._resolved_base_blueprints = {}
 
     def resolve(self, blueprint):
         """
@@ -28,37 +36,103 @@ class BlueprintResolver():
         
         :param blueprint: this either is a blueprint dict, or a sting id, referencing the parent directly
         :type blueprint: dict or str
-        :return: resolved dict
-        :rtype: dict
+        :return: resolved read only dict
+        :rtype: ReadOnlyDict
         :raises BlueprintResolver.ResolvingException: raised in case the blueprint is not valid and therefore can't be
         resolved
         """
         if isinstance(blueprint, str):
-            return self._clean_representation(self._get_base_blueprint_by_id(blueprint))
+            return self._resolve_base_blueprint(blueprint)
         if isinstance(blueprint, dict):
-            parents = self._get_parents(blueprint)
-            return self._clean_representation(
-                reduce(DictUtils.merge_dicts, [blueprint] + parents) if parents else blueprint
-            )
+            return self._merge_with_parent(blueprint, ())
 
         raise BlueprintResolver.ResolvingException(
             'following blueprint is not valid: {blueprint}'.format(blueprint=blueprint)
         )
 
-    def _get_parents(self, blueprint):
+    def _resolve_base_blueprint(self, id, dependent_ids=()):
         """
-        returns all parents for a given blueprint
+        returns the resolved base blueprint with the given id, which is resolved, if it has not been resolved before
         
-        :param blueprint: blueprint to get the parents for
+        :param id: the id of the base blueprint
+        :type id: str
+        :param dependent_ids: the ids of the base blueprints, which are currently resolved and inherit from this one
+        :type dependent_ids: tuple
+        :return: the resolved base blueprint, which is shared
+        :rtype: ReadOnlyDict
+        :raises BlueprintResolver.ResolvingException: raised if the id is not found or the inheritance is cyclic
+        """
+        if id in dependent_ids:
+            raise BlueprintResolver.ResolvingException(
+                'the inheritance of the following blueprints is cyclic: {cycle}'.format(
+                    cycle=' -> '.join(dependent_ids[dependent_ids.index(id):] + (id,))
+                )
+            )
+
+        if id not in self._resolved_base_blueprints:
+            self._resolved_base_blueprints[id] = self._merge_with_parent(
+                self._get_base_blueprint_by_id(id),
+                dependent_ids + (id,)
+            )
+
+        return self._resolved_base_blueprints[id]
+
+    def _merge_with_parent(self, blueprint, dependent_ids):
+        """
+        merges a blueprint with its resolved parent, if it has one
+        
+        :param blueprint: the blueprint to merge
         :type blueprint: dict
-        :return: list of all parents. It is sorted with the nearest parent coming first
-        :rtype: list
+        :param dependent_ids: the ids of the base blueprints, which are currently resolved
+        :type dependent_ids: tuple
+        :return: the merged blueprint
+        :rtype: ReadOnlyDict
+        """
+        cleaned_blueprint = self._freeze(self._clean_representation(blueprint))
+
+        if self.PARENT_KEY in blueprint:
+            return self._overlay(
+                cleaned_blueprint,
+                self._resolve_base_blueprint(blueprint[self.PARENT_KEY], dependent_ids)
+            )
+
+        return cleaned_blueprint
+
+    def _overlay(self, dominant_blueprint, parent_blueprint):
+        """
+        overlays the values of a blueprint on its parent. If both of them define a dict for the same key, these are
+        overlaid as well. All other values of the parent are shared with the returned blueprint, without being copied.
+
+        :param dominant_blueprint: the read only blueprint, which overwrites the values of the parent
+        :type dominant_blueprint: ReadOnlyDict
+        :param parent_blueprint: the read only parent blueprint
+        :type parent_blueprint: ReadOnlyDict
+        :return: the overlaid blueprint
+        :rtype: ReadOnlyDict
+        """
+        overlaid_blueprint = dict(parent_blueprint)
+
+        for key, value in dominant_blueprint.items():
+            if isinstance(value, dict) and isinstance(overlaid_blueprint.get(key), dict):
+                overlaid_blueprint[key] = self._overlay(value, overlaid_blueprint[key])
+            else:
+                overlaid_blueprint[key] = value
+
+        return ReadOnlyDict(overlaid_blueprint)
+
+    def _freeze(self, value):
+        """
+        returns a read only copy of the given value, in which all dicts are ReadOnlyDicts and all lists are tuples
+
+        :param value: the value to freeze
+        :return: the read only value
         """
-        if 'parent' in blueprint:
-            parent_blueprint = self._get_base_blueprint_by_id(blueprint['parent'])
-            return [parent_blueprint] + self._get_parents(parent_blueprint)
+        if isinstance(value, dict):
+            return ReadOnlyDict((key, self._freeze(nested_value)) for key, nested_value in value.items())
+        if isinstance(value, list):
+            return tuple(self._freeze(nested_value) for nested_value in value)
 
-        return []
+        return value
 
     def _get_base_blueprint_by_id(self, id):
         """
@@ -81,12 +155,11 @@ class BlueprintResolver():
 
     def _clean_representation(self, blueprint):
         """
-        clean the blueprint of data, not relevant for the final representation
+        returns a copy of the blueprint, without data, which is not relevant for the final representation
         
         :param blueprint: blueprint to clean
         :type: dict
         :return: cleaned blueprint
         :rtype: dict
         """
-        blueprint.pop('parent', None)
-        return blueprint
+        return {key: value for key, value in blueprint.items() if key != self.PARENT_KEY}
@@ -25,3 +25,11 @@ class DbItemHandler():
         """
         [db_item.delete() for db_item in self.db_items]
         self.db_items = []
+
+    def discard(self):
+        """
+        Stops handling all items, without deleting them. This is used, if the items do not exist anymore, since the
+        transaction which created them has been rolled back. Other watched DbItemHandlers are discarded recursively
+        """
+        [db_item.discard() for db_item in self.db_items if isinstance(db_item, DbItemHandler)]
+        self.db_items = []
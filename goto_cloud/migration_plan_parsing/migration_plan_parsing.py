@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from migration_plan.public import MigrationPlan
 
 from migration_run.public import MigrationRun
@@ -11,8 +13,14 @@ class MigrationPlanParser(DbItemHandler):
     Takes care of parsing a migration plan.
     
     It fills the model with the data needed, during the migration, checks that the sources are available and resolves
-    the blueprints to determine what the targets are gonna look like
+    the blueprints to determine what the targets are gonna look like.
+
+    The sources are inspected first and kept in memory. Afterwards all db entries are created in a single transaction,
+    using bulk inserts, so a failure rolls back everything, which has been created. The ips distributed for the targets
+    are released on failure as well.
     """
+    DEFAULT_PERSISTENT_IP_DISTRIBUTION = False
+
     def __init__(self):
         super().__init__()
 
@@ -26,12 +34,16 @@ class MigrationPlanParser(DbItemHandler):
         :rtype: MigrationRun
         """
         try:
-            migration_plan = self._create_migration_plan(migration_plan_dict)
-            sources = self._create_sources(migration_plan_dict)
+            source_parser, sources = self._build_sources(migration_plan_dict)
+
+            with transaction.atomic():
+                migration_plan = self._create_migration_plan(migration_plan_dict)
+                migration_run = self._create_migration_run(migration_plan, source_parser.get_persisted_ips())
+                source_parser.persist(sources, migration_run)
 
-            return self._create_migration_run(migration_plan, sources)
+            return migration_run
         except Exception as e:
-            self.delete()
+            self.discard()
             raise e
 
     def _create_migration_plan(self, migration_plan_dict):
@@ -49,40 +61,41 @@ class MigrationPlanParser(DbItemHandler):
             )
         )
 
-    def _create_sources(self, migration_plan_dict):
+    def _build_sources(self, migration_plan_dict):
         """
-        parses and creates the sources
+        parses the sources, without creating their db entries
         
         :param migration_plan_dict: the migration plan
         :type migration_plan_dict: dict
-        :return: the created sources
-        :rtype: list[source.public.Source]
+        :return: the source parser, which is used to persist the sources, and the unsaved sources
+        :rtype: (SourceParser, list[source.public.Source])
         """
         source_parser = self.add_db_item(
-            SourceParser(migration_plan_dict['blueprints'], migration_plan_dict['target_cloud'])
+            SourceParser(
+                migration_plan_dict['blueprints'],
+                migration_plan_dict['target_cloud'],
+                migration_plan_dict.get('migration', {}).get(
+                    'persistent_ip_distribution', self.DEFAULT_PERSISTENT_IP_DISTRIBUTION
+                ),
+            )
         )
 
-        return [source_parser.parse(source_dict) for source_dict in migration_plan_dict['sources']]
+        return source_parser, [source_parser.build(source_dict) for source_dict in migration_plan_dict['sources']]
 
-    def _create_migration_run(self, migration_plan, sources):
+    def _create_migration_run(self, migration_plan, allocated_ips=()):
         """
-        creates the migration run and connects it with the migration plan and sources
+        creates the migration run and connects it with the migration plan
         
         :param migration_plan: the migration plan
         :type migration_plan: MigrationPlan
-        :param sources: the sources
-        :type sources: list[source.public.Source]
+        :param allocated_ips: the ips distributed from persisted ranges, which are released with the migration run
+        :type allocated_ips: list[dict]
         :return: the created migration run
         :rtype: MigrationRun
         """
-        migration_run = self.add_db_item(
+        return self.add_db_item(
             MigrationRun.objects.create(
                 plan=migration_plan,
+                allocated_ips=list(allocated_ips),
             )
         )
-
-        for source in sources:
-            source.migration_run = migration_run
-            source.save()
-
-        return migration_run
@@ -1,5 +1,9 @@
 import ipaddress
 
+import json
+
+from ip_allocation.public import IpAllocator, IpRangeAllocation
+
 
 class IpValidation():
     """
@@ -114,6 +118,60 @@ class IpValidation():
             raise IpValidation.InvalidIpException(ip_string)
 
 
+class CompiledNetworkMapping():
+    """
+    the network mapping of a blueprint, with its net addresses parsed once. An interface is mapped onto the net address,
+    which contains its ip and has its net mask, so the matching net address is looked up by hashing the net of the
+    interface, instead of comparing it to every net address of the mapping. Interfaces, which don't match any net
+    address, are mapped onto the first net address containing the public ip matcher, if there is one.
+    """
+    PUBLIC_IP_MATCHER = IpValidation.validate_ip_address('0.0.0.0')
+
+    def __init__(self, network_mapping):
+        """
+        :param network_mapping: the network mapping of a blueprint
+        :type network_mapping: dict
+        :raises KeyError: if a mapping does not define its network
+        :raises IpValidation.InvalidIpException: if a net address is not valid
+        """
+        self._networks = {}
+        self._public_network = None
+
+        for net_address_string, mapping_config in network_mapping.items():
+            net_address = IpValidation.validate_net_address(net_address_string)
+            network = {
+                'network': mapping_config['network']
+            }
+
+            if 'static' in mapping_config:
+                network['static'] = mapping_config['static']
+            elif 'range' in mapping_config:
+                network['range'] = mapping_config['range']
+
+            self._networks.setdefault(net_address, network)
+
+            if self._public_network is None and self.PUBLIC_IP_MATCHER in net_address:
+                self._public_network = network
+
+    def get_network(self, ip, net_mask):
+        """
+        returns the network, the given interface is mapped to
+
+        :param ip: the ip of the interface
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :param net_mask: the net mask of the interface
+        :type net_mask: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :return: the network, or None if the interface is not mapped
+        :rtype: dict
+        """
+        try:
+            net_address = ipaddress.ip_network('{ip}/{net_mask}'.format(ip=ip, net_mask=net_mask), strict=False)
+        except ValueError:
+            net_address = None
+
+        return self._networks.get(net_address, self._public_network)
+
+
 class NetworkMapper():
     """
     takes care of assigning network settings for a given blueprint, to given interfaces
@@ -130,17 +188,22 @@ class NetworkMapper():
         """
         pass
 
-    PUBLIC_IP_MATCHER = IpValidation.validate_ip_address('0.0.0.0')
+    PUBLIC_IP_MATCHER = CompiledNetworkMapping.PUBLIC_IP_MATCHER
 
-    def __init__(self, network_settings):
+    def __init__(self, network_settings, persistent_ip_distribution=False):
         """
         is initialized with the network settings it should use
         
         :param network_settings: the network settings to use
         :type network_settings: dict
+        :param persistent_ip_distribution: if True, the distributed ips are persisted and shared with all other
+        NetworkMappers, instead of being kept in memory
+        :type persistent_ip_distribution: bool
         :raises NetworkMapper.InvalidNetworkSettingsException: in case the settings are not valid
         """
         self.networks = self._create_network_structure(network_settings)
+        self._ip_distributor_class = PersistentIpDistributor if persistent_ip_distribution else IpDistributor
+        self._network_mappings = {}
 
     def map_interfaces(self, interfaces, blueprint):
         """
@@ -156,7 +219,7 @@ class NetworkMapper():
         """
         try:
             mapped_interfaces = []
-            network_mapping = self._create_network_mapping(blueprint)
+            network_mapping = self._get_network_mapping(blueprint)
 
             for interface_id, interface in interfaces.items():
                 if not IpValidation.validate_ip_address(interface['ip']).is_loopback:
@@ -180,30 +243,21 @@ class NetworkMapper():
         :param net_mask_string: the ips net mask
         :type net_mask_string: str
         :param network_mapping: the network mapping used to determine how the ip is mapped
-        :type network_mapping: dict
+        :type network_mapping: CompiledNetworkMapping
         :return: the network the ip is mapped to
         :rtype: dict
         """
         ip = IpValidation.validate_ip_address(ip_string)
         net_mask = IpValidation.validate_ip_address(net_mask_string)
 
-        net_address = next(
-            (net_address for net_address in network_mapping if ip in net_address and net_address.netmask == net_mask),
-            None
-        )
+        network = network_mapping.get_network(ip, net_mask)
 
-        if net_address is None:
-            net_address = next(
-                (net_address for net_address in network_mapping if self.PUBLIC_IP_MATCHER in net_address),
-                None
-            )
-
-        if net_address is None:
+        if network is None:
             raise NetworkMapper.NoMappingFoundException(
                 'no matching network mapping was found, for the following ip: {ip}'.format(ip=str(ip))
             )
 
-        return network_mapping[net_address]
+        return network
 
     def assign_network_settings(self, network, source_interface=None):
         """
@@ -269,35 +323,67 @@ class NetworkMapper():
         :rtype: IpDistributor
         """
         if (from_ip, to_ip,) not in self.networks[network_id]['distributors']:
-            self.networks[network_id]['distributors'][(from_ip, to_ip,)] = IpDistributor(
+            self.networks[network_id]['distributors'][(from_ip, to_ip,)] = self._ip_distributor_class(
                 from_ip, to_ip, self.networks[network_id]['net_address']
             )
 
         return self.networks[network_id]['distributors'][(from_ip, to_ip,)]
 
-    def _create_network_mapping(self, blueprint):
+    def get_persisted_ips(self):
         """
-        creates a network mapping from a blueprint
+        returns the ips, which have been distributed from persisted ranges by this NetworkMapper, so they can be
+        released once they are not used anymore
+
+        :return: a list of dicts, containing the range and the ips distributed from it
+        :rtype: list[dict]
+        """
+        return [
+            {
+                'net_address': str(distributor.net_address),
+                'from_ip': str(distributor.from_ip),
+                'to_ip': str(distributor.to_ip),
+                'ips': list(distributor.distributed_ips),
+            }
+            for network in self.networks.values()
+            for distributor in network['distributors'].values()
+            if isinstance(distributor, PersistentIpDistributor) and distributor.distributed_ips
+        ]
+
+    def release_distributed_ips(self):
+        """
+        releases all ips, which have been distributed by this NetworkMapper
+        """
+        for network in self.networks.values():
+            for distributor in network['distributors'].values():
+                distributor.release_distributed_ips()
+
+    def _get_network_mapping(self, blueprint):
+        """
+        returns the compiled network mapping of a blueprint. Blueprints with the same network mapping share the compiled
+        network mapping, so it is only created once per NetworkMapper.
         
-        :param blueprint: the blueprint to create the network mapping with 
+        :param blueprint: the blueprint to get the network mapping for
         :type blueprint: dict
         :return: the network mapping
-        :rtype: dict
+        :rtype: CompiledNetworkMapping
         """
-        network_mapping = {}
+        cache_key = json.dumps(blueprint['network_mapping'], sort_keys=True)
 
-        for net_address_string, mapping_config in blueprint['network_mapping'].items():
-            net_address = IpValidation.validate_net_address(net_address_string)
-            network_mapping[net_address] = {
-                'network': mapping_config['network']
-            }
+        if cache_key not in self._network_mappings:
+            self._network_mappings[cache_key] = self._create_network_mapping(blueprint)
 
-            if 'static' in mapping_config:
-                network_mapping[net_address]['static'] = mapping_config['static']
-            elif 'range' in mapping_config:
-                network_mapping[net_address]['range'] = mapping_config['range']
+        return self._network_mappings[cache_key]
 
-        return network_mapping
+    def _create_network_mapping(self, blueprint):
+        """
+        creates a network mapping from a blueprint
+        
+        :param blueprint: the blueprint to create the network mapping with 
+        :type blueprint: dict
+        :return: the network mapping
+        :rtype: CompiledNetworkMapping
+        """
+        return CompiledNetworkMapping(blueprint['network_mapping'])
 
     def _create_network_structure(self, network_settings):
         """
@@ -344,21 +430,7 @@ class IpDistributor():
     """
     takes care of distributing ips of a given net in a given range
     """
-    class RangeExhaustedException(Exception):
-        """
-        is raised when the range is exhausted
-        """
-        def __init__(self, from_ip, to_ip):
-            """
-            :param from_ip: the ranges from address
-            :type from_ip: ipaddress.IPv4Address or ipaddress.IPv6Address  
-            :param to_ip: the ranges to address
-            :type to_ip: ipaddress.IPv4Address or ipaddress.IPv6Address 
-            """
-            super().__init__('the ip range ({from_ip} - {to_ip}) is exhausted!'.format(
-                from_ip=from_ip,
-                to_ip=to_ip,
-            ))
+    RangeExhaustedException = IpAllocator.RangeExhaustedException
 
     def __init__(self, from_ip, to_ip, net_address):
         """
@@ -373,33 +445,73 @@ class IpDistributor():
         :raises IpValidation.InvalidIpException: if a ip is not valid
         :raises IpValidation.InvalidRangeException: if range is not valid
         """
-        self.last_distributed_ip = None
         self.from_ip = from_ip
         self.to_ip = to_ip
         self.net_address = net_address
 
         IpValidation.validate_ip_range(self.from_ip, self.to_ip, self.net_address)
 
+        self._allocator = self._create_allocator()
+        self.distributed_ips = []
+
+    def _create_allocator(self):
+        """
+        creates the allocator, which keeps track of the distributed ips
+
+        :return: the allocator
+        :rtype: ip_allocation.public.IpAllocator | ip_allocation.public.IpRangeAllocation
+        """
+        return IpAllocator(self.from_ip, self.to_ip, self.net_address)
+
     def get_next_ip(self):
         """
         gets the next available ip address
         
         :return: ip address
         :rtype: str
-        :raises IpValidation.RangeExhaustedException: raised if range is exhausted
+        :raises IpDistributor.RangeExhaustedException: raised if range is exhausted
         """
-        if self.last_distributed_ip:
-            self.last_distributed_ip = self.last_distributed_ip + 1
-        else:
-            self.last_distributed_ip = self.from_ip
+        ip_string = str(self._allocator.allocate())
+        self.distributed_ips.append(ip_string)
+        return ip_string
 
-        if self.last_distributed_ip > self.to_ip:
-            raise IpDistributor.RangeExhaustedException(self.from_ip, self.to_ip)
+    def reserve_ip(self, ip_string):
+        """
+        marks the given ip as distributed, so it is not handed out
+        
+        :param ip_string: the ip to reserve
+        :type ip_string: str
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be distributed from this range
+        :raises IpAllocator.IpAlreadyAllocatedException: if the ip has already been distributed
+        """
+        self._allocator.reserve(IpValidation.validate_ip_address(ip_string))
 
-        if (
-            self.last_distributed_ip == self.net_address.network_address
-            or self.last_distributed_ip == self.net_address.broadcast_address
-        ):
-            return self.get_next_ip()
+    def release_ip(self, ip_string):
+        """
+        releases a distributed ip, so it can be handed out again
+        
+        :param ip_string: the ip to release
+        :type ip_string: str
+        :raises IpAllocator.IpNotAssignableException: if the ip can not be distributed from this range
+        """
+        self._allocator.release(IpValidation.validate_ip_address(ip_string))
+
+        if ip_string in self.distributed_ips:
+            self.distributed_ips.remove(ip_string)
 
-        return str(self.last_distributed_ip)
+    def release_distributed_ips(self):
+        """
+        releases all ips, which have been handed out by this distributor, for example because the targets they have
+        been distributed for are not created
+        """
+        for ip_string in list(self.distributed_ips):
+            self.release_ip(ip_string)
+
+
+class PersistentIpDistributor(IpDistributor):
+    """
+    an IpDistributor, which persists the distributed ips of its range. All distributors of the same range share them,
+    even if they are used by different processes, so the same ip is never handed out twice.
+    """
+    def _create_allocator(self):
+        return IpRangeAllocation.get_for_range(self.from_ip, self.to_ip, self.net_address)
@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from remote_host.public import RemoteHost
 
 from source.public import Source
@@ -24,17 +26,20 @@ class SourceParser(DbItemHandler):
         """
         pass
 
-    def __init__(self, blueprints, cloud_settings):
+    def __init__(self, blueprints, cloud_settings, persistent_ip_distribution=False):
         """
         :param blueprints: the blueprints which should be used to resolve the sources blueprints
         :type blueprints: dict
         :param cloud_settings: the cloud settings from the migration plan used
         :type cloud_settings: dict
+        :param persistent_ip_distribution: if True, the ips of the targets are distributed using the persisted state of
+        their ranges, so concurrently parsed sources never get the same ip
+        :type persistent_ip_distribution: bool
         """
         super().__init__()
         self._cloud_settings = cloud_settings
         self._blueprint_resolver = BlueprintResolver(blueprints)
-        self._network_mapper = NetworkMapper(cloud_settings['networks'])
+        self._network_mapper = NetworkMapper(cloud_settings['networks'], persistent_ip_distribution)
 
     def parse(self, source):
         """
@@ -45,39 +50,108 @@ class SourceParser(DbItemHandler):
         :return: the created Source
         :rtype: Source
         """
+        return self.parse_many([source])[0]
+
+    def parse_many(self, sources, migration_run=None):
+        """
+        parses the given sources using the provided blueprints and creates them, using one bulk insert per model
+
+        :param sources: the sources to parse
+        :type sources: list[dict]
+        :param migration_run: the migration run the sources are part of
+        :type migration_run: migration_run.public.MigrationRun
+        :return: the created Sources, in the order of the given sources
+        :rtype: list[Source]
+        """
+        return self.persist([self.build(source) for source in sources], migration_run)
+
+    def build(self, source):
+        """
+        parses the given source using the provided blueprints, without creating any db entries. The returned Source, its
+        RemoteHost and its Target are kept in memory, until they are persisted.
+
+        :param source: the source to parse
+        :type source: dict
+        :return: the unsaved Source
+        :rtype: Source
+        """
         try:
             blueprint = self._resolve_blueprint(source)
-            remote_host = self._create_remote_host(source, blueprint)
+            remote_host = self._build_remote_host(source, blueprint)
             system_info = self._get_system_info(remote_host)
             self._update_remote_host_with_system_info(remote_host, system_info)
-            target = self._create_target(blueprint, system_info)
-            return self._create_source(remote_host, target)
+            target = self._build_target(blueprint, system_info)
+            return self._build_source(remote_host, target)
         except KeyError:
             raise SourceParser.InvalidSourceException(
                 'the source: {address} is not valid'.format(address=source.get('address', source))
             )
 
-    def _create_remote_host(self, source, blueprint):
+    def persist(self, sources, migration_run=None):
+        """
+        creates the db entries of the given built sources, their remote hosts and their targets in a single transaction,
+        using one bulk insert per model
+
+        :param sources: the built sources to persist
+        :type sources: list[Source]
+        :param migration_run: the migration run the sources are part of
+        :type migration_run: migration_run.public.MigrationRun
+        :return: the persisted sources
+        :rtype: list[Source]
+        """
+        with transaction.atomic():
+            RemoteHost.objects.bulk_create([source.remote_host for source in sources])
+            Target.objects.bulk_create([source.target for source in sources])
+
+            for source in sources:
+                # the related objects are assigned again, since their primary keys have been set by the bulk insert
+                source.remote_host = source.remote_host
+                source.target = source.target
+                source.migration_run = migration_run
+
+            Source.objects.bulk_create(sources)
+
+        for source in sources:
+            self.add_db_item(source.remote_host)
+            self.add_db_item(source.target)
+            self.add_db_item(source)
+
+        return sources
+
+    def get_persisted_ips(self):
+        """
+        :return: the ips, which have been distributed from persisted ranges for the targets, grouped by their range
+        :rtype: list[dict]
+        """
+        return self._network_mapper.get_persisted_ips()
+
+    def discard(self):
         """
-        creates the RemoteHost db entry
+        Stops handling all items, without deleting them, and releases the ips distributed for the targets, since the
+        targets have not been created
+        """
+        super().discard()
+        self._network_mapper.release_distributed_ips()
+
+    def _build_remote_host(self, source, blueprint):
+        """
+        builds the RemoteHost
         
         :param source: the source to use
         :type source: dict
         :param blueprint: the blueprint to use
         :type blueprint: dict
-        :return: the newly created remote host
+        :return: the unsaved remote host
         :rtype: RemoteHost
         """
-        return self.add_db_item(
-            RemoteHost.objects.create(
-                **{
-                    'address': source['address'],
-                    'username': blueprint['ssh'].get('username'),
-                    'password': blueprint['ssh'].get('password'),
-                    'private_key': blueprint['ssh'].get('private_key'),
-                    'private_key_file_path': blueprint['ssh'].get('private_key_file_path'),
-                }, **({'port': blueprint['ssh'].get('port')} if blueprint['ssh'].get('port') else {})
-            )
+        return RemoteHost(
+            **{
+                'address': source['address'],
+                'username': blueprint['ssh'].get('username'),
+                'password': blueprint['ssh'].get('password'),
+                'private_key': blueprint['ssh'].get('private_key'),
+                'private_key_file_path': blueprint['ssh'].get('private_key_file_path'),
+            }, **({'port': blueprint['ssh'].get('port')} if blueprint['ssh'].get('port') else {})
         )
 
     def _get_system_info(self, remote_host):
@@ -91,22 +165,20 @@ class SourceParser(DbItemHandler):
         """
         return RemoteHostSystemInfoGetter(remote_host).get_system_info()
 
-    def _create_source(self, remote_host, target):
+    def _build_source(self, remote_host, target):
         """
-        creates the source db entry
+        builds the source
         
         :param remote_host: the remote host which is used to connect to the source
         :type remote_host: RemoteHost
         :param target: the target which the source translates to
         :type target: Target
-        :return: the newly created source
+        :return: the unsaved source
         :rtype: Source
         """
-        return self.add_db_item(
-            Source.objects.create(
-                target=target,
-                remote_host=remote_host,
-            )
+        return Source(
+            target=target,
+            remote_host=remote_host,
         )
 
     def _update_remote_host_with_system_info(self, remote_host, system_info):
@@ -121,17 +193,18 @@ class SourceParser(DbItemHandler):
         remote_host.system_info = system_info
         remote_host.os = system_info['os']['name']
         remote_host.version = system_info['os']['version']
-        remote_host.save()
+        remote_host.update_lookup_fields()
 
-    def _create_target(self, blueprint, system_info):
+    def _build_target(self, blueprint, system_info):
         """
-        creates a target db entry, using a provided blueprint
+        builds a target, using a provided blueprint
         
-        :param blueprint: the resolved blueprint to create the target with
-        :type blueprint: dict
+        :param blueprint: the resolved blueprint to create the target with. It is read only and shared with other
+        targets, so only its top level is copied
+        :type blueprint: dict_utils.public.ReadOnlyDict
         :param system_info: sources system info, used to find out the interfaces
         :type system_info: dict
-        :return: the newly created target
+        :return: the unsaved target
         :rtype: Target
         """
         blueprint_with_network_interfaces = {
@@ -142,10 +215,8 @@ class SourceParser(DbItemHandler):
             **blueprint,
         }
         blueprint_with_network_interfaces.pop('network_mapping')
-        return self.add_db_item(
-            Target.objects.create(
-                blueprint=blueprint_with_network_interfaces
-            )
+        return Target(
+            blueprint=blueprint_with_network_interfaces
         )
 
     def _resolve_blueprint(self, source):
@@ -1,4 +1,7 @@
+import copy
+
 from unittest import TestCase
+from unittest.mock import patch
 
 from test_assets.public import TestAsset
 
@@ -113,6 +116,7 @@ class TestBlueprintResolver(TestCase):
                         "sudo rsync -zaXAPx --delete --numeric-ids "
                         "-e \"ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no\" "
                         "--rsync-path=\"sudo rsync\" {SOURCE_DIR}/ {TARGET_DIR}",
+                    "block_sync_ssh": "ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no",
                     "reinstall_bootloader": "sudo grub-install --boot-directory=/boot {DEVICE}",
                 }
             }
@@ -196,6 +200,7 @@ class TestBlueprintResolver(TestCase):
                         "sudo rsync -zaXAPx --delete --numeric-ids "
                         "-e \"ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no\" "
                         "--rsync-path=\"sudo rsync\" {SOURCE_DIR}/ {TARGET_DIR}",
+                    "block_sync_ssh": "ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no",
                     "reinstall_bootloader": "sudo grub-install --boot-directory=/boot {DEVICE}",
                 }
             }
@@ -208,3 +213,73 @@ class TestBlueprintResolver(TestCase):
     def test_resolve__invalid_blueprint(self):
         with self.assertRaises(BlueprintResolver.ResolvingException):
             self.blueprint_resolver.resolve(123)
+
+    def test_resolve__blueprints_not_modified(self):
+        blueprints = copy.deepcopy(TestAsset.MIGRATION_PLAN_MOCK['blueprints'])
+        blueprint = {'parent': 'django', 'hardware': {'cores': 4}}
+
+        BlueprintResolver(blueprints).resolve(blueprint)
+        BlueprintResolver(blueprints).resolve('django')
+
+        self.assertEqual(blueprints, TestAsset.MIGRATION_PLAN_MOCK['blueprints'])
+        self.assertEqual(blueprint, {'parent': 'django', 'hardware': {'cores': 4}})
+
+    def test_resolve__read_only(self):
+        blueprint = {'parent': 'django', 'hardware': {'cores': 4}}
+
+        with self.assertRaises(TypeError):
+            self.blueprint_resolver.resolve('django')['ssh'] = None
+        with self.assertRaises(TypeError):
+            self.blueprint_resolver.resolve('django')['ssh']['username'] = 'changed'
+        with self.assertRaises(TypeError):
+            self.blueprint_resolver.resolve(blueprint)['network_mapping']['0.0.0.0/0'].pop('network')
+        with self.assertRaises(TypeError):
+            self.blueprint_resolver.resolve(blueprint)['hardware'].update(cores=8)
+
+        self.assertEqual(self.blueprint_resolver.resolve('django')['ssh']['username'], 'root')
+        self.assertEqual(self.blueprint_resolver.resolve(blueprint)['network_mapping']['0.0.0.0/0']['network'], 'LAN 1')
+        self.assertEqual(blueprint, {'parent': 'django', 'hardware': {'cores': 4}})
+
+    def test_resolve__lists_read_only(self):
+        blueprint_resolver = BlueprintResolver({'base': {'hooks': {'commands': ['first']}}})
+
+        self.assertEqual(blueprint_resolver.resolve({'parent': 'base'})['hooks']['commands'], ('first',))
+
+    def test_resolve__base_blueprint_shared(self):
+        blueprint = {'parent': 'django', 'hardware': {'cores': 4}}
+
+        self.assertIs(self.blueprint_resolver.resolve('django'), self.blueprint_resolver.resolve('django'))
+        self.assertIs(
+            self.blueprint_resolver.resolve(blueprint)['ssh'],
+            self.blueprint_resolver.resolve('django')['ssh']
+        )
+        self.assertIsNot(
+            self.blueprint_resolver.resolve(blueprint)['hardware'],
+            self.blueprint_resolver.resolve('django')['hardware']
+        )
+
+    def test_resolve__base_blueprint_resolved_once(self):
+        with patch.object(
+            self.blueprint_resolver,
+            '_merge_with_parent',
+            wraps=self.blueprint_resolver._merge_with_parent
+        ) as mocked_merge_with_parent:
+            self.blueprint_resolver.resolve('django')
+            self.blueprint_resolver.resolve('django')
+            self.blueprint_resolver.resolve({'parent': 'django'})
+
+        self.assertEqual(mocked_merge_with_parent.call_count, 3)
+
+    def test_resolve__cyclic_inheritance(self):
+        blueprint_resolver = BlueprintResolver({
+            'first': {'parent': 'second'},
+            'second': {'parent': 'third'},
+            'third': {'parent': 'first'},
+        })
+
+        with self.assertRaisesRegex(BlueprintResolver.ResolvingException, 'first -> second -> third -> first'):
+            blueprint_resolver.resolve({'parent': 'first'})
+
+    def test_resolve__self_inheritance(self):
+        with self.assertRaises(BlueprintResolver.ResolvingException):
+            BlueprintResolver({'first': {'parent': 'first'}}).resolve('first')
@@ -1,9 +1,20 @@
+import copy
+import ipaddress
+
+from unittest.mock import patch
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ip_allocation.public import IpRangeAllocation
 
 from migration_plan.public import MigrationPlan
 
 from migration_run.public import MigrationRun
 
+from remote_host.public import RemoteHost
+
 from source.public import Source
 
 from target.public import Target
@@ -59,3 +70,103 @@ class TestMigrationPlanParser(TestCase, metaclass=TestAsset.PatchRemoteHostMeta)
         self.assertEquals(MigrationRun.objects.count(), 0)
         self.assertEquals(Source.objects.count(), 0)
         self.assertEquals(Target.objects.count(), 0)
+
+    def test_parse__bulk_created(self):
+        migration_plan_parser = MigrationPlanParser()
+
+        with CaptureQueriesContext(connection) as queries:
+            migration_plan_parser.parse(TestAsset.MIGRATION_PLAN_MOCK)
+
+        self.assertEquals(
+            [query['sql'].split()[2] for query in queries.captured_queries if query['sql'].startswith('INSERT')],
+            [
+                '"migration_plan_migrationplan"',
+                '"migration_run_migrationrun"',
+                '"remote_host_remotehost"',
+                '"target_target"',
+                '"source_source"',
+            ]
+        )
+        self.assertFalse([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')])
+
+    def test_parse__rolled_back_on_failure(self):
+        migration_plan_parser = MigrationPlanParser()
+
+        with patch('source.public.Source.objects.bulk_create', side_effect=failing_method):
+            with self.assertRaises(Exception):
+                migration_plan_parser.parse(TestAsset.MIGRATION_PLAN_MOCK)
+
+        self.assertEquals(MigrationPlan.objects.count(), 0)
+        self.assertEquals(MigrationRun.objects.count(), 0)
+        self.assertEquals(RemoteHost.objects.count(), 0)
+        self.assertEquals(Target.objects.count(), 0)
+        self.assertEquals(migration_plan_parser.db_items, [])
+
+    def _get_persistent_migration_plan(self):
+        migration_plan = copy.deepcopy(TestAsset.MIGRATION_PLAN_MOCK)
+        migration_plan['migration']['persistent_ip_distribution'] = True
+        return migration_plan
+
+    def _get_allocated_ips(self):
+        return {
+            str(ipaddress.ip_address(ip_range_allocation.from_ip) + offset)
+            for ip_range_allocation in IpRangeAllocation.objects.all()
+            for offset in range(int(ipaddress.ip_address(ip_range_allocation.to_ip)) - int(
+                ipaddress.ip_address(ip_range_allocation.from_ip)
+            ) + 1)
+            if ip_range_allocation.is_allocated(ipaddress.ip_address(ip_range_allocation.from_ip) + offset)
+        }
+
+    def test_parse__persisted_ips_recorded(self):
+        migration_run = MigrationPlanParser().parse(self._get_persistent_migration_plan())
+
+        self.assertEqual(
+            {ip for allocation in migration_run.allocated_ips for ip in allocation['ips']},
+            self._get_allocated_ips()
+        )
+        self.assertTrue(self._get_allocated_ips())
+        self.assertEqual(MigrationRun.objects.get().allocated_ips, migration_run.allocated_ips)
+
+    def test_parse__in_memory_ips_not_recorded(self):
+        self.assertEqual(MigrationPlanParser().parse(TestAsset.MIGRATION_PLAN_MOCK).allocated_ips, [])
+
+    def test_parse__persisted_ips_released_on_failure(self):
+        with patch('source.public.Source.objects.bulk_create', side_effect=failing_method):
+            with self.assertRaises(Exception):
+                MigrationPlanParser().parse(self._get_persistent_migration_plan())
+
+        self.assertTrue(IpRangeAllocation.objects.exists())
+        self.assertEqual(self._get_allocated_ips(), set())
+
+    def test_parse__persisted_ips_released_on_build_failure(self):
+        migration_plan = self._get_persistent_migration_plan()
+        migration_plan['sources'].append({'address': 'i.do.not.exist', 'blueprint': 'i_do_not_exist'})
+
+        with self.assertRaises(Exception):
+            MigrationPlanParser().parse(migration_plan)
+
+        self.assertTrue(IpRangeAllocation.objects.exists())
+        self.assertEqual(self._get_allocated_ips(), set())
+
+    def test_delete__persisted_ips_released(self):
+        MigrationPlanParser().parse(self._get_persistent_migration_plan())
+
+        MigrationRun.objects.all().delete()
+
+        self.assertEqual(self._get_allocated_ips(), set())
+
+    def test_delete__persisted_ips_released_by_cascade(self):
+        MigrationPlanParser().parse(self._get_persistent_migration_plan())
+
+        MigrationPlan.objects.all().delete()
+
+        self.assertEqual(self._get_allocated_ips(), set())
+
+    def test_delete__persisted_ips_of_other_runs_kept(self):
+        MigrationPlanParser().parse(self._get_persistent_migration_plan())
+        allocated_ips = self._get_allocated_ips()
+        migration_run = MigrationPlanParser().parse(self._get_persistent_migration_plan())
+
+        migration_run.delete()
+
+        self.assertEqual(self._get_allocated_ips(), allocated_ips)
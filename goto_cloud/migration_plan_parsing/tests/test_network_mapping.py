@@ -1,8 +1,12 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import ipaddress
 
-from ..network_mapping import IpDistributor, NetworkMapper, IpValidation
+from django.test import TestCase as DjangoTestCase
+
+from ..network_mapping import IpDistributor, NetworkMapper, IpValidation, PersistentIpDistributor, \
+    CompiledNetworkMapping
 
 
 class TestNetworkMapper(TestCase):
@@ -269,6 +273,89 @@ class TestNetworkMapper(TestCase):
         )
 
 
+    def test_map_interfaces__network_mapping_compiled_once(self):
+        blueprint = {
+            'network_mapping': {
+                '10.17.32.0/24': {
+                    'network': 'LAN 2',
+                },
+            },
+        }
+        interfaces = {
+            'eth0': {
+                'ip': '10.17.32.6',
+                'net_mask': '255.255.255.0',
+                'routes': []
+            },
+        }
+
+        with patch.object(
+            self.network_assigner,
+            '_create_network_mapping',
+            wraps=self.network_assigner._create_network_mapping
+        ) as mocked_create_network_mapping:
+            self.network_assigner.map_interfaces(interfaces, blueprint)
+            self.network_assigner.map_interfaces(interfaces, {'network_mapping': dict(blueprint['network_mapping'])})
+
+        self.assertEqual(mocked_create_network_mapping.call_count, 1)
+
+    def test_map_interfaces__many_network_mappings(self):
+        blueprint = {
+            'network_mapping': {
+                '10.{index}.0.0/16'.format(index=index): {
+                    'network': 'LAN 2',
+                    'range': {'from': '10.17.32.10', 'to': '10.17.32.250'},
+                } for index in range(200)
+            },
+        }
+        blueprint['network_mapping']['10.17.0.0/16'] = {'network': 'LAN 3'}
+        interfaces = {
+            'eth{index}'.format(index=index): {
+                'ip': '10.{index}.0.5'.format(index=index),
+                'net_mask': '255.255.0.0',
+                'routes': []
+            } for index in range(16, 18)
+        }
+
+        self.assertEquals(
+            [interface['network_id'] for interface in self.network_assigner.map_interfaces(interfaces, blueprint)],
+            ['LAN 2', 'LAN 3']
+        )
+
+
+class TestCompiledNetworkMapping(TestCase):
+    def setUp(self):
+        self.network_mapping = CompiledNetworkMapping({
+            '10.17.32.0/24': {'network': 'LAN 2', 'static': '10.17.32.100'},
+            '10.17.0.0/16': {'network': 'LAN 3', 'range': {'from': '10.17.33.10', 'to': '10.17.33.20'}},
+            '0.0.0.0/0': {'network': 'LAN 1'},
+        })
+
+    def _get_network(self, ip, net_mask):
+        return self.network_mapping.get_network(ipaddress.ip_address(ip), ipaddress.ip_address(net_mask))
+
+    def test_get_network(self):
+        self.assertEqual(
+            self._get_network('10.17.32.6', '255.255.255.0'),
+            {'network': 'LAN 2', 'static': '10.17.32.100'}
+        )
+        self.assertEqual(
+            self._get_network('10.17.32.6', '255.255.0.0'),
+            {'network': 'LAN 3', 'range': {'from': '10.17.33.10', 'to': '10.17.33.20'}}
+        )
+
+    def test_get_network__public_fallback(self):
+        self.assertEqual(self._get_network('10.18.32.6', '255.255.255.0'), {'network': 'LAN 1'})
+        self.assertEqual(self._get_network('10.17.32.6', '255.0.255.0'), {'network': 'LAN 1'})
+
+    def test_get_network__no_fallback(self):
+        network_mapping = CompiledNetworkMapping({'10.17.32.0/24': {'network': 'LAN 2'}})
+
+        self.assertIsNone(
+            network_mapping.get_network(ipaddress.ip_address('10.18.32.6'), ipaddress.ip_address('255.255.255.0'))
+        )
+
+
 class TestIpDistributor(TestCase):
     def test_get_next_ip(self):
         distributor = IpDistributor(
@@ -323,6 +410,45 @@ class TestIpDistributor(TestCase):
         with self.assertRaises(IpDistributor.RangeExhaustedException):
             distributor.get_next_ip()
 
+    def test_reserve_ip(self):
+        distributor = IpDistributor(
+            ipaddress.ip_address('192.168.0.100'),
+            ipaddress.ip_address('192.168.0.104'),
+            ipaddress.ip_network('192.168.0.0/24'),
+        )
+
+        distributor.reserve_ip('192.168.0.100')
+
+        self.assertEquals(distributor.get_next_ip(), '192.168.0.101')
+
+    def test_release_ip(self):
+        distributor = IpDistributor(
+            ipaddress.ip_address('192.168.0.100'),
+            ipaddress.ip_address('192.168.0.104'),
+            ipaddress.ip_network('192.168.0.0/24'),
+        )
+
+        distributor.get_next_ip()
+        distributor.get_next_ip()
+        distributor.release_ip('192.168.0.100')
+
+        self.assertEquals(distributor.get_next_ip(), '192.168.0.100')
+        self.assertEquals(distributor.get_next_ip(), '192.168.0.102')
+
+    def test_release_distributed_ips(self):
+        distributor = IpDistributor(
+            ipaddress.ip_address('192.168.0.100'),
+            ipaddress.ip_address('192.168.0.104'),
+            ipaddress.ip_network('192.168.0.0/24'),
+        )
+
+        distributor.get_next_ip()
+        distributor.get_next_ip()
+        distributor.release_distributed_ips()
+
+        self.assertEquals(distributor.distributed_ips, [])
+        self.assertEquals(distributor.get_next_ip(), '192.168.0.100')
+
 
 class TestIpValidation(TestCase):
     def test_validate_ip_address(self):
@@ -368,3 +494,67 @@ class TestIpValidation(TestCase):
                 ipaddress.ip_address('192.168.0.10'),
                 ipaddress.ip_network('192.168.0.0/24'),
             )
+
+
+class TestPersistentIpDistributor(DjangoTestCase):
+    def _create_distributor(self):
+        return PersistentIpDistributor(
+            ipaddress.ip_address('10.17.32.10'),
+            ipaddress.ip_address('10.17.32.20'),
+            ipaddress.ip_network('10.17.32.0/24'),
+        )
+
+    def test_get_next_ip__shared_between_distributors(self):
+        self.assertEqual(self._create_distributor().get_next_ip(), '10.17.32.10')
+        self.assertEqual(self._create_distributor().get_next_ip(), '10.17.32.11')
+
+    def test_release_ip(self):
+        distributor = self._create_distributor()
+        distributor.get_next_ip()
+        distributor.release_ip('10.17.32.10')
+
+        self.assertEqual(self._create_distributor().get_next_ip(), '10.17.32.10')
+
+    def test_network_mapper(self):
+        network_settings = {'LAN 2': {'net': '10.17.32.0/24'}}
+        network = {'network': 'LAN 2', 'range': {'from': '10.17.32.10', 'to': '10.17.32.20'}}
+
+        self.assertEqual(
+            NetworkMapper(network_settings, persistent_ip_distribution=True).assign_network_settings(network)['ip'],
+            '10.17.32.10'
+        )
+        self.assertEqual(
+            NetworkMapper(network_settings, persistent_ip_distribution=True).assign_network_settings(network)['ip'],
+            '10.17.32.11'
+        )
+
+    def test_network_mapper__persisted_ips_released(self):
+        network_settings = {'LAN 1': {'net': '192.168.0.0/24'}, 'LAN 2': {'net': '10.17.32.0/24'}}
+        network = {'network': 'LAN 2', 'range': {'from': '10.17.32.10', 'to': '10.17.32.20'}}
+        network_mapper = NetworkMapper(network_settings, persistent_ip_distribution=True)
+
+        network_mapper.assign_network_settings(network)
+        network_mapper.assign_network_settings(network)
+        NetworkMapper(network_settings).assign_network_settings(
+            {'network': 'LAN 1', 'range': {'from': '192.168.0.10', 'to': '192.168.0.20'}}
+        )
+
+        self.assertEqual(network_mapper.get_persisted_ips(), [{
+            'net_address': '10.17.32.0/24',
+            'from_ip': '10.17.32.10',
+            'to_ip': '10.17.32.20',
+            'ips': ['10.17.32.10', '10.17.32.11'],
+        }])
+
+        network_mapper.release_distributed_ips()
+
+        self.assertEqual(network_mapper.get_persisted_ips(), [])
+        self.assertEqual(self._create_distributor().get_next_ip(), '10.17.32.10')
+
+    def test_network_mapper__in_memory_ips_not_persisted(self):
+        network_mapper = NetworkMapper({'LAN 2': {'net': '10.17.32.0/24'}})
+        network_mapper.assign_network_settings(
+            {'network': 'LAN 2', 'range': {'from': '10.17.32.10', 'to': '10.17.32.20'}}
+        )
+
+        self.assertEqual(network_mapper.get_persisted_ips(), [])
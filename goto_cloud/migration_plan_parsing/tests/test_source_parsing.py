@@ -94,3 +94,27 @@ class TestSourceParsing(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
             ).parse({
                 "address": "ubuntu12",
             })
+
+    def test_parse_many(self):
+        sources = SourceParser(
+            TestAsset.MIGRATION_PLAN_MOCK['blueprints'],
+            TestAsset.MIGRATION_PLAN_MOCK['target_cloud'],
+        ).parse_many(TestAsset.MIGRATION_PLAN_MOCK['sources'])
+
+        self.assertEquals(list(Source.objects.order_by('pk')), sources)
+        self.assertEquals(
+            [source.remote_host.address for source in Source.objects.order_by('pk')],
+            [source['address'] for source in TestAsset.MIGRATION_PLAN_MOCK['sources']]
+        )
+        for source in Source.objects.all():
+            self.assertIsNotNone(source.target)
+
+    def test_build__nothing_created(self):
+        source = SourceParser(
+            TestAsset.MIGRATION_PLAN_MOCK['blueprints'],
+            TestAsset.MIGRATION_PLAN_MOCK['target_cloud'],
+        ).build(TestAsset.MIGRATION_PLAN_MOCK['sources'][0])
+
+        self.assertIsNone(source.pk)
+        self.assertEquals(source.remote_host.os, 'Ubuntu')
+        self.assertEquals(Source.objects.count(), 0)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:40
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('migration_run', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='migrationrun',
+            name='allocated_ips',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=list),
+        ),
+    ]
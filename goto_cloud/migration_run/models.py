@@ -1,4 +1,11 @@
+import ipaddress
+
+from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from ip_allocation.public import IpRangeAllocation
 
 from tracked_model.public import TrackedModel
 
@@ -10,3 +17,30 @@ class MigrationRun(TrackedModel):
     represents a single execution of migration, defined by the migration plan, this run is related to
     """
     plan = models.ForeignKey(MigrationPlan, related_name='migration_runs')
+    allocated_ips = JSONField(default=list)
+    """
+    the ips, which have been distributed from persisted ranges for the targets of this run, as returned by
+    NetworkMapper.get_persisted_ips. They are released, when the run is deleted.
+    """
+
+    def release_allocated_ips(self):
+        """
+        releases the ips, which have been distributed for the targets of this run, so they can be distributed again
+        """
+        for allocation in self.allocated_ips:
+            for ip_range_allocation in IpRangeAllocation.objects.filter(
+                net_address=allocation['net_address'],
+                from_ip=allocation['from_ip'],
+                to_ip=allocation['to_ip'],
+            ):
+                ip_range_allocation.release_many([ipaddress.ip_address(ip) for ip in allocation['ips']])
+
+        self.allocated_ips = []
+
+
+@receiver(pre_delete, sender=MigrationRun)
+def release_allocated_ips(sender, instance, **kwargs):
+    """
+    releases the allocated ips of a migration run, which is deleted, including runs deleted by a cascade
+    """
+    instance.release_allocated_ips()
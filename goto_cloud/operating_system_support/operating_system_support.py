@@ -1,3 +1,5 @@
+import inspect
+
 from abc import ABCMeta, abstractmethod
 
 from dict_utils.public import DictUtils
@@ -17,6 +19,9 @@ class OperatingSystemRelations():
     system.
     """
 
+    _subsystems_cache = {}
+    _cached_relations = None
+
     def __init__(self, operating_system):
         """
         
@@ -34,7 +39,7 @@ class OperatingSystemRelations():
         :return: whether it is a parent or not
         :rtype: bool
         """
-        return related_operating_system in self.get_subsystems()
+        return related_operating_system in self._get_cached_subsystems()
 
     def is_child_of(self, related_operating_system):
         """
@@ -45,7 +50,7 @@ class OperatingSystemRelations():
         :return: whether it is a child or not
         :rtype: bool
         """
-        return self.operating_system in OperatingSystemRelations(related_operating_system).get_subsystems()
+        return self.operating_system in OperatingSystemRelations(related_operating_system)._get_cached_subsystems()
 
     def get_subsystems(self):
         """
@@ -54,24 +59,53 @@ class OperatingSystemRelations():
         :return: list of subsystems
         :rtype: list
         """
-        subsystems = DictUtils.find_sub_dict_by_key(self._RELATIONS, self.operating_system)
-        return DictUtils.flatten_child_elements(subsystems) if subsystems else []
+        return list(self._get_cached_subsystems())
+
+    def _get_cached_subsystems(self):
+        """
+        returns the subsystems of the operating system, which are only looked up once per operating system. The cache is
+        bound to the identity of the relations, so it is dropped if they are replaced.
+
+        :return: the subsystems
+        :rtype: tuple
+        """
+        relations = self._RELATIONS
+
+        if OperatingSystemRelations._cached_relations is not relations:
+            OperatingSystemRelations._subsystems_cache = {}
+            OperatingSystemRelations._cached_relations = relations
+
+        if self.operating_system not in OperatingSystemRelations._subsystems_cache:
+            subsystems = DictUtils.find_sub_dict_by_key(relations, self.operating_system)
+            OperatingSystemRelations._subsystems_cache[self.operating_system] = tuple(
+                DictUtils.flatten_child_elements(subsystems) if subsystems else []
+            )
+
+        return OperatingSystemRelations._subsystems_cache[self.operating_system]
 
 
 class AbstractedRemoteHostOperator(metaclass=ABCMeta):
     """
     a operation which executes on a given RemoteHost and abstracts the operating system support away. All method calls
     to an instance of this class, are proxied to the supported operator, which is chosen at runtime.
+
+    Which operator class supports which operating system is only evaluated once per operator and operating system, and
+    methods of the operator are only looked up once per instance.
     """
-    NOT_PROXIED_ATTRIBUTES = (
+    NOT_PROXIED_ATTRIBUTES = frozenset((
         'operator',
         'remote_host',
+        '_bound_methods',
         '_get_supported_operator',
-        '_get_directly_supported_operator',
-        '_get_related_supported_operator',
+        '_get_supported_operator_class',
+        '_get_directly_supported_operator_class',
+        '_get_related_supported_operator_class',
         '_get_operating_systems_to_supported_operation_mapping',
         '_init_operator_class',
-    )
+    ))
+
+    _operator_class_cache = {}
+    _cached_relations = None
 
     def __init__(self, remote_host):
         """
@@ -80,51 +114,81 @@ class AbstractedRemoteHostOperator(metaclass=ABCMeta):
         :param remote_host: the remote host you wan to execute on
         :type remote_host: remote_host.public.RemoteHost
         """
+        self._bound_methods = {}
         self.remote_host = remote_host
         self.operator = self._get_supported_operator()
 
     def _get_supported_operator(self):
         """
-        returns the supported operator class for a given RemoteHost  
+        returns the supported operator for a given RemoteHost  
         
+        :return: a operator, which is supported by the given RemoteHost
+        :rtype: Any
+        :raises OperatingSystem.NotSupportedException: raised in case, the operating system of the given RemoteHost is
+        not supported at all
+        """
+        return self._init_operator_class(self._get_supported_operator_class())
+
+    def _get_supported_operator_class(self):
+        """
+        returns the supported operator class for a given RemoteHost. The result is cached per operator and operating
+        system, as long as the operating system relations are not replaced.
+
         :return: a operator class, which is supported by the given RemoteHost
         :rtype: Any.__class__
         :raises OperatingSystem.NotSupportedException: raised in case, the operating system of the given RemoteHost is
         not supported at all
         """
-        supported_operator = self._get_directly_supported_operator()
+        if AbstractedRemoteHostOperator._cached_relations is not OperatingSystemRelations._RELATIONS:
+            AbstractedRemoteHostOperator._operator_class_cache = {}
+            AbstractedRemoteHostOperator._cached_relations = OperatingSystemRelations._RELATIONS
 
-        if supported_operator:
-            return supported_operator
+        cache_key = (type(self), self.remote_host.os)
 
-        related_supported_operator = self._get_related_supported_operator()
+        if cache_key not in AbstractedRemoteHostOperator._operator_class_cache:
+            AbstractedRemoteHostOperator._operator_class_cache[cache_key] = (
+                self._get_directly_supported_operator_class() or self._get_related_supported_operator_class()
+            )
 
-        if related_supported_operator:
-            return related_supported_operator
+        supported_operator_class = AbstractedRemoteHostOperator._operator_class_cache[cache_key]
+
+        if supported_operator_class:
+            return supported_operator_class
 
         raise OperatingSystem.NotSupportedException()
 
-    def _get_directly_supported_operator(self):
+    def _get_directly_supported_operator_class(self):
         for operating_systems, operator_class in self._get_operating_systems_to_supported_operation_mapping().items():
             if self.remote_host.os in operating_systems:
-                return self._init_operator_class(operator_class)
+                return operator_class
         return None
 
-    def _get_related_supported_operator(self):
+    def _get_related_supported_operator_class(self):
+        remote_host_operating_system_relations = OperatingSystemRelations(self.remote_host.os)
+
         for operating_systems, operator_class in self._get_operating_systems_to_supported_operation_mapping().items():
-            remote_host_operating_system_relations = OperatingSystemRelations(self.remote_host.os)
             if any(
                 remote_host_operating_system_relations.is_child_of(operating_system)
                 for operating_system in operating_systems
             ):
-                return self._init_operator_class(operator_class)
+                return operator_class
         return None
 
     def __getattribute__(self, item):
         if item in AbstractedRemoteHostOperator.NOT_PROXIED_ATTRIBUTES:
             return super().__getattribute__(item)
 
-        return getattr(self.operator, item)
+        bound_methods = super().__getattribute__('_bound_methods')
+
+        if item in bound_methods:
+            return bound_methods[item]
+
+        attribute = getattr(super().__getattribute__('operator'), item)
+
+        if inspect.ismethod(attribute):
+            bound_methods[item] = attribute
+
+        return attribute
 
     @abstractmethod
     def _get_operating_systems_to_supported_operation_mapping(self):
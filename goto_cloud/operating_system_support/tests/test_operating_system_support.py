@@ -1,5 +1,7 @@
 import unittest
 
+from unittest.mock import patch
+
 from django.test import TestCase
 
 from operating_system.public import OperatingSystem
@@ -27,8 +29,15 @@ RELATION_MOCK = {
 }
 
 
+RELATIONS = OperatingSystemRelations._RELATIONS
+
+
 class TestOperationA():
-    pass
+    def __init__(self):
+        self.state = 'initial'
+
+    def operate(self):
+        return self.state
 
 
 class TestOperationB():
@@ -50,6 +59,9 @@ class TestOperatingSystemRelations(unittest.TestCase):
     def setUp(self):
         OperatingSystemRelations._RELATIONS = RELATION_MOCK
 
+    def tearDown(self):
+        OperatingSystemRelations._RELATIONS = RELATIONS
+
     def test_get_subsystems(self):
         self.assertEqual(
             set(OperatingSystemRelations('2').get_subsystems()),
@@ -68,11 +80,29 @@ class TestOperatingSystemRelations(unittest.TestCase):
     def test_is_child_of(self):
         self.assertTrue(OperatingSystemRelations('3').is_child_of('1'))
 
+    def test_get_subsystems__cached(self):
+        OperatingSystemRelations('2').get_subsystems()
+
+        with patch('dict_utils.public.DictUtils.find_sub_dict_by_key') as find_sub_dict_by_key:
+            OperatingSystemRelations('2').get_subsystems()
+
+        find_sub_dict_by_key.assert_not_called()
+
+    def test_get_subsystems__cache_dropped_if_relations_replaced(self):
+        OperatingSystemRelations('2').get_subsystems()
+
+        OperatingSystemRelations._RELATIONS = {'2': {'17': '18'}}
+
+        self.assertEqual(set(OperatingSystemRelations('2').get_subsystems()), {'17', '18'})
+
 
 class TestAbstractedRemoteHostOperator(TestCase):
     def setUp(self):
         OperatingSystemRelations._RELATIONS = RELATION_MOCK
 
+    def tearDown(self):
+        OperatingSystemRelations._RELATIONS = RELATIONS
+
     def test_initialization(self):
         self.assertTrue(
             isinstance(
@@ -104,3 +134,42 @@ class TestAbstractedRemoteHostOperator(TestCase):
     def test_initialization__not_supported(self):
         with self.assertRaises(OperatingSystem.NotSupportedException):
             AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='16'))
+
+    def test_initialization__resolution_cached(self):
+        AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='4'))
+
+        with patch.object(
+            AbstractedRemoteHostOperatorTestImplementation,
+            '_get_operating_systems_to_supported_operation_mapping'
+        ) as get_mapping:
+            operator = AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='4')).operator
+
+        get_mapping.assert_not_called()
+        self.assertTrue(isinstance(operator, TestOperationA))
+
+    def test_initialization__resolution_cache_dropped_if_relations_replaced(self):
+        AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='4'))
+
+        OperatingSystemRelations._RELATIONS = {'13': {'4': '5'}}
+
+        self.assertTrue(
+            isinstance(
+                AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='4')).operator,
+                TestOperationB
+            )
+        )
+
+    def test_proxy__methods_bound_once(self):
+        operator = AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='8'))
+
+        self.assertIs(operator.operate, operator.operate)
+        self.assertEqual(operator.operate(), 'initial')
+
+    def test_proxy__attributes_not_cached(self):
+        operator = AbstractedRemoteHostOperatorTestImplementation(RemoteHost.objects.create(os='8'))
+        operator.state
+
+        operator.operator.state = 'changed'
+
+        self.assertEqual(operator.state, 'changed')
+        self.assertEqual(operator.operate(), 'changed')
@@ -0,0 +1,333 @@
+import csv
+import io
+import json
+import math
+
+from collections import namedtuple, OrderedDict
+
+from event_store.public import SourceEvent
+
+
+class PhaseSpan(namedtuple('PhaseSpan', ('source_id', 'phase', 'command', 'start', 'end', 'failed'))):
+    """
+    the time a command of a source has been running in a phase
+    """
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """
+        :return: the duration of the span in seconds
+        :rtype: float
+        """
+        return (self.end - self.start).total_seconds()
+
+
+class PhaseTimingReport():
+    """
+    Reports which phases dominate the wall time of a MigrationRun. The report is built out of the phase spans of all
+    sources, which are derived from the COMMAND_STARTED events and the COMMAND_FINISHED or COMMAND_FAILED events
+    following them. Commands which are still running are not part of the report.
+
+    The report consists of:
+    - percentiles of the durations per phase
+    - the critical path, which is the sequence of phases of the source that finished last, and therefore determined
+      the wall time of the run
+    - the utilization, which describes how many commands have been running concurrently over time
+    """
+    DEFAULT_PERCENTILES = (50, 90, 95, 99)
+    SPAN_CLOSING_EVENT_TYPES = (SourceEvent.EventType.COMMAND_FINISHED, SourceEvent.EventType.COMMAND_FAILED)
+
+    def __init__(self, spans, percentiles=DEFAULT_PERCENTILES):
+        """
+        :param spans: the phase spans the report is built out of
+        :type spans: list[PhaseSpan]
+        :param percentiles: the percentiles of the phase durations, which are reported
+        :type percentiles: tuple
+        """
+        self.spans = sorted(spans, key=lambda span: (span.start, span.end))
+        self.percentiles = percentiles
+
+    @classmethod
+    def for_migration_run(cls, migration_run, percentiles=DEFAULT_PERCENTILES):
+        """
+        builds the report for the given migration run, loading its events with a single query
+
+        :param migration_run: the migration run to report on
+        :type migration_run: migration_run.public.MigrationRun
+        :param percentiles: the percentiles of the phase durations, which are reported
+        :type percentiles: tuple
+        :return: the report
+        :rtype: PhaseTimingReport
+        """
+        return cls(
+            cls.build_spans(
+                SourceEvent.objects.in_migration_run(migration_run).of_types(
+                    SourceEvent.EventType.COMMAND_STARTED, *cls.SPAN_CLOSING_EVENT_TYPES
+                ).timeline().values_list('source_id', 'phase', 'command', 'event_type', 'timestamp')
+            ),
+            percentiles
+        )
+
+    @classmethod
+    def build_spans(cls, events):
+        """
+        pairs the start events with the events closing them
+
+        :param events: tuples of source_id, phase, command, event_type and timestamp, in the order of the timeline
+        :type events: collections.Iterable
+        :return: the spans, in the order they have been closed
+        :rtype: list[PhaseSpan]
+        """
+        started = {}
+        spans = []
+
+        for source_id, phase, command, event_type, timestamp in events:
+            if event_type == SourceEvent.EventType.COMMAND_STARTED:
+                started[(source_id, phase, command)] = timestamp
+            elif (source_id, phase, command) in started:
+                spans.append(PhaseSpan(
+                    source_id,
+                    phase,
+                    command,
+                    started.pop((source_id, phase, command)),
+                    timestamp,
+                    event_type == SourceEvent.EventType.COMMAND_FAILED,
+                ))
+
+        return spans
+
+    @property
+    def start(self):
+        """
+        :return: the time the first phase started at, or None if there are no spans
+        :rtype: datetime.datetime
+        """
+        return self.spans[0].start if self.spans else None
+
+    @property
+    def end(self):
+        """
+        :return: the time the last phase ended at, or None if there are no spans
+        :rtype: datetime.datetime
+        """
+        return max(span.end for span in self.spans) if self.spans else None
+
+    @property
+    def phases(self):
+        """
+        :return: the phases of the report, in the order they have been started first
+        :rtype: list[str]
+        """
+        return list(OrderedDict.fromkeys(span.phase for span in self.spans))
+
+    def get_phase_statistics(self):
+        """
+        aggregates the durations of every phase. If a phase has been executed several times for a source, for example
+        since its command returned a SLEEP signal, the durations of these executions are summed up.
+
+        :return: a mapping of every phase onto the number of sources and of failed executions, as well as the total,
+        the mean, the minimum, the maximum and the percentiles of its durations in seconds, like {'p50': float}
+        :rtype: collections.OrderedDict
+        """
+        durations = OrderedDict((phase, OrderedDict()) for phase in self.phases)
+        failures = dict.fromkeys(durations, 0)
+
+        for span in self.spans:
+            source_durations = durations[span.phase]
+            source_durations[span.source_id] = source_durations.get(span.source_id, 0) + span.duration
+            failures[span.phase] += span.failed
+
+        statistics = OrderedDict()
+        for phase, source_durations in durations.items():
+            phase_durations = sorted(source_durations.values())
+            statistics[phase] = OrderedDict((
+                ('sources', len(phase_durations)),
+                ('failed', failures[phase]),
+                ('total', sum(phase_durations)),
+                ('mean', sum(phase_durations) / len(phase_durations)),
+                ('min', phase_durations[0]),
+                ('max', phase_durations[-1]),
+            ))
+            for percentile in self.percentiles:
+                statistics[phase]['p{percentile}'.format(percentile=percentile)] = self._get_percentile(
+                    phase_durations, percentile
+                )
+
+        return statistics
+
+    @staticmethod
+    def _get_percentile(sorted_values, percentile):
+        """
+        :param sorted_values: the values to get the percentile of, in ascending order
+        :type sorted_values: list[float]
+        :param percentile: the percentile to get, between 0 and 100
+        :type percentile: float
+        :return: the percentile, interpolated linearly between the closest ranks
+        :rtype: float
+        """
+        rank = (len(sorted_values) - 1) * percentile / 100
+        lower, upper = math.floor(rank), math.ceil(rank)
+        return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+    def get_critical_path(self):
+        """
+        The sources of a run are migrated independently, so the wall time of a run is determined by the source that
+        finished last. Its phases form the critical path of the run. The time a phase waited, after the previous
+        phase of the source ended, or after the run started, is reported as well.
+
+        :return: the source id, the start, the end and the duration of the critical path, the busy and waiting time on
+        it, and its phases with their start, end, duration and waiting time. None if there are no spans.
+        :rtype: collections.OrderedDict
+        """
+        if not self.spans:
+            return None
+
+        critical_source_id = max(self.spans, key=lambda span: span.end).source_id
+        previous_end = self.start
+        phases = []
+
+        for span in (span for span in self.spans if span.source_id == critical_source_id):
+            phases.append(OrderedDict((
+                ('phase', span.phase),
+                ('command', span.command),
+                ('start', span.start),
+                ('end', span.end),
+                ('duration', span.duration),
+                ('wait', max((span.start - previous_end).total_seconds(), 0)),
+            )))
+            previous_end = max(previous_end, span.end)
+
+        return OrderedDict((
+            ('source_id', critical_source_id),
+            ('start', self.start),
+            ('end', self.end),
+            ('duration', (self.end - self.start).total_seconds()),
+            ('busy', sum(phase['duration'] for phase in phases)),
+            ('waiting', sum(phase['wait'] for phase in phases)),
+            ('phases', phases),
+        ))
+
+    def get_utilization(self, capacity=None):
+        """
+        sweeps over the starts and ends of all spans, to determine how many commands have been running concurrently
+
+        :param capacity: the number of commands, which could have been running concurrently. By default the peak
+        concurrency is used.
+        :type capacity: int
+        :return: the peak and the time weighted mean concurrency, the utilization of the capacity as a fraction, and the
+        timeline of the concurrency as a list of (timestamp, running commands) pairs, every pair describing the
+        concurrency from its timestamp until the next one
+        :rtype: collections.OrderedDict
+        """
+        changes = sorted(
+            [(span.start, 1) for span in self.spans] + [(span.end, -1) for span in self.spans],
+            key=lambda change: change[0]
+        )
+        timeline = []
+        running = 0
+        weighted_running = 0
+        previous_timestamp = None
+
+        for timestamp, change in changes:
+            if previous_timestamp is not None:
+                weighted_running += running * (timestamp - previous_timestamp).total_seconds()
+            previous_timestamp = timestamp
+            running += change
+
+            if timeline and timeline[-1][0] == timestamp:
+                timeline.pop()
+            if not timeline or timeline[-1][1] != running:
+                timeline.append((timestamp, running))
+
+        peak = max((running for timestamp, running in timeline), default=0)
+        duration = (self.end - self.start).total_seconds() if self.spans else 0
+        mean = weighted_running / duration if duration else float(peak)
+        capacity = capacity or peak
+
+        return OrderedDict((
+            ('peak', peak),
+            ('mean', mean),
+            ('utilization', mean / capacity if capacity else 0.0),
+            ('timeline', timeline),
+        ))
+
+    def to_dict(self, capacity=None):
+        """
+        :param capacity: the capacity the utilization is calculated for
+        :type capacity: int
+        :return: the whole report, with timestamps formatted in ISO 8601, so it can be serialized as JSON
+        :rtype: collections.OrderedDict
+        """
+        utilization = self.get_utilization(capacity)
+        utilization['timeline'] = [[timestamp.isoformat(), running] for timestamp, running in utilization['timeline']]
+
+        critical_path = self.get_critical_path()
+        if critical_path:
+            critical_path['start'] = critical_path['start'].isoformat()
+            critical_path['end'] = critical_path['end'].isoformat()
+            for phase in critical_path['phases']:
+                phase['start'] = phase['start'].isoformat()
+                phase['end'] = phase['end'].isoformat()
+
+        return OrderedDict((
+            ('phases', self.get_phase_statistics()),
+            ('critical_path', critical_path),
+            ('utilization', utilization),
+        ))
+
+    def to_json(self, capacity=None):
+        """
+        :param capacity: the capacity the utilization is calculated for
+        :type capacity: int
+        :return: the whole report as JSON
+        :rtype: str
+        """
+        return json.dumps(self.to_dict(capacity), indent=2)
+
+    def phases_to_csv(self):
+        """
+        :return: the statistics of the phases as CSV, one row per phase
+        :rtype: str
+        """
+        statistics = self.get_phase_statistics()
+        columns = ['sources', 'failed', 'total', 'mean', 'min', 'max'] + [
+            'p{percentile}'.format(percentile=percentile) for percentile in self.percentiles
+        ]
+
+        return self._to_csv(
+            ['phase'] + columns,
+            (
+                [phase] + [phase_statistics[column] for column in columns]
+                for phase, phase_statistics in statistics.items()
+            )
+        )
+
+    def spans_to_csv(self):
+        """
+        :return: the spans of the report as CSV, one row per span
+        :rtype: str
+        """
+        return self._to_csv(
+            ['source_id', 'phase', 'command', 'start', 'end', 'duration', 'failed'],
+            (
+                [
+                    span.source_id,
+                    span.phase,
+                    span.command,
+                    span.start.isoformat(),
+                    span.end.isoformat(),
+                    span.duration,
+                    span.failed,
+                ]
+                for span in self.spans
+            )
+        )
+
+    @staticmethod
+    def _to_csv(header, rows):
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+        return output.getvalue()
@@ -0,0 +1 @@
+from .phase_timing_reporting import PhaseSpan, PhaseTimingReport
@@ -0,0 +1,191 @@
+import csv
+import datetime
+import io
+import json
+
+from django.test import TestCase
+from django.utils import timezone
+
+from event_store.public import SourceEvent
+
+from migration_plan.public import MigrationPlan
+
+from migration_run.public import MigrationRun
+
+from phase_timing_reporting.public import PhaseSpan, PhaseTimingReport
+
+from remote_host.public import RemoteHost
+
+from source.public import Source
+
+
+START = datetime.datetime(2017, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def create_span(source_id, phase, start, end, failed=False):
+    return PhaseSpan(
+        source_id,
+        phase,
+        'Command',
+        START + datetime.timedelta(seconds=start),
+        START + datetime.timedelta(seconds=end),
+        failed
+    )
+
+
+class TestPhaseTimingReport(TestCase):
+    def setUp(self):
+        self.report = PhaseTimingReport([
+            create_span(1, Source.Status.DRAFT, 0, 2),
+            create_span(2, Source.Status.DRAFT, 0, 4),
+            create_span(1, Source.Status.SYNC, 2, 12),
+            create_span(2, Source.Status.SYNC, 6, 26, failed=True),
+            create_span(2, Source.Status.SYNC, 26, 30),
+        ])
+
+    def test_span_duration(self):
+        self.assertEqual(create_span(1, Source.Status.DRAFT, 1, 3.5).duration, 2.5)
+
+    def test_phases(self):
+        self.assertEqual(self.report.phases, [Source.Status.DRAFT, Source.Status.SYNC])
+
+    def test_get_phase_statistics(self):
+        statistics = self.report.get_phase_statistics()
+
+        self.assertEqual(list(statistics), [Source.Status.DRAFT, Source.Status.SYNC])
+        self.assertEqual(dict(statistics[Source.Status.DRAFT]), {
+            'sources': 2,
+            'failed': 0,
+            'total': 6,
+            'mean': 3,
+            'min': 2,
+            'max': 4,
+            'p50': 3,
+            'p90': 3.8,
+            'p95': 3.9,
+            'p99': 3.98,
+        })
+        self.assertEqual(statistics[Source.Status.SYNC]['failed'], 1)
+        self.assertEqual(statistics[Source.Status.SYNC]['max'], 24)
+
+    def test_get_percentile(self):
+        self.assertEqual(PhaseTimingReport._get_percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertEqual(PhaseTimingReport._get_percentile([1, 2, 3, 4, 5], 100), 5)
+        self.assertEqual(PhaseTimingReport._get_percentile([1, 2, 3, 4, 5], 0), 1)
+        self.assertEqual(PhaseTimingReport._get_percentile([7], 99), 7)
+
+    def test_get_critical_path(self):
+        critical_path = self.report.get_critical_path()
+
+        self.assertEqual(critical_path['source_id'], 2)
+        self.assertEqual(critical_path['duration'], 30)
+        self.assertEqual(critical_path['busy'], 28)
+        self.assertEqual(critical_path['waiting'], 2)
+        self.assertEqual(
+            [(phase['phase'], phase['duration'], phase['wait']) for phase in critical_path['phases']],
+            [(Source.Status.DRAFT, 4, 0), (Source.Status.SYNC, 20, 2), (Source.Status.SYNC, 4, 0)]
+        )
+
+    def test_get_critical_path__no_spans(self):
+        self.assertIsNone(PhaseTimingReport([]).get_critical_path())
+
+    def test_get_utilization(self):
+        utilization = self.report.get_utilization()
+
+        self.assertEqual(utilization['peak'], 2)
+        self.assertEqual(utilization['mean'], (2 * 2 + 2 * 2 + 1 * 2 + 2 * 6 + 1 * 18) / 30)
+        self.assertEqual(utilization['utilization'], utilization['mean'] / 2)
+        self.assertEqual(
+            [(int((timestamp - START).total_seconds()), running) for timestamp, running in utilization['timeline']],
+            [(0, 2), (4, 1), (6, 2), (12, 1), (30, 0)]
+        )
+
+    def test_get_utilization__capacity(self):
+        self.assertEqual(
+            self.report.get_utilization(capacity=4)['utilization'],
+            self.report.get_utilization()['mean'] / 4
+        )
+
+    def test_get_utilization__no_spans(self):
+        self.assertEqual(dict(PhaseTimingReport([]).get_utilization()), {
+            'peak': 0,
+            'mean': 0.0,
+            'utilization': 0.0,
+            'timeline': [],
+        })
+
+    def test_to_json(self):
+        report = json.loads(self.report.to_json(capacity=4))
+
+        self.assertEqual(list(report), ['phases', 'critical_path', 'utilization'])
+        self.assertEqual(report['critical_path']['start'], START.isoformat())
+        self.assertEqual(report['utilization']['timeline'][0], [START.isoformat(), 2])
+
+    def test_to_json__no_spans(self):
+        self.assertIsNone(json.loads(PhaseTimingReport([]).to_json())['critical_path'])
+
+    def test_phases_to_csv(self):
+        rows = list(csv.reader(io.StringIO(self.report.phases_to_csv())))
+
+        self.assertEqual(
+            rows[0],
+            ['phase', 'sources', 'failed', 'total', 'mean', 'min', 'max', 'p50', 'p90', 'p95', 'p99']
+        )
+        self.assertEqual([row[0] for row in rows[1:]], [Source.Status.DRAFT, Source.Status.SYNC])
+
+    def test_spans_to_csv(self):
+        rows = list(csv.reader(io.StringIO(self.report.spans_to_csv())))
+
+        self.assertEqual(rows[0], ['source_id', 'phase', 'command', 'start', 'end', 'duration', 'failed'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[4], [
+            '2',
+            Source.Status.SYNC,
+            'Command',
+            (START + datetime.timedelta(seconds=6)).isoformat(),
+            (START + datetime.timedelta(seconds=26)).isoformat(),
+            '20.0',
+            'True',
+        ])
+
+
+class TestPhaseTimingReportForMigrationRun(TestCase):
+    def setUp(self):
+        self.migration_run = MigrationRun.objects.create(plan=MigrationPlan.objects.create())
+        self.source = Source.objects.create(migration_run=self.migration_run, remote_host=RemoteHost.objects.create())
+        self.start = timezone.now()
+
+    def _create_event(self, phase, event_type, seconds):
+        SourceEvent.objects.create(
+            source=self.source,
+            migration_run=self.migration_run,
+            phase=phase,
+            command='Command',
+            event_type=event_type,
+            timestamp=self.start + datetime.timedelta(seconds=seconds),
+        )
+
+    def test_for_migration_run(self):
+        self._create_event(Source.Status.DRAFT, SourceEvent.EventType.COMMAND_STARTED, 0)
+        self._create_event(Source.Status.DRAFT, SourceEvent.EventType.COMMAND_FINISHED, 1)
+        self._create_event(Source.Status.SYNC, SourceEvent.EventType.COMMAND_STARTED, 1)
+        self._create_event(Source.Status.SYNC, SourceEvent.EventType.COMMAND_FAILED, 4)
+        self._create_event(Source.Status.SYNC, SourceEvent.EventType.COMMAND_STARTED, 5)
+        Source.objects.create(remote_host=RemoteHost.objects.create()).events.create(
+            phase=Source.Status.DRAFT, event_type=SourceEvent.EventType.COMMAND_FINISHED
+        )
+
+        with self.assertNumQueries(1):
+            report = PhaseTimingReport.for_migration_run(self.migration_run)
+
+        self.assertEqual(
+            [(span.phase, span.duration, span.failed) for span in report.spans],
+            [(Source.Status.DRAFT, 1, False), (Source.Status.SYNC, 3, True)]
+        )
+        self.assertEqual(report.get_critical_path()['source_id'], self.source.pk)
+
+    def test_for_migration_run__no_events(self):
+        report = PhaseTimingReport.for_migration_run(self.migration_run)
+
+        self.assertEqual(report.spans, [])
+        self.assertEqual(report.get_phase_statistics(), {})
@@ -0,0 +1 @@
+from .remote_command_batching import RemoteCommandBatch, RemoteCommandResult
@@ -0,0 +1,293 @@
+import re
+
+from remote_execution.public import RemoteHostExecutor
+
+from remote_host_command.public import RemoteHostCommand
+
+
+class RemoteCommandResult():
+    """
+    the result of a single command, which has been executed as part of a RemoteCommandBatch
+    """
+    def __init__(self, command, exit_code=None, stdout='', stderr='', accepted_exit_codes=None, duration=None):
+        """
+        :param command: the executed command
+        :type command: str
+        :param exit_code: the exit code of the command, or None if the command has not been executed
+        :type exit_code: int
+        :param stdout: the output of the command
+        :type stdout: str
+        :param stderr: the error output of the command
+        :type stderr: str
+        :param accepted_exit_codes: exit codes which are accepted besides 0
+        :type accepted_exit_codes: tuple
+        :param duration: the time the command took to execute in seconds, or None if it is unknown
+        :type duration: float
+        """
+        self.command = command
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.accepted_exit_codes = accepted_exit_codes or ()
+        self.duration = duration
+
+    @property
+    def executed(self):
+        """
+        :return: whether the command has been executed, or was skipped since a previous command failed
+        :rtype: bool
+        """
+        return self.exit_code is not None
+
+    @property
+    def failed(self):
+        """
+        :return: whether the command has been executed and did not exit with an accepted exit code
+        :rtype: bool
+        """
+        return self.executed and self.exit_code not in self.accepted_exit_codes + (0,)
+
+    def get_error_message(self):
+        """
+        :return: an error message describing the failure, formatted like the ones of the RemoteExecutor
+        :rtype: str
+        """
+        return 'While executing:\n{command}\n\nThe following Error occurred:\n{error}'.format(
+            command=self.command,
+            error=self.stderr,
+        )
+
+
+class RemoteCommandBatch():
+    """
+    Collects commands and executes them on the remote host, using a single remote call. The commands are executed one
+    after another in a shell script, which captures the exit code, stdout and stderr of every command separately and
+    returns them in a delimited format, which is parsed into a RemoteCommandResult per command.
+
+    By default the execution stops at the first command which fails. Commands which may fail, without affecting the
+    following ones, can be added with stop_on_failure=False.
+
+    In parallel mode, the commands are started as background jobs and the batch waits for all of them to finish. If
+    max_concurrency is set, a command is only started once fewer than max_concurrency commands are running. The failure
+    of one command does not stop the others, but still raises an exception after the execution, if the command has been
+    added with stop_on_failure.
+
+    The duration of every executed command is measured on the remote host.
+    """
+    BATCH_DIRECTORY_VARIABLE = 'GOTO_CLOUD_BATCH'
+    FAILED_VARIABLE = 'GOTO_CLOUD_BATCH_FAILED'
+    COMMAND_MARKER = '# @@GOTO_CLOUD_COMMAND {index}@@'
+    RESULT_MARKER = '@@GOTO_CLOUD_RESULT {index} {exit_code} {duration}@@'
+    STDERR_MARKER = '@@GOTO_CLOUD_STDERR {index}@@'
+    RESULT_MARKER_PATTERN = re.compile(r'^@@GOTO_CLOUD_RESULT (\d+) (-?\d*) (\d*)@@$')
+    STDERR_MARKER_PATTERN = re.compile(r'^@@GOTO_CLOUD_STDERR (\d+)@@$')
+
+    SCRIPT_HEADER = (
+        '{BATCH_DIRECTORY}=$(mktemp -d)\n'
+        '{FAILED}=\n'
+    )
+    COMMAND_TEMPLATE = (
+        'if [ -z "${FAILED}" ]; then\n'
+        'GOTO_CLOUD_START=$(date +%s%N)\n'
+        '{COMMAND_MARKER}\n'
+        '(\n'
+        '{COMMAND}\n'
+        ') >"${BATCH_DIRECTORY}/{INDEX}.out" 2>"${BATCH_DIRECTORY}/{INDEX}.err"\n'
+        'GOTO_CLOUD_EXIT_CODE=$?\n'
+        'echo $GOTO_CLOUD_EXIT_CODE >"${BATCH_DIRECTORY}/{INDEX}.rc"\n'
+        'echo $(( ($(date +%s%N) - GOTO_CLOUD_START) / 1000000 )) >"${BATCH_DIRECTORY}/{INDEX}.ms"\n'
+        '{FAILURE_CHECK}'
+        'fi\n'
+    )
+    PARALLEL_COMMAND_TEMPLATE = (
+        '{THROTTLE}'
+        '{{\n'
+        'GOTO_CLOUD_START=$(date +%s%N)\n'
+        '{COMMAND_MARKER}\n'
+        '(\n'
+        '{COMMAND}\n'
+        ') >"${BATCH_DIRECTORY}/{INDEX}.out" 2>"${BATCH_DIRECTORY}/{INDEX}.err"\n'
+        'echo $? >"${BATCH_DIRECTORY}/{INDEX}.rc"\n'
+        'echo $(( ($(date +%s%N) - GOTO_CLOUD_START) / 1000000 )) >"${BATCH_DIRECTORY}/{INDEX}.ms"\n'
+        '}} &\n'
+    )
+    THROTTLE_TEMPLATE = (
+        'while [ "$(jobs -pr | wc -l)" -ge {MAX_CONCURRENCY} ]; do wait -n 2>/dev/null || sleep 0.1; done\n'
+    )
+    PARALLEL_WAIT = 'wait\n'
+    FAILURE_CHECK_TEMPLATE = 'case $GOTO_CLOUD_EXIT_CODE in {ACCEPTED_EXIT_CODES}) ;; *) {FAILED}=1 ;; esac\n'
+    SCRIPT_FOOTER = (
+        'for GOTO_CLOUD_INDEX in {INDICES}; do\n'
+        '  echo\n'
+        '  echo "{RESULT_MARKER}"\n'
+        '  cat "${BATCH_DIRECTORY}/$GOTO_CLOUD_INDEX.out" 2>/dev/null\n'
+        '  echo\n'
+        '  echo "{STDERR_MARKER}"\n'
+        '  cat "${BATCH_DIRECTORY}/$GOTO_CLOUD_INDEX.err" 2>/dev/null\n'
+        'done\n'
+        'rm -rf "${BATCH_DIRECTORY}"\n'
+    )
+
+    def __init__(self, remote_executor, parallel=False, max_concurrency=None):
+        """
+        :param remote_executor: the remote executor the batch is executed with
+        :type remote_executor: remote_execution.public.RemoteExecutor
+        :param parallel: whether the commands are executed concurrently, instead of one after another
+        :type parallel: bool
+        :param max_concurrency: the maximum number of commands, which are executed at the same time in parallel mode. By
+        default there is no limit.
+        :type max_concurrency: int
+        """
+        self.remote_executor = remote_executor
+        self.parallel = parallel
+        self.max_concurrency = max_concurrency
+        self._commands = []
+
+    def __len__(self):
+        return len(self._commands)
+
+    def add(self, command, accepted_exit_codes=None, stop_on_failure=True, **context):
+        """
+        adds a command to the batch
+
+        :param command: the command to add. If a RemoteHostCommand is given, it is rendered with the given context
+        :type command: str | RemoteHostCommand
+        :param accepted_exit_codes: a tuple of exit codes which are accepted besides 0
+        :type accepted_exit_codes: tuple
+        :param stop_on_failure: whether the following commands should be skipped, if this command fails
+        :type stop_on_failure: bool
+        :param context: the context to render the RemoteHostCommand with
+        :type context: **dict
+        :return: the index of the command in the batch, which can be used to look up its result
+        :rtype: int
+        """
+        if isinstance(command, RemoteHostCommand):
+            command = command.render(**context)
+
+        self._commands.append({
+            'command': command,
+            'accepted_exit_codes': tuple(accepted_exit_codes or ()),
+            'stop_on_failure': stop_on_failure,
+        })
+
+        return len(self._commands) - 1
+
+    def execute(self, raise_exception_on_failure=True):
+        """
+        executes all commands of the batch, using a single remote call
+
+        :param raise_exception_on_failure: if True, an exception is raised for the first failing command, which has
+        been added with stop_on_failure
+        :type raise_exception_on_failure: bool
+        :return: the results of all commands, in the order they have been added
+        :rtype: list[RemoteCommandResult]
+        :raises RemoteHostExecutor.ExecutionException: if a command fails and raise_exception_on_failure is True
+        """
+        if not self._commands:
+            return []
+
+        results = self._parse_output(self.remote_executor.execute(self.render()))
+
+        if raise_exception_on_failure:
+            for command, result in zip(self._commands, results):
+                if result.failed and command['stop_on_failure']:
+                    raise RemoteHostExecutor.ExecutionException(result.get_error_message())
+
+        return results
+
+    def render(self):
+        """
+        renders the shell script, which executes the batch
+
+        :return: the rendered script
+        :rtype: str
+        """
+        return ''.join(
+            [
+                self.SCRIPT_HEADER.format(
+                    BATCH_DIRECTORY=self.BATCH_DIRECTORY_VARIABLE,
+                    FAILED=self.FAILED_VARIABLE,
+                )
+            ] + [
+                self._render_command(index, command) for index, command in enumerate(self._commands)
+            ] + [
+                self.PARALLEL_WAIT if self.parallel else ''
+            ] + [
+                self.SCRIPT_FOOTER.format(
+                    BATCH_DIRECTORY=self.BATCH_DIRECTORY_VARIABLE,
+                    INDICES=' '.join(str(index) for index in range(len(self._commands))),
+                    RESULT_MARKER=self.RESULT_MARKER.format(
+                        index='$GOTO_CLOUD_INDEX',
+                        exit_code='$(cat "${batch_directory}/$GOTO_CLOUD_INDEX.rc" 2>/dev/null)'.format(
+                            batch_directory=self.BATCH_DIRECTORY_VARIABLE
+                        ),
+                        duration='$(cat "${batch_directory}/$GOTO_CLOUD_INDEX.ms" 2>/dev/null)'.format(
+                            batch_directory=self.BATCH_DIRECTORY_VARIABLE
+                        ),
+                    ),
+                    STDERR_MARKER=self.STDERR_MARKER.format(index='$GOTO_CLOUD_INDEX'),
+                )
+            ]
+        )
+
+    def _render_command(self, index, command):
+        if self.parallel:
+            return self.PARALLEL_COMMAND_TEMPLATE.format(
+                THROTTLE=self.THROTTLE_TEMPLATE.format(
+                    MAX_CONCURRENCY=self.max_concurrency
+                ) if self.max_concurrency else '',
+                BATCH_DIRECTORY=self.BATCH_DIRECTORY_VARIABLE,
+                COMMAND_MARKER=self.COMMAND_MARKER.format(index=index),
+                COMMAND=command['command'],
+                INDEX=index,
+            )
+
+        return self.COMMAND_TEMPLATE.format(
+            FAILED=self.FAILED_VARIABLE,
+            BATCH_DIRECTORY=self.BATCH_DIRECTORY_VARIABLE,
+            COMMAND_MARKER=self.COMMAND_MARKER.format(index=index),
+            COMMAND=command['command'],
+            INDEX=index,
+            FAILURE_CHECK=self.FAILURE_CHECK_TEMPLATE.format(
+                ACCEPTED_EXIT_CODES='|'.join(str(exit_code) for exit_code in (0,) + command['accepted_exit_codes']),
+                FAILED=self.FAILED_VARIABLE,
+            ) if command['stop_on_failure'] else '',
+        )
+
+    def _parse_output(self, output):
+        """
+        parses the output of the batch script into results
+
+        :param output: the output of the batch script
+        :type output: str
+        :return: the results of all commands, in the order they have been added
+        :rtype: list[RemoteCommandResult]
+        """
+        results = [
+            RemoteCommandResult(command['command'], accepted_exit_codes=command['accepted_exit_codes'])
+            for command in self._commands
+        ]
+        outputs = {}
+        current_output = None
+
+        for line in (output or '').split('\n'):
+            result_match = self.RESULT_MARKER_PATTERN.match(line)
+            stderr_match = self.STDERR_MARKER_PATTERN.match(line)
+
+            if result_match:
+                index = int(result_match.group(1))
+                if result_match.group(2) and index < len(results):
+                    results[index].exit_code = int(result_match.group(2))
+                if result_match.group(3) and index < len(results):
+                    results[index].duration = int(result_match.group(3)) / 1000
+                current_output = outputs.setdefault((index, 'stdout'), [])
+            elif stderr_match:
+                current_output = outputs.setdefault((int(stderr_match.group(1)), 'stderr'), [])
+            elif current_output is not None:
+                current_output.append(line)
+
+        for (index, stream), lines in outputs.items():
+            if index < len(results):
+                setattr(results[index], stream, '\n'.join(lines).strip())
+
+        return results
@@ -0,0 +1,184 @@
+import os
+import subprocess
+import tempfile
+
+from unittest import TestCase
+
+from remote_execution.public import RemoteHostExecutor
+
+from remote_host_command.public import RemoteHostCommand
+
+from ..public import RemoteCommandBatch
+
+
+class LocalExecutor():
+    """
+    executes commands locally using bash, to test the rendered batch scripts for real
+    """
+    def __init__(self):
+        self.executed_commands = []
+
+    def execute(self, command, *args, **kwargs):
+        self.executed_commands.append(command)
+        return subprocess.run(['bash', '-c', command], stdout=subprocess.PIPE, stderr=subprocess.PIPE).stdout.decode()
+
+
+class TestRemoteCommandBatch(TestCase):
+    def setUp(self):
+        self.remote_executor = LocalExecutor()
+        self.batch = RemoteCommandBatch(self.remote_executor)
+
+    def test_execute__single_remote_call(self):
+        self.batch.add('echo a')
+        self.batch.add('echo b')
+        self.batch.add('echo c')
+
+        self.batch.execute()
+
+        self.assertEqual(len(self.remote_executor.executed_commands), 1)
+
+    def test_execute__results_per_command(self):
+        self.batch.add('echo a; echo error a >&2')
+        self.batch.add('printf "b\\nc"')
+
+        results = self.batch.execute()
+
+        self.assertEqual([result.exit_code for result in results], [0, 0])
+        self.assertEqual([result.stdout for result in results], ['a', 'b\nc'])
+        self.assertEqual([result.stderr for result in results], ['error a', ''])
+
+    def test_execute__stops_on_failure(self):
+        self.batch.add('echo a')
+        self.batch.add('echo failed >&2; exit 3')
+        self.batch.add('echo c')
+
+        results = self.batch.execute(raise_exception_on_failure=False)
+
+        self.assertEqual([result.exit_code for result in results], [0, 3, None])
+        self.assertTrue(results[1].failed)
+        self.assertFalse(results[2].executed)
+        self.assertEqual(results[1].stderr, 'failed')
+
+    def test_execute__exception_raised_on_failure(self):
+        self.batch.add('echo a')
+        self.batch.add('echo failed >&2; exit 3')
+
+        with self.assertRaises(RemoteHostExecutor.ExecutionException) as context:
+            self.batch.execute()
+
+        self.assertIn('echo failed >&2; exit 3', str(context.exception))
+        self.assertIn('failed', str(context.exception))
+
+    def test_execute__accepted_exit_codes(self):
+        self.batch.add('exit 24', accepted_exit_codes=(24,))
+        self.batch.add('echo b')
+
+        results = self.batch.execute()
+
+        self.assertFalse(results[0].failed)
+        self.assertEqual(results[1].stdout, 'b')
+
+    def test_execute__continues_without_stop_on_failure(self):
+        self.batch.add('exit 1', stop_on_failure=False)
+        self.batch.add('echo b')
+
+        results = self.batch.execute()
+
+        self.assertTrue(results[0].failed)
+        self.assertEqual(results[1].stdout, 'b')
+
+    def test_execute__commands_share_no_shell_state(self):
+        self.batch.add('cd /tmp && GOTO_CLOUD_TEST=1')
+        self.batch.add('pwd; echo "$GOTO_CLOUD_TEST"')
+
+        self.assertEqual(self.batch.execute()[1].stdout, self.remote_executor.execute('pwd').strip())
+
+    def test_execute__empty_batch(self):
+        self.assertEqual(self.batch.execute(), [])
+        self.assertEqual(self.remote_executor.executed_commands, [])
+
+    def test_add__remote_host_command_rendered(self):
+        self.batch.add(RemoteHostCommand('echo {TEXT}'), text='rendered')
+
+        self.assertEqual(self.batch.execute()[0].stdout, 'rendered')
+
+    def test_add__index_returned(self):
+        self.assertEqual(self.batch.add('echo a'), 0)
+        self.assertEqual(self.batch.add('echo b'), 1)
+        self.assertEqual(len(self.batch), 2)
+
+
+class TestParallelRemoteCommandBatch(TestCase):
+    def setUp(self):
+        self.remote_executor = LocalExecutor()
+        self.batch = RemoteCommandBatch(self.remote_executor, parallel=True)
+        self.directory = tempfile.TemporaryDirectory()
+        self.flag_file = os.path.join(self.directory.name, 'flag')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_execute__commands_run_concurrently(self):
+        self.batch.add(
+            'for i in $(seq 100); do [ -f {flag_file} ] && echo a && exit 0; sleep 0.05; done; exit 1'.format(
+                flag_file=self.flag_file
+            )
+        )
+        self.batch.add('touch {flag_file}'.format(flag_file=self.flag_file))
+
+        results = self.batch.execute()
+
+        self.assertEqual([result.exit_code for result in results], [0, 0])
+        self.assertEqual(results[0].stdout, 'a')
+        self.assertEqual(len(self.remote_executor.executed_commands), 1)
+
+    def test_execute__failure_does_not_stop_other_commands(self):
+        self.batch.add('echo failed >&2; exit 2')
+        self.batch.add('echo b')
+
+        results = self.batch.execute(raise_exception_on_failure=False)
+
+        self.assertEqual([result.exit_code for result in results], [2, 0])
+        self.assertEqual(results[0].stderr, 'failed')
+        self.assertEqual(results[1].stdout, 'b')
+
+    def test_execute__exception_raised_on_failure(self):
+        self.batch.add('exit 2')
+        self.batch.add('echo b')
+
+        with self.assertRaises(RemoteHostExecutor.ExecutionException):
+            self.batch.execute()
+
+    def test_execute__max_concurrency(self):
+        batch = RemoteCommandBatch(self.remote_executor, parallel=True, max_concurrency=1)
+        batch.add(
+            'for i in $(seq 4); do [ -f {flag_file} ] && exit 0; sleep 0.05; done; exit 1'.format(
+                flag_file=self.flag_file
+            ),
+            stop_on_failure=False
+        )
+        batch.add('touch {flag_file}'.format(flag_file=self.flag_file))
+
+        self.assertEqual([result.exit_code for result in batch.execute()], [1, 0])
+
+    def test_execute__all_commands_executed_with_max_concurrency(self):
+        batch = RemoteCommandBatch(self.remote_executor, parallel=True, max_concurrency=2)
+        for index in range(5):
+            batch.add('echo {index}'.format(index=index))
+
+        self.assertEqual([result.stdout for result in batch.execute()], ['0', '1', '2', '3', '4'])
+
+
+class TestRemoteCommandResultDuration(TestCase):
+    def test_execute__duration_measured(self):
+        batch = RemoteCommandBatch(LocalExecutor())
+        batch.add('sleep 0.2')
+        batch.add('exit 1')
+        batch.add('true')
+
+        results = batch.execute(raise_exception_on_failure=False)
+
+        self.assertGreaterEqual(results[0].duration, 0.2)
+        self.assertLess(results[0].duration, 5)
+        self.assertIsNotNone(results[1].duration)
+        self.assertIsNone(results[2].duration)
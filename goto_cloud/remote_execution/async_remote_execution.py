@@ -0,0 +1,62 @@
+import asyncio
+
+from functools import partial
+
+from .remote_execution import RemoteHostExecutor
+
+
+class AsyncRemoteHostExecutor():
+    """
+    Executes commands on a RemoteHost, without blocking the event loop. The commands are executed by a
+    RemoteHostExecutor in an executor of the event loop, so the blocking remote client can be used by coroutines.
+    """
+    ExecutionException = RemoteHostExecutor.ExecutionException
+
+    def __init__(self, remote_host, executor=None):
+        """
+        :param remote_host: the remote host to execute the commands on
+        :type remote_host: remote_host.public.RemoteHost
+        :param executor: the executor the blocking calls are run in. By default the event loops default executor is used
+        :type executor: concurrent.futures.Executor
+        """
+        self.remote_host = remote_host
+        self.remote_executor = RemoteHostExecutor(remote_host)
+        self._executor = executor
+
+    async def execute(
+        self, command, raise_exception_on_failure=True, block_for_response=True, accepted_exit_codes=None, stdin=None
+    ):
+        """
+        executes the given command on the remote host
+
+        :param command: the command to execute
+        :type command: str
+        :param raise_exception_on_failure: if True, an exception is raised if the command fails
+        :type raise_exception_on_failure: bool
+        :param block_for_response: if True, the coroutine waits for the command to finish and returns its output
+        :type block_for_response: bool
+        :param accepted_exit_codes: exit codes which are accepted besides 0
+        :type accepted_exit_codes: tuple
+        :param stdin: data which is written to the stdin of the command
+        :type stdin: bytes | str
+        :return: the output of the command
+        :rtype: str
+        :raises RemoteHostExecutor.ExecutionException: if the command fails and raise_exception_on_failure is True
+        """
+        return await self._run_in_executor(
+            self.remote_executor.execute,
+            command,
+            raise_exception_on_failure=raise_exception_on_failure,
+            block_for_response=block_for_response,
+            accepted_exit_codes=accepted_exit_codes,
+            stdin=stdin,
+        )
+
+    async def close(self):
+        """
+        closes the connection to the remote host, if it is open
+        """
+        await self._run_in_executor(self.remote_executor.close)
+
+    def _run_in_executor(self, function, *args, **kwargs):
+        return asyncio.get_event_loop().run_in_executor(self._executor, partial(function, *args, **kwargs))
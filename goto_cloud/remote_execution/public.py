@@ -1 +1,2 @@
 from .remote_execution import RemoteHostExecutor
+from .async_remote_execution import AsyncRemoteHostExecutor
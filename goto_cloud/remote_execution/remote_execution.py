@@ -1,12 +1,10 @@
 import time
 
 import logging
+import threading
 
 from abc import ABCMeta, abstractmethod
-
-from paramiko import SSHClient, AutoAddPolicy
-from paramiko.pkey import PKey
-from paramiko.ssh_exception import NoValidConnectionsError, AuthenticationException
+from concurrent.futures import Future
 
 from operating_system.public import OperatingSystem
 
@@ -129,7 +127,9 @@ class RemoteExecutor(metaclass=ABCMeta):
         pass
 
     @catch_and_retry_for(ConnectionException)
-    def execute(self, command, raise_exception_on_failure=True, block_for_response=True, accepted_exit_codes=None):
+    def execute(
+        self, command, raise_exception_on_failure=True, block_for_response=True, accepted_exit_codes=None, stdin=None
+    ):
         """
         executes the given command on the remote host and parses the returned output
         
@@ -143,6 +143,8 @@ class RemoteExecutor(metaclass=ABCMeta):
         :type block_for_response: bool
         :param accepted_exit_codes: a tuple of exit codes which are accepted besides 0
         :type accepted_exit_codes: tuple
+        :param stdin: data which is written to the stdin of the command, before its input is closed
+        :type stdin: bytes | str
         :return: the output the command produced
         :rtype: str
         :raises RemoteExecutor.ExecutionException: in case something goes wrong during execution 
@@ -150,7 +152,7 @@ class RemoteExecutor(metaclass=ABCMeta):
         if not self.is_connected():
             self.connect()
 
-        execution_result = self._execute(command, block_for_response)
+        execution_result = self._execute(command, block_for_response, stdin=stdin)
 
         if block_for_response:
             if (
@@ -167,20 +169,21 @@ class RemoteExecutor(metaclass=ABCMeta):
                 else:
                     return execution_result['stderr']
 
-            self._logger.debug('executed the following command:\n{command}{stdout}{stderr}'.format(
-                command=command,
-                stdout='\n\nSTDOUT:\n{stdout}'.format(
-                    stdout=execution_result['stdout']
-                ) if execution_result['stdout'].split() else '',
-                stderr='\n\nSTDERR:\n{stderr}'.format(
-                    stderr=execution_result['stderr']
-                ) if execution_result['stderr'].split() else '',
-            ))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug('executed the following command:\n{command}{stdout}{stderr}'.format(
+                    command=command,
+                    stdout='\n\nSTDOUT:\n{stdout}'.format(
+                        stdout=execution_result['stdout']
+                    ) if execution_result['stdout'].split() else '',
+                    stderr='\n\nSTDERR:\n{stderr}'.format(
+                        stderr=execution_result['stderr']
+                    ) if execution_result['stderr'].split() else '',
+                ))
             return execution_result['stdout']
         return None
 
     @abstractmethod
-    def _execute(self, command, block_for_response=True):
+    def _execute(self, command, block_for_response=True, stdin=None):
         """
         does the execution and returns the raw output
         
@@ -189,6 +192,8 @@ class RemoteExecutor(metaclass=ABCMeta):
         :param block_for_response: if this is true, the method will block until execution is done and return the
         response streams
         :type block_for_response: bool
+        :param stdin: data which is written to the stdin of the command, before its input is closed
+        :type stdin: bytes | str
         :return: the return value of the execution
         :rtype: Any
         """
@@ -200,15 +205,20 @@ class RemoteExecutor(metaclass=ABCMeta):
 
 class SshRemoteExecutor(RemoteExecutor):
     """
-    implements RemoteExecutor using SSH as the remote execution client
+    implements RemoteExecutor using SSH as the remote execution client. paramiko is only imported, once a connection is
+    established, since importing it and its crypto backend is expensive.
     """
-    def _execute(self, command, block_for_response=True):
-        _, stdout, stderr = self.remote_client.exec_command(command)
+    def _execute(self, command, block_for_response=True, stdin=None):
+        stdin_file, stdout, stderr = self.remote_client.exec_command(command)
+        stdin_written = self._write_stdin(stdin_file, stdin) if stdin is not None else None
 
         if block_for_response:
             stdout_output = stdout.read().decode().strip()
             stderr_output = stderr.read().decode().strip()
 
+            if stdin_written:
+                stdin_written.result()
+
             return {
                 'exit_code': stdout.channel.recv_exit_status(),
                 'stdout': stdout_output,
@@ -216,7 +226,38 @@ class SshRemoteExecutor(RemoteExecutor):
             }
         return None
 
+    def _write_stdin(self, stdin_file, stdin):
+        """
+        writes the given data to the stdin of a command from a helper thread, and closes the input afterwards. The
+        output is read meanwhile, since a command, which writes its output while reading its input, blocks once its
+        output is not read, so writing a large input before reading the output would never finish.
+
+        :param stdin_file: the stdin of the command
+        :type stdin_file: paramiko.ChannelFile
+        :param stdin: the data to write
+        :type stdin: bytes | str
+        :return: future, which is done once the data is written, or holds the exception raised while writing it
+        :rtype: Future
+        """
+        stdin_written = Future()
+
+        def write():
+            try:
+                stdin_file.write(stdin)
+                stdin_file.channel.shutdown_write()
+            except Exception as e:
+                stdin_written.set_exception(e)
+            else:
+                stdin_written.set_result(None)
+
+        threading.Thread(target=write, daemon=True).start()
+        return stdin_written
+
     def connect(self):
+        from paramiko import SSHClient, AutoAddPolicy
+        from paramiko.pkey import PKey
+        from paramiko.ssh_exception import NoValidConnectionsError, AuthenticationException
+
         try:
             self.remote_client = SSHClient()
             self.remote_client.set_missing_host_key_policy(AutoAddPolicy())
@@ -267,7 +308,7 @@ class RemoteHostExecutor(AbstractedRemoteHostOperator, RemoteExecutor):
                 if self.remote_host.private_key_file_path else None,
         )
 
-    def _execute(self, command, block_for_response=True): # pragma: no cover
+    def _execute(self, command, block_for_response=True, stdin=None): # pragma: no cover
         # At runtime the method of the chosen operator is used. This stub is only to implement the abstract method.
         pass
 
@@ -0,0 +1,53 @@
+import asyncio
+
+from django.test import TestCase
+
+from remote_host.public import RemoteHost
+
+from test_assets.public import TestAsset
+
+from remote_execution.public import AsyncRemoteHostExecutor
+
+
+class TestAsyncRemoteHostExecutor(TestCase, metaclass=TestAsset.PatchTrackedRemoteExecutionMeta):
+    def setUp(self):
+        self.executed_commands.clear()
+        self.remote_host = RemoteHost.objects.create(address='ubuntu16')
+
+    def _run(self, coroutine):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+
+    def test_execute(self):
+        self.assertEqual(
+            self._run(AsyncRemoteHostExecutor(self.remote_host).execute('sudo hostname')),
+            'ubuntu16'
+        )
+        self.assertIn('sudo hostname', self.executed_commands)
+
+    def test_execute__concurrently(self):
+        async_remote_executor = AsyncRemoteHostExecutor(self.remote_host)
+
+        self._run(asyncio.gather(
+            async_remote_executor.execute('sudo hostname'),
+            async_remote_executor.execute('sudo cat /proc/cpuinfo'),
+        ))
+
+        self.assertIn('sudo hostname', self.executed_commands)
+        self.assertIn('sudo cat /proc/cpuinfo', self.executed_commands)
+
+    def test_execute__failed(self):
+        with self.assertRaises(AsyncRemoteHostExecutor.ExecutionException):
+            self._run(AsyncRemoteHostExecutor(self.remote_host).execute('I_WILL_FAIL'))
+
+    def test_execute__failure_not_raised(self):
+        self._run(
+            AsyncRemoteHostExecutor(self.remote_host).execute('I_WILL_FAIL', raise_exception_on_failure=False)
+        )
+
+    def test_execute__custom_executor(self):
+        self.assertEqual(
+            self._run(
+                AsyncRemoteHostExecutor(self.remote_host, TestAsset.CurrentThreadExecutor()).execute('sudo hostname')
+            ),
+            'ubuntu16'
+        )
@@ -1,7 +1,9 @@
 from io import BytesIO
 
+import os
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from django.test import TestCase
 
@@ -11,16 +13,22 @@ from paramiko.ssh_exception import NoValidConnectionsError, AuthenticationExcept
 from operating_system.public import OperatingSystem
 from remote_host.public import RemoteHost
 
+from test_assets.public import TestAsset
+
 from ..remote_execution import RemoteExecutor, SshRemoteExecutor, RemoteHostExecutor
 
 
 class ChannelMock():
     def __init__(self, failing):
         self.failing = failing
+        self.write_shut_down = False
 
     def recv_exit_status(self):
         return 1 if self.failing else 0
 
+    def shutdown_write(self):
+        self.write_shut_down = True
+
 
 class ChannelFileMock():
     def __init__(self, content, failing=False):
@@ -33,6 +41,38 @@ class ChannelFileMock():
         return getattr(self.file_object, item)
 
 
+class PipeChannelFileMock():
+    """
+    a channel file, which is backed by a pipe and therefore blocks writing, once its buffer is full and not read
+    """
+    def __init__(self, file_descriptor, mode):
+        self.file_object = os.fdopen(file_descriptor, mode)
+        self.channel = Mock(shutdown_write=self.file_object.close, recv_exit_status=lambda: 0)
+
+    def write(self, data):
+        self.file_object.write(data)
+
+    def read(self):
+        return self.file_object.read()
+
+
+def echo_command_mock(self, command):
+    stdin_read_descriptor, stdin_write_descriptor = os.pipe()
+    stdout_read_descriptor, stdout_write_descriptor = os.pipe()
+
+    def echo():
+        with os.fdopen(stdin_read_descriptor, 'rb') as stdin, os.fdopen(stdout_write_descriptor, 'wb') as stdout:
+            for chunk in iter(lambda: stdin.read(1024), b''):
+                stdout.write(chunk)
+
+    threading.Thread(target=echo, daemon=True).start()
+    return (
+        PipeChannelFileMock(stdin_write_descriptor, 'wb'),
+        PipeChannelFileMock(stdout_read_descriptor, 'rb'),
+        ChannelFileMock(''),
+    )
+
+
 def connect_mock(self, *args, **kwargs):
     self.connected = True
 
@@ -135,6 +175,51 @@ class TestSshRemoteExecutor(unittest.TestCase):
     def test_execute__don_t_block_for_response(self):
         self.assertEqual(self.remote_executor.execute('successful_command', block_for_response=False), None)
 
+    def test_execute__stdin(self):
+        stdin_file = ChannelFileMock('')
+
+        with patch(
+            'paramiko.SSHClient.exec_command',
+            lambda self, command: (stdin_file, ChannelFileMock('Command Success'), ChannelFileMock(''))
+        ):
+            self.assertEqual(self.remote_executor.execute('successful_command', stdin=b'input'), 'Command Success')
+
+        self.assertEqual(stdin_file.getvalue(), b'input')
+        self.assertTrue(stdin_file.channel.write_shut_down)
+
+    def test_execute__large_stdin(self):
+        stdin = b'x' * 10 * 1024 * 1024
+        results = []
+
+        with patch('paramiko.SSHClient.exec_command', echo_command_mock):
+            execution = threading.Thread(
+                target=lambda: results.append(self.remote_executor.execute('echo', stdin=stdin)),
+                daemon=True
+            )
+            execution.start()
+            execution.join(timeout=30)
+
+        self.assertFalse(execution.is_alive())
+        self.assertEqual(results, ['x' * len(stdin)])
+
+    def test_execute__stdin_write_fails(self):
+        stdin_file = ChannelFileMock('')
+        stdin_file.channel.shutdown_write = Mock(side_effect=OSError('closed'))
+
+        with patch(
+            'paramiko.SSHClient.exec_command',
+            lambda self, command: (stdin_file, ChannelFileMock('Command Success'), ChannelFileMock(''))
+        ), self.assertRaises(OSError):
+            self.remote_executor.execute('successful_command', stdin=b'input')
+
+    def test_execute__output_not_logged_if_debug_disabled(self):
+        logger = Mock(isEnabledFor=lambda level: False)
+        getattr(self.remote_executor, 'operator', self.remote_executor)._logger = logger
+
+        self.remote_executor.execute('successful_command')
+
+        logger.debug.assert_not_called()
+
 
 @patch('paramiko.SSHClient.connect', connect_mock)
 @patch('paramiko.SSHClient.connect', connect_mock)
@@ -185,3 +270,17 @@ class TestRemoteHostExecutor(TestCase, TestSshRemoteExecutor):
         self.assertFalse(self.remote_executor.operator.remote_client.connected)
         self.remote_executor.connect()
         self.assertTrue(self.remote_executor.operator.remote_client.connected)
+
+
+class TestRemoteExecutionImport(unittest.TestCase):
+    MODULE_BUDGET = 200
+
+    def setUp(self):
+        self.measurement = TestAsset.ImportMeasurement('remote_execution.public')
+
+    def test_import__ssh_client_not_loaded(self):
+        self.assertFalse(self.measurement.loaded('paramiko'))
+        self.assertFalse(self.measurement.loaded('cryptography'))
+
+    def test_import__within_budget(self):
+        self.assertLessEqual(len(self.measurement.imported_modules), self.MODULE_BUDGET)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 16:38
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remote_host', '0003_remotehost_cloud_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotehost',
+            name='system_info_timestamps',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remote_host', '0004_remotehost_system_info_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotehost',
+            name='cloud_server_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='remotehost',
+            name='hostname',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
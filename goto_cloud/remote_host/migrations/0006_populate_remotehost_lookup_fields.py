@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def populate_lookup_fields(apps, schema_editor):
+    RemoteHost = apps.get_model('remote_host', 'RemoteHost')
+
+    for remote_host in RemoteHost.objects.all().iterator():
+        remote_host.hostname = remote_host.system_info.get('network', {}).get('hostname') or None
+        remote_host.cloud_server_id = remote_host.cloud_metadata.get('id') or None
+        remote_host.save(update_fields=['hostname', 'cloud_server_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remote_host', '0005_remotehost_lookup_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_lookup_fields, migrations.RunPython.noop),
+    ]
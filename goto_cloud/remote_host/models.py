@@ -1,3 +1,5 @@
+import time
+
 from django.db import models
 from django.contrib.postgres.fields.jsonb import JSONField
 
@@ -8,10 +10,52 @@ from system_info_inspection.public import RemoteHostSystemInfoGetter
 from tracked_model.public import TrackedModel
 
 
+class RemoteHostQuerySet(models.QuerySet):
+    """
+    lookups of remote hosts, which use the indexed lookup fields, instead of the JSON fields they are derived from
+    """
+    def by_hostname(self, hostname):
+        """
+        :param hostname: the hostname of the remote host, as it is reported by its system info
+        :type hostname: str
+        :return: the remote hosts with the given hostname
+        :rtype: RemoteHostQuerySet
+        """
+        return self.filter(hostname=hostname)
+
+    def by_cloud_server_id(self, cloud_server_id):
+        """
+        :param cloud_server_id: the id of the server in the cloud, as it is stored in the cloud metadata
+        :type cloud_server_id: str
+        :return: the remote hosts with the given cloud server id
+        :rtype: RemoteHostQuerySet
+        """
+        return self.filter(cloud_server_id=cloud_server_id)
+
+
 class RemoteHost(TrackedModel):
     """
     represents an Entity which can be accessed remotely
     """
+    class SystemInfoSection():
+        """
+        the sections of the system info, which are cached and refreshed independently
+        """
+        BLOCK_DEVICES = 'block_devices'
+        NETWORK = 'network'
+        HARDWARE = 'hardware'
+        OS = 'os'
+
+    SYSTEM_INFO_TTLS = {
+        SystemInfoSection.BLOCK_DEVICES: 60,
+        SystemInfoSection.NETWORK: 5 * 60,
+        SystemInfoSection.HARDWARE: 60 * 60,
+        SystemInfoSection.OS: 24 * 60 * 60,
+    }
+    """
+    the number of seconds, for which a section of the system info is considered fresh
+    """
+
     # os default is Debian, as of now, since only Linux is supported. Should be changed, if support for others is added.
     os = models.CharField(max_length=255, default=OperatingSystem.DEBIAN, choices=OperatingSystem.get_django_choices())
     version = models.CharField(max_length=255, null=True, blank=True)
@@ -22,8 +66,77 @@ class RemoteHost(TrackedModel):
     private_key = models.TextField(null=True, blank=True)
     private_key_file_path = models.CharField(max_length=512, null=True, blank=True)
     system_info = JSONField(default=dict)
+    system_info_timestamps = JSONField(default=dict)
+    """
+    maps the sections of the system info onto the unix time, they have been retrieved at
+    """
     cloud_metadata = JSONField(default=dict)
+    hostname = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    """
+    the hostname of the system info, which is stored in an indexed column, to be able to look it up efficiently
+    """
+    cloud_server_id = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    """
+    the server id of the cloud metadata, which is stored in an indexed column, to be able to look it up efficiently
+    """
+
+    objects = RemoteHostQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.update_lookup_fields()
+        return super().save(*args, **kwargs)
+
+    def update_lookup_fields(self):
+        """
+        copies the values which are looked up from the JSON fields into their indexed columns. This is done on every
+        save, but has to be called explicitly, before remote hosts are created using bulk_create.
+        """
+        self.hostname = self.system_info.get(self.SystemInfoSection.NETWORK, {}).get('hostname') or None
+        self.cloud_server_id = self.cloud_metadata.get('id') or None
 
-    def update_system_info(self):
-        self.system_info = RemoteHostSystemInfoGetter(self).get_system_info()
+    def update_system_info(self, sections=None, force=False):
+        """
+        refreshes the sections of the system info which are stale. A section is stale, if it has been retrieved longer
+        ago than its TTL, or if it has been invalidated.
+
+        :param sections: the sections to refresh, by default all sections are refreshed
+        :type sections: list[str]
+        :param force: if True, the sections are refreshed, even if they are not stale
+        :type force: bool
+        """
+        stale_sections = [
+            section for section in (sections if sections is not None else self.SYSTEM_INFO_TTLS)
+            if force or self.is_system_info_stale(section)
+        ]
+
+        if stale_sections:
+            self.system_info.update(RemoteHostSystemInfoGetter(self).get_system_info(stale_sections))
+            self.system_info_timestamps.update({section: time.time() for section in stale_sections})
+            self.save()
+
+    def invalidate_system_info(self, *sections):
+        """
+        marks the given sections of the system info as stale, so they are refreshed on the next update. Should be called
+        after the corresponding state of the remote host has been changed.
+
+        :param sections: the sections to invalidate, by default all sections are invalidated
+        :type sections: str
+        """
+        for section in (sections or tuple(self.SYSTEM_INFO_TTLS)):
+            self.system_info_timestamps.pop(section, None)
         self.save()
+
+    def is_system_info_stale(self, section):
+        """
+        checks whether the given section of the system info has to be refreshed
+
+        :param section: the section to check
+        :type section: str
+        :return: True if it is stale
+        :rtype: bool
+        """
+        return (
+            section not in self.system_info
+            or section not in self.system_info_timestamps
+            or time.time() - self.system_info_timestamps[section] > self.SYSTEM_INFO_TTLS[section]
+        )
@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from test_assets.public import TestAsset
+
+from remote_host.public import RemoteHost
+
+
+class TestRemoteHost(TestCase, metaclass=TestAsset.PatchTrackedRemoteExecutionMeta):
+    LSBLK = 'sudo lsblk -bPo NAME,FSTYPE,LABEL,UUID,MOUNTPOINT,TYPE,SIZE'
+    OS_RELEASE = 'sudo cat /etc/os-release'
+
+    def setUp(self):
+        self.remote_host = RemoteHost.objects.create(address='ubuntu16')
+        self.executed_commands.clear()
+
+    def test_update_system_info(self):
+        self.remote_host.update_system_info()
+
+        self.assertDictEqual(self.remote_host.system_info, TestAsset.REMOTE_HOST_MOCKS['ubuntu16'].get_config())
+        self.assertEqual(
+            set(self.remote_host.system_info_timestamps),
+            {'block_devices', 'network', 'hardware', 'os'}
+        )
+
+    def test_update_system_info__persisted(self):
+        self.remote_host.update_system_info()
+
+        self.remote_host.refresh_from_db()
+
+        self.assertDictEqual(self.remote_host.system_info, TestAsset.REMOTE_HOST_MOCKS['ubuntu16'].get_config())
+
+    def test_update_system_info__fresh_sections_not_refreshed(self):
+        self.remote_host.update_system_info()
+        self.executed_commands.clear()
+
+        self.remote_host.update_system_info()
+
+        self.assertFalse(self.executed_commands)
+
+    @patch('remote_host.models.time.time')
+    def test_update_system_info__only_stale_sections_refreshed(self, mocked_time):
+        mocked_time.return_value = 1000
+        self.remote_host.update_system_info()
+        self.executed_commands.clear()
+
+        mocked_time.return_value = 1000 + RemoteHost.SYSTEM_INFO_TTLS[RemoteHost.SystemInfoSection.BLOCK_DEVICES] + 1
+        self.remote_host.update_system_info()
+
+        self.assertIn(self.LSBLK, self.executed_commands)
+        self.assertNotIn(self.OS_RELEASE, self.executed_commands)
+        self.assertEqual(
+            self.remote_host.system_info_timestamps[RemoteHost.SystemInfoSection.BLOCK_DEVICES],
+            mocked_time.return_value
+        )
+        self.assertEqual(self.remote_host.system_info_timestamps[RemoteHost.SystemInfoSection.OS], 1000)
+
+    def test_update_system_info__sections(self):
+        self.remote_host.update_system_info([RemoteHost.SystemInfoSection.OS])
+
+        self.assertEqual(set(self.remote_host.system_info), {RemoteHost.SystemInfoSection.OS})
+        self.assertNotIn(self.LSBLK, self.executed_commands)
+
+    def test_update_system_info__force(self):
+        self.remote_host.update_system_info()
+        self.executed_commands.clear()
+
+        self.remote_host.update_system_info(force=True)
+
+        self.assertIn(self.LSBLK, self.executed_commands)
+        self.assertIn(self.OS_RELEASE, self.executed_commands)
+
+    def test_invalidate_system_info(self):
+        self.remote_host.update_system_info()
+        self.executed_commands.clear()
+
+        self.remote_host.invalidate_system_info(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
+        self.remote_host.update_system_info()
+
+        self.assertIn(self.LSBLK, self.executed_commands)
+        self.assertNotIn(self.OS_RELEASE, self.executed_commands)
+
+    def test_invalidate_system_info__all_sections(self):
+        self.remote_host.update_system_info()
+
+        self.remote_host.invalidate_system_info()
+
+        self.assertFalse(
+            [section for section in RemoteHost.SYSTEM_INFO_TTLS if not self.remote_host.is_system_info_stale(section)]
+        )
+
+    def test_invalidate_system_info__persisted(self):
+        self.remote_host.update_system_info()
+
+        self.remote_host.invalidate_system_info(RemoteHost.SystemInfoSection.BLOCK_DEVICES)
+        self.remote_host.refresh_from_db()
+
+        self.assertTrue(self.remote_host.is_system_info_stale(RemoteHost.SystemInfoSection.BLOCK_DEVICES))
+
+    def test_update_system_info__hostname_indexed(self):
+        self.remote_host.update_system_info()
+
+        self.assertEqual(RemoteHost.objects.by_hostname('ubuntu16').get(), self.remote_host)
+
+    def test_save__cloud_server_id_indexed(self):
+        self.remote_host.cloud_metadata = {'id': 'cloud-server-1'}
+        self.remote_host.save()
+
+        self.assertEqual(RemoteHost.objects.by_cloud_server_id('cloud-server-1').get(), self.remote_host)
+        self.assertFalse(RemoteHost.objects.by_cloud_server_id('cloud-server-2').exists())
@@ -1,3 +1,6 @@
+from string import Formatter
+
+
 class RemoteHostCommand():
     """
     can be used to wrap a command which can be execute on a Remote Host
@@ -15,6 +18,11 @@ class RemoteHostCommand():
                 )
             )
 
+    OPTIONALS_KEY = 'optionals'
+    COMPILED_COMMAND_CACHE_SIZE = 256
+
+    _compiled_commands = {}
+
     def __init__(self, command):
         """
         Initialized with the command which will be rendered. This can either be a string, or a dict looking like this:
@@ -25,9 +33,11 @@ class RemoteHostCommand():
                 ...
             }
         }
-        if the command is a dict (and therefore optionals are provided), the optional parts will be rendered into the 
+        if the command is a dict (and therefore optionals are provided), the optional parts will be rendered into the
         command, if the key of the optional if provided for rendering
-        
+
+        The placeholders of the command are parsed once, when it is initialized.
+
         :param command: the command to render at execution
         :type command: str | dict
         """
@@ -38,26 +48,89 @@ class RemoteHostCommand():
             self.command = command
             self.optionals = {}
 
+        self._required_keys = self._parse_keys(self.command)
+        self._optional_keys = {
+            optional: optional.upper() for optional in self.optionals
+        }
+
+    @classmethod
+    def compile(cls, command):
+        """
+        returns a RemoteHostCommand for the given command, which is only parsed once and reused afterwards. This should
+        be used for commands which are rendered repeatedly, like the commands defined in a blueprint.
+
+        :param command: the command to render at execution
+        :type command: str | dict
+        :return: the compiled command
+        :rtype: RemoteHostCommand
+        """
+        cache_key = cls._get_cache_key(command)
+
+        if cache_key not in cls._compiled_commands:
+            if len(cls._compiled_commands) >= cls.COMPILED_COMMAND_CACHE_SIZE:
+                cls._compiled_commands.clear()
+            cls._compiled_commands[cache_key] = cls(command)
+
+        return cls._compiled_commands[cache_key]
+
+    @staticmethod
+    def _get_cache_key(command):
+        if isinstance(command, dict):
+            return command['command'], tuple(command['optionals'].items())
+        return command
+
+    @staticmethod
+    def _parse_keys(template):
+        """
+        returns the keys of all placeholders used in the given template
+
+        :param template: the template to parse
+        :type template: str
+        :return: the used keys
+        :rtype: frozenset
+        """
+        return frozenset(
+            field_name.split('.')[0].split('[')[0]
+            for literal_text, field_name, format_spec, conversion in Formatter().parse(template)
+            if field_name is not None
+        )
+
     def render(self, **context):
         """
         renders the command with the given context
-        
+
         :param context: the context to render the command with
         :type context: **dict
         :return: the rendered command
         :rtype: str
+        :raises RemoteHostCommand.InvalidContextException: if a placeholder of the command is missing in the context
         """
-        if self.optionals:
-            optional_strings = []
+        values = {}
 
-            for relevant_optional in (optional for optional in self.optionals if optional in context):
-                optional_strings.append(
-                    self.optionals[relevant_optional].format(**{relevant_optional.upper(): context[relevant_optional]})
-                )
-                del context[relevant_optional]
+        for key, value in context.items():
+            if key not in self._optional_keys:
+                values[key.upper()] = value
 
-            context['optionals'] = ' '.join(optional_strings)
-        try:
-            return self.command.format(**{key.upper(): value for key, value in context.items()})
-        except KeyError:
+        if self.optionals:
+            values[self.OPTIONALS_KEY.upper()] = ' '.join(
+                self.optionals[optional].format(**{optional_key: context[optional]})
+                for optional, optional_key in self._optional_keys.items()
+                if optional in context
+            )
+
+        if not self._required_keys <= values.keys():
             raise RemoteHostCommand.InvalidContextException(self.command, context)
+
+        return self.command.format_map(values)
+
+    def render_many(self, contexts):
+        """
+        renders the command once for every given context, for example to create the commands for a batch of devices
+
+        :param contexts: the contexts to render the command with
+        :type contexts: list[dict]
+        :return: the rendered commands, in the order of the contexts
+        :rtype: list[str]
+        :raises RemoteHostCommand.InvalidContextException: if a placeholder of the command is missing in a context
+        """
+        return [self.render(**context) for context in contexts]
@@ -73,3 +73,66 @@ class TestRemoteHostCommand(TestCase):
                     'forthvar': '-4 {FORTHVAR}'
                 }
             }).render(firstvar='firstvar'),
+
+    def test_render__invalid_context_of_string(self):
+        with self.assertRaises(RemoteHostCommand.InvalidContextException):
+            RemoteHostCommand('ls {FIRSTVAR} {SECONDVAR}').render(secondvar='secondvar')
+
+    def test_render__context_not_mutated(self):
+        context = {'firstvar': 'firstvar', 'thirdvar': 'thirdvar'}
+
+        RemoteHostCommand({
+            'command': 'ls {OPTIONALS} {FIRSTVAR}',
+            'optionals': {
+                'thirdvar': '-3 {THIRDVAR}',
+            }
+        }).render(**context)
+
+        self.assertEqual(context, {'firstvar': 'firstvar', 'thirdvar': 'thirdvar'})
+
+    def test_render__repeatedly(self):
+        command = RemoteHostCommand({
+            'command': 'ls {OPTIONALS} {FIRSTVAR}',
+            'optionals': {
+                'thirdvar': '-3 {THIRDVAR}',
+            }
+        })
+
+        self.assertEqual(command.render(firstvar='1', thirdvar='3'), 'ls -3 3 1')
+        self.assertEqual(command.render(firstvar='2'), 'ls  2')
+
+    def test_render__escaped_braces(self):
+        self.assertEquals(
+            RemoteHostCommand('echo {{}} {FIRSTVAR}').render(firstvar='firstvar'),
+            'echo {} firstvar'
+        )
+
+    def test_render_many(self):
+        self.assertEqual(
+            RemoteHostCommand('mkfs {DEVICE}').render_many([{'device': '/dev/vdb'}, {'device': '/dev/vdc'}]),
+            ['mkfs /dev/vdb', 'mkfs /dev/vdc']
+        )
+
+    def test_render_many__invalid_context(self):
+        with self.assertRaises(RemoteHostCommand.InvalidContextException):
+            RemoteHostCommand('mkfs {DEVICE}').render_many([{'device': '/dev/vdb'}, {}])
+
+    def test_compile(self):
+        self.assertIs(RemoteHostCommand.compile('ls {FIRSTVAR}'), RemoteHostCommand.compile('ls {FIRSTVAR}'))
+
+    def test_compile__from_dict(self):
+        command = {
+            'command': 'ls {OPTIONALS} {FIRSTVAR}',
+            'optionals': {
+                'thirdvar': '-3 {THIRDVAR}',
+            }
+        }
+
+        self.assertIs(RemoteHostCommand.compile(command), RemoteHostCommand.compile(dict(command)))
+        self.assertEqual(RemoteHostCommand.compile(command).render(firstvar='1', thirdvar='3'), 'ls -3 3 1')
+
+    def test_compile__different_optionals(self):
+        self.assertIsNot(
+            RemoteHostCommand.compile({'command': 'ls {OPTIONALS}', 'optionals': {'a': '-a {A}'}}),
+            RemoteHostCommand.compile({'command': 'ls {OPTIONALS}', 'optionals': {'b': '-b {B}'}}),
+        )
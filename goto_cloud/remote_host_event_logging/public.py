@@ -1 +1 @@
-from .remote_host_event_logging import RemoteHostEventLogger
+from .remote_host_event_logging import RemoteHostEventLogger, RemoteHostEventMessage, RemoteHostEventQueueHandler
@@ -1,10 +1,73 @@
+import atexit
 import datetime
 import logging
 
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+
+
+class RemoteHostEventMessage():
+    """
+    The message of a logged event. Formatting the message into its boxed representation is deferred, until the message
+    is converted into a string by a handler, so messages of disabled log levels, or messages which are emitted by a
+    background thread, don't cost any formatting on the logging thread.
+    """
+    def __init__(self, message, remote_host_address, timestamp):
+        """
+        :param message: the message to log
+        :type message: str
+        :param remote_host_address: the address of the remote host the event has been logged for
+        :type remote_host_address: str
+        :param timestamp: the time the event has been logged at
+        :type timestamp: datetime.datetime
+        """
+        self.message = message
+        self.remote_host_address = remote_host_address
+        self.timestamp = timestamp
+        self._formatted_message = None
+
+    def __str__(self):
+        if self._formatted_message is None:
+            self._formatted_message = self._format_message()
+        return self._formatted_message
+
+    @property
+    def _logging_message_prefix(self):
+        return '[{timestamp}] <{source_address}>'.format(
+            source_address=self.remote_host_address,
+            timestamp=self.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+    def _format_message(self):
+        message_prefix = self._logging_message_prefix
+        formatted_message = '+------------- {message_prefix} -------------'.format(
+            message_prefix=message_prefix
+        )
+        if self.message:
+            for line in str(self.message).split('\n'):
+                formatted_message += '\n| {logging_line}'.format(logging_line=line)
+        formatted_message += '\n+--------------{sized_gap}--------------\n'.format(
+            sized_gap='-' * len(message_prefix)
+        )
+        return formatted_message
+
+
+class RemoteHostEventQueueHandler(QueueHandler):
+    """
+    QueueHandler, which enqueues records without formatting them. The records are formatted by the handlers of the
+    QueueListener, which runs in a background thread.
+    """
+    def prepare(self, record):
+        return record
+
 
 class RemoteHostEventLogger():
     """
     Logs event based on a given RemoteHost. Supports all log levels of the default Logger.
+
+    Messages are only built if their level is enabled, and are formatted lazily. The address and the id of the remote
+    host are attached to every record as the structured fields remote_host_address and remote_host_id, so handlers and
+    filters can use them without parsing the message.
     """
     class DisableLoggingContextManager():
         """
@@ -16,46 +79,123 @@ class RemoteHostEventLogger():
         def __exit__(self, exc_type, exc_val, exc_tb):
             logging.disable(logging.NOTSET)
 
+    UNKNOWN_HOST = 'unknown host'
+
+    _queue_listener = None
+    _propagate = True
+
     def __init__(self, remote_host):
         """
         initialized with the remote host which the events are logged for
-        
+
         :param remote_host: the remote host to log for
         :type remote_host: remote_host.public.RemoteHost
         """
         self.logger = logging.getLogger(__name__)
         self.remote_host = remote_host
 
+    def isEnabledFor(self, level):
+        """
+        checks whether a message of the given level would be logged, so expensive messages are only built if needed.
+        The name follows the one of logging.Logger, so both can be used interchangeably.
+
+        :param level: the level to check
+        :type level: int
+        :return: whether the level is enabled
+        :rtype: bool
+        """
+        return self.logger.isEnabledFor(level)
+
     def debug(self, msg, *args, **kwargs):
-        self.logger.debug(self._format_message(msg), *args, **kwargs)
+        self.log(logging.DEBUG, msg, *args, **kwargs)
 
     def info(self, msg, *args, **kwargs):
-        self.logger.info(self._format_message(msg), *args, **kwargs)
+        self.log(logging.INFO, msg, *args, **kwargs)
 
     def warning(self, msg, *args, **kwargs):
-        self.logger.warning(self._format_message(msg), *args, **kwargs)
+        self.log(logging.WARNING, msg, *args, **kwargs)
 
     def error(self, msg, *args, **kwargs):
-        self.logger.error(self._format_message(msg), *args, **kwargs)
+        self.log(logging.ERROR, msg, *args, **kwargs)
 
     def critical(self, msg, *args, **kwargs):
-        self.logger.critical(self._format_message(msg), *args, **kwargs)
+        self.log(logging.CRITICAL, msg, *args, **kwargs)
 
-    @property
-    def _logging_message_prefix(self):
-        return '[{timestamp}] <{source_address}>'.format(
-            source_address=self.remote_host.address if self.remote_host else 'unknown host',
-            timestamp=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
+    def log(self, level, msg, *args, **kwargs):
+        """
+        logs the given message for the remote host, if the given level is enabled
 
-    def _format_message(self, message):
-        formatted_message = '+------------- {message_prefix} -------------'.format(
-            message_prefix=self._logging_message_prefix
+        :param level: the level to log the message with
+        :type level: int
+        :param msg: the message to log
+        :type msg: str
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+
+        remote_host_address = self.remote_host.address if self.remote_host else None
+
+        kwargs['extra'] = dict(
+            kwargs.get('extra') or {},
+            remote_host_address=remote_host_address,
+            remote_host_id=self.remote_host.pk if self.remote_host else None,
         )
-        if message:
-            for line in message.split('\n'):
-                formatted_message += '\n| {logging_line}'.format(logging_line=line)
-        formatted_message += '\n+--------------{sized_gap}--------------\n'.format(
-            sized_gap='-' * len(self._logging_message_prefix)
+        self.logger.log(
+            level,
+            RemoteHostEventMessage(msg, remote_host_address or self.UNKNOWN_HOST, datetime.datetime.now()),
+            *args,
+            **kwargs
         )
-        return formatted_message
+
+    @classmethod
+    def start_background_logging(cls, *handlers):
+        """
+        moves the emission of the logged events to a background thread. The records are put onto a queue by a
+        RemoteHostEventQueueHandler and are formatted and emitted by a QueueListener. While the background logging is
+        running, the records are not propagated to the handlers of the parent loggers, since those would format them on
+        the logging thread again. The remaining records are emitted when the interpreter exits.
+
+        :param handlers: the handlers which emit the records, by default the handlers of the logger are used
+        :type handlers: logging.Handler
+        """
+        cls.stop_background_logging()
+
+        logger = logging.getLogger(__name__)
+        handlers = handlers or tuple(logger.handlers)
+
+        if not handlers:
+            return
+
+        queue = Queue()
+
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(RemoteHostEventQueueHandler(queue))
+        RemoteHostEventLogger._propagate = logger.propagate
+        logger.propagate = False
+
+        RemoteHostEventLogger._queue_listener = QueueListener(queue, *handlers, respect_handler_level=True)
+        RemoteHostEventLogger._queue_listener.start()
+        atexit.register(cls.stop_background_logging)
+
+    @classmethod
+    def stop_background_logging(cls):
+        """
+        emits all queued records and stops the background thread. The handlers of the QueueListener are attached to
+        the logger again.
+        """
+        if RemoteHostEventLogger._queue_listener is None:
+            return
+
+        logger = logging.getLogger(__name__)
+        queue_listener = RemoteHostEventLogger._queue_listener
+        RemoteHostEventLogger._queue_listener = None
+        queue_listener.stop()
+        atexit.unregister(cls.stop_background_logging)
+
+        for handler in list(logger.handlers):
+            if isinstance(handler, RemoteHostEventQueueHandler):
+                logger.removeHandler(handler)
+        for handler in queue_listener.handlers:
+            logger.addHandler(handler)
+        logger.propagate = RemoteHostEventLogger._propagate
@@ -1,11 +1,17 @@
+import datetime
+import logging
+import threading
+
+from queue import Queue
 from unittest import TestCase
+from unittest.mock import patch
 
 from testfixtures import test_datetime, replace
 from testfixtures.logcapture import log_capture
 
 from remote_host.public import RemoteHost
 
-from ..remote_host_event_logging import RemoteHostEventLogger
+from ..remote_host_event_logging import RemoteHostEventLogger, RemoteHostEventMessage, RemoteHostEventQueueHandler
 
 
 class TestSourceEventLogging(TestCase):
@@ -88,3 +94,82 @@ class TestSourceEventLogging(TestCase):
                 self.expected_message
             )
         )
+
+    @log_capture()
+    def test_log__structured_fields(self, log):
+        self.logger.info('test message')
+
+        self.assertEqual(log.records[0].remote_host_address, 'test.com')
+        self.assertEqual(log.records[0].remote_host_id, self.logger.remote_host.pk)
+        self.assertIsInstance(log.records[0].msg, RemoteHostEventMessage)
+
+    @log_capture()
+    def test_log__without_remote_host(self, log):
+        RemoteHostEventLogger(None).info('test message')
+
+        self.assertIsNone(log.records[0].remote_host_address)
+        self.assertIn('<unknown host>', log.records[0].getMessage())
+
+    def test_log__disabled_level_not_formatted(self):
+        logger = logging.getLogger(RemoteHostEventLogger.__module__)
+        level = logger.level
+        logger.setLevel(logging.INFO)
+
+        try:
+            with patch('logging.Logger.log') as log:
+                self.logger.debug('test message')
+
+            self.assertFalse(self.logger.isEnabledFor(logging.DEBUG))
+            log.assert_not_called()
+        finally:
+            logger.setLevel(level)
+
+    @replace(
+        'remote_host_event_logging.remote_host_event_logging.datetime.datetime', test_datetime(2000, 1, 1, 12, 0, 0)
+    )
+    def test_start_background_logging(self):
+        handler = RecordingHandler()
+        logger = logging.getLogger(RemoteHostEventLogger.__module__)
+
+        RemoteHostEventLogger.start_background_logging(handler)
+        try:
+            self.assertNotIn(handler, logger.handlers)
+            self.assertFalse(logger.propagate)
+
+            self.logger.warning('test message')
+        finally:
+            RemoteHostEventLogger.stop_background_logging()
+
+        self.assertEqual(handler.messages, [self.expected_message])
+        self.assertNotEqual(handler.threads, [threading.current_thread()])
+        self.assertIn(handler, logger.handlers)
+        self.assertTrue(logger.propagate)
+        logger.removeHandler(handler)
+
+    def test_start_background_logging__without_handlers(self):
+        RemoteHostEventLogger.start_background_logging()
+
+        self.assertIsNone(RemoteHostEventLogger._queue_listener)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.threads.append(threading.current_thread())
+
+
+class TestRemoteHostEventQueueHandler(TestCase):
+    def test_prepare__record_not_formatted(self):
+        message = RemoteHostEventMessage('test message', 'test.com', datetime.datetime(2000, 1, 1, 12, 0, 0))
+        record = logging.LogRecord('test', logging.INFO, __file__, 1, message, (), None)
+        queue = Queue()
+
+        RemoteHostEventQueueHandler(queue).handle(record)
+
+        self.assertIs(queue.get_nowait().msg, message)
+        self.assertIsNone(message._formatted_message)
@@ -1,4 +1,8 @@
 import base64
+import json
+import zlib
+
+from enums.public import StringEnum
 
 from remote_execution.public import RemoteHostExecutor
 
@@ -8,7 +12,19 @@ from remote_host_command.public import RemoteHostCommand
 class RemoteScriptExecutor():
     """
     takes care of executing a given python script on a remote host and injecting environment variables
+
+    By default the script and its env are inlined into the executed command. Using the STDIN transport, only a small,
+    constant bootstrap script is part of the command, while the script and its env are streamed over the stdin of the
+    command, as a length prefixed frame, optionally compressed by zlib. The env is sent as JSON and is only decompressed
+    and parsed, once the script accesses CONTEXT.
     """
+    class Transport(StringEnum):
+        """
+        Enum to describe how a script and its env are transferred to the remote host
+        """
+        COMMAND_LINE = 'COMMAND_LINE'
+        STDIN = 'STDIN'
+
     REMOTE_SCRIPT_BASE_TEMPLATE = (
         'CONTEXT = {env_string}\n{script_string}'
     )
@@ -16,18 +32,66 @@ class RemoteScriptExecutor():
         '{SUDO_PREFIX}python -c "import base64;exec(base64.b64decode({ENCODED_SCRIPT}))"'
     )
 
-    def __init__(self, remote_host):
+    STDIN_HEADER_TEMPLATE = '{script_length} {env_length} {compressed}\n'
+    STDIN_BOOTSTRAP_SCRIPT = (
+        'import json, sys, zlib\n'
+        '\n'
+        'class _LazyContext(object):\n'
+        '    def __init__(self, load):\n'
+        '        self._load = load\n'
+        '        self._context = None\n'
+        '\n'
+        '    def _get_context(self):\n'
+        '        if self._context is None:\n'
+        '            self._context = self._load()\n'
+        '        return self._context\n'
+        '\n'
+        '    def __getattr__(self, name):\n'
+        '        return getattr(self._get_context(), name)\n'
+        '\n'
+        '    def __getitem__(self, key):\n'
+        '        return self._get_context()[key]\n'
+        '\n'
+        '    def __contains__(self, key):\n'
+        '        return key in self._get_context()\n'
+        '\n'
+        '    def __iter__(self):\n'
+        '        return iter(self._get_context())\n'
+        '\n'
+        '    def __len__(self):\n'
+        '        return len(self._get_context())\n'
+        '\n'
+        '    def __repr__(self):\n'
+        '        return repr(self._get_context())\n'
+        '\n'
+        '_input = getattr(sys.stdin, "buffer", sys.stdin)\n'
+        '_header = _input.readline().split()\n'
+        '_decode = zlib.decompress if int(_header[2]) else (lambda data: data)\n'
+        '_script = _decode(_input.read(int(_header[0])))\n'
+        '_env = _input.read(int(_header[1]))\n'
+        'CONTEXT = _LazyContext(lambda: json.loads(_decode(_env).decode("utf-8") or "{}"))\n'
+        'exec(compile(_script, "<script>", "exec"))\n'
+    )
+    DEFAULT_COMPRESSION_LEVEL = 6
+
+    def __init__(self, remote_host, transport=Transport.COMMAND_LINE, compress=False):
         """
-        
+
         :param remote_host: the remote host to execute on
         :type remote_host: remote_host.public.RemoteHost
+        :param transport: how the script and its env are transferred to the remote host
+        :type transport: str
+        :param compress: whether the script and its env are compressed, if they are transferred over stdin
+        :type compress: bool
         """
         self.remote_executor = RemoteHostExecutor(remote_host)
+        self.transport = transport
+        self.compress = compress
 
     def execute(self, script, env=None, sudo=False):
         """
         executes the given script on the remote host and injects the env dict as a CONTEXT dict into the script
-        
+
         :param script: the script to execute
         :type script: str
         :param env: the env to inject into the script
@@ -37,21 +101,86 @@ class RemoteScriptExecutor():
         :return: the stdout of the script execution
         :rtype: str
         """
-        return self.remote_executor.execute(self._render_script_execution_command(script, env, sudo))
+        if self.transport == self.Transport.STDIN:
+            return self.remote_executor.execute(
+                self.render_stdin_command(sudo),
+                stdin=self.render_stdin(script, env, self.compress),
+            )
+
+        return self.remote_executor.execute(self.render_command(script, env, sudo))
 
-    def _render_script_execution_command(self, script, env, sudo):
-        return self.PYTHON_SCRIPT_EXECUTION_COMMAND.render(
+    @classmethod
+    def render_command(cls, script, env=None, sudo=False):
+        """
+        renders the command which executes the given script, without executing it. This can be used to embed a script
+        into a more complex command, like a pipe.
+
+        :param script: the script to render
+        :type script: str
+        :param env: the env to inject into the script
+        :type env: dict
+        :param sudo: whether the script should be executed as sudo or not
+        :type sudo: bool
+        :return: the rendered command
+        :rtype: str
+        """
+        return cls.PYTHON_SCRIPT_EXECUTION_COMMAND.render(
             sudo_prefix='sudo ' if sudo else '',
-            encoded_script=self._encode_script(
-                self.REMOTE_SCRIPT_BASE_TEMPLATE.format(
-                    env_string=self._render_env(env),
+            encoded_script=cls._encode_script(
+                cls.REMOTE_SCRIPT_BASE_TEMPLATE.format(
+                    env_string=cls._render_env(env),
                     script_string=script,
                 )
             ),
         )
 
-    def _render_env(self, env):
+    @classmethod
+    def render_stdin_command(cls, sudo=False):
+        """
+        renders the command which reads a script and its env from stdin and executes the script. The command does not
+        depend on the script, so its size is constant.
+
+        :param sudo: whether the script should be executed as sudo or not
+        :type sudo: bool
+        :return: the rendered command
+        :rtype: str
+        """
+        return cls.PYTHON_SCRIPT_EXECUTION_COMMAND.render(
+            sudo_prefix='sudo ' if sudo else '',
+            encoded_script=cls._encode_script(cls.STDIN_BOOTSTRAP_SCRIPT),
+        )
+
+    @classmethod
+    def render_stdin(cls, script, env=None, compress=False):
+        """
+        renders the data, which is written to the stdin of the command rendered by render_stdin_command
+
+        :param script: the script to render
+        :type script: str
+        :param env: the env to inject into the script
+        :type env: dict
+        :param compress: whether the script and the env are compressed by zlib
+        :type compress: bool
+        :return: the header, followed by the script and the env as JSON
+        :rtype: bytes
+        """
+        encoded_script = script.encode()
+        encoded_env = json.dumps(env if env else {}, separators=(',', ':')).encode()
+
+        if compress:
+            encoded_script = zlib.compress(encoded_script, cls.DEFAULT_COMPRESSION_LEVEL)
+            encoded_env = zlib.compress(encoded_env, cls.DEFAULT_COMPRESSION_LEVEL)
+
+        return cls.STDIN_HEADER_TEMPLATE.format(
+            script_length=len(encoded_script),
+            env_length=len(encoded_env),
+            compressed=int(compress),
+        ).encode() + encoded_script + encoded_env
+
+    @staticmethod
+    def _render_env(env):
         return str(env if env else {})
 
-    def _encode_script(self, rendered_script):
+    @staticmethod
+    def _encode_script(rendered_script):
         return base64.b64encode(rendered_script.encode())
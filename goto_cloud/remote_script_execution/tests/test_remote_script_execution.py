@@ -1,4 +1,10 @@
 import base64
+import json
+import subprocess
+import sys
+import zlib
+
+from types import SimpleNamespace
 
 from django.test import TestCase
 
@@ -71,3 +77,74 @@ class TestRemoteScriptExecutor(TestCase, metaclass=TestAsset.PatchTrackedRemoteE
             ),
             self.executed_commands
         )
+
+    def test_execute__stdin_transport(self):
+        remote_script_executor = RemoteScriptExecutor(
+            RemoteHost.objects.create(address='ubuntu16'),
+            transport=RemoteScriptExecutor.Transport.STDIN,
+        )
+        executions = []
+        remote_script_executor.remote_executor = SimpleNamespace(
+            execute=lambda command, stdin=None: executions.append((command, stdin))
+        )
+
+        remote_script_executor.execute('script', {'1': 1}, sudo=True)
+
+        self.assertEqual(executions, [(
+            RemoteScriptExecutor.render_stdin_command(sudo=True),
+            RemoteScriptExecutor.render_stdin('script', {'1': 1}),
+        )])
+        self.assertTrue(executions[0][0].startswith('sudo python -c '))
+
+    def test_render_stdin_command__independent_of_script(self):
+        self.assertEqual(
+            RemoteScriptExecutor.render_stdin_command(),
+            'python -c "import base64;exec(base64.b64decode({encoded_script}))"'.format(
+                encoded_script=base64.b64encode(RemoteScriptExecutor.STDIN_BOOTSTRAP_SCRIPT.encode())
+            )
+        )
+
+    def test_render_stdin(self):
+        self.assertEqual(
+            RemoteScriptExecutor.render_stdin('script', {'key': ['value']}),
+            b'6 17 0\nscript{"key":["value"]}'
+        )
+
+    def test_render_stdin__compressed(self):
+        env = {'system_info': ['value'] * 1000}
+        stdin = RemoteScriptExecutor.render_stdin('script', env, compress=True)
+        script_length, env_length, compressed = stdin.split(b'\n', 1)[0].split()
+        body = stdin.split(b'\n', 1)[1]
+
+        self.assertEqual(compressed, b'1')
+        self.assertEqual(zlib.decompress(body[:int(script_length)]), b'script')
+        self.assertEqual(json.loads(zlib.decompress(body[int(script_length):]).decode()), env)
+        self.assertLess(len(stdin), len(json.dumps(env)) / 10)
+
+
+class TestRemoteScriptExecutorStdinBootstrap(TestCase):
+    def _run(self, stdin):
+        return subprocess.run(
+            [sys.executable, '-c', RemoteScriptExecutor.STDIN_BOOTSTRAP_SCRIPT],
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def test_bootstrap(self):
+        result = self._run(RemoteScriptExecutor.render_stdin(
+            'print(CONTEXT["key"], "key" in CONTEXT, len(CONTEXT), CONTEXT.get("missing"))',
+            {'key': '"quoted"\n'}
+        ))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'"quoted"\n True 1 None\n')
+
+    def test_bootstrap__compressed(self):
+        result = self._run(RemoteScriptExecutor.render_stdin('print(sorted(CONTEXT))', {'a': 1, 'b': 2}, True))
+
+        self.assertEqual(result.stdout, b"['a', 'b']\n")
+
+    def test_bootstrap__env_only_parsed_on_access(self):
+        self.assertEqual(self._run(b'11 7 0\nprint("ok")invalid').stdout, b'ok\n')
+        self.assertNotEqual(self._run(b'14 7 0\nprint(CONTEXT)invalid').returncode, 0)
@@ -10,17 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/1.10/ref/settings/
 """
 import os
-import json
+
+from .secret_loading import SECRETS_FILE_PATH, get_secret
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROJECT_DIR = os.path.dirname(BASE_DIR)
-SECRETS_FILE_PATH = PROJECT_DIR + '/secrets.json'
 
-SECRETS = json.load(open(SECRETS_FILE_PATH))
+# the secrets are read on their first access. Django accesses the secret key and the databases, when it configures its
+# settings, other secrets are only read once the modules using them need them
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = SECRETS.get('django_secret', '')
+SECRET_KEY = get_secret('django_secret', '')
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -48,6 +49,8 @@ INTERNAL_APPS = [
     'target',
     'source',
     'status_model',
+    'ip_allocation',
+    'event_store',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + EXTERNAL_APPS + INTERNAL_APPS
@@ -95,10 +98,16 @@ DEFAULT_DATABASE = {
 
 DATABASES = {
     'default': {
-        **SECRETS.get('database'),
+        **get_secret('database'),
         'ENGINE': 'django.db.backends.postgresql_psycopg2',
     }
-} if SECRETS.get('database') else DEFAULT_DATABASE
+} if get_secret('database') else DEFAULT_DATABASE
+
+
+# Source events
+# the process wide SourceEventRecorder writes the events of the commanders from a background thread
+
+SOURCE_EVENT_RECORDER_STARTED = True
 
 
 # Password validation
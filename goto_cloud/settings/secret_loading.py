@@ -0,0 +1,29 @@
+import json
+import os
+
+from functools import lru_cache
+
+
+SECRETS_FILE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + '/secrets.json'
+
+
+@lru_cache(maxsize=None)
+def load_secrets():
+    """
+    reads the secrets file, when a secret is accessed for the first time. The file is only read once per process.
+
+    :return: the secrets
+    :rtype: dict
+    """
+    with open(SECRETS_FILE_PATH) as secrets_file:
+        return json.load(secrets_file)
+
+
+def get_secret(name, default=None):
+    """
+    :param name: the name of the secret
+    :type name: str
+    :param default: returned, if the secret is not defined
+    :return: the secret with the given name
+    """
+    return load_secrets().get(name, default)
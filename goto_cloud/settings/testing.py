@@ -1,3 +1,7 @@
 from .base import *
 
 ENVIRONMENT = 'testing'
+
+# the background thread writes events using its own database connection, which can't see the data of the test cases,
+# so the events are written synchronously in tests
+SOURCE_EVENT_RECORDER_STARTED = False
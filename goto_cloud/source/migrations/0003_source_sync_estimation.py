@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 16:30
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0002_remove_source_system_info'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='sync_estimation',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0003_source_sync_estimation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='source',
+            index=models.Index(fields=['migration_run', 'status'], name='source_run_status_idx'),
+        ),
+    ]
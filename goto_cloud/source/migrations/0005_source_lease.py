@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-19 17:29
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0004_source_run_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='lease_expires',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='lease_owner',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
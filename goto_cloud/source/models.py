@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.fields import JSONField
 
 from migration_run.public import MigrationRun
 
@@ -9,6 +10,65 @@ from target.public import Target
 from status_model.public import StatusModel
 
 
+class SourceQuerySet(models.QuerySet):
+    """
+    lookups of sources, which use the indexed columns of the sources and their remote hosts
+    """
+    def in_migration_run(self, migration_run, *statuses):
+        """
+        :param migration_run: the migration run the sources are part of
+        :type migration_run: MigrationRun
+        :param statuses: if given, only sources with one of these statuses are returned
+        :type statuses: str
+        :return: the sources of the given migration run
+        :rtype: SourceQuerySet
+        """
+        sources = self.filter(migration_run=migration_run)
+        return sources.filter(status__in=statuses) if statuses else sources
+
+    def with_lifecycle_context(self):
+        """
+        :return: the sources, with all related objects, which are used during their lifecycle, loaded in the same query
+        :rtype: SourceQuerySet
+        """
+        return self.select_related(*Source.LIFECYCLE_CONTEXT)
+
+    def count_statuses(self, migration_run):
+        """
+        counts the sources of a migration run per status. The query is answered by the index on migration run and
+        status, without reading the rows of the sources.
+
+        :param migration_run: the migration run to count the statuses for
+        :type migration_run: MigrationRun
+        :return: maps the statuses onto the number of sources having them
+        :rtype: dict
+        """
+        return {
+            row['status']: row['count']
+            for row in self.filter(migration_run=migration_run).order_by().values('status').annotate(
+                count=models.Count('status')
+            )
+        }
+
+    def by_hostname(self, hostname):
+        """
+        :param hostname: the hostname of the source system
+        :type hostname: str
+        :return: the sources with the given hostname
+        :rtype: SourceQuerySet
+        """
+        return self.filter(remote_host__hostname=hostname)
+
+    def by_cloud_server_id(self, cloud_server_id):
+        """
+        :param cloud_server_id: the id of the server of the sources target in the cloud
+        :type cloud_server_id: str
+        :return: the sources whose target has the given cloud server id
+        :rtype: SourceQuerySet
+        """
+        return self.filter(target__remote_host__cloud_server_id=cloud_server_id)
+
+
 class Source(StatusModel):
     """
     represents a source system, which will be migrated to a Target during the migration
@@ -21,6 +81,7 @@ class Source(StatusModel):
         CREATE_PARTITIONS = 'CREATE_PARTITIONS'
         CREATE_FILESYSTEMS = 'CREATE_FILESYSTEMS'
         MOUNT_FILESYSTEMS = 'MOUNT_FILESYSTEMS'
+        ESTIMATE_SYNC = 'ESTIMATE_SYNC'
         SYNC = 'SYNC'
         FINAL_SYNC = 'FINAL_SYNC'
         ADJUST_NETWORK_CONFIG = 'ADJUST_NETWORK_CONFIG'
@@ -42,6 +103,7 @@ class Source(StatusModel):
         Status.CREATE_PARTITIONS,
         Status.CREATE_FILESYSTEMS,
         Status.MOUNT_FILESYSTEMS,
+        Status.ESTIMATE_SYNC,
         Status.SYNC,
         Status.FINAL_SYNC,
         Status.ADJUST_NETWORK_CONFIG,
@@ -56,6 +118,11 @@ class Source(StatusModel):
         Status.LIVE,
     )
 
+    LIFECYCLE_CONTEXT = ('remote_host', 'target__remote_host', 'migration_run__plan')
+    """
+    the related objects, which are used by the commands during the lifecycle of a source
+    """
+
     @property
     def lifecycle(self):
         return self._LIFECYCLE
@@ -63,3 +130,33 @@ class Source(StatusModel):
     migration_run = models.ForeignKey(MigrationRun, related_name='sources', null=True,)
     target = models.OneToOneField(Target, related_name='source', null=True,)
     remote_host = models.ForeignKey(RemoteHost, related_name='sources')
+    sync_estimation = JSONField(default=dict)
+    """
+    maps the mountpoints which will be synced, onto the number of bytes and inodes which are used on them
+    """
+
+    objects = SourceQuerySet.as_manager()
+
+    def load_lifecycle_context(self):
+        """
+        loads the related objects of the LIFECYCLE_CONTEXT, using a single query, so the commands of the lifecycle
+        share them, instead of loading and deserializing them one by one. Related objects which have already been
+        loaded are kept, so changes to them are not lost.
+        """
+        relations = [
+            relation for relation in ('remote_host', 'target', 'migration_run')
+            if not getattr(Source, relation).is_cached(self)
+        ]
+
+        if self.pk is None or not relations:
+            return
+
+        loaded_source = Source.objects.with_lifecycle_context().get(pk=self.pk)
+
+        for relation in relations:
+            setattr(self, relation, getattr(loaded_source, relation))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['migration_run', 'status'], name='source_run_status_idx'),
+        ]
@@ -1,11 +1,19 @@
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from migration_plan.public import MigrationPlan
+
+from migration_run.public import MigrationRun
 
 from source.public import Source
 
 from remote_host.public import RemoteHost
 
+from target.public import Target
+
 
 TEST_LIFECYCLE = (
     'FIRST',
@@ -38,3 +46,302 @@ class TestSource(TestCase):
         self.assertEquals(self.test_source.status, 'SECOND')
         self.test_source.decrement_status()
         self.assertEquals(self.test_source.status, 'FIRST')
+
+    def test_increment_status__only_status_written(self):
+        self.test_source.sync_estimation = {'/': {'bytes': 1}}
+        updated = self.test_source.updated
+
+        with self.assertNumQueries(1):
+            self.test_source.increment_status()
+
+        source = Source.objects.get(pk=self.test_source.pk)
+        self.assertEquals(source.status, 'SECOND')
+        self.assertEquals(source.sync_estimation, {})
+        self.assertEquals(source.updated, self.test_source.updated)
+        self.assertGreater(source.updated, updated)
+
+    def test_increment_status__conflict(self):
+        Source.objects.filter(pk=self.test_source.pk).update(status='THIRD')
+
+        with self.assertRaises(Source.StatusConflictException):
+            self.test_source.increment_status()
+
+        self.assertEquals(self.test_source.status, 'FIRST')
+        self.assertEquals(Source.objects.get(pk=self.test_source.pk).status, 'THIRD')
+
+    @patch('source.models.Source._LIFECYCLE', TEST_LIFECYCLE)
+    def test_increment_status__unsaved(self):
+        source = Source(remote_host=self.test_source.remote_host)
+        source.increment_status()
+
+        self.assertEquals(Source.objects.get(pk=source.pk).status, 'SECOND')
+
+    def test_advance_many(self):
+        sources = [
+            Source.objects.create(remote_host=RemoteHost.objects.create()),
+            Source.objects.create(remote_host=RemoteHost.objects.create(), status=Source.Status.SYNC),
+            Source.objects.create(remote_host=RemoteHost.objects.create(), status=Source.Status.LIVE),
+            Source.objects.create(remote_host=RemoteHost.objects.create()),
+        ]
+        Source.objects.filter(pk=sources[3].pk).update(status=Source.Status.SYNC)
+
+        advanced = Source.advance_many(sources)
+
+        self.assertEquals(set(advanced), set(sources[:2]))
+        self.assertEquals(
+            [source.status for source in sources],
+            [Source.Status.CREATE_TARGET, Source.Status.FINAL_SYNC, Source.Status.LIVE, Source.Status.DRAFT]
+        )
+        self.assertEquals(
+            dict(Source.objects.filter(pk__in=[source.pk for source in sources]).values_list('pk', 'status')),
+            {
+                sources[0].pk: Source.Status.CREATE_TARGET,
+                sources[1].pk: Source.Status.FINAL_SYNC,
+                sources[2].pk: Source.Status.LIVE,
+                sources[3].pk: Source.Status.SYNC,
+            }
+        )
+
+    def test_advance_many__nothing_to_advance(self):
+        with self.assertNumQueries(0):
+            self.assertEquals(Source.advance_many([]), [])
+
+    def test_advance_many__leased_by_other_owner(self):
+        source = Source.objects.create(remote_host=RemoteHost.objects.create())
+        Source.objects.get(pk=source.pk).claim('other worker')
+
+        self.assertEquals(Source.advance_many([source]), [])
+        self.assertEquals(source.status, Source.Status.DRAFT)
+
+    def test_advance_many__freshly_loaded_leased_by_other_owner(self):
+        source = Source.objects.create(remote_host=RemoteHost.objects.create())
+        source.claim('other worker')
+
+        self.assertEquals(Source.advance_many([Source.objects.get(pk=source.pk)], 'worker'), [])
+        self.assertEquals(Source.advance_many([Source.objects.get(pk=source.pk)]), [])
+        self.assertEquals(Source.objects.get(pk=source.pk).status, Source.Status.DRAFT)
+
+    def test_advance_many__lease_held(self):
+        source = Source.objects.create(remote_host=RemoteHost.objects.create())
+        source.claim('worker')
+
+        self.assertEquals(Source.advance_many([Source.objects.get(pk=source.pk)], 'worker'), [source])
+        self.assertEquals(Source.objects.get(pk=source.pk).status, Source.Status.CREATE_TARGET)
+
+
+class TestSourceLease(TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(remote_host=RemoteHost.objects.create())
+
+    def get_lease(self, source=None):
+        return Source.objects.filter(pk=(source or self.source).pk).values_list('lease_owner', 'lease_expires').get()
+
+    def test_claim(self):
+        self.assertTrue(self.source.claim('worker', duration=60))
+
+        self.assertEquals(self.source.lease_owner, 'worker')
+        self.assertEquals(self.get_lease(), ('worker', self.source.lease_expires))
+        self.assertAlmostEqual(
+            (self.source.lease_expires - timezone.now()).total_seconds(),
+            60,
+            delta=5
+        )
+
+    def test_claim__renew(self):
+        self.source.claim('worker', duration=60)
+        self.assertTrue(self.source.claim('worker', duration=120))
+
+        self.assertEquals(self.get_lease(), ('worker', self.source.lease_expires))
+
+    def test_claim__leased_by_other_owner(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        self.assertFalse(self.source.claim('worker'))
+        self.assertEquals(self.source.lease_owner, '')
+        self.assertEquals(self.get_lease()[0], 'other worker')
+
+    def test_claim__expired_lease(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker', duration=-1)
+
+        self.assertTrue(self.source.claim('worker'))
+        self.assertEquals(self.get_lease()[0], 'worker')
+
+    def test_claim__status_changed(self):
+        Source.objects.filter(pk=self.source.pk).update(status=Source.Status.SYNC)
+
+        self.assertFalse(self.source.claim('worker'))
+
+    def test_heartbeat(self):
+        self.source.claim('worker', duration=60)
+        self.source.heartbeat('worker', duration=120)
+
+        self.assertEquals(self.get_lease(), ('worker', self.source.lease_expires))
+        self.assertGreater((self.source.lease_expires - timezone.now()).total_seconds(), 60)
+
+    def test_heartbeat__lease_lost(self):
+        self.source.claim('worker', duration=-1)
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        with self.assertRaises(Source.LeaseLostException):
+            self.source.heartbeat('worker')
+
+    def test_heartbeat__lease_expired(self):
+        self.source.claim('worker', duration=-1)
+
+        with self.assertRaises(Source.LeaseLostException):
+            self.source.heartbeat('worker')
+
+    def test_release(self):
+        self.source.claim('worker')
+
+        self.assertTrue(self.source.release('worker'))
+        self.assertEquals(self.source.lease_owner, '')
+        self.assertEquals(self.get_lease(), ('', None))
+
+    def test_release__not_held(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        self.assertFalse(self.source.release('worker'))
+        self.assertEquals(self.get_lease()[0], 'other worker')
+
+    def test_increment_status__leased_by_other_owner(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker')
+
+        with self.assertRaises(Source.StatusConflictException):
+            self.source.increment_status()
+
+    def test_increment_status__freshly_loaded_leased_by_other_owner(self):
+        self.source.claim('other worker')
+        source = Source.objects.get(pk=self.source.pk)
+
+        with self.assertRaises(Source.StatusConflictException):
+            source.increment_status()
+        with self.assertRaises(Source.StatusConflictException):
+            source.increment_status(owner='worker')
+
+        self.assertEquals(Source.objects.get(pk=self.source.pk).status, Source.Status.DRAFT)
+
+    def test_increment_status__expired_lease(self):
+        Source.objects.get(pk=self.source.pk).claim('other worker', duration=-1)
+
+        self.source.increment_status(owner='worker')
+
+        self.assertEquals(Source.objects.get(pk=self.source.pk).status, Source.Status.CREATE_TARGET)
+
+    def test_increment_status__lease_held(self):
+        self.source.claim('worker')
+        Source.objects.get(pk=self.source.pk).increment_status(owner='worker')
+
+        self.assertEquals(
+            Source.objects.filter(pk=self.source.pk).values_list('status', 'lease_owner').get(),
+            (Source.Status.CREATE_TARGET, 'worker')
+        )
+
+    def test_claim_next(self):
+        leased_source = Source.objects.create(remote_host=RemoteHost.objects.create())
+        Source.objects.get(pk=leased_source.pk).claim('other worker')
+        other_source = Source.objects.create(remote_host=RemoteHost.objects.create())
+
+        claimed_source = Source.claim_next('worker')
+        self.assertEquals(claimed_source, self.source)
+        self.assertEquals(claimed_source.lease_owner, 'worker')
+
+        self.assertEquals(Source.claim_next('another worker'), other_source)
+        self.assertIsNone(Source.claim_next('third worker'))
+
+    def test_claim_next__queryset(self):
+        live_source = Source.objects.create(remote_host=RemoteHost.objects.create(), status=Source.Status.LIVE)
+
+        claimed_source = Source.claim_next(
+            'worker',
+            queryset=Source.objects.filter(status=Source.Status.LIVE).with_lifecycle_context()
+        )
+
+        self.assertEquals(claimed_source, live_source)
+        self.assertEquals(self.get_lease(live_source)[0], 'worker')
+        self.assertEquals(self.get_lease()[0], '')
+
+    def test_claim_next__queryset_filtering_lease(self):
+        claimed_source = Source.claim_next('worker', queryset=Source.objects.filter(lease_owner=''))
+
+        self.assertEquals(claimed_source, self.source)
+        self.assertEquals(claimed_source.lease_owner, 'worker')
+
+    def test_claim_next__related_objects_selected(self):
+        claimed_source = Source.claim_next('worker', queryset=Source.objects.with_lifecycle_context())
+
+        with self.assertNumQueries(0):
+            self.assertEquals(claimed_source.remote_host, self.source.remote_host)
+
+
+class TestSourceQuerySet(TestCase):
+    def setUp(self):
+        self.migration_run = MigrationRun.objects.create(plan=MigrationPlan.objects.create())
+        self.other_migration_run = MigrationRun.objects.create(plan=MigrationPlan.objects.create())
+        self.draft_source = self._create_source('ubuntu12', self.migration_run)
+        self.live_source = self._create_source('ubuntu14', self.migration_run, status=Source.Status.LIVE)
+        self.other_source = self._create_source('ubuntu16', self.other_migration_run)
+
+    def _create_source(self, hostname, migration_run, **kwargs):
+        return Source.objects.create(
+            remote_host=RemoteHost.objects.create(system_info={'network': {'hostname': hostname}}),
+            target=Target.objects.create(
+                remote_host=RemoteHost.objects.create(cloud_metadata={'id': '{hostname}-id'.format(hostname=hostname)})
+            ),
+            migration_run=migration_run,
+            **kwargs
+        )
+
+    def test_in_migration_run(self):
+        self.assertEqual(
+            set(Source.objects.in_migration_run(self.migration_run)),
+            {self.draft_source, self.live_source}
+        )
+
+    def test_in_migration_run__statuses(self):
+        self.assertEqual(
+            list(Source.objects.in_migration_run(self.migration_run, Source.Status.LIVE, Source.Status.SYNC)),
+            [self.live_source]
+        )
+
+    def test_count_statuses(self):
+        self.assertEqual(
+            Source.objects.count_statuses(self.migration_run),
+            {Source.Status.DRAFT: 1, Source.Status.LIVE: 1}
+        )
+
+    def test_by_hostname(self):
+        self.assertEqual(list(Source.objects.by_hostname('ubuntu14')), [self.live_source])
+
+    def test_by_cloud_server_id(self):
+        self.assertEqual(list(Source.objects.by_cloud_server_id('ubuntu16-id')), [self.other_source])
+
+    def test_migration_run_status_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Source._meta.db_table)
+
+        self.assertEqual(constraints['source_run_status_idx']['columns'], ['migration_run_id', 'status'])
+
+    def test_load_lifecycle_context(self):
+        source = Source.objects.get(pk=self.draft_source.pk)
+
+        with self.assertNumQueries(1):
+            source.load_lifecycle_context()
+            self.assertEqual(source.remote_host.hostname, 'ubuntu12')
+            self.assertEqual(source.target.remote_host.cloud_server_id, 'ubuntu12-id')
+            self.assertEqual(source.migration_run.plan, self.migration_run.plan)
+
+    def test_load_lifecycle_context__loaded_objects_kept(self):
+        source = Source.objects.get(pk=self.draft_source.pk)
+        source.remote_host.address = 'changed'
+
+        source.load_lifecycle_context()
+
+        self.assertEqual(source.remote_host.address, 'changed')
+        self.assertEqual(source.target, self.draft_source.target)
+
+    def test_load_lifecycle_context__unsaved_source(self):
+        source = Source()
+
+        with self.assertNumQueries(0):
+            source.load_lifecycle_context()
@@ -112,7 +112,7 @@ class ObjectStatusLifecycleManager():
         :return: is the status valid
         :rtype: bool
         """
-        valid = status in self.status_lifecycle.statuses
+        valid = status in self.status_lifecycle.index_lookup
         if not valid and raise_exception:
             raise ObjectStatusLifecycleManager.InvalidStatusException()
         else:
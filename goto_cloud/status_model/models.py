@@ -1,6 +1,13 @@
+import datetime
+
 from abc import abstractmethod
 
-from django.db import models
+from functools import reduce
+
+from operator import or_
+
+from django.db import models, transaction
+from django.utils import timezone
 
 from enums.public import StringEnum
 
@@ -13,6 +20,11 @@ class StatusModel(TrackedModel):
     """
     This Model can be inherited by models which have a status in a lifecycle. The property model.lifecycle_manager
     returns a ObjectStatusLifecycleManager containing the relevant lifecycle.
+
+    Workers which drive the lifecycles of the same models concurrently, can lease a model, before working on its
+    status. A lease is held by an owner until it expires, is released, or is renewed by a heartbeat. Leases and
+    statuses are changed with row level compare-and-set updates, so status transitions of a model, which is leased by
+    another owner, fail until the lease expired.
     """
     class InvalidStatusException(Exception):
         """
@@ -20,6 +32,18 @@ class StatusModel(TrackedModel):
         """
         pass
 
+    class StatusConflictException(Exception):
+        """
+        raised if the status has been changed in the database, since the model has been loaded
+        """
+        pass
+
+    class LeaseLostException(Exception):
+        """
+        raised if a lease is not held by an owner anymore
+        """
+        pass
+
     class Status(StringEnum):
         pass
 
@@ -47,25 +71,261 @@ class StatusModel(TrackedModel):
 
         return super().save(*args, **kwargs)
 
+    DEFAULT_LEASE_DURATION = 600
+    """
+    the number of seconds a lease is held, if it is not renewed
+    """
+
     status = models.CharField(max_length=255)
+    lease_owner = models.CharField(max_length=255, blank=True, default='')
+    lease_expires = models.DateTimeField(null=True, blank=True)
 
-    def increment_status(self):
+    def increment_status(self, owner=''):
         """
-        increments the status of this StatusModel
+        increments the status of this StatusModel. Only the status and the updated timestamp are written, and only if
+        the status in the database is still the one of this instance.
 
+        :param owner: the worker, which changes the status. The status is only changed, if the model is leased by this
+        owner, or its lease expired. By default only models which are not leased can be changed.
+        :type owner: str
         :raises: ObjectStatusLifecycleManager.InvalidStatusException in case there is no next status
+        :raises: StatusModel.StatusConflictException in case the status has been changed in the meantime
         """
-        self.status = self._lifecycle_manager.get_next_status()
-        self.save()
+        self._transition_status(self._lifecycle_manager.get_next_status(), owner)
 
-    def decrement_status(self):
+    def decrement_status(self, owner=''):
         """
-        decrements the status of this StatusModel
+        decrements the status of this StatusModel. Only the status and the updated timestamp are written, and only if
+        the status in the database is still the one of this instance.
 
+        :param owner: the worker, which changes the status. The status is only changed, if the model is leased by this
+        owner, or its lease expired. By default only models which are not leased can be changed.
+        :type owner: str
         :raises: ObjectStatusLifecycleManager.InvalidStatusException in case there is no previous status
+        :raises: StatusModel.StatusConflictException in case the status has been changed in the meantime
+        """
+        self._transition_status(self._lifecycle_manager.get_previous_status(), owner)
+
+    def _transition_status(self, status, owner=''):
         """
-        self.status = self._lifecycle_manager.get_previous_status()
-        self.save()
+        changes the status with a single UPDATE ... WHERE status = <current status>, so concurrent transitions of the
+        same model can not overwrite each other. Models which have not been saved yet, are saved completely.
+
+        :param status: the status to change to
+        :type status: str
+        :param owner: the worker, which changes the status
+        :type owner: str
+        :raises: StatusModel.StatusConflictException in case the status has been changed in the meantime
+        """
+        if self.pk is None:
+            self.status = status
+            self.save()
+            return
+
+        updated = timezone.now()
+        if not type(self)._default_manager.filter(self._get_transition_filter(owner, updated)).update(
+            status=status,
+            updated=updated,
+        ):
+            raise StatusModel.StatusConflictException(
+                'status of {model} {pk} is not {status} anymore, or it is leased by another owner'.format(
+                    model=type(self).__name__,
+                    pk=self.pk,
+                    status=self.status,
+                )
+            )
+
+        self.status = status
+        self.updated = updated
+
+    def _get_transition_filter(self, owner, now):
+        """
+        :param owner: the worker, which changes the status
+        :type owner: str
+        :param now: the time the transition happens at
+        :type now: datetime.datetime
+        :return: matches the row of this model, if it still has the status of this instance, and it is leased by the
+        given owner, or the lease expired. The lease of the row is matched and not the one of this instance, which
+        might have been loaded with the lease of another owner.
+        :rtype: django.db.models.Q
+        """
+        return models.Q(pk=self.pk, status=self.status) & (
+            models.Q(lease_owner=owner) | models.Q(lease_expires__lt=now)
+        )
+
+    @staticmethod
+    def _get_claimable_filter(owner, now):
+        """
+        :param owner: the owner, who wants to claim a lease
+        :type owner: str
+        :param now: the time the lease is claimed at
+        :type now: datetime.datetime
+        :return: matches the rows which are not leased, leased by the given owner or whose lease expired
+        :rtype: django.db.models.Q
+        """
+        return models.Q(lease_owner='') | models.Q(lease_owner=owner) | models.Q(lease_expires__lt=now)
+
+    def claim(self, owner, duration=DEFAULT_LEASE_DURATION):
+        """
+        claims the lease of this model in its current status. The claim succeeds, if the status in the database is
+        still the one of this instance and the model is not leased by another owner, or the lease expired. Claiming a
+        lease which is already held by the owner renews it.
+
+        :param owner: identifies the worker, which claims the lease
+        :type owner: str
+        :param duration: the number of seconds the lease is held
+        :type duration: float
+        :return: whether the lease has been claimed
+        :rtype: bool
+        """
+        now = timezone.now()
+        lease_expires = now + datetime.timedelta(seconds=duration)
+
+        if not type(self)._default_manager.filter(
+            self._get_claimable_filter(owner, now),
+            pk=self.pk,
+            status=self.status,
+        ).update(lease_owner=owner, lease_expires=lease_expires):
+            return False
+
+        self.lease_owner = owner
+        self.lease_expires = lease_expires
+        return True
+
+    def heartbeat(self, owner, duration=DEFAULT_LEASE_DURATION):
+        """
+        renews the lease of the given owner
+
+        :param owner: identifies the worker, which holds the lease
+        :type owner: str
+        :param duration: the number of seconds the lease is held from now on
+        :type duration: float
+        :raises: StatusModel.LeaseLostException in case the owner does not hold the lease anymore, or it expired
+        """
+        now = timezone.now()
+        lease_expires = now + datetime.timedelta(seconds=duration)
+
+        if not type(self)._default_manager.filter(
+            pk=self.pk,
+            lease_owner=owner,
+            lease_expires__gte=now,
+        ).update(lease_expires=lease_expires):
+            raise StatusModel.LeaseLostException('{owner} does not hold the lease of {model} {pk} anymore'.format(
+                owner=owner,
+                model=type(self).__name__,
+                pk=self.pk,
+            ))
+
+        self.lease_owner = owner
+        self.lease_expires = lease_expires
+
+    def release(self, owner):
+        """
+        releases the lease of the given owner, so other workers can claim the model right away
+
+        :param owner: identifies the worker, which holds the lease
+        :type owner: str
+        :return: whether the owner held the lease
+        :rtype: bool
+        """
+        released = type(self)._default_manager.filter(
+            pk=self.pk,
+            lease_owner=owner,
+        ).update(lease_owner='', lease_expires=None)
+
+        if self.lease_owner == owner:
+            self.lease_owner = ''
+            self.lease_expires = None
+
+        return bool(released)
+
+    @classmethod
+    def claim_next(cls, owner, queryset=None, duration=DEFAULT_LEASE_DURATION):
+        """
+        claims the lease of the least recently updated model, which can be claimed by the given owner. The rows are
+        locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers pulling from the same queryset, claim
+        different models without waiting for each other.
+
+        :param owner: identifies the worker, which claims the lease
+        :type owner: str
+        :param queryset: the models to choose from, for example the sources of a migration run, which did not reach the
+        end of their lifecycle yet. By default all models are considered.
+        :type queryset: django.db.models.QuerySet
+        :param duration: the number of seconds the lease is held
+        :type duration: float
+        :return: the claimed model, or None if there is no model which can be claimed
+        :rtype: StatusModel
+        """
+        queryset = cls._default_manager.all() if queryset is None else queryset
+        now = timezone.now()
+        lease_expires = now + datetime.timedelta(seconds=duration)
+
+        with transaction.atomic():
+            pk = queryset.select_related(None).filter(
+                cls._get_claimable_filter(owner, now)
+            ).select_for_update(skip_locked=True).order_by('updated', 'pk').values_list('pk', flat=True).first()
+
+            if pk is None:
+                return None
+
+            cls._default_manager.filter(pk=pk).update(lease_owner=owner, lease_expires=lease_expires)
+
+        # the claimed model is loaded without the filters of the queryset, which might not match its new lease, but
+        # with the related objects the queryset selects
+        claimed = cls._default_manager.all()
+        claimed.query.select_related = queryset.query.select_related
+        return claimed.get(pk=pk)
+
+    @classmethod
+    def advance_many(cls, models_to_advance, owner=''):
+        """
+        increments the statuses of several models at once, using one query to lock their rows and one UPDATE for all
+        of them. Models whose status has been changed in the database in the meantime, which are leased by an owner
+        other than the given one, or which already reached the end of their lifecycle, are skipped.
+
+        :param models_to_advance: the saved models to advance
+        :type models_to_advance: collections.Iterable[StatusModel]
+        :param owner: the worker, which advances the models. By default only models which are not leased are advanced.
+        :type owner: str
+        :return: the models which have been advanced, with their new statuses
+        :rtype: list[StatusModel]
+        """
+        next_statuses = {
+            model.pk: (model, model._lifecycle_manager.get_next_status(raise_exception=False))
+            for model in models_to_advance
+        }
+        next_statuses = {pk: model_status for pk, model_status in next_statuses.items() if model_status[1]}
+
+        if not next_statuses:
+            return []
+
+        updated = timezone.now()
+
+        with transaction.atomic():
+            advanceable = set(cls._default_manager.select_for_update().filter(reduce(
+                or_,
+                (model._get_transition_filter(owner, updated) for model, next_status in next_statuses.values())
+            )).values_list('pk', flat=True))
+            advanced = [
+                (model, next_status) for pk, (model, next_status) in next_statuses.items() if pk in advanceable
+            ]
+
+            if not advanced:
+                return []
+
+            cls._default_manager.filter(pk__in=[model.pk for model, next_status in advanced]).update(
+                status=models.Case(
+                    *[models.When(pk=model.pk, then=models.Value(next_status)) for model, next_status in advanced],
+                    output_field=models.CharField()
+                ),
+                updated=updated,
+            )
+
+        for model, next_status in advanced:
+            model.status = next_status
+            model.updated = updated
+
+        return [model for model, next_status in advanced]
 
     class Meta:
         abstract = True
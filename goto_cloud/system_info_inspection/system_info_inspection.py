@@ -114,18 +114,25 @@ class SystemInfoGetter(metaclass=ABCMeta):
         """
         pass
 
-    def get_system_info(self):
+    def get_system_info(self, sections=None):
         """
         retrieves aggregates information about the system
 
+        :param sections: the sections of the system info to retrieve, by default all sections are retrieved
+        :type sections: list[str]
         :return: system info
         :rtype: dict
         """
+        section_getters = {
+            'block_devices': self.get_block_devices,
+            'network': self.get_network_info,
+            'os': self.get_os,
+            'hardware': self.get_hardware,
+        }
+
         return {
-            'block_devices': self.get_block_devices(),
-            'network': self.get_network_info(),
-            'os': self.get_os(),
-            'hardware': self.get_hardware(),
+            section: section_getters[section]()
+            for section in (sections if sections is not None else section_getters)
         }
 
 
@@ -86,3 +86,12 @@ class TestSystemInfoGetter(TestCase, metaclass=TestAsset.PatchRemoteHostMeta):
             lambda system_info_getter: system_info_getter.get_system_info(),
             lambda tested_vm, result: self.assertDictEqual(result, tested_vm.get_config())
         )
+
+    def test_get_system_info__sections(self):
+        self.call_on_all_test_vms(
+            lambda system_info_getter: system_info_getter.get_system_info(['network', 'os']),
+            lambda tested_vm, result: self.assertDictEqual(
+                result,
+                {'network': tested_vm.get_config()['network'], 'os': tested_vm.get_config()['os']}
+            )
+        )
@@ -0,0 +1,17 @@
+from concurrent.futures import Executor, Future
+
+
+class CurrentThreadExecutor(Executor):
+    """
+    an executor, which runs the submitted calls right away in the current thread. This can be used to test code, which
+    runs blocking calls in an executor, with the database connection of the test case.
+    """
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+        return future
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+
+MEASUREMENT_SCRIPT = '''
+import json
+import sys
+
+modules_before_import = sorted(sys.modules)
+import {module}
+
+print(json.dumps({{'before': modules_before_import, 'after': sorted(sys.modules)}}))
+'''
+
+
+class ImportMeasurement():
+    """
+    imports a module in a fresh interpreter and captures which modules it loaded, so the startup cost of a module can
+    be tested without being affected by the modules the test run already imported. The number of imported modules is
+    used as the measure of the cost, since it does not depend on the load of the machine, like the import time does.
+    """
+    SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def __init__(self, module):
+        """
+        :param module: the dotted path of the module to import
+        :type module: str
+        """
+        result = json.loads(subprocess.check_output(
+            [sys.executable, '-c', MEASUREMENT_SCRIPT.format(module=module)],
+            cwd=self.SOURCE_DIRECTORY,
+            env={**os.environ, 'PYTHONPATH': self.SOURCE_DIRECTORY},
+        ).decode())
+
+        self.modules = set(result['after'])
+        self.imported_modules = self.modules - set(result['before'])
+
+    def loaded(self, package):
+        """
+        :param package: the name of a top level package
+        :type package: str
+        :return: whether the package, or any of its submodules, has been loaded by the import
+        :rtype: bool
+        """
+        return any(module == package or module.startswith(package + '.') for module in self.modules)
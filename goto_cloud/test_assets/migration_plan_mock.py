@@ -72,6 +72,7 @@ MIGRATION_PLAN_MOCK = {
                     }
                 },
                 "sync": "sudo rsync -zaXAPx --delete --numeric-ids -e \"ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no\" --rsync-path=\"sudo rsync\" {SOURCE_DIR}/ {TARGET_DIR}",
+                "block_sync_ssh": "ssh -i $HOME/.ssh/id_rsa -o StrictHostKeyChecking=no",
                 "reinstall_bootloader": "sudo grub-install --boot-directory=/boot {DEVICE}",
             }
         },
@@ -0,0 +1,101 @@
+from remote_command_batching.public import RemoteCommandBatch
+
+
+class RemoteCommandBatchEmulator():
+    """
+    emulates the execution of a RemoteCommandBatch script, by executing its single commands one after another, so they
+    can be answered and tracked by the remote host mocks like commands which are executed on their own. Parallel batches
+    are emulated sequentially as well, but never stop on a failure. Commands chained by && or || are executed one by
+    one as well, without supporting a mix of both in the same command.
+    """
+    SEQUENCE_SEPARATOR = ' && '
+    ALTERNATIVE_SEPARATOR = ' || '
+    RESULT_OUTPUT_PREFIX = ') >"$'
+    FAILURE_CHECK_PREFIX = 'case $GOTO_CLOUD_EXIT_CODE in '
+
+    def __init__(self, script):
+        self.script = script
+
+    @staticmethod
+    def is_batch(command):
+        return RemoteCommandBatch.COMMAND_MARKER.format(index=0) in command
+
+    def execute(self, execute_command):
+        """
+        executes the commands of the batch
+
+        :param execute_command: executes a single command and returns a dict with exit_code, stdout and stderr
+        :type execute_command: (str) -> dict
+        :return: the emulated result of the batch script
+        :rtype: dict
+        """
+        output_lines = []
+        failed = False
+
+        for index, command, accepted_exit_codes in self._parse_commands():
+            result = {'exit_code': '', 'stdout': '', 'stderr': '', 'duration': ''}
+            if not failed:
+                result = dict(self._execute_sequence(command, execute_command), duration=0)
+                failed = accepted_exit_codes is not None and result['exit_code'] not in accepted_exit_codes
+
+            output_lines += [
+                RemoteCommandBatch.RESULT_MARKER.format(
+                    index=index,
+                    exit_code=result['exit_code'],
+                    duration=result['duration'],
+                ),
+                result['stdout'],
+                RemoteCommandBatch.STDERR_MARKER.format(index=index),
+                result['stderr'].decode() if isinstance(result['stderr'], bytes) else result['stderr'],
+            ]
+
+        return {
+            'exit_code': 0,
+            'stdout': '\n'.join(output_lines),
+            'stderr': '',
+        }
+
+    def _execute_sequence(self, command, execute_command):
+        for part in command.split(self.SEQUENCE_SEPARATOR):
+            result = self._execute_alternatives(part, execute_command)
+            if result['exit_code'] != 0:
+                break
+        return result
+
+    def _execute_alternatives(self, command, execute_command):
+        for alternative in command.split(self.ALTERNATIVE_SEPARATOR):
+            result = execute_command(alternative)
+            if result['exit_code'] == 0:
+                break
+        return result
+
+    def _parse_commands(self):
+        """
+        :return: the index, command and accepted exit codes of every command in the batch. The accepted exit codes are
+        None, if a failure does not stop the batch
+        :rtype: list[(int, str, tuple)]
+        """
+        commands = []
+
+        command_separator = '\n' + RemoteCommandBatch.COMMAND_MARKER.split(' {index}')[0]
+
+        for index, section in enumerate(self.script.split(command_separator)[1:]):
+            lines = section.split('\n')
+            command_end = next(
+                line_index for line_index, line in enumerate(lines) if line.startswith(self.RESULT_OUTPUT_PREFIX)
+            )
+            failure_check = next(
+                (line for line in lines[command_end:] if line.startswith(self.FAILURE_CHECK_PREFIX)),
+                None
+            )
+
+            commands.append((
+                index,
+                '\n'.join(lines[2:command_end]),
+                tuple(
+                    int(exit_code)
+                    for exit_code in failure_check[len(self.FAILURE_CHECK_PREFIX):].split(')')[0].split('|')
+                ) if failure_check else None,
+            ))
+
+        return commands
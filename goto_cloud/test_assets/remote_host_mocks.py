@@ -63,12 +63,16 @@ COMMAND_DIRECTORY_MAP = {
     'hostname': 'hostname',
     'lsblk -no NAME': 'lsblkl',
     '| sudo fdisk': None,
+    'partprobe': None,
     'sudo mkfs': None,
     'rsync': None,
+    'sudo df': None,
+    'sudo mv': None,
     'mount': None,
     'grub-install': None,
     'echo -e': None,
     'mkdir': None,
+    'goto_cloud/hooks': None,
     '(': None,
     '&': None,
 }
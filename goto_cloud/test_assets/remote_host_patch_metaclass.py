@@ -2,10 +2,26 @@ from unittest.mock import patch
 
 
 def mocked_execute(remote_executor, command, *args, **kwargs):
+    return execute_on_remote_host_mock(remote_executor.hostname, command)
+
+
+def execute_on_remote_host_mock(hostname, command, track_command=None):
+    """
+    executes a command on the remote host mock of the given host. Batches of commands are split up into their single
+    commands, which are executed and tracked one by one.
+    """
     from .test_assets import TestAsset
-    return TestAsset.REMOTE_HOST_MOCKS[remote_executor.hostname].execute(
-        command
-    )
+    from .remote_command_batch_emulation import RemoteCommandBatchEmulator
+
+    def execute(single_command):
+        if track_command:
+            track_command(single_command)
+        return TestAsset.REMOTE_HOST_MOCKS[hostname].execute(single_command)
+
+    if RemoteCommandBatchEmulator.is_batch(command):
+        return RemoteCommandBatchEmulator(command).execute(execute)
+    return execute(command)
+
 
 class PatchRemoteHostMeta(type):
     """
@@ -28,9 +44,8 @@ class PatchTrackedRemoteExecutionMeta(PatchRemoteHostMeta):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.executed_commands = set()
-        def tracked_mocked_execute(remote_host, command, *args, **kwargs):
-            self.executed_commands.add(command)
-            return PatchRemoteHostMeta.MOCKED_EXECUTE(remote_host, command)
+        def tracked_mocked_execute(remote_executor, command, *args, **kwargs):
+            return execute_on_remote_host_mock(remote_executor.hostname, command, self.executed_commands.add)
 
         patch(
             'remote_execution.remote_execution.SshRemoteExecutor._execute',
@@ -2,11 +2,15 @@ from .remote_host_patch_metaclass import PatchRemoteHostMeta, PatchTrackedRemote
 from .remote_host_mocks import UBUNTU_12_04, UBUNTU_14_04, UBUNTU_16_04, UBUNTU_16_04__LVM,\
     TARGET__DEVICE_IDENTIFICATION, TARGET__FILESYSTEM_CREATION
 from .migration_plan_mock import MIGRATION_PLAN_MOCK
+from .current_thread_executor import CurrentThreadExecutor
+from .import_measurement import ImportMeasurement
 
 
 class TestAsset():
     PatchRemoteHostMeta = PatchRemoteHostMeta
     PatchTrackedRemoteExecutionMeta = PatchTrackedRemoteExecutionMeta
+    CurrentThreadExecutor = CurrentThreadExecutor
+    ImportMeasurement = ImportMeasurement
 
     REMOTE_HOST_MOCKS = {
         'ubuntu12': UBUNTU_12_04,